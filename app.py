@@ -1,1524 +1,1639 @@
-import streamlit as st
-import math
-
-# ==============================================================================
-# PAGE CONFIGURATION
-# ==============================================================================
-
-st.set_page_config(
-    page_title="面積計算機", 
-    page_icon="📐", 
-    layout="centered"
-)
-
-# ==============================================================================
-# CONSTANTS & SPECIFICATIONS
-# ==============================================================================
-
-SHEET_SPECS = {
-    'ceiling_thin': {
-        'name': '養生シート 0.1mm × 1800mm × 50m',
-        'width_mm': 1800,
-        'length_m': 50,
-        'thickness_mm': 0.1,
-        'nominal_coverage': 90,
-        'overlap_factor': 0.8,  # 20%重複
-        'actual_coverage': 72,
-        'description': '天井用 (1層)'
-    },
-    'ceiling_wide': {
-        'name': '養生シート 0.1mm × 3600mm × 50m',
-        'width_mm': 3600,
-        'length_m': 50,
-        'thickness_mm': 0.1,
-        'nominal_coverage': 180,
-        'overlap_factor': 0.8,  # 20%重複
-        'actual_coverage': 144,
-        'description': '天井用 (1層)'
-    },
-    'wall_thin': {
-        'name': '養生シート 0.1mm × 1800mm × 50m',
-        'width_mm': 1800,
-        'length_m': 50,
-        'thickness_mm': 0.1,
-        'nominal_coverage': 90,
-        'overlap_factor': 0.8,  # 20%重複
-        'actual_coverage': 72,
-        'description': '壁面用 (1層)'
-    },
-    'wall_wide': {
-        'name': '養生シート 0.1mm × 3600mm × 50m',
-        'width_mm': 3600,
-        'length_m': 50,
-        'thickness_mm': 0.1,
-        'nominal_coverage': 180,
-        'overlap_factor': 0.8,  # 20%重複
-        'actual_coverage': 144,
-        'description': '壁面用 (1層)'
-    },
-    'floor_thin': {
-        'name': '養生シート 0.15mm × 1800mm × 50m',
-        'width_mm': 1800,
-        'length_m': 50,
-        'thickness_mm': 0.15,
-        'nominal_coverage': 90,
-        'layers_required': 2,
-        'actual_coverage': 36,  # 2層必要のため半分
-        'description': '床面用 (2層必要)'
-    },
-    'floor_wide': {
-        'name': '養生シート 0.15mm × 3600mm × 50m',
-        'width_mm': 3600,
-        'length_m': 50,
-        'thickness_mm': 0.15,
-        'nominal_coverage': 180,
-        'layers_required': 2,
-        'actual_coverage': 72,  # 2層必要のため半分
-        'description': '床面用 (2層必要)'
-    }
-}
-
-ROLL_WIDTH_1800 = 1800
-ROLL_WIDTH_3600 = 3600
-ROLL_LENGTH = 50
-
-# ==============================================================================
-# HELPER FUNCTIONS - ROLL CALCULATIONS
-# ==============================================================================
-
-def calculate_roll_combination_by_dimension(dimension_mm):
-    """
-    Calculate optimal roll combination based on a dimension (width for ceiling/floor).
-    Returns the combination pattern, number of 1800mm rolls, and number of 3600mm rolls.
-    
-    Logic follows the specific pattern:
-    - dimension ≤ 1200mm: use 1×1800mm
-    - dimension ≤ 3000mm: use 1×3600mm
-    - dimension 3000mm < 4500mm: use 1×3600mm + 1×1800mm
-    - dimension 4500mm < 6300mm: use 2×3600mm
-    - dimension 6300mm < 7800mm: use 2×3600mm + 1×1800mm
-    - dimension 7800mm < 9600mm: use 3×3600mm
-    - dimension 9600mm < 11100mm: use 3×3600mm + 1×1800mm
-    - dimension 11100mm < 12900mm: use 4×3600mm
-    - Continue pattern: alternate adding 3600mm then 1800mm until 100000mm
-    """
-    if dimension_mm <= 0:
-        return [], 0, 0
-    
-    # Handle dimensions up to 100000mm with the specified pattern
-    if dimension_mm <= 1200:
-        rolls_1800, rolls_3600 = 1, 0
-    elif dimension_mm <= 3000:
-        rolls_1800, rolls_3600 = 0, 1
-    elif dimension_mm <= 4500:
-        rolls_1800, rolls_3600 = 1, 1
-    elif dimension_mm <= 6300:
-        rolls_1800, rolls_3600 = 0, 2
-    elif dimension_mm <= 7800:
-        rolls_1800, rolls_3600 = 1, 2
-    elif dimension_mm <= 9600:
-        rolls_1800, rolls_3600 = 0, 3
-    elif dimension_mm <= 11100:
-        rolls_1800, rolls_3600 = 1, 3
-    elif dimension_mm <= 12900:
-        rolls_1800, rolls_3600 = 0, 4
-    elif dimension_mm <= 14400:
-        rolls_1800, rolls_3600 = 1, 4
-    elif dimension_mm <= 16200:
-        rolls_1800, rolls_3600 = 0, 5
-    elif dimension_mm <= 17700:
-        rolls_1800, rolls_3600 = 1, 5
-    elif dimension_mm <= 19500:
-        rolls_1800, rolls_3600 = 0, 6
-    elif dimension_mm <= 21000:
-        rolls_1800, rolls_3600 = 1, 6
-    elif dimension_mm <= 22800:
-        rolls_1800, rolls_3600 = 0, 7
-    elif dimension_mm <= 24300:
-        rolls_1800, rolls_3600 = 1, 7
-    elif dimension_mm <= 26100:
-        rolls_1800, rolls_3600 = 0, 8
-    elif dimension_mm <= 27600:
-        rolls_1800, rolls_3600 = 1, 8
-    elif dimension_mm <= 29400:
-        rolls_1800, rolls_3600 = 0, 9
-    elif dimension_mm <= 30900:
-        rolls_1800, rolls_3600 = 1, 9
-    elif dimension_mm <= 32700:
-        rolls_1800, rolls_3600 = 0, 10
-    elif dimension_mm <= 34200:
-        rolls_1800, rolls_3600 = 1, 10
-    elif dimension_mm <= 36000:
-        rolls_1800, rolls_3600 = 0, 11
-    elif dimension_mm <= 37500:
-        rolls_1800, rolls_3600 = 1, 11
-    elif dimension_mm <= 39300:
-        rolls_1800, rolls_3600 = 0, 12
-    elif dimension_mm <= 40800:
-        rolls_1800, rolls_3600 = 1, 12
-    elif dimension_mm <= 42600:
-        rolls_1800, rolls_3600 = 0, 13
-    elif dimension_mm <= 44100:
-        rolls_1800, rolls_3600 = 1, 13
-    elif dimension_mm <= 45900:
-        rolls_1800, rolls_3600 = 0, 14
-    elif dimension_mm <= 47400:
-        rolls_1800, rolls_3600 = 1, 14
-    elif dimension_mm <= 49200:
-        rolls_1800, rolls_3600 = 0, 15
-    elif dimension_mm <= 50700:
-        rolls_1800, rolls_3600 = 1, 15
-    elif dimension_mm <= 52500:
-        rolls_1800, rolls_3600 = 0, 16
-    elif dimension_mm <= 54000:
-        rolls_1800, rolls_3600 = 1, 16
-    elif dimension_mm <= 55800:
-        rolls_1800, rolls_3600 = 0, 17
-    elif dimension_mm <= 57300:
-        rolls_1800, rolls_3600 = 1, 17
-    elif dimension_mm <= 59100:
-        rolls_1800, rolls_3600 = 0, 18
-    elif dimension_mm <= 60600:
-        rolls_1800, rolls_3600 = 1, 18
-    elif dimension_mm <= 62400:
-        rolls_1800, rolls_3600 = 0, 19
-    elif dimension_mm <= 63900:
-        rolls_1800, rolls_3600 = 1, 19
-    elif dimension_mm <= 65700:
-        rolls_1800, rolls_3600 = 0, 20
-    elif dimension_mm <= 67200:
-        rolls_1800, rolls_3600 = 1, 20
-    elif dimension_mm <= 69000:
-        rolls_1800, rolls_3600 = 0, 21
-    elif dimension_mm <= 70500:
-        rolls_1800, rolls_3600 = 1, 21
-    elif dimension_mm <= 72300:
-        rolls_1800, rolls_3600 = 0, 22
-    elif dimension_mm <= 73800:
-        rolls_1800, rolls_3600 = 1, 22
-    elif dimension_mm <= 75600:
-        rolls_1800, rolls_3600 = 0, 23
-    elif dimension_mm <= 77100:
-        rolls_1800, rolls_3600 = 1, 23
-    elif dimension_mm <= 78900:
-        rolls_1800, rolls_3600 = 0, 24
-    elif dimension_mm <= 80400:
-        rolls_1800, rolls_3600 = 1, 24
-    elif dimension_mm <= 82200:
-        rolls_1800, rolls_3600 = 0, 25
-    elif dimension_mm <= 83700:
-        rolls_1800, rolls_3600 = 1, 25
-    elif dimension_mm <= 85500:
-        rolls_1800, rolls_3600 = 0, 26
-    elif dimension_mm <= 87000:
-        rolls_1800, rolls_3600 = 1, 26
-    elif dimension_mm <= 88800:
-        rolls_1800, rolls_3600 = 0, 27
-    elif dimension_mm <= 90300:
-        rolls_1800, rolls_3600 = 1, 27
-    elif dimension_mm <= 92100:
-        rolls_1800, rolls_3600 = 0, 28
-    elif dimension_mm <= 93600:
-        rolls_1800, rolls_3600 = 1, 28
-    elif dimension_mm <= 95400:
-        rolls_1800, rolls_3600 = 0, 29
-    elif dimension_mm <= 96900:
-        rolls_1800, rolls_3600 = 1, 29
-    elif dimension_mm <= 98700:
-        rolls_1800, rolls_3600 = 0, 30
-    elif dimension_mm <= 100000:
-        rolls_1800, rolls_3600 = 1, 30
-    else:
-        # For dimensions > 100000mm, use algorithmic approach
-        # Pattern: every 1800mm increment alternates between adding 3600mm and 1800mm
-        base_3600_rolls = int(dimension_mm // 3600)
-        remainder = dimension_mm % 3600
-        
-        if remainder <= 1200:
-            rolls_1800 = 1 if remainder > 0 else 0
-            rolls_3600 = base_3600_rolls
-        else:
-            # Need one more 3600mm roll for the remainder
-            rolls_1800 = 0
-            rolls_3600 = base_3600_rolls + 1
-    
-    # Build combination list for display
-    combination = []
-    for _ in range(rolls_3600):
-        combination.append("3600mm")
-    for _ in range(rolls_1800):
-        combination.append("1800mm")
-    
-    return combination, rolls_1800, rolls_3600
-
-
-def calculate_wall_roll_combination_by_dimension(dimension_mm, has_floor_covering=False):
-    """
-    Calculate optimal wall roll combination based on dimension and floor covering status.
-    
-    Args:
-        dimension_mm: Wall dimension in millimeters
-        has_floor_covering: Whether floor covering is being calculated
-    
-    Returns:
-        tuple: (combination_list, rolls_1800, rolls_3600)
-    
-    Logic without floor covering:
-    - dimension ≤ 1800mm: use 1×1800mm
-    - dimension ≤ 3600mm: use 1×3600mm  
-    - 3600mm < dimension ≤ 5400mm: use 1×3600mm + 1×1800mm
-    - 5400mm < dimension ≤ 7200mm: use 2×3600mm
-    - Continue pattern...
-    
-    Logic with floor covering:
-    - dimension ≤ 2100mm: use 1×1800mm
-    - dimension ≤ 3900mm: use 1×3600mm
-    - 3900mm < dimension ≤ 5700mm: use 1×3600mm + 1×1800mm
-    - 5700mm < dimension ≤ 7500mm: use 2×3600mm
-    - Continue pattern...
-    """
-    if dimension_mm <= 0:
-        return [], 0, 0
-    
-    rolls_1800 = 0
-    rolls_3600 = 0
-    remaining = dimension_mm
-    
-    # Set thresholds based on floor covering status
-    if has_floor_covering:
-        single_1800_threshold = 2100
-        single_3600_threshold = 3900
-        pattern_increment = 1800  # 2100 -> 3900 -> 5700 -> 7500...
-    else:
-        single_1800_threshold = 1800
-        single_3600_threshold = 3600
-        pattern_increment = 1800  # 1800 -> 3600 -> 5400 -> 7200...
-    
-    while remaining > 0:
-        if remaining <= single_1800_threshold:
-            rolls_1800 += 1
-            remaining = 0
-        elif remaining <= single_3600_threshold:
-            rolls_3600 += 1
-            remaining = 0
-        elif remaining <= single_3600_threshold + pattern_increment:
-            # Use 3600mm + 1800mm
-            rolls_3600 += 1
-            rolls_1800 += 1
-            remaining = 0
-        elif remaining <= single_3600_threshold + (2 * pattern_increment):
-            # Use 2×3600mm
-            rolls_3600 += 2
-            remaining = 0
-        else:
-            # For larger dimensions, subtract one 3600mm and continue
-            rolls_3600 += 1
-            remaining -= 3600
-            
-            # If remainder is small enough for 1800mm, use it
-            if remaining > 0 and remaining <= single_1800_threshold:
-                rolls_1800 += 1
-                remaining = 0
-    
-    # Build combination list for display
-    combination = []
-    for _ in range(rolls_3600):
-        combination.append("3600mm")
-    for _ in range(rolls_1800):
-        combination.append("1800mm")
-    
-    return combination, rolls_1800, rolls_3600
-
-
-def calculate_wall_rolls_by_height(height_mm, perimeter_m, has_floor_covering=False):
-    """
-    Calculate wall rolls based on height pattern and perimeter coverage.
-    
-    Args:
-        height_mm: Wall height in millimeters
-        perimeter_m: Room perimeter in meters
-        has_floor_covering: Whether floor covering is being calculated
-    
-    Returns:
-        tuple: (combination_list, rolls_1800_per_set, rolls_3600_per_set, num_sets)
-    """
-    if height_mm <= 0 or perimeter_m <= 0:
-        return [], 0, 0, 0
-    
-    # Get the height-based roll pattern using wall-specific logic
-    combination, rolls_1800_per_set, rolls_3600_per_set = calculate_wall_roll_combination_by_dimension(height_mm, has_floor_covering)
-    
-    # Calculate how many sets needed for perimeter coverage (50m per roll)
-    num_sets = math.ceil(perimeter_m / ROLL_LENGTH)
-    
-    # Total rolls = pattern per set × number of sets
-    total_rolls_1800 = rolls_1800_per_set * num_sets
-    total_rolls_3600 = rolls_3600_per_set * num_sets
-    
-    return combination, total_rolls_1800, total_rolls_3600, num_sets
-
-
-def calculate_floor_rolls_by_length(width_mm, length_m):
-    """
-    Calculate floor rolls based on width pattern and room length.
-    Floor requires 2 layers, so length calculation is doubled.
-    An additional 0.6m is added to the room length for safety margin/waste allowance.
-    
-    Args:
-        width_mm: Room width in millimeters
-        length_m: Room length in meters
-    
-    Returns:
-        tuple: (combination_list, total_rolls_1800, total_rolls_3600)
-    """
-    if width_mm <= 0 or length_m <= 0:
-        return [], 0, 0
-    
-    # Add 0.6m safety margin to room length
-    adjusted_length_m = length_m + 0.6
-    
-    # Get the width-based roll pattern
-    combination, rolls_1800_per_layer, rolls_3600_per_layer = calculate_roll_combination_by_dimension(width_mm)
-    
-    # Calculate total length needed (2 layers)
-    total_rolls_1800 = 0
-    total_rolls_3600 = 0
-    
-    if rolls_1800_per_layer > 0:
-        length_needed_1800 = adjusted_length_m * 2 * rolls_1800_per_layer
-        total_rolls_1800 = math.ceil(length_needed_1800 / ROLL_LENGTH)
-    
-    if rolls_3600_per_layer > 0:
-        length_needed_3600 = adjusted_length_m * 2 * rolls_3600_per_layer
-        total_rolls_3600 = math.ceil(length_needed_3600 / ROLL_LENGTH)
-    
-    return combination, total_rolls_1800, total_rolls_3600
-
-
-def calculate_optimized_multi_room_floor(rooms_data):
-    """
-    Calculate optimized floor roll usage across ALL rooms.
-    This function pools leftover material across rooms to minimize total rolls needed.
-    
-    Args:
-        rooms_data: List of room dictionaries with floor_area, width_mm, length_m
-    
-    Returns:
-        dict: Detailed breakdown including per-room usage and cross-room optimization
-    """
-    if not rooms_data:
-        return {}, 0, 0
-    
-    # Track global leftover coverage that can be shared between rooms (in m²)
-    global_leftover_1800_floor = 0
-    global_leftover_3600_floor = 0
-    
-    # Track total rolls needed
-    total_rolls_1800_floor = 0
-    total_rolls_3600_floor = 0
-    
-    # Track detailed results per room
-    floor_room_results = []
-    
-    # Floor coverage values (0.15mm thickness, 2 layers required)
-    coverage_1800_floor = SHEET_SPECS['floor_thin']['actual_coverage']
-    coverage_3600_floor = SHEET_SPECS['floor_wide']['actual_coverage']
-    
-    for room in rooms_data:
-        room_name = room['name']
-        floor_area = room.get('floor_area', 0)
-        width_mm = room.get('width_mm', 0)
-        length_m = room.get('length_m', 0)
-        
-        if floor_area <= 0 or width_mm <= 0 or length_m <= 0:
-            continue
-        
-        # Get the width-based roll pattern
-        combination, rolls_1800_per_layer, rolls_3600_per_layer = calculate_roll_combination_by_dimension(width_mm)
-        
-        # Calculate floor coverage needed (the actual_coverage already accounts for 2 layers)
-        floor_1800_coverage_needed = 0
-        floor_3600_coverage_needed = 0
-        
-        if floor_area > 0 and width_mm > 0:
-            total_pattern_units = rolls_1800_per_layer + rolls_3600_per_layer
-            if total_pattern_units > 0:
-                # Do NOT double the area - actual_coverage already accounts for 2 layers
-                floor_1800_coverage_needed = floor_area * (rolls_1800_per_layer / total_pattern_units)
-                floor_3600_coverage_needed = floor_area * (rolls_3600_per_layer / total_pattern_units)
-        
-        # === TRY TO USE GLOBAL LEFTOVER FOR FLOOR FIRST ===
-        floor_1800_from_leftover = 0
-        floor_3600_from_leftover = 0
-        
-        if floor_1800_coverage_needed > 0 and global_leftover_1800_floor > 0:
-            floor_1800_from_leftover = min(global_leftover_1800_floor, floor_1800_coverage_needed)
-            global_leftover_1800_floor -= floor_1800_from_leftover
-            floor_1800_coverage_needed -= floor_1800_from_leftover
-        
-        if floor_3600_coverage_needed > 0 and global_leftover_3600_floor > 0:
-            floor_3600_from_leftover = min(global_leftover_3600_floor, floor_3600_coverage_needed)
-            global_leftover_3600_floor -= floor_3600_from_leftover
-            floor_3600_coverage_needed -= floor_3600_from_leftover
-        
-        # Calculate NEW rolls needed for remaining floor coverage
-        new_floor_1800_rolls = 0
-        new_floor_3600_rolls = 0
-        new_leftover_1800_floor = 0
-        new_leftover_3600_floor = 0
-        
-        # Use same approach as ceiling/wall: work entirely in coverage area (m²)
-        if floor_1800_coverage_needed > 0:
-            rolls_exact = floor_1800_coverage_needed / coverage_1800_floor
-            new_floor_1800_rolls = math.ceil(rolls_exact)
-            new_leftover_1800_floor = (new_floor_1800_rolls - rolls_exact) * coverage_1800_floor
-        
-        if floor_3600_coverage_needed > 0:
-            rolls_exact = floor_3600_coverage_needed / coverage_3600_floor
-            new_floor_3600_rolls = math.ceil(rolls_exact)
-            new_leftover_3600_floor = (new_floor_3600_rolls - rolls_exact) * coverage_3600_floor
-        
-        # Add new leftovers to global pool
-        global_leftover_1800_floor += new_leftover_1800_floor
-        global_leftover_3600_floor += new_leftover_3600_floor
-        
-        # Update totals
-        total_rolls_1800_floor += new_floor_1800_rolls
-        total_rolls_3600_floor += new_floor_3600_rolls
-        
-        # Store results
-        floor_room_results.append({
-            'name': room_name,
-            'floor_1800_from_leftover': floor_1800_from_leftover,
-            'floor_3600_from_leftover': floor_3600_from_leftover,
-            'new_floor_1800_rolls': new_floor_1800_rolls,
-            'new_floor_3600_rolls': new_floor_3600_rolls,
-            'room_total_1800': new_floor_1800_rolls,
-            'room_total_3600': new_floor_3600_rolls,
-            'floor_combination': combination
-        })
-    
-    return {
-        'floor_room_results': floor_room_results,
-        'total_rolls_1800_floor': total_rolls_1800_floor,
-        'total_rolls_3600_floor': total_rolls_3600_floor,
-        'final_leftover_1800_floor': global_leftover_1800_floor,
-        'final_leftover_3600_floor': global_leftover_3600_floor
-    }, total_rolls_1800_floor, total_rolls_3600_floor
-
-
-def calculate_optimized_multi_room_ceiling_wall(rooms_data, has_floor_covering=False):
-    """
-    Calculate optimized roll usage across ALL rooms for ceiling and walls.
-    This function pools leftover material across rooms to minimize total rolls needed.
-    
-    Args:
-        rooms_data: List of room dictionaries with ceiling_area, wall_area, width_mm, height_mm, perimeter
-        has_floor_covering: Whether floor covering is being calculated (affects wall dimension logic)
-    
-    Returns:
-        dict: Detailed breakdown including per-room usage and cross-room optimization
-    """
-    if not rooms_data:
-        return {}, 0, 0
-    
-    # Track global leftover coverage that can be shared between rooms
-    global_leftover_1800 = 0
-    global_leftover_3600 = 0
-    
-    # Track total rolls needed
-    total_rolls_1800 = 0
-    total_rolls_3600 = 0
-    
-    # Track detailed results per room
-    room_results = []
-    
-    # Coverage values
-    coverage_1800 = SHEET_SPECS['ceiling_thin']['actual_coverage']
-    coverage_3600 = SHEET_SPECS['ceiling_wide']['actual_coverage']
-    
-    for room in rooms_data:
-        room_name = room['name']
-        ceiling_area = room.get('ceiling_area', 0)
-        wall_area = room.get('wall_area', 0)
-        width_mm = room.get('width_mm', 0)
-        height_mm = room.get('height_mm', 0)
-        perimeter = room.get('perimeter', 0)
-        
-        if ceiling_area <= 0 and wall_area <= 0:
-            continue
-        
-        # Get patterns
-        ceiling_combination, ceiling_1800_pattern, ceiling_3600_pattern = \
-            calculate_roll_combination_by_dimension(width_mm) if width_mm > 0 else ([], 0, 0)
-        
-        wall_combination, wall_1800_per_set, wall_3600_per_set, wall_perimeter_sets = \
-            calculate_wall_rolls_by_height(height_mm, perimeter, has_floor_covering) if height_mm > 0 and perimeter > 0 else ([], 0, 0, 0)
-        
-        # Calculate ceiling coverage needed
-        ceiling_1800_coverage_needed = 0
-        ceiling_3600_coverage_needed = 0
-        
-        if ceiling_area > 0 and width_mm > 0:
-            total_pattern_units = ceiling_1800_pattern + ceiling_3600_pattern
-            if total_pattern_units > 0:
-                ceiling_1800_coverage_needed = ceiling_area * (ceiling_1800_pattern / total_pattern_units)
-                ceiling_3600_coverage_needed = ceiling_area * (ceiling_3600_pattern / total_pattern_units)
-        
-        # === TRY TO USE GLOBAL LEFTOVER FOR CEILING FIRST ===
-        ceiling_1800_from_leftover = 0
-        ceiling_3600_from_leftover = 0
-        
-        if ceiling_1800_coverage_needed > 0 and global_leftover_1800 > 0:
-            ceiling_1800_from_leftover = min(global_leftover_1800, ceiling_1800_coverage_needed)
-            global_leftover_1800 -= ceiling_1800_from_leftover
-            ceiling_1800_coverage_needed -= ceiling_1800_from_leftover
-        
-        if ceiling_3600_coverage_needed > 0 and global_leftover_3600 > 0:
-            ceiling_3600_from_leftover = min(global_leftover_3600, ceiling_3600_coverage_needed)
-            global_leftover_3600 -= ceiling_3600_from_leftover
-            ceiling_3600_coverage_needed -= ceiling_3600_from_leftover
-        
-        # Calculate NEW rolls needed for remaining ceiling coverage
-        new_ceiling_1800_rolls = 0
-        new_ceiling_3600_rolls = 0
-        new_leftover_1800 = 0
-        new_leftover_3600 = 0
-        
-        if ceiling_1800_coverage_needed > 0:
-            rolls_exact = ceiling_1800_coverage_needed / coverage_1800
-            new_ceiling_1800_rolls = math.ceil(rolls_exact)
-            new_leftover_1800 = (new_ceiling_1800_rolls - rolls_exact) * coverage_1800
-        
-        if ceiling_3600_coverage_needed > 0:
-            rolls_exact = ceiling_3600_coverage_needed / coverage_3600
-            new_ceiling_3600_rolls = math.ceil(rolls_exact)
-            new_leftover_3600 = (new_ceiling_3600_rolls - rolls_exact) * coverage_3600
-        
-        # Add new leftovers to global pool
-        global_leftover_1800 += new_leftover_1800
-        global_leftover_3600 += new_leftover_3600
-        
-        # === CALCULATE WALL NEEDS ===
-        remaining_wall_area = wall_area
-        
-        # Try to use global leftover for walls
-        wall_1800_from_leftover = 0
-        wall_3600_from_leftover = 0
-        
-        if remaining_wall_area > 0 and global_leftover_1800 > 0:
-            wall_1800_from_leftover = min(global_leftover_1800, remaining_wall_area)
-            global_leftover_1800 -= wall_1800_from_leftover
-            remaining_wall_area -= wall_1800_from_leftover
-        
-        if remaining_wall_area > 0 and global_leftover_3600 > 0:
-            wall_3600_from_leftover = min(global_leftover_3600, remaining_wall_area)
-            global_leftover_3600 -= wall_3600_from_leftover
-            remaining_wall_area -= wall_3600_from_leftover
-        
-        # Calculate additional rolls for remaining wall area
-        additional_wall_1800_rolls = 0
-        additional_wall_3600_rolls = 0
-        
-        if remaining_wall_area > 0:
-            if wall_1800_per_set > 0 or wall_3600_per_set > 0:
-                pattern_coverage_per_set = (wall_3600_per_set * coverage_3600) + (wall_1800_per_set * coverage_1800)
-                if pattern_coverage_per_set > 0:
-                    sets_needed = math.ceil(remaining_wall_area / pattern_coverage_per_set)
-                    additional_wall_3600_rolls = wall_3600_per_set * sets_needed
-                    additional_wall_1800_rolls = wall_1800_per_set * sets_needed
-                    
-                    # Calculate leftover from these additional wall rolls
-                    wall_coverage_provided = sets_needed * pattern_coverage_per_set
-                    wall_leftover = wall_coverage_provided - remaining_wall_area
-                    
-                    # Distribute leftover proportionally
-                    if wall_leftover > 0 and (wall_1800_per_set + wall_3600_per_set) > 0:
-                        leftover_1800_portion = wall_leftover * (wall_1800_per_set / (wall_1800_per_set + wall_3600_per_set))
-                        leftover_3600_portion = wall_leftover * (wall_3600_per_set / (wall_1800_per_set + wall_3600_per_set))
-                        global_leftover_1800 += leftover_1800_portion
-                        global_leftover_3600 += leftover_3600_portion
-            else:
-                # Fallback
-                if remaining_wall_area >= coverage_3600:
-                    additional_wall_3600_rolls = int(remaining_wall_area // coverage_3600)
-                    remaining_after_3600 = remaining_wall_area % coverage_3600
-                    if remaining_after_3600 > 0:
-                        additional_wall_1800_rolls = 1
-                        global_leftover_1800 += (coverage_1800 - remaining_after_3600)
-                else:
-                    additional_wall_1800_rolls = 1
-                    global_leftover_1800 += (coverage_1800 - remaining_wall_area)
-        
-        # Update totals
-        room_total_1800 = new_ceiling_1800_rolls + additional_wall_1800_rolls
-        room_total_3600 = new_ceiling_3600_rolls + additional_wall_3600_rolls
-        
-        total_rolls_1800 += room_total_1800
-        total_rolls_3600 += room_total_3600
-        
-        # Store results
-        room_results.append({
-            'name': room_name,
-            'ceiling_1800_from_leftover': ceiling_1800_from_leftover,
-            'ceiling_3600_from_leftover': ceiling_3600_from_leftover,
-            'new_ceiling_1800_rolls': new_ceiling_1800_rolls,
-            'new_ceiling_3600_rolls': new_ceiling_3600_rolls,
-            'wall_1800_from_leftover': wall_1800_from_leftover,
-            'wall_3600_from_leftover': wall_3600_from_leftover,
-            'additional_wall_1800_rolls': additional_wall_1800_rolls,
-            'additional_wall_3600_rolls': additional_wall_3600_rolls,
-            'room_total_1800': room_total_1800,
-            'room_total_3600': room_total_3600,
-            'ceiling_combination': ceiling_combination,
-            'wall_combination': wall_combination,
-            'wall_perimeter_sets': wall_perimeter_sets
-        })
-    
-    return {
-        'room_results': room_results,
-        'total_rolls_1800': total_rolls_1800,
-        'total_rolls_3600': total_rolls_3600,
-        'final_leftover_1800': global_leftover_1800,
-        'final_leftover_3600': global_leftover_3600
-    }, total_rolls_1800, total_rolls_3600
-
-
-def calculate_optimized_multi_room_ceiling_wall_1800_only(rooms_data, has_floor_covering=False):
-    """
-    Calculate optimized roll usage across ALL rooms for ceiling and walls.
-    ONLY uses 1800mm rolls (no 3600mm rolls).
-    This function pools leftover material across rooms to minimize total rolls needed.
-    
-    Args:
-        rooms_data: List of room dictionaries with ceiling_area, wall_area, width_mm, height_mm, perimeter
-        has_floor_covering: Whether floor covering is being calculated
-    
-    Returns:
-        dict: Detailed breakdown including per-room usage and cross-room optimization
-    """
-    if not rooms_data:
-        return {}, 0, 0
-    
-    # Track global leftover coverage that can be shared between rooms
-    global_leftover_1800 = 0
-    
-    # Track total rolls needed (only 1800mm)
-    total_rolls_1800 = 0
-    
-    # Track detailed results per room
-    room_results = []
-    
-    # Coverage values (only 1800mm)
-    coverage_1800 = SHEET_SPECS['ceiling_thin']['actual_coverage']  # 72 m²
-    
-    for room in rooms_data:
-        room_name = room['name']
-        ceiling_area = room.get('ceiling_area', 0)
-        wall_area = room.get('wall_area', 0)
-        
-        if ceiling_area <= 0 and wall_area <= 0:
-            continue
-        
-        total_area_needed = ceiling_area + wall_area
-        
-        # === TRY TO USE GLOBAL LEFTOVER FIRST ===
-        area_from_leftover = 0
-        
-        if total_area_needed > 0 and global_leftover_1800 > 0:
-            area_from_leftover = min(global_leftover_1800, total_area_needed)
-            global_leftover_1800 -= area_from_leftover
-            total_area_needed -= area_from_leftover
-        
-        # Calculate NEW rolls needed for remaining area
-        new_rolls_1800 = 0
-        new_leftover_1800 = 0
-        
-        if total_area_needed > 0:
-            rolls_exact = total_area_needed / coverage_1800
-            new_rolls_1800 = math.ceil(rolls_exact)
-            new_leftover_1800 = (new_rolls_1800 - rolls_exact) * coverage_1800
-        
-        # Add new leftovers to global pool
-        global_leftover_1800 += new_leftover_1800
-        
-        # Update totals
-        total_rolls_1800 += new_rolls_1800
-        
-        # Store results
-        room_results.append({
-            'name': room_name,
-            'area_from_leftover': area_from_leftover,
-            'new_rolls_1800': new_rolls_1800,
-            'room_total_1800': new_rolls_1800,
-            'room_total_3600': 0,  # No 3600mm rolls used
-            'ceiling_combination': ["1800mm"] if ceiling_area > 0 else [],
-            'wall_combination': ["1800mm"] if wall_area > 0 else []
-        })
-    
-    return {
-        'room_results': room_results,
-        'total_rolls_1800': total_rolls_1800,
-        'total_rolls_3600': 0,  # No 3600mm rolls
-        'final_leftover_1800': global_leftover_1800,
-        'final_leftover_3600': 0  # No 3600mm rolls
-    }, total_rolls_1800, 0
-
-
-def calculate_optimized_multi_room_floor_1800_only(rooms_data):
-    """
-    Calculate optimized floor roll usage across ALL rooms.
-    ONLY uses 1800mm rolls (no 3600mm rolls).
-    This function pools leftover material across rooms to minimize total rolls needed.
-    
-    Args:
-        rooms_data: List of room dictionaries with floor_area, width_mm, length_m
-    
-    Returns:
-        dict: Detailed breakdown including per-room usage and cross-room optimization
-    """
-    if not rooms_data:
-        return {}, 0, 0
-    
-    # Track global leftover coverage that can be shared between rooms (in m²)
-    global_leftover_1800_floor = 0
-    
-    # Track total rolls needed (only 1800mm)
-    total_rolls_1800_floor = 0
-    
-    # Track detailed results per room
-    floor_room_results = []
-    
-    # Floor coverage values (0.15mm thickness, 2 layers required) - only 1800mm
-    coverage_1800_floor = SHEET_SPECS['floor_thin']['actual_coverage']  # 36 m²
-    
-    for room in rooms_data:
-        room_name = room['name']
-        floor_area = room.get('floor_area', 0)
-        
-        if floor_area <= 0:
-            continue
-        
-        floor_coverage_needed = floor_area
-        
-        # === TRY TO USE GLOBAL LEFTOVER FOR FLOOR FIRST ===
-        floor_from_leftover = 0
-        
-        if floor_coverage_needed > 0 and global_leftover_1800_floor > 0:
-            floor_from_leftover = min(global_leftover_1800_floor, floor_coverage_needed)
-            global_leftover_1800_floor -= floor_from_leftover
-            floor_coverage_needed -= floor_from_leftover
-        
-        # Calculate NEW rolls needed for remaining floor coverage
-        new_floor_1800_rolls = 0
-        new_leftover_1800_floor = 0
-        
-        if floor_coverage_needed > 0:
-            rolls_exact = floor_coverage_needed / coverage_1800_floor
-            new_floor_1800_rolls = math.ceil(rolls_exact)
-            new_leftover_1800_floor = (new_floor_1800_rolls - rolls_exact) * coverage_1800_floor
-        
-        # Add new leftovers to global pool
-        global_leftover_1800_floor += new_leftover_1800_floor
-        
-        # Update totals
-        total_rolls_1800_floor += new_floor_1800_rolls
-        
-        # Store results
-        floor_room_results.append({
-            'name': room_name,
-            'floor_1800_from_leftover': floor_from_leftover,
-            'floor_3600_from_leftover': 0,  # No 3600mm rolls
-            'new_floor_1800_rolls': new_floor_1800_rolls,
-            'new_floor_3600_rolls': 0,  # No 3600mm rolls
-            'room_total_1800': new_floor_1800_rolls,
-            'room_total_3600': 0,  # No 3600mm rolls
-            'floor_combination': ["1800mm"] if floor_area > 0 else []
-        })
-    
-    return {
-        'floor_room_results': floor_room_results,
-        'total_rolls_1800_floor': total_rolls_1800_floor,
-        'total_rolls_3600_floor': 0,  # No 3600mm rolls
-        'final_leftover_1800_floor': global_leftover_1800_floor,
-        'final_leftover_3600_floor': 0  # No 3600mm rolls
-    }, total_rolls_1800_floor, 0
-
-
-# ==============================================================================
-# HELPER FUNCTIONS - ROOM CALCULATIONS
-# ==============================================================================
-
-def calculate_room_metrics(length, width, height):
-    """Calculate all metrics for a single room."""
-    if length <= 0 or width <= 0 or height <= 0:
-        return None
-    
-    floor_area = length * width
-    ceiling_area = floor_area
-    perimeter = 2 * (length + width)
-    wall_area = perimeter * height
-    
-    return {
-        'floor_area': floor_area,
-        'ceiling_area': ceiling_area,
-        'perimeter': perimeter,
-        'wall_area': wall_area
-    }
-
-# ==============================================================================
-# MAIN APP
-# ==============================================================================
-
-st.title("📐 面積計算機")
-
-tab_room, tab_building, tab_sheets = st.tabs([
-    "🏠 多室計算", 
-    "🏗️ 外壁足場養生", 
-    "🛡️ スマート養生シート"
-])
-
-# ==============================================================================
-# TAB 1: MULTIPLE ROOMS
-# ==============================================================================
-
-with tab_room:
-    st.header("🏠 多室計算機")
-    
-    # Initialize session state for rooms
-    if 'rooms' not in st.session_state:
-        st.session_state.rooms = [
-            {'name': '部屋 1', 'length': 0.0, 'width': 0.0, 'height': 0.0}
-        ]
-    
-    st.markdown("部屋を追加して設定してください:")
-    
-    # 部屋追加・削除ボタン
-    col_btn1, col_btn2 = st.columns(2)
-    with col_btn1:
-        if st.button("➕ 部屋を追加"):
-            room_num = len(st.session_state.rooms) + 1
-            st.session_state.rooms.append({
-                'name': f'部屋 {room_num}',
-                'length': 0.0,
-                'width': 0.0,
-                'height': 0.0
-            })
-            st.rerun()
-    
-    with col_btn2:
-        if st.button("➖ 最後の部屋を削除") and len(st.session_state.rooms) > 1:
-            st.session_state.rooms.pop()
-            st.rerun()
-    
-    # Display rooms configuration
-    rooms_data = []
-    total_floor_area = 0
-    total_ceiling_area = 0
-    total_wall_area = 0
-    
-    for i, room in enumerate(st.session_state.rooms):
-        st.markdown(f"### {room['name']}")
-        
-        col1, col2, col3, col4 = st.columns(4)
-        with col1:
-            room['name'] = st.text_input(
-                "部屋名", 
-                value=room['name'], 
-                key=f"name_{i}"
-            )
-        with col2:
-            room['length'] = st.number_input(
-                "長さ (m)", 
-                min_value=0.0, 
-                value=room['length'], 
-                step=0.01, 
-                format="%.4f",
-                key=f"length_{i}"
-            )
-        with col3:
-            room['width'] = st.number_input(
-                "幅 (m)", 
-                min_value=0.0, 
-                value=room['width'], 
-                step=0.01,
-                format="%.4f",
-                key=f"width_{i}"
-            )
-        with col4:
-            room['height'] = st.number_input(
-                "高さ (m)", 
-                min_value=0.0, 
-                value=room['height'], 
-                step=0.01,
-                format="%.4f",
-                key=f"height_{i}"
-            )
-        
-        # Calculate room metrics
-        metrics = calculate_room_metrics(room['length'], room['width'], room['height'])
-        
-        if metrics:
-            # Add to totals (always include all surfaces in Multi-Room tab)
-            total_floor_area += metrics['floor_area']
-            total_ceiling_area += metrics['ceiling_area']
-            total_wall_area += metrics['wall_area']
-            
-            # Store room data (always include all areas)
-            rooms_data.append({
-                'name': room['name'],
-                'floor_area': metrics['floor_area'],
-                'ceiling_area': metrics['ceiling_area'],
-                'wall_area': metrics['wall_area'],
-                'perimeter': metrics['perimeter']
-            })
-            
-            # Display individual room results (always show all)
-            col_a, col_b, col_c = st.columns(3)
-            with col_a:
-                st.metric("床面積", f"{metrics['floor_area']:.2f} m²")
-            with col_b:
-                st.metric("天井面積", f"{metrics['ceiling_area']:.2f} m²")
-            with col_c:
-                st.metric("壁面積", f"{metrics['wall_area']:.2f} m²")
-        
-        st.markdown("---")
-    
-    # Display summary
-    if rooms_data:
-        st.subheader("📊 概要 - 全室")
-        
-        # Always show all surface totals in Multi-Room tab
-        col_sum1, col_sum2, col_sum3 = st.columns(3)
-        with col_sum1:
-            st.metric("**合計床面積**", f"{total_floor_area:.2f} m²")
-        with col_sum2:
-            st.metric("**合計天井面積**", f"{total_ceiling_area:.2f} m²")
-        with col_sum3:
-            st.metric("**合計壁面積**", f"{total_wall_area:.2f} m²")
-        
-        # Detailed breakdown table
-        st.subheader("📋 部屋別内訳")
-        
-        # Always show all headers in Multi-Room tab
-        col_headers = st.columns(5)
-        headers = ["部屋名", "床面積 (m²)", "天井面積 (m²)", 
-                   "壁面積 (m²)", "周囲長 (m)"]
-        for col, header in zip(col_headers, headers):
-            with col:
-                st.write(f"**{header}**")
-        
-        for room_data in rooms_data:
-            col_data = st.columns(5)
-            with col_data[0]:
-                st.write(room_data['name'])
-            with col_data[1]:
-                st.write(f"{room_data['floor_area']:.2f}")
-            with col_data[2]:
-                st.write(f"{room_data['ceiling_area']:.2f}")
-            with col_data[3]:
-                st.write(f"{room_data['wall_area']:.2f}")
-            with col_data[4]:
-                st.write(f"{room_data['perimeter']:.2f}")
-    else:
-        st.info("👆 少なくとも1つの部屋について、**長さ、幅、高さに正の値**を入力してください。")
-
-# ==============================================================================
-# TAB 2: 外壁足場養生 (EXTERIOR WALL PROTECTION)
-# ==============================================================================
-
-with tab_building:
-    st.header("🏗️ 外壁足場養生計算機")
-    
-    # Initialize session state for building and scaffolding
-    if 'building_config' not in st.session_state:
-        st.session_state.building_config = {
-            'building_length_m': 0.0,   # Default empty
-            'building_height_m': 0.0,   # Default empty
-            'scaffolding_length_m': 1.829, # Standard scaffolding length in meters
-            'scaffolding_width_m': 0.9,    # Standard scaffolding width in meters
-            'scaffolding_height_m': 1.725  # Standard scaffolding height in meters
-        }
-    
-    st.markdown("**🏢 建物外壁寸法 (m):**")
-    
-    col_building1, col_building2 = st.columns(2)
-    with col_building1:
-        st.session_state.building_config['building_length_m'] = st.number_input(
-            "建物長さ (m)", 
-            min_value=0.0, 
-            value=st.session_state.building_config['building_length_m'], 
-            step=0.1,
-            format="%.3f",
-            key="building_length"
-        )
-    with col_building2:
-        st.session_state.building_config['building_height_m'] = st.number_input(
-            "建物高さ (m)", 
-            min_value=0.0, 
-            value=st.session_state.building_config['building_height_m'], 
-            step=0.1,
-            format="%.3f",
-            key="building_height"
-        )
-    
-    st.markdown("**🏗️ 足場寸法 (m):**")
-    
-    col_scaff1, col_scaff2, col_scaff3 = st.columns(3)
-    with col_scaff1:
-        st.session_state.building_config['scaffolding_length_m'] = st.number_input(
-            "足場長さ (m)", 
-            min_value=0.001, 
-            value=st.session_state.building_config['scaffolding_length_m'], 
-            step=0.001,
-            format="%.3f",
-            key="scaff_length"
-        )
-    with col_scaff2:
-        st.session_state.building_config['scaffolding_width_m'] = st.number_input(
-            "足場幅 (m)", 
-            min_value=0.001, 
-            value=st.session_state.building_config['scaffolding_width_m'], 
-            step=0.001,
-            format="%.3f",
-            key="scaff_width"
-        )
-    with col_scaff3:
-        st.session_state.building_config['scaffolding_height_m'] = st.number_input(
-            "足場高さ (m)", 
-            min_value=0.001, 
-            value=st.session_state.building_config['scaffolding_height_m'], 
-            step=0.001,
-            format="%.3f",
-            key="scaff_height"
-        )
-    
-    # Calculate scaffolding requirements
-    config = st.session_state.building_config
-    
-    if (config['building_length_m'] > 0 and config['building_height_m'] > 0 and 
-        config['scaffolding_length_m'] > 0 and config['scaffolding_width_m'] > 0 and
-        config['scaffolding_height_m'] > 0):
-        
-        # Calculate number of scaffolding units needed for ONE SIDE (always round UP)
-        units_along_length = math.ceil(config['building_length_m'] / config['scaffolding_length_m'])
-        units_along_height = math.ceil(config['building_height_m'] / config['scaffolding_height_m'])
-        
-        # Calculate scaffolding units for one side only
-        total_side_units = units_along_length * units_along_height
-        
-        # Calculate coverage areas per scaffolding unit
-        # Each unit covers: scaffolding_length × scaffolding_width (already in m²)
-        unit_coverage_area = config['scaffolding_length_m'] * config['scaffolding_width_m']
-        
-        # Total coverage areas for one side
-        total_top_area = total_side_units * unit_coverage_area      # Top (floor covering)
-        total_bottom_area = total_side_units * unit_coverage_area   # Bottom (ceiling covering)
-        
-        # Calculate side wall coverage (足場側壁養生)
-        # Total scaffolding length = units_along_length * scaffolding_length_m
-        # Total scaffolding height = units_along_height * scaffolding_height_m
-        total_scaffolding_length = units_along_length * config['scaffolding_length_m']
-        total_scaffolding_height = units_along_height * config['scaffolding_height_m']
-        side_wall_area = total_scaffolding_length * total_scaffolding_height
-        
-        # Calculate side wall horizontal covering details
-        # Each 1800mm roll covers 1.8m width × 50m length horizontally
-        roll_width_m = ROLL_WIDTH_1800 / 1000  # Convert 1800mm to 1.8m
-        horizontal_strips_needed = math.ceil(total_scaffolding_height / roll_width_m)
-        rolls_per_strip = math.ceil(total_scaffolding_length / ROLL_LENGTH)  # 50m per roll
-        
-        total_coverage_area = total_top_area + total_bottom_area + side_wall_area
-        
-        st.markdown("---")
-        st.subheader("📊 足場ユニット計算")
-        
-        # Display calculation breakdown
-        col_calc1, col_calc2, col_calc3 = st.columns(3)
-        with col_calc1:
-            st.markdown("**📐 必要ユニット数 (切り上げ):**")
-            st.info(f"長さ: {config['building_length_m']:.3f}m ÷ {config['scaffolding_length_m']:.3f}m = **{units_along_length}** ユニット")
-            st.info(f"高さ: {config['building_height_m']:.3f}m ÷ {config['scaffolding_height_m']:.3f}m = **{units_along_height}** ユニット")
-        
-        with col_calc2:
-            st.markdown("**🏗️ 片面カバー範囲:**")
-            st.write(f"長さユニット: {units_along_length}")
-            st.write(f"高さユニット: {units_along_height}")
-            st.metric("**片面ユニット**", f"{total_side_units}")
-        
-        with col_calc3:
-            st.markdown("**📏 総カバー範囲:**")
-            st.write(f"長さ × 高さ: {units_along_length} × {units_along_height}")
-            st.metric("**総足場ユニット**", f"{total_side_units}")
-            st.metric("**ユニット面積**", f"{unit_coverage_area:.3f} m²")
-            st.caption("per ユニット")
-            st.write(f"**側壁寸法:** {total_scaffolding_length:.3f}m × {total_scaffolding_height:.3f}m")
-            st.write(f"**側壁ストリップ数:** {horizontal_strips_needed} 水平ストリップが必要")
-            st.write(f"**ストリップ当たりロール数:** {rolls_per_strip} ロール (各50m長)")
-        
-        # Calculate roll requirements
-        # Always use 1800mm rolls only for all surfaces in 外壁養生
-        
-        top_roll_coverage = SHEET_SPECS['floor_thin']['actual_coverage']      # 36 m² (2 layers, 0.15mm)
-        bottom_roll_coverage = SHEET_SPECS['ceiling_thin']['actual_coverage']  # 72 m² (1 layer, 0.1mm)
-        side_wall_roll_coverage = SHEET_SPECS['wall_thin']['actual_coverage']  # 72 m² (1 layer, 0.1mm)
-        
-        # Calculate rolls needed for each surface (all using 1800mm rolls)
-        total_top_rolls = math.ceil(total_top_area / top_roll_coverage)
-        total_bottom_rolls = math.ceil(total_bottom_area / bottom_roll_coverage)
-        
-        # Side wall calculation: Use pre-calculated horizontal covering values
-        total_side_wall_rolls = horizontal_strips_needed * rolls_per_strip
-        
-        # Total rolls = sum of all surfaces (all 1800mm)
-        total_all_rolls = total_top_rolls + total_bottom_rolls + total_side_wall_rolls
-        
-        st.subheader("📦 材料要件")
-        
-        col_mat1, col_mat2, col_mat3, col_mat4 = st.columns(4)
-        with col_mat1:
-            st.metric("**上部ロール (0.15mm)**", f"{total_top_rolls}")
-            st.caption(f"{total_top_area:.1f} m² ÷ 36 = {total_top_rolls} × 1800mmロール")
-        with col_mat2:
-            st.metric("**下部ロール (0.1mm)**", f"{total_bottom_rolls}")  
-            st.caption(f"{total_bottom_area:.1f} m² ÷ 72 = {total_bottom_rolls} × 1800mmロール")
-        with col_mat3:
-            st.metric("**側壁ロール (0.1mm)**", f"{total_side_wall_rolls}")
-            st.caption(f"{horizontal_strips_needed} ストリップ × {rolls_per_strip} ロール/ストリップ = {total_side_wall_rolls} × 1800mmロール")
-        with col_mat4:
-            st.metric("**全ロール合計**", f"{total_all_rolls}")
-            st.caption(f"全て1800mmロール: {total_all_rolls} 合計")
-        
-        # Display total coverage area separately with better formatting
-        st.markdown("### 📏 **総カバー面積**")
-        st.success(f"🎯 **{total_coverage_area:,.2f} m²** (上面: {total_top_area:.1f} + 下面: {total_bottom_area:.1f} + 側壁: {side_wall_area:.1f})")
-        
-        # Coverage options with safety margin
-        st.subheader("🛡️ 材料概要")
-        
-        st.markdown("**📦 ロール必要数:**")
-        st.success(f"🏢 **上面カバー（床）:** {total_top_rolls} ロール 0.15mm × 1800mm × 50m")
-        st.success(f"🏠 **下面カバー（天井）:** {total_bottom_rolls} ロール 0.1mm × 1800mm × 50m")
-        st.success(f"🧱 **側壁カバー:** {total_side_wall_rolls} ロール 0.1mm × 1800mm × 50m")
-        
-        st.info(f"**📊 総材料:** {total_all_rolls} ロール（すべて1800mm × 50m）")
-        
-        # Detailed breakdown table
-        st.subheader("📋 計算詳細")
-        
-        # Create data for display
-        calculation_data = {
-            '建物長さ (m)': f"{config['building_length_m']:.3f}",
-            '建物高さ (m)': f"{config['building_height_m']:.3f}",
-            '足場長さ (m)': f"{config['scaffolding_length_m']:.3f}",
-            '足場幅 (m)': f"{config['scaffolding_width_m']:.3f}",
-            '足場高さ (m)': f"{config['scaffolding_height_m']:.3f}",
-            '長さ方向ユニット数': units_along_length,
-            '高さ方向ユニット数': units_along_height,
-            '側面総ユニット数': total_side_units,
-            '足場総長さ (m)': f"{total_scaffolding_length:.3f}",
-            '足場総高さ (m)': f"{total_scaffolding_height:.3f}",
-            '上面カバー面積 (m²)': f"{total_top_area:.2f}",
-            '下面カバー面積 (m²)': f"{total_bottom_area:.2f}",
-            '側壁面積 (m²)': f"{side_wall_area:.2f}",
-            '総カバー面積 (m²)': f"{total_coverage_area:.2f}"
-        }
-        
-        # Display as two-column layout
-        col_table1, col_table2 = st.columns(2)
-        
-        with col_table1:
-            st.markdown("**🏢 建物・足場寸法:**")
-            for key, value in list(calculation_data.items())[:9]:
-                st.write(f"• **{key}:** {value}")
-        
-        with col_table2:
-            st.markdown("**📊 カバー面積計算:**")
-            for key, value in list(calculation_data.items())[9:]:
-                st.write(f"• **{key}:** {value}")
-        
-        # Store data for integration with 養生シート calculator  
-        scaffolding_data = [{
-            'name': '建物足場カバー',
-            'length': config['scaffolding_length_m'],  # Already in meters
-            'width': config['scaffolding_width_m'],
-            'height': config['scaffolding_height_m'],
-            'top_area': total_top_area,
-            'bottom_area': total_bottom_area,
-            'side_wall_area': side_wall_area,
-            'total_scaffolding_length': total_scaffolding_length,
-            'total_scaffolding_height': total_scaffolding_height,
-            'total_coverage_area': total_coverage_area,
-            'volume': total_side_units * unit_coverage_area * config['scaffolding_height_m'],
-            'total_top_rolls': total_top_rolls,
-            'total_bottom_rolls': total_bottom_rolls,
-            'total_side_wall_rolls': total_side_wall_rolls,
-            'horizontal_strips_needed': horizontal_strips_needed,
-            'rolls_per_strip': rolls_per_strip,
-            'roll_type': '1800mmのみ - 水平カバー'
-        }]
-        
-        # Store in session state for 養生シート tab integration
-        st.session_state['scaffolding_data'] = scaffolding_data
-        
-    else:
-        st.info("👆 すべての建物および足場寸法に**正の値**を入力してください。")
-
-# ==============================================================================
-# TAB 3: SMART 養生シート CALCULATOR  
-# ==============================================================================
-
-with tab_sheets:
-    st.header("🛡️ スマート養生シート計算機")
-    
-    # Import data from other tabs
-    st.subheader("📥 部屋データの取り込み")
-    
-    if st.button("📂 多室データを取り込み", use_container_width=True):
-        if 'rooms' in st.session_state and st.session_state.rooms:
-            # Process room data for Smart calculator
-            imported_rooms = []
-            for room in st.session_state.rooms:
-                metrics = calculate_room_metrics(room['length'], room['width'], room['height'])
-                if metrics:
-                    imported_rooms.append({
-                        'name': room['name'],
-                        'floor_area': metrics['floor_area'],
-                        'ceiling_area': metrics['ceiling_area'],
-                        'wall_area': metrics['wall_area'],
-                        'perimeter': metrics['perimeter'],
-                        'width_mm': room['width'] * 1000,  # Convert to mm
-                        'height_mm': room['height'] * 1000,  # Convert to mm
-                        'length_m': room['length']
-                    })
-            
-            if imported_rooms:
-                st.session_state['imported_rooms'] = imported_rooms
-                st.success(f"✅ {len(imported_rooms)}室を正常に取り込みました！")
-                st.rerun()
-            else:
-                st.error("❌ 有効な部屋データが見つかりませんでした。")
-        else:
-            st.error("❌ 利用可能な部屋データがありません。まず多室タブで部屋を設定してください。")
-    
-    # Display imported rooms
-    if 'imported_rooms' in st.session_state and st.session_state.imported_rooms:
-        st.subheader("📋 取り込み済み部屋/エリア")
-        
-        for i, room in enumerate(st.session_state.imported_rooms):
-            col_room = st.columns([3, 1])
-            with col_room[0]:
-                st.write(f"**{room['name']}** - 床: {room['floor_area']:.2f}m², 天井: {room['ceiling_area']:.2f}m², 壁: {room['wall_area']:.2f}m²")
-            with col_room[1]:
-                if st.button("🗑️", key=f"remove_{i}", help="この部屋を削除"):
-                    st.session_state.imported_rooms.pop(i)
-                    st.rerun()
-        
-        st.markdown("---")
-        
-        # Multi-room optimization section
-        st.subheader("🚀 AI搭載多室最適化")
-        
-        # Surface selection checkboxes
-        st.markdown("**📊 計算する面を選択してください:**")
-        col_surface1, col_surface2, col_surface3 = st.columns(3)
-        
-        with col_surface1:
-            include_floor_calc = st.checkbox("🏠 床面積", value=True, key="calc_include_floor")
-        with col_surface2:
-            include_ceiling_calc = st.checkbox("🏠 天井面積", value=True, key="calc_include_ceiling")  
-        with col_surface3:
-            include_wall_calc = st.checkbox("🧱 壁面積", value=True, key="calc_include_wall")
-        
-        if st.button("🧮 最適化ロール要件を計算", use_container_width=True, type="primary"):
-            # Filter imported rooms based on surface selection
-            rooms_for_calc = []
-            for room in st.session_state.imported_rooms:
-                filtered_room = {
-                    'name': room['name'],
-                    'perimeter': room['perimeter'],
-                    'width_mm': room['width_mm'],
-                    'height_mm': room['height_mm'], 
-                    'length_m': room['length_m']
-                }
-                
-                # Apply surface selection filters
-                if include_floor_calc:
-                    filtered_room['floor_area'] = room.get('floor_area', 0)
-                else:
-                    filtered_room['floor_area'] = 0
-                    
-                if include_ceiling_calc:
-                    filtered_room['ceiling_area'] = room.get('ceiling_area', 0)
-                else:
-                    filtered_room['ceiling_area'] = 0
-                    
-                if include_wall_calc:
-                    filtered_room['wall_area'] = room.get('wall_area', 0)
-                else:
-                    filtered_room['wall_area'] = 0
-                
-                rooms_for_calc.append(filtered_room)
-            
-            # Always use Mixed Roll Sizes for multi-room optimization
-            # Calculate ceiling + wall optimization (use floor checkbox for wall calculation logic)
-            ceiling_wall_results, total_cw_1800, total_cw_3600 = calculate_optimized_multi_room_ceiling_wall(rooms_for_calc, include_floor_calc)
-            
-            # Calculate floor optimization if floor is enabled
-            floor_results = {}
-            total_floor_1800 = 0
-            total_floor_3600 = 0
-            
-            if include_floor_calc:
-                floor_results, total_floor_1800, total_floor_3600 = calculate_optimized_multi_room_floor(rooms_for_calc)
-            
-            # Combined totals
-            grand_total_1800 = total_cw_1800 + total_floor_1800
-            grand_total_3600 = total_cw_3600 + total_floor_3600
-            
-            # Display results summary with thickness breakdown
-            st.subheader("📦 最適化ロール概要")
-            
-            # Calculate rolls by thickness
-            ceiling_wall_1800_01mm = total_cw_1800  # Ceiling/wall uses 0.1mm
-            ceiling_wall_3600_01mm = total_cw_3600  # Ceiling/wall uses 0.1mm
-            floor_1800_015mm = total_floor_1800 if include_floor_calc else 0  # Floor uses 0.15mm
-            floor_3600_015mm = total_floor_3600 if include_floor_calc else 0  # Floor uses 0.15mm
-            
-            col_summary = st.columns(5)
-            with col_summary[0]:
-                st.metric("**1800mm × 0.1mm**", f"{ceiling_wall_1800_01mm}")
-                st.caption("天井・壁カバー")
-            with col_summary[1]:
-                st.metric("**1800mm × 0.15mm**", f"{floor_1800_015mm}")
-                st.caption("床カバー (2層)")
-            with col_summary[2]:
-                st.metric("**3600mm × 0.1mm**", f"{ceiling_wall_3600_01mm}")
-                st.caption("天井・壁カバー")
-            with col_summary[3]:
-                st.metric("**3600mm × 0.15mm**", f"{floor_3600_015mm}")
-                st.caption("床カバー (2層)")
-            with col_summary[4]:
-                total_rolls = grand_total_1800 + grand_total_3600
-                st.metric("**総ロール数**", f"{total_rolls}")
-                st.caption("全厚さ・サイズ")
-            
-            # Additional summary breakdown
-            st.markdown("### 📊 **用途別ロール概要**")
-            col_app = st.columns(3)
-            with col_app[0]:
-                ceiling_wall_total = ceiling_wall_1800_01mm + ceiling_wall_3600_01mm
-                st.info(f"🏠 **天井・壁:** {ceiling_wall_total} ロール (0.1mm)")
-                if ceiling_wall_1800_01mm > 0:
-                    st.write(f"• {ceiling_wall_1800_01mm} × 1800mm × 0.1mm")
-                if ceiling_wall_3600_01mm > 0:
-                    st.write(f"• {ceiling_wall_3600_01mm} × 3600mm × 0.1mm")
-            
-            with col_app[1]:
-                if include_floor_calc:
-                    floor_total = floor_1800_015mm + floor_3600_015mm
-                    st.info(f"🏢 **床:** {floor_total} ロール (0.15mm)")
-                    if floor_1800_015mm > 0:
-                        st.write(f"• {floor_1800_015mm} × 1800mm × 0.15mm")
-                    if floor_3600_015mm > 0:
-                        st.write(f"• {floor_3600_015mm} × 3600mm × 0.15mm")
-                else:
-                    st.info("🏢 **床:** 含まれていません")
-            
-            with col_app[2]:
-                st.success(f"📦 **総合計:** {total_rolls} ロール")
-                st.write(f"• **1800mm:** {grand_total_1800} ロール")
-                st.write(f"• **3600mm:** {grand_total_3600} ロール")
-            
-            # Detailed breakdown
-            if ceiling_wall_results and 'room_results' in ceiling_wall_results:
-                st.subheader("🏠 天井・壁内訳")
-                
-                for room_result in ceiling_wall_results['room_results']:
-                    with st.expander(f"📋 {room_result['name']} 詳細"):
-                        col_detail = st.columns(2)
-                        with col_detail[0]:
-                            st.write("**天井カバー:**")
-                            if room_result.get('ceiling_1800_from_leftover', 0) > 0:
-                                st.write(f"• 余りから: {room_result['ceiling_1800_from_leftover']:.1f} m² (1800mm)")
-                            if room_result.get('ceiling_3600_from_leftover', 0) > 0:
-                                st.write(f"• 余りから: {room_result['ceiling_3600_from_leftover']:.1f} m² (3600mm)")
-                            if room_result.get('new_ceiling_1800_rolls', 0) > 0:
-                                st.write(f"• 新規ロール: {room_result['new_ceiling_1800_rolls']} × 1800mm")
-                            if room_result.get('new_ceiling_3600_rolls', 0) > 0:
-                                st.write(f"• 新規ロール: {room_result['new_ceiling_3600_rolls']} × 3600mm")
-                        
-                        with col_detail[1]:
-                            st.write("**壁カバー:**")
-                            if room_result.get('wall_1800_from_leftover', 0) > 0:
-                                st.write(f"• 余りから: {room_result['wall_1800_from_leftover']:.1f} m² (1800mm)")
-                            if room_result.get('wall_3600_from_leftover', 0) > 0:
-                                st.write(f"• 余りから: {room_result['wall_3600_from_leftover']:.1f} m² (3600mm)")
-                            if room_result.get('additional_wall_1800_rolls', 0) > 0:
-                                st.write(f"• 追加ロール: {room_result['additional_wall_1800_rolls']} × 1800mm")
-                            if room_result.get('additional_wall_3600_rolls', 0) > 0:
-                                st.write(f"• 追加ロール: {room_result['additional_wall_3600_rolls']} × 3600mm")
-            
-            if include_floor_calc and floor_results and 'floor_room_results' in floor_results:
-                st.subheader("🏢 床カバー内訳")
-                
-                for room_result in floor_results['floor_room_results']:
-                    with st.expander(f"📋 {room_result['name']} 床詳細"):
-                        col_floor = st.columns(2)
-                        with col_floor[0]:
-                            st.write("**床カバー (2層):**")
-                            if room_result.get('floor_1800_from_leftover', 0) > 0:
-                                st.write(f"• 余りから: {room_result['floor_1800_from_leftover']:.1f} m² (1800mm)")
-                            if room_result.get('floor_3600_from_leftover', 0) > 0:
-                                st.write(f"• 余りから: {room_result['floor_3600_from_leftover']:.1f} m² (3600mm)")
-                        
-                        with col_floor[1]:
-                            st.write("**必要新規ロール:**")
-                            if room_result.get('new_floor_1800_rolls', 0) > 0:
-                                st.write(f"• 新規ロール: {room_result['new_floor_1800_rolls']} × 1800mm")
-                            if room_result.get('new_floor_3600_rolls', 0) > 0:
-                                st.write(f"• 新規ロール: {room_result['new_floor_3600_rolls']} × 3600mm")
-            
-            # Leftover material summary
-            st.subheader("♻️ 残余材料")
-            
-            col_leftover = st.columns(2)
-            with col_leftover[0]:
-                if ceiling_wall_results:
-                    leftover_1800 = ceiling_wall_results.get('final_leftover_1800', 0)
-                    leftover_3600 = ceiling_wall_results.get('final_leftover_3600', 0)
-                    st.write(f"**天井・壁余り:**")
-                    st.write(f"• 1800mmカバー: {leftover_1800:.1f} m²")
-                    st.write(f"• 3600mmカバー: {leftover_3600:.1f} m²")
-            
-            with col_leftover[1]:
-                if include_floor_calc and floor_results:
-                    leftover_floor_1800 = floor_results.get('final_leftover_1800_floor', 0)
-                    leftover_floor_3600 = floor_results.get('final_leftover_3600_floor', 0)
-                    st.write(f"**床余り:**")
-                    st.write(f"• 1800mmカバー: {leftover_floor_1800:.1f} m²")
-                    st.write(f"• 3600mmカバー: {leftover_floor_3600:.1f} m²")
-        
-    else:
-        st.info("📥 スマート最適化を開始するには、**多室または外壁足場養生タブから部屋データを取り込み**してください。")
-        st.markdown("""
-        **🚀 スマート機能:**
-        - 🔄 室間材料最適化
-        - 💰 廃棄物最小化アルゴリズム  
-        - 🎯 インテリジェントロールサイズ選択
-        - 📊 詳細カバレッジ内訳
-        """)
-
-# ==============================================================================
-# FOOTER
-# ==============================================================================
-
-st.markdown("---")
-st.markdown(
-    """
-    <div style="text-align: center; color: #666; font-size: 0.8em; margin-top: 2rem;">
-    📐 面積計算機 | 🛡️ スマート養生シート最適化 | 🏗️ 外壁足場養生計画
-    </div>
-    """, 
-    unsafe_allow_html=True
-)
+import streamlit as st
+import time
+
+import pandas as pd
+
+from sheet_engine import calculate_scaffolding_requirements
+from background_jobs import (
+    ENGINE_MODE_FIXED,
+    ENGINE_MODE_FLOAT,
+    FLOOR_METHOD_AREA,
+    FLOOR_METHOD_STRIPS,
+    JOB_POLL_INTERVAL_S,
+    JOB_STATUS_CANCELLED,
+    JOB_STATUS_DONE,
+    JOB_STATUS_FAILED,
+    STREAM_CEILING_WALL,
+    STREAM_FLOOR,
+    create_job_executor,
+    submit_optimization_job
+)
+from breakpoints import (
+    SENSITIVITY_TOLERANCE_MM,
+    get_ceiling_floor_breakpoint_index,
+    get_wall_breakpoint_index
+)
+from calculation_graph import (
+    NODE_BUILDING_CONFIG,
+    NODE_IMPORTED_ROOMS,
+    NODE_PHASE_PROGRAM,
+    NODE_ROOM_INPUTS,
+    NODE_ROOM_METRICS,
+    NODE_ROOM_SENSITIVITY,
+    NODE_ROOM_SUMMARY,
+    NODE_ROOMS_FOR_CALC,
+    NODE_SCAFFOLDING,
+    NODE_SCAFFOLDING_UNITS,
+    NODE_SENSITIVITY_TOLERANCE,
+    NODE_SURFACE_OPTIONS,
+    build_calculator_graph,
+    calculate_room_entry,
+    room_input_key
+)
+from engine_metrics import (
+    ENGINE_CALL_SECONDS,
+    RERUN_SECONDS,
+    MetricsRegistry,
+    record_result_cache_stats
+)
+from floor_templates import CLOSED_FORM_FLOOR_TOLERANCE_ROLLS, calculate_floor_template_plan
+from inventory import (
+    RollInventory,
+    calculate_optimized_multi_room_with_inventory
+)
+from memory_footprint import (
+    SESSION_MEMORY_REPORT_INTERVAL_S,
+    SESSION_MEMORY_WARNING_BYTES,
+    format_bytes,
+    session_memory_report
+)
+from ordering_search import (
+    ORDERING_TIME_LIMIT_S,
+    create_ordering_executor,
+    optimize_room_order
+)
+from lower_bounds import optimality_gap, plan_optimality_gap
+from result_cache import ResultCache
+from scaffolding_units import (
+    SCAFFOLDING_UNIT_HEIGHTS_M,
+    SCAFFOLDING_UNIT_LENGTHS_M,
+    calculate_mixed_scaffolding_requirements
+)
+from phased_plans import PHASE_SURFACE_CEILING_WALL, PHASE_SURFACE_FLOOR, compare_phase_schedules, evaluate_phase_schedule
+from room_types import calculate_optimized_room_types, expand_room_type_results
+from site_pooling import calculate_unified_site_plan
+from roll_orientation import ORIENTATION_ACROSS_LENGTH, ORIENTATION_LABELS
+from quotation_report import render_quotation_html
+from result_frames import CEILING_WALL_COLUMNS, FLOOR_COLUMNS, combined_room_frame, room_results_frame
+from strategy_evaluator import evaluate_strategies
+from wall_segments import rectangular_wall_segments
+
+# ==============================================================================
+# PAGE CONFIGURATION
+# ==============================================================================
+
+st.set_page_config(
+    page_title="面積計算機", 
+    page_icon="📐", 
+    layout="centered"
+)
+
+# ==============================================================================
+# SHARED RESOURCES
+# ==============================================================================
+
+@st.cache_resource
+def get_job_executor():
+    """Process-wide executor for background optimization jobs."""
+    return create_job_executor()
+
+
+@st.cache_resource
+def get_ordering_executor():
+    """Process pool for the parallel room-ordering search."""
+    return create_ordering_executor()
+
+
+@st.cache_resource
+def get_result_cache():
+    """Process-wide on-disk cache of engine results, shared by all sessions."""
+    return ResultCache()
+
+
+@st.cache_resource
+def get_metrics():
+    """Process-wide metrics registry, written periodically as a Prometheus text file."""
+    return MetricsRegistry()
+
+
+@st.cache_resource
+def get_pattern_tables():
+    """Roll pattern breakpoint indexes, built once per process and shared read-only."""
+    return {
+        'ceiling_floor': get_ceiling_floor_breakpoint_index(),
+        'wall': get_wall_breakpoint_index(False),
+        'wall_with_floor': get_wall_breakpoint_index(True)
+    }
+
+
+def timed_room_entry(room_key):
+    """Areas of one room editor entry, recorded in the engine latency metrics."""
+    with get_metrics().time(ENGINE_CALL_SECONDS, function='calculate_room_metrics'):
+        return calculate_room_entry(room_key)
+
+
+def timed_scaffolding_requirements(config):
+    """Scaffolding calculation for a building configuration, recorded in the engine latency metrics."""
+    with get_metrics().time(ENGINE_CALL_SECONDS, function='calculate_scaffolding_requirements'):
+        return calculate_scaffolding_requirements(
+            config['building_length_m'],
+            config['building_height_m'],
+            config['scaffolding_length_m'],
+            config['scaffolding_width_m'],
+            config['scaffolding_height_m']
+        )
+
+
+def timed_mixed_scaffolding_requirements(config, unit_lengths_m, unit_heights_m):
+    """Mixed-unit scaffolding layout for a building configuration, recorded in the engine latency metrics."""
+    with get_metrics().time(ENGINE_CALL_SECONDS, function='calculate_mixed_scaffolding_requirements'):
+        return calculate_mixed_scaffolding_requirements(
+            config['building_length_m'],
+            config['building_height_m'],
+            config['scaffolding_width_m'],
+            unit_lengths_m,
+            unit_heights_m
+        )
+
+
+def optimality_gap_caption(gap):
+    """One-line caption of a plan's distance from its lower bound."""
+    if gap['gap_rolls'] == 0:
+        return f"🎯 下限 {gap['lower_bound']} ロールに到達 (これ以上の削減は不可能)"
+    return (
+        f"🎯 下限 {gap['lower_bound']} ロール | 最適解との差は最大 {gap['gap_rolls']} ロール "
+        f"({gap['gap_ratio']:.1%})"
+    )
+
+
+def calculate_building_scaffolding(config, scaffolding_units):
+    """
+    Scaffolding of the building tab: uniform units, or the mixed layout when unit sizes are chosen.
+
+    Args:
+        config: building_config of the session
+        scaffolding_units: (unit_lengths_m, unit_heights_m) of the mixed layout, or None for uniform units
+
+    Returns:
+        dict: scaffolding, uniform_total_rolls and mixed_layout, or None for incomplete dimensions
+    """
+    if not (config['building_length_m'] > 0 and config['building_height_m'] > 0 and
+            config['scaffolding_length_m'] > 0 and config['scaffolding_width_m'] > 0 and
+            config['scaffolding_height_m'] > 0):
+        return None
+
+    # Identical facades are common, so reuse results from the shared on-disk cache
+    scaffolding = get_result_cache().get_or_compute(
+        'scaffolding',
+        config,
+        lambda: timed_scaffolding_requirements(config)
+    )
+    uniform_total_rolls = scaffolding['total_all_rolls']
+
+    mixed_layout = scaffolding_units is not None
+    if mixed_layout:
+        unit_lengths_m, unit_heights_m = scaffolding_units
+        scaffolding = get_result_cache().get_or_compute(
+            'scaffolding_mixed',
+            {
+                # Only the inputs the mixed layout reads, so changing the uniform unit size keeps the entry
+                'building_length_m': config['building_length_m'],
+                'building_height_m': config['building_height_m'],
+                'scaffolding_width_m': config['scaffolding_width_m'],
+                'unit_lengths_m': sorted(unit_lengths_m),
+                'unit_heights_m': sorted(unit_heights_m)
+            },
+            lambda: timed_mixed_scaffolding_requirements(config, unit_lengths_m, unit_heights_m)
+        )
+    return {'scaffolding': scaffolding, 'uniform_total_rolls': uniform_total_rolls, 'mixed_layout': mixed_layout}
+
+
+def get_calculation_graph():
+    """
+    This session's calculator dependency graph.
+
+    Widgets set the graph inputs on every rerun; only nodes downstream of a
+    changed input are recomputed, and imported rooms follow the room tab
+    automatically.
+    """
+    if 'calculation_graph' not in st.session_state:
+        st.session_state.calculation_graph = build_calculator_graph(calculate_building_scaffolding, timed_room_entry)
+    return st.session_state.calculation_graph
+
+
+def get_session_memory_report():
+    """
+    This session's memory report, reused across reruns.
+
+    The session is walked again only once the rooms, the scaffolding or the
+    optimization job changed, and at most once per
+    SESSION_MEMORY_REPORT_INTERVAL_S, like the metrics text file.
+    """
+    calculation_graph = get_calculation_graph()
+    optimization_job = st.session_state.get('optimization_job')
+    report_inputs = (
+        calculation_graph.version(NODE_ROOM_INPUTS), calculation_graph.version(NODE_ROOMS_FOR_CALC),
+        calculation_graph.version(NODE_SCAFFOLDING), len(st.session_state),
+        id(optimization_job), None if optimization_job is None else optimization_job.status
+    )
+    cached = st.session_state.get('session_memory')
+    now = time.time()
+    if cached is not None and (cached['inputs'] == report_inputs
+                               or now - cached['computed_at'] < SESSION_MEMORY_REPORT_INTERVAL_S):
+        return cached['report']
+
+    # Shared resources referenced from the session are not charged to it
+    report = session_memory_report(
+        [(key, value) for key, value in st.session_state.to_dict().items() if key != 'session_memory'],
+        shared_objects=[get_job_executor(), get_ordering_executor(), get_result_cache(), get_metrics(),
+                        *get_pattern_tables().values()]
+    )
+    st.session_state['session_memory'] = {'inputs': report_inputs, 'computed_at': now, 'report': report}
+    return report
+
+
+# Warm the shared pattern tables before the first session needs them
+get_pattern_tables()
+
+# ==============================================================================
+# MAIN APP
+# ==============================================================================
+
+st.title("📐 面積計算機")
+
+tab_room, tab_building, tab_sheets = st.tabs([
+    "🏠 多室計算", 
+    "🏗️ 外壁足場養生", 
+    "🛡️ スマート養生シート"
+])
+
+# ==============================================================================
+# TAB 1: MULTIPLE ROOMS
+# ==============================================================================
+
+with tab_room, get_metrics().time(RERUN_SECONDS, tab='room'):
+    st.header("🏠 多室計算機")
+    
+    # Initialize session state for rooms
+    if 'rooms' not in st.session_state:
+        st.session_state.rooms = [
+            {'name': '部屋 1', 'length': 0.0, 'width': 0.0, 'height': 0.0}
+        ]
+    
+    st.markdown("部屋を追加して設定してください:")
+    
+    # 部屋追加・削除ボタン
+    col_btn1, col_btn2 = st.columns(2)
+    with col_btn1:
+        if st.button("➕ 部屋を追加"):
+            room_num = len(st.session_state.rooms) + 1
+            st.session_state.rooms.append({
+                'name': f'部屋 {room_num}',
+                'length': 0.0,
+                'width': 0.0,
+                'height': 0.0
+            })
+            st.rerun()
+    
+    with col_btn2:
+        if st.button("➖ 最後の部屋を削除") and len(st.session_state.rooms) > 1:
+            st.session_state.rooms.pop()
+            st.rerun()
+    
+    sensitivity_tolerance_mm = st.number_input(
+        "📏 寸法感度の許容差 (mm)",
+        min_value=1,
+        max_value=1000,
+        value=SENSITIVITY_TOLERANCE_MM,
+        step=10,
+        key="sensitivity_tolerance_mm",
+        help="各寸法がこの範囲内でロール数の境界に近い場合に警告します。"
+    )
+    
+    # Display rooms configuration; each room's results are filled in once the graph is up to date
+    room_result_slots = []
+    
+    for i, room in enumerate(st.session_state.rooms):
+        st.markdown(f"### {room['name']}")
+        
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            room['name'] = st.text_input(
+                "部屋名", 
+                value=room['name'], 
+                key=f"name_{i}"
+            )
+        with col2:
+            room['length'] = st.number_input(
+                "長さ (m)", 
+                min_value=0.0, 
+                value=room['length'], 
+                step=0.01, 
+                format="%.4f",
+                key=f"length_{i}"
+            )
+        with col3:
+            room['width'] = st.number_input(
+                "幅 (m)", 
+                min_value=0.0, 
+                value=room['width'], 
+                step=0.01,
+                format="%.4f",
+                key=f"width_{i}"
+            )
+        with col4:
+            room['height'] = st.number_input(
+                "高さ (m)", 
+                min_value=0.0, 
+                value=room['height'], 
+                step=0.01,
+                format="%.4f",
+                key=f"height_{i}"
+            )
+        
+        # Optional per-wall segments with door/window openings
+        with st.expander("🧱 壁セグメント・開口部 (任意)"):
+            use_wall_segments = st.checkbox(
+                "壁ごとに長さ・高さ・開口部を指定",
+                value=bool(room.get('wall_segments')),
+                key=f"use_segments_{i}"
+            )
+            if use_wall_segments:
+                if 'wall_segments_input' not in room:
+                    room['wall_segments_input'] = pd.DataFrame([
+                        {'length_m': segment['length_m'], 'height_m': segment['height_m']}
+                        for segment in rectangular_wall_segments(room['length'], room['width'], room['height'])
+                    ])
+                    room['openings_input'] = pd.DataFrame(
+                        {'segment': pd.Series(dtype='int64'), 'width_m': pd.Series(dtype='float64'), 'height_m': pd.Series(dtype='float64')}
+                    )
+                
+                st.caption("壁セグメント (番号は上から 1, 2, 3...)")
+                segments_df = st.data_editor(
+                    room['wall_segments_input'],
+                    num_rows="dynamic",
+                    use_container_width=True,
+                    key=f"segments_{i}",
+                    column_config={
+                        'length_m': st.column_config.NumberColumn("長さ (m)", min_value=0.0, step=0.01),
+                        'height_m': st.column_config.NumberColumn("高さ (m)", min_value=0.0, step=0.01)
+                    }
+                )
+                st.caption("開口部 (ドア・窓)")
+                openings_df = st.data_editor(
+                    room['openings_input'],
+                    num_rows="dynamic",
+                    use_container_width=True,
+                    key=f"openings_{i}",
+                    column_config={
+                        'segment': st.column_config.NumberColumn("壁番号", min_value=1, step=1),
+                        'width_m': st.column_config.NumberColumn("幅 (m)", min_value=0.0, step=0.01),
+                        'height_m': st.column_config.NumberColumn("高さ (m)", min_value=0.0, step=0.01)
+                    }
+                )
+                
+                wall_segments = [
+                    {'length_m': segment_row['length_m'], 'height_m': segment_row['height_m'], 'openings': []}
+                    for segment_row in segments_df.fillna(0).to_dict('records')
+                ]
+                for opening_row in openings_df.dropna().to_dict('records'):
+                    segment_number = int(opening_row['segment'])
+                    if 1 <= segment_number <= len(wall_segments):
+                        wall_segments[segment_number - 1]['openings'].append(
+                            {'width_m': opening_row['width_m'], 'height_m': opening_row['height_m']}
+                        )
+                room['wall_segments'] = wall_segments
+            else:
+                room['wall_segments'] = []
+        
+        room_result_slots.append(st.container())
+        
+        st.markdown("---")
+    
+    # Only rooms whose inputs changed are recalculated
+    calculation_graph = get_calculation_graph()
+    calculation_graph.set_input(NODE_ROOM_INPUTS, tuple(room_input_key(room) for room in st.session_state.rooms))
+    calculation_graph.set_input(NODE_SENSITIVITY_TOLERANCE, sensitivity_tolerance_mm)
+    room_entries = calculation_graph.get(NODE_ROOM_METRICS)
+    room_sensitivities = calculation_graph.get(NODE_ROOM_SENSITIVITY)
+    
+    for room_result_slot, room_entry, sensitivity in zip(room_result_slots, room_entries, room_sensitivities):
+        metrics = room_entry['metrics']
+        room_walls = room_entry['walls']
+        with room_result_slot:
+            if room_walls:
+                st.caption(
+                    f"🧱 壁総面積 {room_walls['gross_wall_area']:.2f} m² - "
+                    f"開口部 {room_walls['opening_area']:.2f} m² = 正味 {room_walls['net_wall_area']:.2f} m²"
+                )
+            
+            if metrics:
+                # Display individual room results (always show all)
+                col_a, col_b, col_c = st.columns(3)
+                with col_a:
+                    st.metric("床面積", f"{metrics['floor_area']:.2f} m²")
+                with col_b:
+                    st.metric("天井面積", f"{metrics['ceiling_area']:.2f} m²")
+                with col_c:
+                    st.metric("壁面積", f"{metrics['wall_area']:.2f} m²")
+                
+                # Breakpoint proximity: how close each dimension is to the next roll-count jump
+                if sensitivity:
+                    sensitivity_notes = []
+                    for dimension_key, dimension_label in (('width', '幅'), ('length', '長さ'), ('height', '高さ')):
+                        entry = sensitivity['dimensions'][dimension_key]
+                        if entry['headroom_mm'] is not None and entry['headroom_mm'] <= sensitivity_tolerance_mm:
+                            sensitivity_notes.append(
+                                f"{dimension_label}: 境界 {entry['next_breakpoint_mm']:,.0f}mm まで残り {entry['headroom_mm']:.0f}mm"
+                            )
+                        delta_up = entry['rolls_delta_if_larger']
+                        delta_down = entry['rolls_delta_if_smaller']
+                        if delta_up:
+                            sensitivity_notes.append(f"{dimension_label} +{sensitivity_tolerance_mm}mm: {delta_up:+d} ロール")
+                        if delta_down:
+                            sensitivity_notes.append(f"{dimension_label} -{sensitivity_tolerance_mm}mm: {delta_down:+d} ロール")
+                    if sensitivity_notes:
+                        st.caption("📏 " + " | ".join(sensitivity_notes))
+    
+    # Display summary
+    room_summary = calculation_graph.get(NODE_ROOM_SUMMARY)
+    rooms_data = room_summary['rooms_data']
+    total_floor_area = room_summary['total_floor_area']
+    total_ceiling_area = room_summary['total_ceiling_area']
+    total_wall_area = room_summary['total_wall_area']
+    if rooms_data:
+        st.subheader("📊 概要 - 全室")
+        
+        # Always show all surface totals in Multi-Room tab
+        col_sum1, col_sum2, col_sum3 = st.columns(3)
+        with col_sum1:
+            st.metric("**合計床面積**", f"{total_floor_area:.2f} m²")
+        with col_sum2:
+            st.metric("**合計天井面積**", f"{total_ceiling_area:.2f} m²")
+        with col_sum3:
+            st.metric("**合計壁面積**", f"{total_wall_area:.2f} m²")
+        
+        # Detailed breakdown table
+        st.subheader("📋 部屋別内訳")
+        
+        # Always show all headers in Multi-Room tab
+        col_headers = st.columns(5)
+        headers = ["部屋名", "床面積 (m²)", "天井面積 (m²)", 
+                   "壁面積 (m²)", "周囲長 (m)"]
+        for col, header in zip(col_headers, headers):
+            with col:
+                st.write(f"**{header}**")
+        
+        for room_data in rooms_data:
+            col_data = st.columns(5)
+            with col_data[0]:
+                st.write(room_data['name'])
+            with col_data[1]:
+                st.write(f"{room_data['floor_area']:.2f}")
+            with col_data[2]:
+                st.write(f"{room_data['ceiling_area']:.2f}")
+            with col_data[3]:
+                st.write(f"{room_data['wall_area']:.2f}")
+            with col_data[4]:
+                st.write(f"{room_data['perimeter']:.2f}")
+    else:
+        st.info("👆 少なくとも1つの部屋について、**長さ、幅、高さに正の値**を入力してください。")
+
+# ==============================================================================
+# TAB 2: 外壁足場養生 (EXTERIOR WALL PROTECTION)
+# ==============================================================================
+
+with tab_building, get_metrics().time(RERUN_SECONDS, tab='building'):
+    st.header("🏗️ 外壁足場養生計算機")
+    
+    # Initialize session state for building and scaffolding
+    if 'building_config' not in st.session_state:
+        st.session_state.building_config = {
+            'building_length_m': 0.0,   # Default empty
+            'building_height_m': 0.0,   # Default empty
+            'scaffolding_length_m': 1.829, # Standard scaffolding length in meters
+            'scaffolding_width_m': 0.9,    # Standard scaffolding width in meters
+            'scaffolding_height_m': 1.725  # Standard scaffolding height in meters
+        }
+    
+    st.markdown("**🏢 建物外壁寸法 (m):**")
+    
+    col_building1, col_building2 = st.columns(2)
+    with col_building1:
+        st.session_state.building_config['building_length_m'] = st.number_input(
+            "建物長さ (m)", 
+            min_value=0.0, 
+            value=st.session_state.building_config['building_length_m'], 
+            step=0.1,
+            format="%.3f",
+            key="building_length"
+        )
+    with col_building2:
+        st.session_state.building_config['building_height_m'] = st.number_input(
+            "建物高さ (m)", 
+            min_value=0.0, 
+            value=st.session_state.building_config['building_height_m'], 
+            step=0.1,
+            format="%.3f",
+            key="building_height"
+        )
+    
+    st.markdown("**🏗️ 足場寸法 (m):**")
+    
+    col_scaff1, col_scaff2, col_scaff3 = st.columns(3)
+    with col_scaff1:
+        st.session_state.building_config['scaffolding_length_m'] = st.number_input(
+            "足場長さ (m)", 
+            min_value=0.001, 
+            value=st.session_state.building_config['scaffolding_length_m'], 
+            step=0.001,
+            format="%.3f",
+            key="scaff_length"
+        )
+    with col_scaff2:
+        st.session_state.building_config['scaffolding_width_m'] = st.number_input(
+            "足場幅 (m)", 
+            min_value=0.001, 
+            value=st.session_state.building_config['scaffolding_width_m'], 
+            step=0.001,
+            format="%.3f",
+            key="scaff_width"
+        )
+    with col_scaff3:
+        st.session_state.building_config['scaffolding_height_m'] = st.number_input(
+            "足場高さ (m)", 
+            min_value=0.001, 
+            value=st.session_state.building_config['scaffolding_height_m'], 
+            step=0.001,
+            format="%.3f",
+            key="scaff_height"
+        )
+    
+    # Mixed standard units: lengths and lifts chosen per facade for the least over-coverage
+    use_mixed_units = st.checkbox(
+        "🧩 標準ユニットを組み合わせて超過を最小化",
+        value=False,
+        key="use_mixed_scaffolding_units",
+        help="複数の標準足場長さ・高さを組み合わせ、建物寸法を超える部分が最も小さくなる構成を選びます。"
+    )
+    if use_mixed_units:
+        col_units1, col_units2 = st.columns(2)
+        with col_units1:
+            unit_lengths_m = st.multiselect(
+                "使用する足場長さ (m)",
+                options=list(SCAFFOLDING_UNIT_LENGTHS_M),
+                default=list(SCAFFOLDING_UNIT_LENGTHS_M),
+                key="scaffolding_unit_lengths"
+            )
+        with col_units2:
+            unit_heights_m = st.multiselect(
+                "使用する足場高さ (m)",
+                options=list(SCAFFOLDING_UNIT_HEIGHTS_M),
+                default=list(SCAFFOLDING_UNIT_HEIGHTS_M),
+                key="scaffolding_unit_heights"
+            )
+    
+    # Calculate scaffolding requirements (recomputed only when the dimensions or unit sizes change)
+    config = st.session_state.building_config
+    calculation_graph = get_calculation_graph()
+    calculation_graph.set_input(NODE_BUILDING_CONFIG, dict(config))
+    calculation_graph.set_input(
+        NODE_SCAFFOLDING_UNITS,
+        (tuple(unit_lengths_m), tuple(unit_heights_m)) if use_mixed_units and unit_lengths_m and unit_heights_m else None
+    )
+    building_scaffolding = calculation_graph.get(NODE_SCAFFOLDING)
+    # Scaffolding shown in this rerun, picked up by the quotation in the sheets tab
+    report_scaffolding = None
+    
+    if building_scaffolding is not None:
+        scaffolding = building_scaffolding['scaffolding']
+        uniform_total_rolls = building_scaffolding['uniform_total_rolls']
+        mixed_layout = building_scaffolding['mixed_layout']
+        if use_mixed_units and not mixed_layout:
+            st.warning("⚠️ 足場長さと高さをそれぞれ1つ以上選択してください。単一ユニットで計算します。")
+        report_scaffolding = scaffolding
+        units_along_length = scaffolding['units_along_length']
+        units_along_height = scaffolding['units_along_height']
+        total_side_units = scaffolding['total_side_units']
+        unit_coverage_area = scaffolding['unit_coverage_area']
+        total_top_area = scaffolding['total_top_area']
+        total_bottom_area = scaffolding['total_bottom_area']
+        total_scaffolding_length = scaffolding['total_scaffolding_length']
+        total_scaffolding_height = scaffolding['total_scaffolding_height']
+        side_wall_area = scaffolding['side_wall_area']
+        horizontal_strips_needed = scaffolding['horizontal_strips_needed']
+        rolls_per_strip = scaffolding['rolls_per_strip']
+        total_coverage_area = scaffolding['total_coverage_area']
+        total_top_rolls = scaffolding['total_top_rolls']
+        total_bottom_rolls = scaffolding['total_bottom_rolls']
+        total_side_wall_rolls = scaffolding['total_side_wall_rolls']
+        total_all_rolls = scaffolding['total_all_rolls']
+        
+        st.markdown("---")
+        st.subheader("📊 足場ユニット計算")
+        
+        # Display calculation breakdown
+        col_calc1, col_calc2, col_calc3 = st.columns(3)
+        with col_calc1:
+            if mixed_layout:
+                st.markdown("**📐 ユニット構成 (超過最小):**")
+                length_terms = ' + '.join(f"{size_m:.3f}m × {count}" for size_m, count in scaffolding['length_units'])
+                height_terms = ' + '.join(f"{size_m:.3f}m × {count}" for size_m, count in scaffolding['height_units'])
+                st.info(f"長さ: {length_terms} = **{total_scaffolding_length:.3f}m** (超過 {scaffolding['length_overshoot_m']:.3f}m)")
+                st.info(f"高さ: {height_terms} = **{total_scaffolding_height:.3f}m** (超過 {scaffolding['height_overshoot_m']:.3f}m)")
+                st.metric("単一ユニットとの比較", f"{total_all_rolls} ロール",
+                          delta=f"{total_all_rolls - uniform_total_rolls} ロール", delta_color="inverse")
+            else:
+                st.markdown("**📐 必要ユニット数 (切り上げ):**")
+                st.info(f"長さ: {config['building_length_m']:.3f}m ÷ {config['scaffolding_length_m']:.3f}m = **{units_along_length}** ユニット")
+                st.info(f"高さ: {config['building_height_m']:.3f}m ÷ {config['scaffolding_height_m']:.3f}m = **{units_along_height}** ユニット")
+        
+        with col_calc2:
+            st.markdown("**🏗️ 片面カバー範囲:**")
+            st.write(f"長さユニット: {units_along_length}")
+            st.write(f"高さユニット: {units_along_height}")
+            st.metric("**片面ユニット**", f"{total_side_units}")
+        
+        with col_calc3:
+            st.markdown("**📏 総カバー範囲:**")
+            st.write(f"長さ × 高さ: {units_along_length} × {units_along_height}")
+            st.metric("**総足場ユニット**", f"{total_side_units}")
+            st.metric("**平均ユニット面積**" if mixed_layout else "**ユニット面積**", f"{unit_coverage_area:.3f} m²")
+            st.caption("per ユニット")
+            st.write(f"**側壁寸法:** {total_scaffolding_length:.3f}m × {total_scaffolding_height:.3f}m")
+            st.write(f"**側壁ストリップ数:** {horizontal_strips_needed} 水平ストリップが必要")
+            st.write(f"**ストリップ当たりロール数:** {rolls_per_strip} ロール (各50m長)")
+        
+        st.subheader("📦 材料要件")
+        
+        col_mat1, col_mat2, col_mat3, col_mat4 = st.columns(4)
+        with col_mat1:
+            st.metric("**上部ロール (0.15mm)**", f"{total_top_rolls}")
+            st.caption(f"{total_top_area:.1f} m² ÷ 36 = {total_top_rolls} × 1800mmロール")
+        with col_mat2:
+            st.metric("**下部ロール (0.1mm)**", f"{total_bottom_rolls}")  
+            st.caption(f"{total_bottom_area:.1f} m² ÷ 72 = {total_bottom_rolls} × 1800mmロール")
+        with col_mat3:
+            st.metric("**側壁ロール (0.1mm)**", f"{total_side_wall_rolls}")
+            st.caption(f"{horizontal_strips_needed} ストリップ × {rolls_per_strip} ロール/ストリップ = {total_side_wall_rolls} × 1800mmロール")
+        with col_mat4:
+            st.metric("**全ロール合計**", f"{total_all_rolls}")
+            st.caption(f"全て1800mmロール: {total_all_rolls} 合計")
+        
+        # Display total coverage area separately with better formatting
+        st.markdown("### 📏 **総カバー面積**")
+        st.success(f"🎯 **{total_coverage_area:,.2f} m²** (上面: {total_top_area:.1f} + 下面: {total_bottom_area:.1f} + 側壁: {side_wall_area:.1f})")
+        
+        # Coverage options with safety margin
+        st.subheader("🛡️ 材料概要")
+        
+        st.markdown("**📦 ロール必要数:**")
+        st.success(f"🏢 **上面カバー（床）:** {total_top_rolls} ロール 0.15mm × 1800mm × 50m")
+        st.success(f"🏠 **下面カバー（天井）:** {total_bottom_rolls} ロール 0.1mm × 1800mm × 50m")
+        st.success(f"🧱 **側壁カバー:** {total_side_wall_rolls} ロール 0.1mm × 1800mm × 50m")
+        
+        st.info(f"**📊 総材料:** {total_all_rolls} ロール（すべて1800mm × 50m）")
+        
+        # Detailed breakdown table
+        st.subheader("📋 計算詳細")
+        
+        # Create data for display
+        calculation_data = {
+            '建物長さ (m)': f"{config['building_length_m']:.3f}",
+            '建物高さ (m)': f"{config['building_height_m']:.3f}",
+            '足場長さ (m)': "混合" if mixed_layout else f"{config['scaffolding_length_m']:.3f}",
+            '足場幅 (m)': f"{config['scaffolding_width_m']:.3f}",
+            '足場高さ (m)': "混合" if mixed_layout else f"{config['scaffolding_height_m']:.3f}",
+            '長さ方向ユニット数': units_along_length,
+            '高さ方向ユニット数': units_along_height,
+            '側面総ユニット数': total_side_units,
+            '足場総長さ (m)': f"{total_scaffolding_length:.3f}",
+            '足場総高さ (m)': f"{total_scaffolding_height:.3f}",
+            '上面カバー面積 (m²)': f"{total_top_area:.2f}",
+            '下面カバー面積 (m²)': f"{total_bottom_area:.2f}",
+            '側壁面積 (m²)': f"{side_wall_area:.2f}",
+            '総カバー面積 (m²)': f"{total_coverage_area:.2f}"
+        }
+        
+        # Display as two-column layout
+        col_table1, col_table2 = st.columns(2)
+        
+        with col_table1:
+            st.markdown("**🏢 建物・足場寸法:**")
+            for key, value in list(calculation_data.items())[:9]:
+                st.write(f"• **{key}:** {value}")
+        
+        with col_table2:
+            st.markdown("**📊 カバー面積計算:**")
+            for key, value in list(calculation_data.items())[9:]:
+                st.write(f"• **{key}:** {value}")
+        
+    else:
+        st.info("👆 すべての建物および足場寸法に**正の値**を入力してください。")
+
+# ==============================================================================
+# TAB 3: SMART 養生シート CALCULATOR  
+# ==============================================================================
+
+# Set while an optimization job runs; the tab is polled again after its timed block
+poll_optimization_job = False
+
+with tab_sheets, get_metrics().time(RERUN_SECONDS, tab='sheets'):
+    st.header("🛡️ スマート養生シート計算機")
+    
+    # Import data from other tabs
+    st.subheader("📥 部屋データの取り込み")
+    
+    st.caption("多室タブの部屋は自動で取り込まれ、変更した部屋だけが再計算されます。")
+    calculation_graph = get_calculation_graph()
+    
+    if st.button("📂 多室データを取り込み", use_container_width=True, help="削除・並べ替えを取り消し、多室タブの部屋をすべて取り込み直します。"):
+        # Drop manual removals and reordering; the node recomputes from the room tab
+        calculation_graph.invalidate(NODE_IMPORTED_ROOMS)
+        imported_rooms = calculation_graph.get(NODE_IMPORTED_ROOMS)
+        if imported_rooms:
+            st.success(f"✅ {len(imported_rooms)}室を正常に取り込みました！")
+        elif st.session_state.get('rooms'):
+            st.error("❌ 有効な部屋データが見つかりませんでした。")
+        else:
+            st.error("❌ 利用可能な部屋データがありません。まず多室タブで部屋を設定してください。")
+    
+    # Display imported rooms
+    imported_rooms = calculation_graph.get(NODE_IMPORTED_ROOMS)
+    if imported_rooms:
+        st.subheader("📋 取り込み済み部屋/エリア")
+        if calculation_graph.is_overridden(NODE_IMPORTED_ROOMS):
+            st.caption("✋ 削除・並べ替え済みの一覧です。多室タブで部屋を変更すると自動で取り込み直されます。")
+        
+        for i, room in enumerate(imported_rooms):
+            col_room = st.columns([3, 1])
+            with col_room[0]:
+                st.write(f"**{room['name']}** - 床: {room['floor_area']:.2f}m², 天井: {room['ceiling_area']:.2f}m², 壁: {room['wall_area']:.2f}m²")
+            with col_room[1]:
+                if st.button("🗑️", key=f"remove_{i}", help="この部屋を削除"):
+                    calculation_graph.override(NODE_IMPORTED_ROOMS, imported_rooms[:i] + imported_rooms[i + 1:])
+                    st.rerun()
+        
+        st.markdown("---")
+        
+        # Multi-room optimization section
+        st.subheader("🚀 AI搭載多室最適化")
+        
+        # Surface selection checkboxes
+        st.markdown("**📊 計算する面を選択してください:**")
+        col_surface1, col_surface2, col_surface3 = st.columns(3)
+        
+        with col_surface1:
+            include_floor_calc = st.checkbox("🏠 床面積", value=True, key="calc_include_floor")
+        with col_surface2:
+            include_ceiling_calc = st.checkbox("🏠 天井面積", value=True, key="calc_include_ceiling")  
+        with col_surface3:
+            include_wall_calc = st.checkbox("🧱 壁面積", value=True, key="calc_include_wall")
+        
+        use_fixed_point = st.checkbox(
+            "🔢 整数演算モード (mm²単位の厳密計算)",
+            value=False,
+            key="calc_fixed_point",
+            help="面積と余り材料を整数mm²で計算し、浮動小数点誤差のない決定的な結果を得ます。"
+        )
+
+        auto_orientation = st.checkbox(
+            "🔄 ロール方向を自動選択 (天井・床)",
+            value=True,
+            key="calc_auto_orientation",
+            help="部屋ごとにロールを幅方向・長さ方向のどちらに張るかを比較し、総ロール数が少なくなる向きを選びます。"
+                 "ストリップ割付の床は幅方向のままです。"
+        )
+        
+        floor_method = st.radio(
+            "🏢 床の計算方法",
+            options=[FLOOR_METHOD_STRIPS, FLOOR_METHOD_AREA],
+            format_func=lambda method: {
+                FLOOR_METHOD_STRIPS: "ストリップ割付 (長さベース・カットリスト付き)",
+                FLOOR_METHOD_AREA: "面積比率 (従来)"
+            }[method],
+            horizontal=True,
+            key="calc_floor_method"
+        )
+        
+        # Filter imported rooms based on surface selection (wall segments are batched in the graph)
+        calculation_graph.set_input(
+            NODE_SURFACE_OPTIONS,
+            {'floor': include_floor_calc, 'ceiling': include_ceiling_calc, 'wall': include_wall_calc}
+        )
+        rooms_for_calc = calculation_graph.get(NODE_ROOMS_FOR_CALC)
+
+        # Room order search: leftovers are consumed in room order, so the order changes totals
+        with st.expander("🔀 部屋順序の最適化"):
+            st.caption("余り材料は部屋の順番に消費されるため、順序を変えると総ロール数が減る場合があります。")
+            ordering_time_limit = st.number_input(
+                "探索時間上限 (秒)",
+                min_value=0.1,
+                max_value=60.0,
+                value=ORDERING_TIME_LIMIT_S,
+                step=0.5,
+                key="ordering_time_limit"
+            )
+            
+            # The search result only applies to the rooms and floor setting it was run on
+            ordering_inputs = (calculation_graph.version(NODE_ROOMS_FOR_CALC), include_floor_calc)
+            if st.button("🔍 最適な部屋順序を探索", use_container_width=True):
+                with st.spinner("部屋順序を並列探索中..."):
+                    ordering_result = optimize_room_order(
+                        rooms_for_calc,
+                        include_floor_calc,
+                        time_limit_s=ordering_time_limit,
+                        executor=get_ordering_executor()
+                    )
+                ordering_result['inputs'] = ordering_inputs
+                # The room copies are already in the session's inputs; keep only the order
+                del ordering_result['best_rooms']
+                st.session_state['ordering_result'] = ordering_result
+            
+            ordering_result = st.session_state.get('ordering_result')
+            if ordering_result and ordering_result['inputs'] != ordering_inputs:
+                st.info("部屋・計算設定が変更されました。もう一度探索してください。")
+            elif ordering_result:
+                col_order = st.columns(3)
+                with col_order[0]:
+                    st.metric("現在の順序", f"{ordering_result['baseline_total']} ロール")
+                with col_order[1]:
+                    st.metric("最適順序", f"{ordering_result['best_total']} ロール")
+                with col_order[2]:
+                    st.metric("削減", f"{ordering_result['rolls_saved']} ロール")
+                st.caption(
+                    f"戦略: {ordering_result['strategy']} | "
+                    f"評価した順序: {ordering_result['candidates_evaluated']} | "
+                    f"探索時間: {ordering_result['elapsed_s']:.2f} 秒"
+                )
+                st.caption(optimality_gap_caption(
+                    optimality_gap(ordering_result['best_total'], ordering_result['lower_bound'])
+                ))
+                
+                if ordering_result['rolls_saved'] > 0:
+                    st.write(" → ".join(rooms_for_calc[index]['name'] for index in ordering_result['best_order']))
+                    if st.button("✅ この順序を適用", key="apply_room_order"):
+                        calculation_graph.override(
+                            NODE_IMPORTED_ROOMS, [imported_rooms[index] for index in ordering_result['best_order']]
+                        )
+                        del st.session_state['ordering_result']
+                        st.rerun()
+                else:
+                    st.success("✅ 現在の順序が最適です。")
+        
+        # Warehouse stock: partly used rolls are drawn before buying new ones
+        with st.expander("📦 倉庫在庫 (使いかけロール) の活用"):
+            st.caption("倉庫にある使いかけロールを新規購入より先に使用し、取り出すロールを一覧表示します。")
+            
+            if 'stock_pieces' not in st.session_state:
+                st.session_state.stock_pieces = pd.DataFrame(
+                    [{'width_mm': 1800, 'thickness_mm': 0.1, 'remaining_length_m': 0.0}]
+                )
+            
+            stock_pieces = st.data_editor(
+                st.session_state.stock_pieces,
+                num_rows="dynamic",
+                use_container_width=True,
+                key="stock_pieces_editor",
+                column_config={
+                    'width_mm': st.column_config.SelectboxColumn("幅 (mm)", options=[1800, 3600], required=True),
+                    'thickness_mm': st.column_config.SelectboxColumn("厚さ (mm)", options=[0.1, 0.15], required=True),
+                    'remaining_length_m': st.column_config.NumberColumn("残り長さ (m)", min_value=0.0, max_value=50.0, step=0.1)
+                }
+            )
+            
+            if st.button("📋 在庫を使った購入計画を作成", use_container_width=True):
+                stock_inventory = RollInventory()
+                for stock_row in stock_pieces.to_dict('records'):
+                    if pd.notna(stock_row.get('remaining_length_m')) and pd.notna(stock_row.get('width_mm')) and pd.notna(stock_row.get('thickness_mm')):
+                        stock_inventory.add_piece(stock_row['width_mm'], stock_row['thickness_mm'], stock_row['remaining_length_m'])
+                
+                with get_metrics().time(ENGINE_CALL_SECONDS, function='calculate_optimized_multi_room_with_inventory'):
+                    inventory_plan = calculate_optimized_multi_room_with_inventory(rooms_for_calc, stock_inventory, include_floor_calc)
+                
+                col_stock = st.columns(3)
+                with col_stock[0]:
+                    st.metric("在庫なしの購入", f"{inventory_plan['baseline_rolls_total']} ロール")
+                with col_stock[1]:
+                    st.metric("在庫使用時の購入", f"{inventory_plan['new_rolls_total']} ロール")
+                with col_stock[2]:
+                    st.metric("削減", f"{inventory_plan['rolls_saved']} ロール")
+                
+                if inventory_plan['stock_pulls']:
+                    st.markdown("**🚚 倉庫から取り出すロール:**")
+                    st.dataframe(
+                        [
+                            {
+                                '在庫ID': pull['piece_id'],
+                                '幅 (mm)': pull['width_mm'],
+                                '厚さ (mm)': pull['thickness_mm'],
+                                '残り長さ (m)': round(pull['remaining_length_m'], 2),
+                                '使用長さ (m)': round(pull['length_used_m'], 2)
+                            }
+                            for pull in inventory_plan['stock_pulls']
+                        ],
+                        use_container_width=True
+                    )
+                else:
+                    st.info("使用できる在庫はありません。")
+        
+        # Strategy comparison: mixed, 1800mm-only and 3600mm-preferred plans from one pass
+        with st.expander("⚖️ ロール戦略の比較"):
+            st.caption("混合・1800mmのみ・3600mm優先の3つの計画を一度の計算で比較します。")
+            if st.button("📊 戦略を比較", use_container_width=True):
+                strategy_plans = get_result_cache().get_or_compute(
+                    'strategies',
+                    {'rooms': rooms_for_calc, 'has_floor_covering': include_floor_calc},
+                    lambda: evaluate_strategies(rooms_for_calc, include_floor_calc, room_results=False)
+                )
+                st.dataframe(
+                    [
+                        {
+                            '戦略': plan['label'],
+                            '1800mm (ロール)': plan['total_1800'],
+                            '3600mm (ロール)': plan['total_3600'],
+                            '総ロール数': plan['total_rolls'],
+                            '天井・壁余り (m²)': round(plan['leftover_cw'], 1),
+                            '床余り (m²)': round(plan['leftover_floor'], 1)
+                        }
+                        for plan in strategy_plans.values()
+                    ],
+                    use_container_width=True
+                )
+                best_plan = min(strategy_plans.values(), key=lambda plan: (plan['total_rolls'], plan['leftover_cw'] + plan['leftover_floor']))
+                st.success(f"✅ 最少ロール: {best_plan['label']} ({best_plan['total_rolls']} ロール)")
+        
+        # Typical-floor template: the imported rooms form one floor that repeats up the building
+        with st.expander("🏢 基準階テンプレート (高層建物)"):
+            st.caption("取り込んだ部屋を基準階として、階数分の繰り返しを部屋を展開せずに計算します。階ごとに部屋を除外することもできます。")
+            template_floors = st.number_input(
+                "基準階の階数",
+                min_value=1,
+                max_value=500,
+                value=1,
+                step=1,
+                key="template_floors"
+            )
+            
+            if 'template_overrides' not in st.session_state:
+                st.session_state.template_overrides = pd.DataFrame(
+                    {'floor': pd.Series(dtype='int64'), 'room': pd.Series(dtype='object')}
+                )
+            
+            st.caption("階ごとの変更 (指定した階からその部屋を除外)")
+            template_overrides = st.data_editor(
+                st.session_state.template_overrides,
+                num_rows="dynamic",
+                use_container_width=True,
+                key="template_overrides_editor",
+                column_config={
+                    'floor': st.column_config.NumberColumn("階 (1〜)", min_value=1, step=1),
+                    'room': st.column_config.SelectboxColumn("除外する部屋", options=[room['name'] for room in rooms_for_calc])
+                }
+            )
+            
+            if st.button("🏢 建物全体を計算", use_container_width=True):
+                excluded_by_floor = {}
+                for override_row in template_overrides.dropna().to_dict('records'):
+                    if 1 <= int(override_row['floor']) <= template_floors:
+                        excluded_by_floor.setdefault(int(override_row['floor']), set()).add(override_row['room'])
+                
+                template_started_at = time.time()
+                template_plan = calculate_floor_template_plan(
+                    [{
+                        'name': '基準階',
+                        'rooms': rooms_for_calc,
+                        'repeat': template_floors,
+                        'overrides': {
+                            floor: [room for room in rooms_for_calc if room['name'] not in excluded]
+                            for floor, excluded in excluded_by_floor.items()
+                        }
+                    }],
+                    include_floor_calc
+                )
+                template_elapsed_s = time.time() - template_started_at
+                
+                col_template = st.columns(3)
+                with col_template[0]:
+                    st.metric("天井・壁 (0.1mm)", f"{template_plan['total_cw_1800'] + template_plan['total_cw_3600']} ロール")
+                    st.caption(f"1800mm: {template_plan['total_cw_1800']} / 3600mm: {template_plan['total_cw_3600']}")
+                with col_template[1]:
+                    st.metric("床 (0.15mm)", f"{template_plan['total_floor_1800'] + template_plan['total_floor_3600']} ロール")
+                    st.caption(f"1800mm: {template_plan['total_floor_1800']} / 3600mm: {template_plan['total_floor_3600']}")
+                with col_template[2]:
+                    template_total = (template_plan['total_cw_1800'] + template_plan['total_cw_3600'] +
+                                      template_plan['total_floor_1800'] + template_plan['total_floor_3600'])
+                    st.metric("建物合計", f"{template_total} ロール")
+                    st.caption(f"{template_plan['total_floors']}階 / {template_plan['total_rooms']}室")
+                
+                st.dataframe(
+                    [
+                        {
+                            '階': f"{run['first_floor']}〜{run['first_floor'] + run['floors'] - 1}",
+                            '階タイプ': run['name'],
+                            '部屋数/階': run['rooms_per_floor'],
+                            '天井・壁 1800mm': run['cw_1800'],
+                            '天井・壁 3600mm': run['cw_3600'],
+                            '床 1800mm': run['floor_1800'],
+                            '床 3600mm': run['floor_3600']
+                        }
+                        for run in template_plan['runs']
+                    ],
+                    use_container_width=True
+                )
+                st.caption(
+                    f"異なる階タイプ: {template_plan['distinct_floors']} | "
+                    f"計算時間: {template_elapsed_s:.3f} 秒"
+                )
+                st.caption(
+                    f"床ロール数は厳密計算のため、全階を展開した計算と幅ごとに最大"
+                    f"±{CLOSED_FORM_FLOOR_TOLERANCE_ROLLS}ロール異なる場合があります。"
+                )
+        
+        # Identical rooms (hotel rooms, apartments) are optimized once per type with a count
+        with st.expander("🏨 同一部屋タイプの集約"):
+            st.caption("寸法が同じ部屋をタイプとしてまとめ、タイプごとの室数で計算します。余り材料はタイプ順に消費されます。")
+            # The per-type room indices and pool states only apply to the rooms they were computed on
+            room_type_inputs = (calculation_graph.version(NODE_ROOMS_FOR_CALC), include_floor_calc)
+            if st.button("🏨 部屋タイプで計算", use_container_width=True):
+                room_type_started_at = time.time()
+                room_type_plan = calculate_optimized_room_types(rooms_for_calc, include_floor_calc)
+                room_type_elapsed_s = time.time() - room_type_started_at
+                room_type_plan['inputs'] = room_type_inputs
+                st.session_state['room_type_plan'] = room_type_plan
+                st.session_state['room_type_elapsed_s'] = room_type_elapsed_s
+            
+            room_type_plan = st.session_state.get('room_type_plan')
+            if room_type_plan and room_type_plan['inputs'] != room_type_inputs:
+                st.info("部屋・計算設定が変更されました。もう一度計算してください。")
+            elif room_type_plan:
+                col_types = st.columns(3)
+                with col_types[0]:
+                    st.metric("天井・壁 (0.1mm)", f"{room_type_plan['total_cw_1800'] + room_type_plan['total_cw_3600']} ロール")
+                    st.caption(f"1800mm: {room_type_plan['total_cw_1800']} / 3600mm: {room_type_plan['total_cw_3600']}")
+                with col_types[1]:
+                    st.metric("床 (0.15mm)", f"{room_type_plan['total_floor_1800'] + room_type_plan['total_floor_3600']} ロール")
+                    st.caption(f"1800mm: {room_type_plan['total_floor_1800']} / 3600mm: {room_type_plan['total_floor_3600']}")
+                with col_types[2]:
+                    st.metric("部屋タイプ", f"{room_type_plan['type_count']} タイプ")
+                    st.caption(f"{room_type_plan['room_count']}室 (逐次計算 {room_type_plan['rooms_simulated']}室) | "
+                               f"計算時間: {st.session_state.get('room_type_elapsed_s', 0):.3f} 秒")
+                st.caption(optimality_gap_caption(plan_optimality_gap(
+                    rooms_for_calc,
+                    room_type_plan['total_cw_1800'] + room_type_plan['total_cw_3600'],
+                    room_type_plan['total_floor_1800'] + room_type_plan['total_floor_3600'],
+                    include_floor_calc
+                )['total']))
+                st.caption(
+                    f"床ロール数は厳密計算のため、部屋ごとの計算と幅ごとに最大"
+                    f"±{CLOSED_FORM_FLOOR_TOLERANCE_ROLLS}ロール異なる場合があります。"
+                )
+                
+                st.dataframe(
+                    [
+                        {
+                            'タイプ': room_type['name'],
+                            '室数': room_type['count'],
+                            '幅 (mm)': room_type['width_mm'],
+                            '高さ (mm)': room_type['height_mm'],
+                            '長さ (m)': room_type['length_m'],
+                            '天井・壁 1800mm': room_type['cw_1800'],
+                            '天井・壁 3600mm': room_type['cw_3600'],
+                            '床 1800mm': room_type['floor_1800'],
+                            '床 3600mm': room_type['floor_3600']
+                        }
+                        for room_type in room_type_plan['room_types']
+                    ],
+                    use_container_width=True
+                )
+                
+                # Per-room detail is replayed for one type only when asked for
+                type_names = [f"{room_type['name']} (×{room_type['count']})" for room_type in room_type_plan['room_types']]
+                selected_type = st.selectbox("部屋ごとの詳細を表示するタイプ", range(len(type_names)),
+                                             format_func=lambda index: type_names[index], key="room_type_detail")
+                type_room_results, type_floor_results = expand_room_type_results(
+                    room_type_plan['room_types'][selected_type], rooms_for_calc, include_floor_calc
+                )
+                # Rooms of one type either all have an entry in a result list or none do
+                type_indices = room_type_plan['room_types'][selected_type]['indices']
+                type_room_results = type_room_results or [{}] * len(type_indices)
+                type_floor_results = type_floor_results or [{}] * len(type_indices)
+                st.dataframe(
+                    [
+                        {
+                            '部屋': rooms_for_calc[room_index]['name'],
+                            '天井・壁 1800mm': room.get('room_total_1800', 0),
+                            '天井・壁 3600mm': room.get('room_total_3600', 0),
+                            '床 1800mm': floor_room.get('room_total_1800', 0),
+                            '床 3600mm': floor_room.get('room_total_3600', 0)
+                        }
+                        for room_index, room, floor_room in zip(type_indices, type_room_results, type_floor_results)
+                    ],
+                    use_container_width=True
+                )
+        
+        # Scaffolding of the building tab pooled with the rooms: one leftover system per thickness class
+        with st.expander("🏗️ 足場と室内の一括最適化"):
+            st.caption("外壁足場の上面・下面・側壁を室内と同じ余り材料プールで計算します。"
+                       "室内の余りを足場に回し、同じ幅・厚さのロールをまとめて購入します。"
+                       "室内は床の計算方法・ロール方向の設定を含めメイン計算と同じ条件で計算します。")
+            if report_scaffolding is None:
+                st.info("👆 外壁足場養生タブで建物と足場の寸法を入力すると利用できます。")
+            else:
+                # A plan is current while the rooms, the scaffolding and the engine options are unchanged
+                site_plan_inputs = (
+                    calculation_graph.version(NODE_ROOMS_FOR_CALC), calculation_graph.version(NODE_SCAFFOLDING),
+                    include_floor_calc, floor_method, auto_orientation
+                )
+                if st.button("🏗️ 足場と室内をまとめて計算", use_container_width=True):
+                    site_plan = calculate_unified_site_plan(
+                        rooms_for_calc, report_scaffolding, include_floor_calc,
+                        floor_strips=floor_method == FLOOR_METHOD_STRIPS,
+                        auto_orientation=auto_orientation
+                    )
+                    site_plan['inputs'] = site_plan_inputs
+                    # Room breakdowns are shown by the main optimization; keep only the totals
+                    del site_plan['ceiling_wall_results'], site_plan['floor_results']
+                    st.session_state['site_plan'] = site_plan
+                
+                site_plan = st.session_state.get('site_plan')
+                if site_plan and site_plan['inputs'] != site_plan_inputs:
+                    st.info("部屋・足場・計算設定が変更されました。もう一度計算してください。")
+                elif site_plan:
+                    col_site = st.columns(3)
+                    with col_site[0]:
+                        st.metric("別々に計算", f"{site_plan['separate_total']} ロール")
+                    with col_site[1]:
+                        st.metric("一括計算", f"{site_plan['unified_total']} ロール")
+                    with col_site[2]:
+                        st.metric("削減", f"{site_plan['rolls_saved']} ロール")
+                    st.caption(
+                        f"0.1mm: 1800mm {site_plan['total_cw_1800']} / 3600mm {site_plan['total_cw_3600']} | "
+                        f"0.15mm: 1800mm {site_plan['total_floor_1800']} / 3600mm {site_plan['total_floor_3600']}"
+                    )
+                    st.dataframe(
+                        [
+                            {
+                                '面': surface['label'],
+                                '必要面積 (m²)': round(surface['need_area'], 2),
+                                '余りから 1800mm (m²)': round(surface['from_leftover_1800'], 2),
+                                '余りから 3600mm (m²)': round(surface['from_leftover_3600'], 2),
+                                '新規 1800mm ロール': surface['new_1800_rolls']
+                            }
+                            for surface in site_plan['scaffolding_results']
+                        ],
+                        use_container_width=True
+                    )
+        
+        # Construction phases: leftovers are carried to later phases only while they stay on site
+        with st.expander("📅 工程 (フェーズ) 別の購入計画"):
+            st.caption("部屋ごとに床・天井/壁の施工フェーズを指定します。余り材料はフェーズ順に持ち越され、"
+                       "フェーズ間で失われる割合を設定できます。フェーズごとの購入ロール数を表示します。")
+            room_names = [room['name'] for room in rooms_for_calc]
+            phase_schedule = st.session_state.get('phase_schedule')
+            if phase_schedule is None or phase_schedule['部屋'].tolist() != room_names:
+                phase_schedule = pd.DataFrame({'部屋': room_names, '床フェーズ': 1, '天井・壁フェーズ': 1})
+                st.session_state.phase_schedule = phase_schedule
+            
+            edited_schedule = st.data_editor(
+                phase_schedule,
+                use_container_width=True,
+                disabled=['部屋'],
+                key="phase_schedule_editor",
+                column_config={
+                    '床フェーズ': st.column_config.NumberColumn("床フェーズ", min_value=1, step=1),
+                    '天井・壁フェーズ': st.column_config.NumberColumn("天井・壁フェーズ", min_value=1, step=1)
+                }
+            )
+            phase_loss_percent = st.number_input(
+                "フェーズ間の余り損失 (%)",
+                min_value=0.0,
+                max_value=100.0,
+                value=0.0,
+                step=5.0,
+                key="phase_loss_percent",
+                help="次のフェーズまでに破損・廃棄・搬出で失われる余り材料の割合です。"
+            )
+            room_phases = [
+                {PHASE_SURFACE_FLOOR: int(floor_phase), PHASE_SURFACE_CEILING_WALL: int(ceiling_wall_phase)}
+                for floor_phase, ceiling_wall_phase in zip(
+                    edited_schedule['床フェーズ'].fillna(1), edited_schedule['天井・壁フェーズ'].fillna(1)
+                )
+            ]
+            
+            # Pool checkpoints live with the compiled program, so re-evaluating after an edit replays only later phases
+            phase_program = calculation_graph.get(NODE_PHASE_PROGRAM)
+            phase_loss = phase_loss_percent / 100
+            phase_plan = evaluate_phase_schedule(phase_program, room_phases, phase_loss)
+            single_phase_plan = evaluate_phase_schedule(phase_program, [1] * len(room_phases))
+            
+            col_phase = st.columns(3)
+            with col_phase[0]:
+                st.metric("一括施工", f"{single_phase_plan['total_rolls']} ロール")
+            with col_phase[1]:
+                st.metric("フェーズ別", f"{phase_plan['total_rolls']} ロール",
+                          delta=f"{phase_plan['total_rolls'] - single_phase_plan['total_rolls']} ロール", delta_color="inverse")
+            with col_phase[2]:
+                st.metric("失われた余り", f"{phase_plan['lost_area']:.1f} m²")
+            st.dataframe(
+                [
+                    {
+                        'フェーズ': phase_result['phase'],
+                        '天井・壁 1800mm': phase_result['cw_1800'],
+                        '天井・壁 3600mm': phase_result['cw_3600'],
+                        '床 1800mm': phase_result['floor_1800'],
+                        '床 3600mm': phase_result['floor_3600'],
+                        '持ち越し余り (m²)': round(sum(phase_result['pools']), 1)
+                    }
+                    for phase_result in phase_plan['phases']
+                ],
+                use_container_width=True
+            )
+            st.caption(
+                f"再計算したフェーズ: {phase_plan['phases_replayed']} | "
+                f"チェックポイントから再開: {phase_plan['checkpoint_hits']}"
+            )
+            
+            # Named schedules for side-by-side comparison of delivery plans
+            col_save = st.columns([3, 1])
+            with col_save[0]:
+                schedule_name = st.text_input("工程名", value=f"案 {len(st.session_state.get('phase_schedules', {})) + 1}",
+                                              key="phase_schedule_name")
+            with col_save[1]:
+                if st.button("💾 比較に追加", key="save_phase_schedule"):
+                    st.session_state.setdefault('phase_schedules', {})[schedule_name] = {
+                        'room_names': room_names, 'room_phases': room_phases
+                    }
+            saved_schedules = {
+                name: schedule['room_phases']
+                for name, schedule in st.session_state.get('phase_schedules', {}).items()
+                if schedule['room_names'] == room_names
+            }
+            if saved_schedules:
+                st.dataframe(
+                    [
+                        {
+                            '工程': name,
+                            '総ロール': result['total_rolls'],
+                            'フェーズ数': len(result['phases']),
+                            '失われた余り (m²)': round(result['lost_area'], 1)
+                        }
+                        for name, result in compare_phase_schedules(phase_program, saved_schedules, phase_loss)
+                    ],
+                    use_container_width=True
+                )
+        
+        # The job's result belongs to these inputs; once they change it is shown as outdated
+        optimization_inputs = (
+            calculation_graph.version(NODE_ROOMS_FOR_CALC), include_floor_calc, use_fixed_point, floor_method,
+            auto_orientation
+        )
+        if st.button("🧮 最適化ロール要件を計算", use_container_width=True, type="primary"):
+            # Always use Mixed Roll Sizes for multi-room optimization
+            # Run in the background; a new click replaces any job still running
+            st.session_state['optimization_job'] = submit_optimization_job(
+                get_job_executor(),
+                rooms_for_calc,
+                include_floor_calc,
+                previous_job=st.session_state.get('optimization_job'),
+                result_cache=get_result_cache(),
+                metrics=get_metrics(),
+                engine_mode=ENGINE_MODE_FIXED if use_fixed_point else ENGINE_MODE_FLOAT,
+                floor_method=floor_method,
+                auto_orientation=auto_orientation,
+                input_signature=optimization_inputs
+            )
+
+        optimization_job = st.session_state.get('optimization_job')
+
+        if optimization_job is not None and optimization_job.is_running():
+            fraction, stage, current_room = optimization_job.progress()
+            st.progress(fraction, text=f"⏳ 計算中... {stage} - {current_room} ({fraction * 100:.0f}%)")
+
+            # Rooms computed so far, rendered on every poll while the optimizers stream them
+            partial_cw_results, cw_room_count, cw_pool_state = optimization_job.partial_results(STREAM_CEILING_WALL)
+            partial_floor_results, floor_room_count, floor_pool_state = optimization_job.partial_results(STREAM_FLOOR)
+            if cw_pool_state is not None:
+                col_partial = st.columns(4)
+                with col_partial[0]:
+                    st.metric("天井・壁 1800mm (途中)", cw_pool_state['total_rolls_1800'])
+                with col_partial[1]:
+                    st.metric("天井・壁 3600mm (途中)", cw_pool_state['total_rolls_3600'])
+                if floor_pool_state is not None:
+                    with col_partial[2]:
+                        st.metric("床 1800mm (途中)", floor_pool_state['total_rolls_1800_floor'])
+                    with col_partial[3]:
+                        st.metric("床 3600mm (途中)", floor_pool_state['total_rolls_3600_floor'])
+                # The floor pass runs after the ceiling/wall pass; show whichever is in progress
+                partial_label, partial_results, partial_count = (
+                    ('床', partial_floor_results, floor_room_count) if partial_floor_results
+                    else ('天井・壁', partial_cw_results, cw_room_count)
+                )
+                st.caption(f"{partial_label}: {partial_count}室計算済み (最新{len(partial_results)}室を表示)")
+                st.dataframe(
+                    [
+                        {
+                            '部屋名': room_result['name'],
+                            f'{partial_label} 1800mm': room_result['room_total_1800'],
+                            f'{partial_label} 3600mm': room_result['room_total_3600']
+                        }
+                        for room_result in partial_results
+                    ],
+                    use_container_width=True
+                )
+
+            if st.button("⏹️ 計算を中止", use_container_width=True):
+                optimization_job.cancel()
+                st.rerun()
+
+            # Poll the job from session state until it finishes
+            poll_optimization_job = True
+
+        elif optimization_job is not None and optimization_job.status == JOB_STATUS_CANCELLED:
+            st.warning("⏹️ 計算は中止されました。")
+
+        elif optimization_job is not None and optimization_job.status == JOB_STATUS_FAILED:
+            st.error(f"❌ 計算中にエラーが発生しました: {optimization_job.error()}")
+
+        elif optimization_job is not None and optimization_job.status == JOB_STATUS_DONE:
+            optimization = optimization_job.result()
+            ceiling_wall_results = optimization['ceiling_wall_results']
+            total_cw_1800 = optimization['total_cw_1800']
+            total_cw_3600 = optimization['total_cw_3600']
+            floor_results = optimization['floor_results']
+            total_floor_1800 = optimization['total_floor_1800']
+            total_floor_3600 = optimization['total_floor_3600']
+            # Render with the surface options the job was submitted with
+            include_floor_calc = optimization['include_floor_calc']
+
+            st.caption(f"⏱️ 計算時間: {optimization_job.elapsed_s():.2f} 秒 ({optimization_job.room_count}室)")
+            if optimization_job.input_signature != optimization_inputs:
+                st.warning("⚠️ 計算後に部屋または計算設定が変更されました。以下は変更前の結果です。再計算してください。")
+
+            orientation = optimization.get('orientation')
+            if orientation is not None:
+                rotated_ceilings = orientation['ceiling'].count(ORIENTATION_ACROSS_LENGTH)
+                rotated_floors = orientation['floor'].count(ORIENTATION_ACROSS_LENGTH)
+                cw_baseline, cw_chosen = orientation['ceiling_wall_rolls']
+                floor_baseline, floor_chosen = orientation['floor_rolls']
+                st.caption(
+                    f"🔄 ロール方向: 天井 {rotated_ceilings}室・床 {rotated_floors}室を90°回転 "
+                    f"(試算: 天井・壁 {cw_baseline}→{cw_chosen} ロール, 床 {floor_baseline}→{floor_chosen} ロール)"
+                )
+
+            # Combined totals
+            grand_total_1800 = total_cw_1800 + total_floor_1800
+            grand_total_3600 = total_cw_3600 + total_floor_3600
+            
+            # Display results summary with thickness breakdown
+            st.subheader("📦 最適化ロール概要")
+            
+            # Calculate rolls by thickness
+            ceiling_wall_1800_01mm = total_cw_1800  # Ceiling/wall uses 0.1mm
+            ceiling_wall_3600_01mm = total_cw_3600  # Ceiling/wall uses 0.1mm
+            floor_1800_015mm = total_floor_1800 if include_floor_calc else 0  # Floor uses 0.15mm
+            floor_3600_015mm = total_floor_3600 if include_floor_calc else 0  # Floor uses 0.15mm
+            
+            col_summary = st.columns(5)
+            with col_summary[0]:
+                st.metric("**1800mm × 0.1mm**", f"{ceiling_wall_1800_01mm}")
+                st.caption("天井・壁カバー")
+            with col_summary[1]:
+                st.metric("**1800mm × 0.15mm**", f"{floor_1800_015mm}")
+                st.caption("床カバー (2層)")
+            with col_summary[2]:
+                st.metric("**3600mm × 0.1mm**", f"{ceiling_wall_3600_01mm}")
+                st.caption("天井・壁カバー")
+            with col_summary[3]:
+                st.metric("**3600mm × 0.15mm**", f"{floor_3600_015mm}")
+                st.caption("床カバー (2層)")
+            with col_summary[4]:
+                total_rolls = grand_total_1800 + grand_total_3600
+                st.metric("**総ロール数**", f"{total_rolls}")
+                st.caption("全厚さ・サイズ")
+
+            lower_bounds = optimization.get('lower_bounds')
+            if lower_bounds is not None:
+                gap_parts = [f"天井・壁 +{lower_bounds['ceiling_wall']['gap_rolls']}"]
+                if lower_bounds['floor'] is not None:
+                    gap_parts.append(f"床 +{lower_bounds['floor']['gap_rolls']}")
+                st.caption(f"{optimality_gap_caption(lower_bounds['total'])} ({' / '.join(gap_parts)})")
+                if lower_bounds['total']['gap_rolls'] > 0:
+                    st.caption("差が大きい場合は「部屋順序の最適化」など時間をかけた探索で削減できる可能性があります。")
+            
+            # Additional summary breakdown
+            st.markdown("### 📊 **用途別ロール概要**")
+            col_app = st.columns(3)
+            with col_app[0]:
+                ceiling_wall_total = ceiling_wall_1800_01mm + ceiling_wall_3600_01mm
+                st.info(f"🏠 **天井・壁:** {ceiling_wall_total} ロール (0.1mm)")
+                if ceiling_wall_1800_01mm > 0:
+                    st.write(f"• {ceiling_wall_1800_01mm} × 1800mm × 0.1mm")
+                if ceiling_wall_3600_01mm > 0:
+                    st.write(f"• {ceiling_wall_3600_01mm} × 3600mm × 0.1mm")
+            
+            with col_app[1]:
+                if include_floor_calc:
+                    floor_total = floor_1800_015mm + floor_3600_015mm
+                    st.info(f"🏢 **床:** {floor_total} ロール (0.15mm)")
+                    if floor_1800_015mm > 0:
+                        st.write(f"• {floor_1800_015mm} × 1800mm × 0.15mm")
+                    if floor_3600_015mm > 0:
+                        st.write(f"• {floor_3600_015mm} × 3600mm × 0.15mm")
+                else:
+                    st.info("🏢 **床:** 含まれていません")
+            
+            with col_app[2]:
+                st.success(f"📦 **総合計:** {total_rolls} ロール")
+                st.write(f"• **1800mm:** {grand_total_1800} ロール")
+                st.write(f"• **3600mm:** {grand_total_3600} ロール")
+            
+            # Detailed breakdown
+            if ceiling_wall_results and 'room_results' in ceiling_wall_results:
+                st.subheader("🏠 天井・壁内訳")
+                
+                for room_result in ceiling_wall_results['room_results']:
+                    with st.expander(f"📋 {room_result['name']} 詳細"):
+                        if 'ceiling_orientation' in room_result:
+                            st.caption(f"天井ロール方向: {ORIENTATION_LABELS[room_result['ceiling_orientation']]}")
+                        col_detail = st.columns(2)
+                        with col_detail[0]:
+                            st.write("**天井カバー:**")
+                            if room_result.get('ceiling_1800_from_leftover', 0) > 0:
+                                st.write(f"• 余りから: {room_result['ceiling_1800_from_leftover']:.1f} m² (1800mm)")
+                            if room_result.get('ceiling_3600_from_leftover', 0) > 0:
+                                st.write(f"• 余りから: {room_result['ceiling_3600_from_leftover']:.1f} m² (3600mm)")
+                            if room_result.get('new_ceiling_1800_rolls', 0) > 0:
+                                st.write(f"• 新規ロール: {room_result['new_ceiling_1800_rolls']} × 1800mm")
+                            if room_result.get('new_ceiling_3600_rolls', 0) > 0:
+                                st.write(f"• 新規ロール: {room_result['new_ceiling_3600_rolls']} × 3600mm")
+                        
+                        with col_detail[1]:
+                            st.write("**壁カバー:**")
+                            if room_result.get('wall_1800_from_leftover', 0) > 0:
+                                st.write(f"• 余りから: {room_result['wall_1800_from_leftover']:.1f} m² (1800mm)")
+                            if room_result.get('wall_3600_from_leftover', 0) > 0:
+                                st.write(f"• 余りから: {room_result['wall_3600_from_leftover']:.1f} m² (3600mm)")
+                            if room_result.get('additional_wall_1800_rolls', 0) > 0:
+                                st.write(f"• 追加ロール: {room_result['additional_wall_1800_rolls']} × 1800mm")
+                            if room_result.get('additional_wall_3600_rolls', 0) > 0:
+                                st.write(f"• 追加ロール: {room_result['additional_wall_3600_rolls']} × 3600mm")
+            
+            if include_floor_calc and floor_results and 'floor_room_results' in floor_results:
+                st.subheader("🏢 床カバー内訳")
+                
+                for room_result in floor_results['floor_room_results']:
+                    with st.expander(f"📋 {room_result['name']} 床詳細"):
+                        if 'floor_orientation' in room_result:
+                            st.caption(f"床ロール方向: {ORIENTATION_LABELS[room_result['floor_orientation']]}")
+                        col_floor = st.columns(2)
+                        with col_floor[0]:
+                            st.write("**床カバー (2層):**")
+                            if room_result.get('floor_1800_from_leftover', 0) > 0:
+                                st.write(f"• 余りから: {room_result['floor_1800_from_leftover']:.1f} m² (1800mm)")
+                            if room_result.get('floor_3600_from_leftover', 0) > 0:
+                                st.write(f"• 余りから: {room_result['floor_3600_from_leftover']:.1f} m² (3600mm)")
+                        
+                        with col_floor[1]:
+                            st.write("**必要新規ロール:**")
+                            if room_result.get('new_floor_1800_rolls', 0) > 0:
+                                st.write(f"• 新規ロール: {room_result['new_floor_1800_rolls']} × 1800mm")
+                            if room_result.get('new_floor_3600_rolls', 0) > 0:
+                                st.write(f"• 新規ロール: {room_result['new_floor_3600_rolls']} × 3600mm")
+                            if 'strip_length_m' in room_result:
+                                st.write(f"• ストリップ長さ: {room_result['strip_length_m']:.2f} m (余裕0.6m込み)")
+                
+                if floor_results.get('cut_lists'):
+                    with st.expander("✂️ 床ロールのカットリスト"):
+                        for cut_list in floor_results['cut_lists']:
+                            cuts_text = ", ".join(
+                                f"{cut['name']} L{cut['layer']}-{cut['strip']}"
+                                + (f"({cut['piece']})" if cut['piece'] > 1 else "")
+                                + f" {cut['length_m']:.2f}m"
+                                for cut in cut_list['cuts']
+                            )
+                            st.write(f"**{cut_list['roll']}** (残り {cut_list['remaining_m']:.2f}m): {cuts_text}")
+            
+            # Columnar view of all rooms: filtering and export run on typed columns
+            with st.expander("📊 部屋別ロール一覧 (表・CSV)"):
+                # Built once per finished job; later reruns reuse it
+                room_frame = optimization.get('room_frame')
+                if room_frame is None:
+                    room_frame = optimization['room_frame'] = combined_room_frame(
+                        room_results_frame((ceiling_wall_results or {}).get('room_results', []), CEILING_WALL_COLUMNS),
+                        room_results_frame(floor_results.get('floor_room_results', []), FLOOR_COLUMNS)
+                        if include_floor_calc and floor_results else None
+                    )
+                if st.checkbox("新規ロールが必要な部屋のみ", value=False, key="room_frame_new_rolls_only"):
+                    room_frame = room_frame[room_frame['total_rolls'] > 0]
+                st.caption(f"{len(room_frame)}室 ・ 余りから使用: {room_frame['leftover_used_m2'].sum():.1f} m²")
+                st.dataframe(
+                    room_frame.rename(columns={
+                        'name': '部屋名',
+                        'cw_1800': '天井・壁 1800mm',
+                        'cw_3600': '天井・壁 3600mm',
+                        'floor_1800': '床 1800mm',
+                        'floor_3600': '床 3600mm',
+                        'leftover_used_m2': '余りから (m²)',
+                        'total_rolls': '新規ロール計'
+                    }),
+                    use_container_width=True,
+                    hide_index=True
+                )
+                st.download_button(
+                    "📥 CSVをダウンロード",
+                    data=room_frame.to_csv(index=False).encode('utf-8-sig'),
+                    file_name="room_rolls.csv",
+                    mime="text/csv",
+                    key="room_frame_csv"
+                )
+
+            # Leftover material summary
+            st.subheader("♻️ 残余材料")
+            
+            col_leftover = st.columns(2)
+            with col_leftover[0]:
+                if ceiling_wall_results:
+                    leftover_1800 = ceiling_wall_results.get('final_leftover_1800', 0)
+                    leftover_3600 = ceiling_wall_results.get('final_leftover_3600', 0)
+                    st.write(f"**天井・壁余り:**")
+                    st.write(f"• 1800mmカバー: {leftover_1800:.1f} m²")
+                    st.write(f"• 3600mmカバー: {leftover_3600:.1f} m²")
+            
+            with col_leftover[1]:
+                if include_floor_calc and floor_results:
+                    leftover_floor_1800 = floor_results.get('final_leftover_1800_floor', 0)
+                    leftover_floor_3600 = floor_results.get('final_leftover_3600_floor', 0)
+                    st.write(f"**床余り:**")
+                    st.write(f"• 1800mmカバー: {leftover_floor_1800:.1f} m²")
+                    st.write(f"• 3600mmカバー: {leftover_floor_3600:.1f} m²")
+
+            # Printable quotation from the finished results; the optimizers are not rerun
+            st.subheader("📄 見積書")
+            col_quote = st.columns([2, 1])
+            with col_quote[0]:
+                quotation_project = st.text_input("案件名・顧客名", value="", key="quotation_project")
+            with col_quote[1]:
+                include_scaffolding_in_quote = st.checkbox(
+                    "外壁足場を含める",
+                    value=report_scaffolding is not None,
+                    disabled=report_scaffolding is None,
+                    key="quotation_include_scaffolding"
+                )
+            st.download_button(
+                "📄 見積書をダウンロード (印刷用HTML)",
+                data=render_quotation_html(
+                    optimization,
+                    scaffolding=report_scaffolding if include_scaffolding_in_quote else None,
+                    project_name=quotation_project
+                ),
+                file_name="quotation.html",
+                mime="text/html",
+                use_container_width=True
+            )
+            st.caption("ブラウザで開き、印刷からPDFとして保存できます。")
+        
+    else:
+        st.info("📥 スマート最適化を開始するには、**多室または外壁足場養生タブから部屋データを取り込み**してください。")
+        st.markdown("""
+        **🚀 スマート機能:**
+        - 🔄 室間材料最適化
+        - 💰 廃棄物最小化アルゴリズム  
+        - 🎯 インテリジェントロールサイズ選択
+        - 📊 詳細カバレッジ内訳
+        """)
+
+# The poll interval is waiting, not rendering: keep it out of the rerun histogram
+if poll_optimization_job:
+    time.sleep(JOB_POLL_INTERVAL_S)
+    st.rerun()
+
+# ==============================================================================
+# FOOTER
+# ==============================================================================
+
+st.markdown("---")
+
+# Per-session memory, walked again only when the session changed (see get_session_memory_report)
+session_memory = get_session_memory_report()
+st.caption(f"🧠 このセッションのメモリ使用量: {format_bytes(session_memory['total_bytes'])}")
+with st.expander("🧠 セッションメモリの内訳"):
+    st.dataframe(
+        [{'キー': key, 'サイズ': format_bytes(size)} for key, size in session_memory['entries']],
+        use_container_width=True
+    )
+if session_memory['total_bytes'] > SESSION_MEMORY_WARNING_BYTES:
+    st.warning("⚠️ このセッションのメモリ使用量が大きくなっています。不要な部屋や在庫行を削除してください。")
+
+# Operations metrics: cache counters are mirrored in, then the text file is refreshed when due
+record_result_cache_stats(get_metrics(), get_result_cache())
+get_metrics().write_textfile_if_due()
+
+st.markdown(
+    """
+    <div style="text-align: center; color: #666; font-size: 0.8em; margin-top: 2rem;">
+    📐 面積計算機 | 🛡️ スマート養生シート最適化 | 🏗️ 外壁足場養生計画
+    </div>
+    """, 
+    unsafe_allow_html=True
+)
@@ -0,0 +1,335 @@
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from sheet_engine import (
+    calculate_optimized_multi_room_ceiling_wall,
+    calculate_optimized_multi_room_floor
+)
+from engine_metrics import ENGINE_CALL_SECONDS, ROOMS_PER_REQUEST
+from floor_strips import calculate_floor_strip_plan
+from lower_bounds import plan_optimality_gap
+from roll_orientation import annotate_orientation, apply_roll_orientation, choose_roll_orientations
+from fixed_point_engine import (
+    calculate_optimized_multi_room_ceiling_wall_fixed,
+    calculate_optimized_multi_room_floor_fixed,
+    convert_fixed_point_results_to_m2
+)
+
+
+# ==============================================================================
+# CONSTANTS
+# ==============================================================================
+
+JOB_MAX_WORKERS = 2
+JOB_POLL_INTERVAL_S = 0.5
+
+JOB_STATUS_RUNNING = 'running'
+JOB_STATUS_DONE = 'done'
+JOB_STATUS_CANCELLED = 'cancelled'
+JOB_STATUS_FAILED = 'failed'
+
+# Engine modes: float (reference m² arithmetic) or fixed (exact integer mm²)
+ENGINE_MODE_FLOAT = 'float'
+ENGINE_MODE_FIXED = 'fixed'
+
+# Floor methods: area-ratio split (pooled m²) or length-based strip packing
+FLOOR_METHOD_AREA = 'area'
+FLOOR_METHOD_STRIPS = 'strips'
+
+ENGINE_OPTIMIZERS = {
+    ENGINE_MODE_FLOAT: (calculate_optimized_multi_room_ceiling_wall, calculate_optimized_multi_room_floor),
+    ENGINE_MODE_FIXED: (calculate_optimized_multi_room_ceiling_wall_fixed, calculate_optimized_multi_room_floor_fixed)
+}
+
+# Optimizers that hand over each room's result as it is computed (result_callback)
+STREAMING_OPTIMIZERS = {calculate_optimized_multi_room_ceiling_wall, calculate_optimized_multi_room_floor}
+
+STREAM_CEILING_WALL = 'ceiling_wall'
+STREAM_FLOOR = 'floor'
+
+# Latest streamed rooms shown while a job runs (every poll re-renders them)
+PARTIAL_RESULT_ROWS = 200
+
+
+# ==============================================================================
+# BACKGROUND OPTIMIZATION JOBS
+# ==============================================================================
+
+class JobCancelledError(Exception):
+    """Raised inside a running job once cancellation has been requested."""
+
+
+class OptimizationJob:
+    """
+    Handle for one background optimization run.
+
+    The handle is stored in st.session_state so every rerun can poll its
+    progress, cancel it, or read the finished result. Progress fields are
+    written by the worker thread and read by the script thread under a lock.
+    """
+
+    def __init__(self, rooms_for_calc, include_floor_calc, result_cache=None, engine_mode=ENGINE_MODE_FLOAT,
+                 floor_method=FLOOR_METHOD_AREA, metrics=None, auto_orientation=False, input_signature=None):
+        self.rooms_for_calc = rooms_for_calc
+        # What the caller computed the job from, compared on later reruns to spot stale results
+        self.input_signature = input_signature
+        self.room_count = len(rooms_for_calc)
+        self.include_floor_calc = include_floor_calc
+        self.result_cache = result_cache
+        self.engine_mode = engine_mode
+        self.floor_method = floor_method
+        self.metrics = metrics
+        self.auto_orientation = auto_orientation
+        self.cancel_event = threading.Event()
+        self.future = None
+        self.started_at = time.time()
+        self.finished_at = None
+
+        # Ceiling/wall pass always runs, the floor pass only when enabled
+        passes = 2 if include_floor_calc else 1
+        self.total_steps = max(len(rooms_for_calc) * passes, 1)
+
+        self._lock = threading.Lock()
+        self._completed_steps = 0
+        self._stage = ''
+        self._current_room = ''
+        # Only the latest rooms are kept for display; the counts cover every streamed room
+        self._streamed_results = {
+            STREAM_CEILING_WALL: deque(maxlen=PARTIAL_RESULT_ROWS),
+            STREAM_FLOOR: deque(maxlen=PARTIAL_RESULT_ROWS)
+        }
+        self._streamed_counts = {STREAM_CEILING_WALL: 0, STREAM_FLOOR: 0}
+        self._pool_states = {STREAM_CEILING_WALL: None, STREAM_FLOOR: None}
+
+    def report_progress(self, stage, step_offset, room_index, room_name):
+        """Record per-room progress; raises JobCancelledError if cancelled."""
+        if self.cancel_event.is_set():
+            raise JobCancelledError()
+        with self._lock:
+            self._completed_steps = step_offset + room_index
+            self._stage = stage
+            self._current_room = room_name
+
+    def report_room_result(self, stream, room_result, pool_state):
+        """Record a room result of a streaming optimizer as soon as it is computed."""
+        with self._lock:
+            self._streamed_results[stream].append(room_result)
+            self._streamed_counts[stream] += 1
+            self._pool_states[stream] = pool_state
+
+    def partial_results(self, stream, limit=PARTIAL_RESULT_ROWS):
+        """
+        Return (latest room results, room count so far, latest pool state or None) of an optimizer pass.
+
+        At most PARTIAL_RESULT_ROWS results are kept, so limit cannot go beyond it.
+        """
+        with self._lock:
+            room_results = list(self._streamed_results[stream])
+            return room_results[-limit:], self._streamed_counts[stream], self._pool_states[stream]
+
+    def clear_partial_results(self):
+        """Drop the streamed room results once the final result holds them."""
+        with self._lock:
+            for room_results in self._streamed_results.values():
+                room_results.clear()
+
+    def progress(self):
+        """Return (fraction_complete, stage, current_room_name)."""
+        with self._lock:
+            if self.future is not None and self.future.done():
+                return 1.0, self._stage, self._current_room
+            return self._completed_steps / self.total_steps, self._stage, self._current_room
+
+    def cancel(self):
+        """Request cooperative cancellation; the worker stops at the next room."""
+        self.cancel_event.set()
+        if self.future is not None:
+            self.future.cancel()
+
+    @property
+    def status(self):
+        if self.future is None or not self.future.done():
+            return JOB_STATUS_RUNNING
+        if self.future.cancelled():
+            return JOB_STATUS_CANCELLED
+        error = self.future.exception()
+        if isinstance(error, JobCancelledError):
+            return JOB_STATUS_CANCELLED
+        if error is not None:
+            return JOB_STATUS_FAILED
+        return JOB_STATUS_DONE
+
+    def is_running(self):
+        return self.status == JOB_STATUS_RUNNING
+
+    def result(self):
+        """Return the optimization result dict of a finished job."""
+        return self.future.result()
+
+    def error(self):
+        """Return the exception of a failed job, or None."""
+        if self.status != JOB_STATUS_FAILED:
+            return None
+        return self.future.exception()
+
+    def elapsed_s(self):
+        end = self.finished_at if self.finished_at is not None else time.time()
+        return end - self.started_at
+
+
+def run_optimization_job(job):
+    """
+    Run the mixed-width ceiling/wall and floor optimizers of the job's engine mode.
+
+    Args:
+        job: OptimizationJob holding the filtered rooms and surface options
+
+    Returns:
+        dict: Optimizer outputs and totals in the shape the sheets tab renders
+    """
+    rooms_for_calc = job.rooms_for_calc
+    room_count = len(rooms_for_calc)
+    ceiling_wall_optimizer, floor_optimizer = ENGINE_OPTIMIZERS[job.engine_mode]
+    floor_namespace = 'floor_' + job.engine_mode
+    if job.floor_method == FLOOR_METHOD_STRIPS:
+        # Strip packing works in integer mm already, so it serves both engine modes
+        floor_optimizer = calculate_floor_strip_plan
+        floor_namespace = 'floor_strips'
+
+    def streamed(optimizer, stream):
+        if optimizer not in STREAMING_OPTIMIZERS:
+            return {}
+        return {'result_callback': lambda room_result, pool_state: job.report_room_result(stream, room_result, pool_state)}
+
+    def timed(optimizer, *args, **kwargs):
+        if job.metrics is None:
+            return optimizer(*args, **kwargs)
+        with job.metrics.time(ENGINE_CALL_SECONDS, function=optimizer.__name__):
+            return optimizer(*args, **kwargs)
+
+    # Rooms as each optimizer sees them: rotated where the other roll direction buys fewer rolls
+    orientation = None
+    ceiling_rooms = floor_rooms = rooms_for_calc
+    if job.auto_orientation:
+        orientation = choose_roll_orientations(rooms_for_calc, job.include_floor_calc)
+        ceiling_rooms = apply_roll_orientation(rooms_for_calc, orientation['ceiling'])
+        if job.floor_method == FLOOR_METHOD_AREA:
+            floor_rooms = apply_roll_orientation(rooms_for_calc, orientation['floor'])
+
+    def run_ceiling_wall():
+        return timed(
+            ceiling_wall_optimizer,
+            ceiling_rooms,
+            job.include_floor_calc,
+            progress_callback=lambda index, count, name: job.report_progress('天井・壁', 0, index, name),
+            **streamed(ceiling_wall_optimizer, STREAM_CEILING_WALL)
+        )
+
+    def run_floor():
+        return timed(
+            floor_optimizer,
+            floor_rooms,
+            progress_callback=lambda index, count, name: job.report_progress('床', room_count, index, name),
+            **streamed(floor_optimizer, STREAM_FLOOR)
+        )
+
+    if job.metrics is not None:
+        job.metrics.observe(ROOMS_PER_REQUEST, room_count)
+
+    try:
+        # Calculate ceiling + wall optimization (use floor checkbox for wall calculation logic)
+        if job.result_cache is not None:
+            cw_inputs = {'rooms': ceiling_rooms, 'has_floor_covering': job.include_floor_calc}
+            ceiling_wall_results, total_cw_1800, total_cw_3600 = job.result_cache.get_or_compute(
+                'ceiling_wall_' + job.engine_mode, cw_inputs, run_ceiling_wall)
+        else:
+            ceiling_wall_results, total_cw_1800, total_cw_3600 = run_ceiling_wall()
+
+        # Calculate floor optimization if floor is enabled
+        floor_results = {}
+        total_floor_1800 = 0
+        total_floor_3600 = 0
+
+        if job.include_floor_calc:
+            if job.result_cache is not None:
+                floor_results, total_floor_1800, total_floor_3600 = job.result_cache.get_or_compute(
+                    floor_namespace, {'rooms': floor_rooms}, run_floor)
+            else:
+                floor_results, total_floor_1800, total_floor_3600 = run_floor()
+
+        if orientation is not None:
+            ceiling_wall_results = {**ceiling_wall_results, 'room_results': annotate_orientation(
+                ceiling_wall_results.get('room_results', []), rooms_for_calc, orientation['ceiling'],
+                'ceiling_orientation'
+            )}
+            if floor_results and job.floor_method == FLOOR_METHOD_AREA:
+                floor_results = {**floor_results, 'floor_room_results': annotate_orientation(
+                    floor_results.get('floor_room_results', []), rooms_for_calc, orientation['floor'],
+                    'floor_orientation'
+                )}
+    finally:
+        job.finished_at = time.time()
+        # The session keeps its own inputs; the finished handle only needs the results
+        job.rooms_for_calc = None
+        job.clear_partial_results()
+
+    floor_results = convert_fixed_point_results_to_m2(floor_results)
+    # Bounds of the rooms as the optimizers saw them (after any re-orientation)
+    lower_bounds = plan_optimality_gap(
+        ceiling_rooms, total_cw_1800 + total_cw_3600, total_floor_1800 + total_floor_3600,
+        job.include_floor_calc, floor_results, floor_rooms
+    )
+
+    return {
+        # Fixed-point results carry integer mm² areas; render them in m²
+        'ceiling_wall_results': convert_fixed_point_results_to_m2(ceiling_wall_results),
+        'total_cw_1800': total_cw_1800,
+        'total_cw_3600': total_cw_3600,
+        'floor_results': floor_results,
+        'total_floor_1800': total_floor_1800,
+        'total_floor_3600': total_floor_3600,
+        'include_floor_calc': job.include_floor_calc,
+        'engine_mode': job.engine_mode,
+        'floor_method': job.floor_method,
+        'orientation': orientation,
+        'lower_bounds': lower_bounds
+    }
+
+
+def create_job_executor(max_workers=JOB_MAX_WORKERS):
+    """Create the executor that background optimization jobs run on."""
+    return ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='sheet-optimizer')
+
+
+def submit_optimization_job(executor, rooms_for_calc, include_floor_calc, previous_job=None, result_cache=None,
+                            engine_mode=ENGINE_MODE_FLOAT, floor_method=FLOOR_METHOD_AREA, metrics=None,
+                            auto_orientation=False, input_signature=None):
+    """
+    Submit a new optimization job, cancelling the previous one if it is still running.
+
+    Args:
+        executor: Executor returned by create_job_executor
+        rooms_for_calc: Surface-filtered room dictionaries
+        include_floor_calc: Whether the floor pass runs (also affects wall patterns)
+        previous_job: The job this submission replaces, if any
+        result_cache: Optional ResultCache shared across sessions
+        engine_mode: ENGINE_MODE_FLOAT or ENGINE_MODE_FIXED
+        floor_method: FLOOR_METHOD_AREA or FLOOR_METHOD_STRIPS
+        metrics: Optional MetricsRegistry for engine latency and request size
+        auto_orientation: Choose per room whether ceiling/floor rolls run across the width or the length
+                          (area floor method only for floors)
+        input_signature: Hashable description of the inputs, kept on the handle; the
+                         result is stale once the caller's current signature differs
+
+    Returns:
+        OptimizationJob: Handle to poll from st.session_state
+    """
+    if previous_job is not None and previous_job.is_running():
+        previous_job.cancel()
+
+    job = OptimizationJob(rooms_for_calc, include_floor_calc, result_cache, engine_mode, floor_method, metrics,
+                         auto_orientation, input_signature)
+    job.future = executor.submit(run_optimization_job, job)
+    return job
@@ -0,0 +1,274 @@
+import math
+import threading
+from bisect import bisect_left
+from functools import lru_cache
+
+import numpy as np
+
+from sheet_engine import (
+    ROLL_LENGTH,
+    calculate_optimized_multi_room_ceiling_wall,
+    calculate_optimized_multi_room_floor,
+    calculate_roll_combination_by_dimension,
+    calculate_room_metrics,
+    calculate_wall_roll_combination_by_dimension
+)
+
+
+# ==============================================================================
+# CONSTANTS
+# ==============================================================================
+
+# Scan ranges for building the indexes (beyond them lookups fall back to the pattern functions)
+CEILING_FLOOR_SCAN_MAX_MM = 120000
+WALL_SCAN_MAX_MM = 30000
+
+SENSITIVITY_TOLERANCE_MM = 100
+
+# Indexes are process-wide; the lock keeps concurrent sessions from building one twice
+_INDEX_BUILD_LOCK = threading.Lock()
+
+
+# ==============================================================================
+# BREAKPOINT INDEX
+# ==============================================================================
+
+class BreakpointIndex:
+    """
+    Sorted index of the dimensions at which a roll pattern function jumps.
+
+    All pattern thresholds are integer millimeters compared with "<=", so the
+    pattern is constant on every interval (upper_bounds[i - 1], upper_bounds[i]].
+    The index is built once by scanning the pattern function at 1mm
+    resolution; lookups afterwards are a single bisect.
+    """
+
+    def __init__(self, pattern_function, scan_max_mm):
+        self.pattern_function = pattern_function
+        self.scan_max_mm = scan_max_mm
+        self.upper_bounds = []
+        self.patterns = []
+
+        previous_pattern = self._pattern(1)
+        for dimension_mm in range(2, scan_max_mm + 1):
+            pattern = self._pattern(dimension_mm)
+            if pattern != previous_pattern:
+                self.upper_bounds.append(dimension_mm - 1)
+                self.patterns.append(previous_pattern)
+                previous_pattern = pattern
+        self.upper_bounds.append(scan_max_mm)
+        self.patterns.append(previous_pattern)
+
+    def _pattern(self, dimension_mm):
+        _, rolls_1800, rolls_3600 = self.pattern_function(dimension_mm)
+        return rolls_1800, rolls_3600
+
+    def lookup(self, dimension_mm):
+        """Return (rolls_1800, rolls_3600) for a dimension."""
+        if dimension_mm <= 0:
+            return 0, 0
+        if dimension_mm > self.scan_max_mm:
+            return self._pattern(dimension_mm)
+        return self.patterns[bisect_left(self.upper_bounds, dimension_mm)]
+
+    def lookup_many(self, dimensions_mm):
+        """
+        Vectorized lookup: (n, 2) int64 array of (rolls_1800, rolls_3600) per dimension.
+
+        One searchsorted over the upper bounds; dimensions beyond the indexed
+        range fall back to the pattern function one by one.
+        """
+        dimensions_mm = np.asarray(dimensions_mm, dtype=np.float64)
+        upper_bounds = np.asarray(self.upper_bounds, dtype=np.float64)
+        pattern_table = np.asarray(self.patterns, dtype=np.int64)
+
+        positions = np.searchsorted(upper_bounds, dimensions_mm, side='left')
+        in_range = (positions < len(upper_bounds)) & (dimensions_mm > 0)
+        patterns = np.zeros((len(dimensions_mm), 2), dtype=np.int64)
+        patterns[in_range] = pattern_table[positions[in_range]]
+
+        for i in np.flatnonzero((dimensions_mm > self.scan_max_mm)):
+            patterns[i] = self._pattern(float(dimensions_mm[i]))
+        return patterns
+
+    def next_breakpoint(self, dimension_mm):
+        """
+        Return (threshold_mm, next_pattern) of the next jump above dimension_mm.
+
+        The pattern changes as soon as the dimension exceeds threshold_mm.
+        Returns (None, None) outside the indexed range.
+        """
+        if dimension_mm > self.scan_max_mm:
+            return None, None
+        position = bisect_left(self.upper_bounds, max(dimension_mm, 0))
+        if position + 1 >= len(self.patterns):
+            return None, None
+        return self.upper_bounds[position], self.patterns[position + 1]
+
+    def previous_breakpoint(self, dimension_mm):
+        """
+        Return (threshold_mm, previous_pattern) of the jump below dimension_mm.
+
+        The dimension must shrink to threshold_mm or less to reach previous_pattern.
+        Returns (None, None) for the first interval or outside the indexed range.
+        """
+        if dimension_mm <= 0 or dimension_mm > self.scan_max_mm:
+            return None, None
+        position = bisect_left(self.upper_bounds, dimension_mm)
+        if position == 0:
+            return None, None
+        return self.upper_bounds[position - 1], self.patterns[position - 1]
+
+
+@lru_cache(maxsize=None)
+def _build_ceiling_floor_breakpoint_index():
+    return BreakpointIndex(calculate_roll_combination_by_dimension, CEILING_FLOOR_SCAN_MAX_MM)
+
+
+@lru_cache(maxsize=None)
+def _build_wall_breakpoint_index(has_floor_covering):
+    return BreakpointIndex(
+        lambda dimension_mm: calculate_wall_roll_combination_by_dimension(dimension_mm, has_floor_covering),
+        WALL_SCAN_MAX_MM
+    )
+
+
+def get_ceiling_floor_breakpoint_index():
+    """Breakpoint index of calculate_roll_combination_by_dimension (ceiling and floor width)."""
+    with _INDEX_BUILD_LOCK:
+        return _build_ceiling_floor_breakpoint_index()
+
+
+def get_wall_breakpoint_index(has_floor_covering):
+    """Breakpoint index of calculate_wall_roll_combination_by_dimension (wall height)."""
+    with _INDEX_BUILD_LOCK:
+        return _build_wall_breakpoint_index(bool(has_floor_covering))
+
+
+def closed_form_roll_pattern(dimension_mm):
+    """
+    Closed-form equivalent of calculate_roll_combination_by_dimension (counts only).
+
+    Above 1200mm the pattern repeats every 3300mm: 1800mm of "n × 3600mm"
+    followed by 1500mm of "n × 3600mm + 1 × 1800mm". The explicit table ends
+    at 100000mm, after which the 3600mm-remainder rule applies.
+
+    Returns:
+        tuple: (rolls_1800, rolls_3600)
+    """
+    if dimension_mm <= 0:
+        return 0, 0
+    if dimension_mm <= 1200:
+        return 1, 0
+    if dimension_mm <= 100000:
+        offset = dimension_mm - 1200
+        cycle = math.ceil(offset / 3300)
+        position = offset - (cycle - 1) * 3300
+        return (0, cycle) if position <= 1800 else (1, cycle)
+
+    base_3600_rolls = int(dimension_mm // 3600)
+    remainder = dimension_mm % 3600
+    if remainder <= 1200:
+        return (1 if remainder > 0 else 0), base_3600_rolls
+    return 0, base_3600_rolls + 1
+
+
+def next_perimeter_breakpoint_m(perimeter_m):
+    """Return the next perimeter (a multiple of the 50m roll length) at which another wall set is needed."""
+    return math.ceil(perimeter_m / ROLL_LENGTH) * ROLL_LENGTH
+
+
+# ==============================================================================
+# DIMENSION SENSITIVITY
+# ==============================================================================
+
+def _standalone_room_rolls(length_m, width_m, height_m, has_floor_covering):
+    """Total rolls for one room optimized on its own (all surfaces)."""
+    metrics = calculate_room_metrics(length_m, width_m, height_m)
+    if not metrics:
+        return 0
+    room = {
+        'name': '',
+        'width_mm': width_m * 1000,
+        'height_mm': height_m * 1000,
+        'length_m': length_m,
+        **metrics
+    }
+    _, cw_1800, cw_3600 = calculate_optimized_multi_room_ceiling_wall([room], has_floor_covering)
+    total = cw_1800 + cw_3600
+    if has_floor_covering:
+        _, floor_1800, floor_3600 = calculate_optimized_multi_room_floor([room])
+        total += floor_1800 + floor_3600
+    return total
+
+
+def _pattern_distances(index, dimension_mm):
+    threshold_up, pattern_up = index.next_breakpoint(dimension_mm)
+    threshold_down, pattern_down = index.previous_breakpoint(dimension_mm)
+    return {
+        'value_mm': dimension_mm,
+        'pattern': index.lookup(dimension_mm),
+        'next_breakpoint_mm': threshold_up,
+        'headroom_mm': threshold_up - dimension_mm if threshold_up is not None else None,
+        'next_pattern': pattern_up,
+        'previous_breakpoint_mm': threshold_down,
+        'reduction_needed_mm': dimension_mm - threshold_down if threshold_down is not None else None,
+        'previous_pattern': pattern_down
+    }
+
+
+def analyze_room_sensitivity(length_m, width_m, height_m, has_floor_covering=True,
+                             tolerance_mm=SENSITIVITY_TOLERANCE_MM):
+    """
+    Report how close a room's dimensions are to roll-count jumps.
+
+    Pattern distances come from the breakpoint indexes (bisect lookups). The
+    roll deltas re-run the single-room optimizers with each dimension moved by
+    ±tolerance_mm, which also captures jumps caused by area and perimeter.
+
+    Args:
+        length_m: Room length in meters
+        width_m: Room width in meters (drives the ceiling/floor pattern)
+        height_m: Room height in meters (drives the wall pattern)
+        has_floor_covering: Whether floor covering is calculated
+        tolerance_mm: Dimension change to evaluate in each direction
+
+    Returns:
+        dict: Per-dimension distances and roll deltas, or None for invalid rooms
+    """
+    base_rolls = _standalone_room_rolls(length_m, width_m, height_m, has_floor_covering)
+    if base_rolls == 0:
+        return None
+
+    tolerance_m = tolerance_mm / 1000
+    perimeter_m = 2 * (length_m + width_m)
+    next_perimeter_m = next_perimeter_breakpoint_m(perimeter_m)
+
+    width = _pattern_distances(get_ceiling_floor_breakpoint_index(), width_m * 1000)
+    height = _pattern_distances(get_wall_breakpoint_index(has_floor_covering), height_m * 1000)
+    length = {
+        'value_mm': length_m * 1000,
+        # Length only jumps the wall sets through the perimeter (both sides count)
+        'next_breakpoint_mm': (length_m + (next_perimeter_m - perimeter_m) / 2) * 1000,
+        'headroom_mm': (next_perimeter_m - perimeter_m) / 2 * 1000
+    }
+
+    dimensions = {'width': width, 'length': length, 'height': height}
+    perturbations = {
+        'width': lambda delta: (length_m, width_m + delta, height_m),
+        'length': lambda delta: (length_m + delta, width_m, height_m),
+        'height': lambda delta: (length_m, width_m, height_m + delta)
+    }
+    for name, perturb in perturbations.items():
+        rolls_up = _standalone_room_rolls(*perturb(tolerance_m), has_floor_covering)
+        rolls_down = _standalone_room_rolls(*perturb(-tolerance_m), has_floor_covering)
+        dimensions[name]['rolls_delta_if_larger'] = rolls_up - base_rolls
+        dimensions[name]['rolls_delta_if_smaller'] = rolls_down - base_rolls if rolls_down else None
+
+    return {
+        'base_rolls': base_rolls,
+        'tolerance_mm': tolerance_mm,
+        'perimeter_m': perimeter_m,
+        'next_perimeter_breakpoint_m': next_perimeter_m,
+        'dimensions': dimensions
+    }
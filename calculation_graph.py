@@ -0,0 +1,338 @@
+from breakpoints import analyze_room_sensitivity
+from phased_plans import compile_phase_program
+from sheet_engine import calculate_room_metrics
+from wall_segments import calculate_wall_segments_batch
+
+
+# ==============================================================================
+# CONSTANTS
+# ==============================================================================
+
+# Input nodes of the calculator pipeline, set from the widgets on every rerun
+NODE_ROOM_INPUTS = 'room_inputs'
+NODE_SENSITIVITY_TOLERANCE = 'sensitivity_tolerance_mm'
+NODE_SURFACE_OPTIONS = 'surface_options'
+NODE_BUILDING_CONFIG = 'building_config'
+NODE_SCAFFOLDING_UNITS = 'scaffolding_units'
+
+# Calculated nodes
+NODE_ROOM_METRICS = 'room_metrics'
+NODE_SENSITIVITY_INPUTS = 'sensitivity_inputs'
+NODE_ROOM_SENSITIVITY = 'room_sensitivity'
+NODE_ROOM_SUMMARY = 'room_summary'
+NODE_IMPORTED_ROOMS = 'imported_rooms'
+NODE_SEGMENT_WALLS = 'segment_walls'
+NODE_ROOMS_FOR_CALC = 'rooms_for_calc'
+NODE_PHASE_PROGRAM = 'phase_program'
+NODE_SCAFFOLDING = 'scaffolding'
+
+
+# ==============================================================================
+# DEPENDENCY GRAPH
+# ==============================================================================
+
+class CalculationGraph:
+    """
+    Calculation nodes with dirty flags and memoized outputs.
+
+    Input nodes hold values set from outside; calculated nodes derive their
+    output from the nodes they depend on. Changing an input marks every
+    node downstream of it dirty, and a dirty node is recomputed the next
+    time it is read, so unrelated nodes keep their outputs.
+
+    Nodes declared with item_compute map a sequence dependency item by item
+    and reuse the results of items that were already in the previous run,
+    so editing one room recomputes only that room. Items must be hashable.
+    """
+
+    def __init__(self):
+        self._nodes = {}
+        self._dependents = {}
+
+    def add_input(self, name, value=None):
+        """Declare an input node with its initial value."""
+        self._add(name, {'input': True, 'depends_on': (), 'value': value, 'dirty': False, 'overridden': False,
+                         'version': 0})
+
+    def add_node(self, name, compute=None, depends_on=(), item_compute=None):
+        """
+        Declare a calculated node.
+
+        Args:
+            name: Node name
+            compute: Function of the dependency outputs, in depends_on order
+            depends_on: Names of already declared nodes
+            item_compute: Instead of compute, a function applied to each item
+                          of the single dependency's sequence (output is a list)
+        """
+        if item_compute is not None and len(depends_on) != 1:
+            raise ValueError(f"Item node {name!r} needs exactly one dependency")
+        for dependency in depends_on:
+            if dependency not in self._nodes:
+                raise KeyError(f"Unknown dependency {dependency!r} of node {name!r}")
+        self._add(name, {
+            'input': False,
+            'compute': compute,
+            'item_compute': item_compute,
+            'item_results': {},
+            'depends_on': tuple(depends_on),
+            'value': None,
+            'dirty': True,
+            'overridden': False,
+            'recomputes': 0,
+            'version': 0
+        })
+        for dependency in depends_on:
+            self._dependents[dependency].append(name)
+
+    def _add(self, name, node):
+        if name in self._nodes:
+            raise ValueError(f"Node {name!r} is already declared")
+        self._nodes[name] = node
+        self._dependents[name] = []
+
+    def _mark_downstream_dirty(self, name):
+        pending = list(self._dependents[name])
+        while pending:
+            dependent = pending.pop()
+            node = self._nodes[dependent]
+            node['overridden'] = False
+            if not node['dirty']:
+                node['dirty'] = True
+                pending.extend(self._dependents[dependent])
+
+    def set_input(self, name, value):
+        """
+        Set an input node; its downstream nodes become dirty only when the value changed.
+
+        Returns:
+            bool: Whether the value changed
+        """
+        node = self._nodes[name]
+        if not node['input']:
+            raise ValueError(f"Node {name!r} is not an input")
+        if node['value'] == value:
+            return False
+        node['value'] = value
+        node['version'] += 1
+        self._mark_downstream_dirty(name)
+        return True
+
+    def override(self, name, value):
+        """
+        Replace a calculated node's output by hand (e.g. rooms removed or reordered).
+
+        The override holds until one of the node's dependencies changes,
+        which recomputes it from its inputs again.
+        """
+        node = self._nodes[name]
+        if node['input']:
+            raise ValueError(f"Node {name!r} is an input; use set_input")
+        node['value'] = value
+        node['version'] += 1
+        node['dirty'] = False
+        node['overridden'] = True
+        self._mark_downstream_dirty(name)
+
+    def invalidate(self, name):
+        """Mark a node and everything downstream dirty, dropping any override."""
+        node = self._nodes[name]
+        if not node['input']:
+            node['dirty'] = True
+            node['overridden'] = False
+        self._mark_downstream_dirty(name)
+
+    def is_dirty(self, name):
+        return self._nodes[name]['dirty']
+
+    def is_overridden(self, name):
+        return self._nodes[name]['overridden']
+
+    def version(self, name):
+        """
+        Counter that changes whenever a node's output may have changed (set, overridden or recomputed).
+
+        Results derived outside the graph record the versions they were
+        computed from and are stale once a version differs. Read it after
+        get(), which brings a dirty node up to date.
+        """
+        return self._nodes[name]['version']
+
+    def get(self, name):
+        """Return a node's output, recomputing it (and dirty nodes upstream) first when dirty."""
+        node = self._nodes[name]
+        if not node['dirty']:
+            return node['value']
+
+        dependency_values = [self.get(dependency) for dependency in node['depends_on']]
+        if node['item_compute'] is not None:
+            previous_results = node['item_results']
+            item_results = {}
+            for item in dependency_values[0]:
+                if item not in item_results:
+                    item_results[item] = (previous_results[item] if item in previous_results
+                                          else node['item_compute'](item))
+            # Only the current items are kept, so removed rooms do not pile up
+            node['item_results'] = item_results
+            node['value'] = [item_results[item] for item in dependency_values[0]]
+        else:
+            node['value'] = node['compute'](*dependency_values)
+        node['dirty'] = False
+        node['recomputes'] += 1
+        node['version'] += 1
+        return node['value']
+
+    def recompute_counts(self):
+        """Number of recomputations per calculated node since the graph was built."""
+        return {name: node['recomputes'] for name, node in self._nodes.items() if not node['input']}
+
+
+# ==============================================================================
+# CALCULATOR PIPELINE
+# ==============================================================================
+
+def room_input_key(room):
+    """Hashable form of a room editor entry: (name, length, width, height, wall segments)."""
+    return (
+        room['name'],
+        room['length'],
+        room['width'],
+        room['height'],
+        tuple(
+            (segment['length_m'], segment['height_m'],
+             tuple((opening['width_m'], opening['height_m']) for opening in segment['openings']))
+            for segment in room.get('wall_segments') or ()
+        )
+    )
+
+
+def _wall_segments_from_key(segments_key):
+    return [
+        {'length_m': length_m, 'height_m': height_m,
+         'openings': [{'width_m': width_m, 'height_m': opening_height_m} for width_m, opening_height_m in openings]}
+        for length_m, height_m, openings in segments_key
+    ]
+
+
+def calculate_room_entry(room_key):
+    """
+    Areas of one room from its input key; net wall area after openings when segments are given.
+
+    Returns:
+        dict: metrics (None for incomplete dimensions) and walls (segment totals or None)
+    """
+    _, length, width, height, segments_key = room_key
+    metrics = calculate_room_metrics(length, width, height)
+    walls = None
+    if metrics and segments_key:
+        # Net wall area after opening deductions replaces perimeter × height
+        walls = calculate_wall_segments_batch([_wall_segments_from_key(segments_key)])[0]
+        metrics = {**metrics, 'wall_area': walls['net_wall_area'], 'perimeter': walls['run_length_m']}
+    return {'metrics': metrics, 'walls': walls}
+
+
+def sensitivity_inputs(room_keys, tolerance_mm):
+    return [(length, width, height, tolerance_mm) for _, length, width, height, _ in room_keys]
+
+
+def calculate_sensitivity_entry(sensitivity_key):
+    length, width, height, tolerance_mm = sensitivity_key
+    return analyze_room_sensitivity(length, width, height, tolerance_mm=tolerance_mm)
+
+
+def summarize_rooms(room_keys, room_entries):
+    """Per-room area rows and the area totals of all complete rooms."""
+    rows = [
+        {'name': room_key[0], **{key: entry['metrics'][key] for key in ('floor_area', 'ceiling_area', 'wall_area', 'perimeter')}}
+        for room_key, entry in zip(room_keys, room_entries) if entry['metrics']
+    ]
+    return {
+        'rooms_data': rows,
+        'total_floor_area': sum(row['floor_area'] for row in rows),
+        'total_ceiling_area': sum(row['ceiling_area'] for row in rows),
+        'total_wall_area': sum(row['wall_area'] for row in rows)
+    }
+
+
+def import_rooms(room_keys, room_entries):
+    """Rooms of the editor with complete dimensions, in the optimizer units (width/height in mm)."""
+    return [
+        {
+            'name': name,
+            'width_mm': width * 1000,  # Convert to mm
+            'height_mm': height * 1000,  # Convert to mm
+            'length_m': length,
+            'wall_segments': _wall_segments_from_key(segments_key),
+            **entry['metrics']
+        }
+        for (name, length, width, height, segments_key), entry in zip(room_keys, room_entries)
+        if entry['metrics']
+    ]
+
+
+def calculate_segment_walls(imported_rooms, surface_options):
+    """Net areas and patterns of all wall segments in the project, in one vectorized batch."""
+    segmented_rooms = [room for room in imported_rooms if room.get('wall_segments')]
+    segment_walls = calculate_wall_segments_batch(
+        [room['wall_segments'] for room in segmented_rooms],
+        surface_options['floor']
+    )
+    return {id(room): walls for room, walls in zip(segmented_rooms, segment_walls)}
+
+
+def filter_rooms_for_calc(imported_rooms, surface_options, walls_by_room):
+    """Imported rooms reduced to the selected surfaces, as the optimizers take them."""
+    rooms_for_calc = []
+    for room in imported_rooms:
+        filtered_room = {
+            'name': room['name'],
+            'perimeter': room['perimeter'],
+            'width_mm': room['width_mm'],
+            'height_mm': room['height_mm'],
+            'length_m': room['length_m'],
+            'floor_area': room.get('floor_area', 0) if surface_options['floor'] else 0,
+            'ceiling_area': room.get('ceiling_area', 0) if surface_options['ceiling'] else 0,
+            'wall_area': room.get('wall_area', 0) if surface_options['wall'] else 0
+        }
+        if id(room) in walls_by_room:
+            filtered_room['wall_segment_rolls'] = walls_by_room[id(room)]['wall_segment_rolls']
+            if surface_options['wall']:
+                filtered_room['wall_area'] = walls_by_room[id(room)]['net_wall_area']
+        rooms_for_calc.append(filtered_room)
+    return rooms_for_calc
+
+
+def compile_rooms_phase_program(rooms_for_calc, surface_options):
+    return compile_phase_program(rooms_for_calc, surface_options['floor'])
+
+
+def build_calculator_graph(calculate_scaffolding, room_entry_compute=calculate_room_entry):
+    """
+    Dependency graph of the calculator: room inputs → metrics → import → surface filter → phase program,
+    and scaffolding.
+
+    Args:
+        calculate_scaffolding: Function of (building_config, scaffolding_units)
+                               returning the scaffolding result (or None)
+        room_entry_compute: Per-room metrics function (e.g. wrapped in latency metrics)
+
+    Returns:
+        CalculationGraph: Inputs start empty; set them from the widgets on every rerun
+    """
+    graph = CalculationGraph()
+    graph.add_input(NODE_ROOM_INPUTS, ())
+    graph.add_input(NODE_SENSITIVITY_TOLERANCE, 0)
+    graph.add_input(NODE_SURFACE_OPTIONS, {'floor': True, 'ceiling': True, 'wall': True})
+    graph.add_input(NODE_BUILDING_CONFIG, {})
+    graph.add_input(NODE_SCAFFOLDING_UNITS, None)
+
+    graph.add_node(NODE_ROOM_METRICS, depends_on=(NODE_ROOM_INPUTS,), item_compute=room_entry_compute)
+    graph.add_node(NODE_SENSITIVITY_INPUTS, sensitivity_inputs, (NODE_ROOM_INPUTS, NODE_SENSITIVITY_TOLERANCE))
+    graph.add_node(NODE_ROOM_SENSITIVITY, depends_on=(NODE_SENSITIVITY_INPUTS,), item_compute=calculate_sensitivity_entry)
+    graph.add_node(NODE_ROOM_SUMMARY, summarize_rooms, (NODE_ROOM_INPUTS, NODE_ROOM_METRICS))
+    graph.add_node(NODE_IMPORTED_ROOMS, import_rooms, (NODE_ROOM_INPUTS, NODE_ROOM_METRICS))
+    graph.add_node(NODE_SEGMENT_WALLS, calculate_segment_walls, (NODE_IMPORTED_ROOMS, NODE_SURFACE_OPTIONS))
+    graph.add_node(NODE_ROOMS_FOR_CALC, filter_rooms_for_calc, (NODE_IMPORTED_ROOMS, NODE_SURFACE_OPTIONS, NODE_SEGMENT_WALLS))
+    graph.add_node(NODE_PHASE_PROGRAM, compile_rooms_phase_program, (NODE_ROOMS_FOR_CALC, NODE_SURFACE_OPTIONS))
+    graph.add_node(NODE_SCAFFOLDING, calculate_scaffolding, (NODE_BUILDING_CONFIG, NODE_SCAFFOLDING_UNITS))
+    return graph
@@ -0,0 +1,171 @@
+import math
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+
+
+# ==============================================================================
+# CONSTANTS
+# ==============================================================================
+
+# Prometheus text file, e.g. inside node_exporter's --collector.textfile.directory
+METRICS_FILE_PATH = os.environ.get('SHEET_METRICS_FILE', '.sheet_metrics.prom')
+METRICS_WRITE_INTERVAL_S = float(os.environ.get('SHEET_METRICS_INTERVAL_S', 15))
+
+METRIC_COUNTER = 'counter'
+METRIC_GAUGE = 'gauge'
+METRIC_HISTOGRAM = 'histogram'
+
+LATENCY_BUCKETS_S = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+ROOM_COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 5000)
+
+# Metric names used by the app and the background jobs
+ENGINE_CALL_SECONDS = 'sheet_engine_call_duration_seconds'
+ROOMS_PER_REQUEST = 'sheet_rooms_per_request'
+RERUN_SECONDS = 'sheet_rerun_duration_seconds'
+RESULT_CACHE_LOOKUPS = 'sheet_result_cache_lookups_total'
+RESULT_CACHE_HIT_RATIO = 'sheet_result_cache_hit_ratio'
+
+METRIC_DEFINITIONS = {
+    ENGINE_CALL_SECONDS: (METRIC_HISTOGRAM, 'Engine call latency by function (_count is the call count).',
+                          LATENCY_BUCKETS_S),
+    ROOMS_PER_REQUEST: (METRIC_HISTOGRAM, 'Rooms per optimization request.', ROOM_COUNT_BUCKETS),
+    RERUN_SECONDS: (METRIC_HISTOGRAM, 'Script rerun time spent in each tab.', LATENCY_BUCKETS_S),
+    RESULT_CACHE_LOOKUPS: (METRIC_COUNTER, 'Result cache lookups by result (hit or miss).', None),
+    RESULT_CACHE_HIT_RATIO: (METRIC_GAUGE, 'Result cache hits per lookup since process start.', None)
+}
+
+
+# ==============================================================================
+# METRICS REGISTRY
+# ==============================================================================
+
+def _label_text(labels):
+    if not labels:
+        return ''
+    pairs = ','.join(
+        '{}="{}"'.format(name, str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'))
+        for name, value in labels
+    )
+    return '{' + pairs + '}'
+
+
+def _format_value(value):
+    if value == math.inf:
+        return '+Inf'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class MetricsRegistry:
+    """
+    Process-wide counters, gauges and histograms in Prometheus text format.
+
+    Shared by all sessions and the background job threads; every update
+    takes the registry lock. Samples are keyed by metric name and a sorted
+    tuple of label pairs.
+    """
+
+    def __init__(self, definitions=METRIC_DEFINITIONS):
+        self.definitions = dict(definitions)
+        self._lock = threading.Lock()
+        self._values = {}
+        self._histograms = {}
+        self._last_written_at = 0.0
+
+    def set(self, name, value, **labels):
+        """Set a counter or gauge sample (counters mirrored from another source)."""
+        with self._lock:
+            self._values[(name, tuple(sorted(labels.items())))] = value
+
+    def inc(self, name, amount=1, **labels):
+        """Increment a counter sample."""
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def observe(self, name, value, **labels):
+        """Add one observation to a histogram."""
+        buckets = self.definitions[name][2]
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = {'buckets': [0] * len(buckets), 'count': 0, 'sum': 0.0}
+            for bucket_index, upper_bound in enumerate(buckets):
+                if value <= upper_bound:
+                    histogram['buckets'][bucket_index] += 1
+            histogram['count'] += 1
+            histogram['sum'] += value
+
+    @contextmanager
+    def time(self, name, **labels):
+        """Observe the wall time of the with-block in seconds, also when it raises."""
+        started_at = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started_at, **labels)
+
+    def render(self):
+        """Return all samples in the Prometheus text exposition format."""
+        with self._lock:
+            values = dict(self._values)
+            histograms = {key: {**histogram, 'buckets': list(histogram['buckets'])}
+                          for key, histogram in self._histograms.items()}
+
+        lines = []
+        for name, (kind, help_text, buckets) in self.definitions.items():
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            if kind == METRIC_HISTOGRAM:
+                for (sample_name, labels), histogram in sorted(histograms.items()):
+                    if sample_name != name:
+                        continue
+                    for upper_bound, bucket_count in zip(buckets, histogram['buckets']):
+                        bucket_labels = labels + (('le', _format_value(upper_bound)),)
+                        lines.append(f"{name}_bucket{_label_text(bucket_labels)} {bucket_count}")
+                    lines.append(f"{name}_bucket{_label_text(labels + (('le', '+Inf'),))} {histogram['count']}")
+                    lines.append(f"{name}_sum{_label_text(labels)} {_format_value(histogram['sum'])}")
+                    lines.append(f"{name}_count{_label_text(labels)} {histogram['count']}")
+            else:
+                for (sample_name, labels), value in sorted(values.items()):
+                    if sample_name == name:
+                        lines.append(f"{name}{_label_text(labels)} {_format_value(value)}")
+        return '\n'.join(lines) + '\n'
+
+    def write_textfile(self, path=METRICS_FILE_PATH):
+        """Atomically replace path with the current samples (readers never see a partial file)."""
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as tmp_file:
+                tmp_file.write(self.render())
+            # mkstemp creates 0600 files; the collector usually runs as another user
+            os.chmod(tmp_path, 0o644)
+            os.replace(tmp_path, path)
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return False
+        return True
+
+    def write_textfile_if_due(self, path=METRICS_FILE_PATH, interval_s=METRICS_WRITE_INTERVAL_S):
+        """Write the text file at most once per interval; called on every rerun."""
+        now = time.time()
+        with self._lock:
+            if now - self._last_written_at < interval_s:
+                return False
+            self._last_written_at = now
+        return self.write_textfile(path)
+
+
+def record_result_cache_stats(registry, result_cache):
+    """Mirror a ResultCache's hit/miss counters into the registry."""
+    registry.set(RESULT_CACHE_LOOKUPS, result_cache.hits, result='hit')
+    registry.set(RESULT_CACHE_LOOKUPS, result_cache.misses, result='miss')
+    registry.set(RESULT_CACHE_HIT_RATIO, result_cache.hit_rate())
@@ -0,0 +1,220 @@
+from sheet_engine import (
+    SHEET_SPECS,
+    ROLL_LENGTH,
+    calculate_wall_roll_combination_by_dimension,
+    calculate_optimized_multi_room_ceiling_wall,
+    calculate_optimized_multi_room_floor
+)
+
+
+# ==============================================================================
+# CONSTANTS
+# ==============================================================================
+
+MM_PER_M = 1000
+MM2_PER_M2 = 1000000
+
+ROLL_LENGTH_MM = ROLL_LENGTH * MM_PER_M
+
+# Result fields that hold areas (mm² in fixed-point results, m² in float results)
+FIXED_POINT_AREA_KEYS = (
+    'ceiling_1800_from_leftover',
+    'ceiling_3600_from_leftover',
+    'wall_1800_from_leftover',
+    'wall_3600_from_leftover',
+    'floor_1800_from_leftover',
+    'floor_3600_from_leftover',
+    'final_leftover_1800',
+    'final_leftover_3600',
+    'final_leftover_1800_floor',
+    'final_leftover_3600_floor'
+)
+
+
+# ==============================================================================
+# HELPER FUNCTIONS - UNIT CONVERSION
+# ==============================================================================
+
+def m_to_mm(length_m):
+    """Convert meters to integer millimeters (rounded to the nearest mm)."""
+    return int(round(length_m * MM_PER_M))
+
+
+def m2_to_mm2(area_m2):
+    """Convert m² to integer mm² (rounded to the nearest mm²)."""
+    return int(round(area_m2 * MM2_PER_M2))
+
+
+def mm2_to_m2(area_mm2):
+    """Convert integer mm² back to m² for display."""
+    return area_mm2 / MM2_PER_M2
+
+
+def ceil_div(numerator, denominator):
+    """Exact integer ceiling division for non-negative integers."""
+    return -(-numerator // denominator)
+
+
+def coverage_mm2(spec_key):
+    """Actual roll coverage of a SHEET_SPECS entry in integer mm²."""
+    return SHEET_SPECS[spec_key]['actual_coverage'] * MM2_PER_M2
+
+
+def split_area_by_pattern(area_mm2, rolls_1800, rolls_3600):
+    """
+    Split an area between roll widths in proportion to the pattern units.
+
+    The 1800mm share is floored and the 3600mm share takes the remainder,
+    so the two parts always add back up to area_mm2 exactly.
+    """
+    total_pattern_units = rolls_1800 + rolls_3600
+    if area_mm2 <= 0 or total_pattern_units <= 0:
+        return 0, 0
+    share_1800 = area_mm2 * rolls_1800 // total_pattern_units
+    return share_1800, area_mm2 - share_1800
+
+
+def calculate_room_metrics_fixed(length_mm, width_mm, height_mm):
+    """Calculate all metrics for a single room in integer mm / mm²."""
+    if length_mm <= 0 or width_mm <= 0 or height_mm <= 0:
+        return None
+
+    floor_area_mm2 = length_mm * width_mm
+    perimeter_mm = 2 * (length_mm + width_mm)
+
+    return {
+        'floor_area_mm2': floor_area_mm2,
+        'ceiling_area_mm2': floor_area_mm2,
+        'perimeter_mm': perimeter_mm,
+        'wall_area_mm2': perimeter_mm * height_mm
+    }
+
+
+# ==============================================================================
+# FIXED-POINT MULTI-ROOM OPTIMIZERS
+# ==============================================================================
+
+def _new_rolls_fixed(need_mm2, coverage):
+    """Whole rolls for a need and the coverage they leave unused, in integer mm²."""
+    new_rolls = ceil_div(need_mm2, coverage)
+    return new_rolls, new_rolls * coverage - need_mm2
+
+
+# sheet_engine's pooling kernel run on integer mm²: exact ceiling division
+# and the floored pattern split
+FIXED_POINT_POOL_ARITHMETIC = {
+    'coverages': {spec_key: coverage_mm2(spec_key) for spec_key in SHEET_SPECS},
+    'new_rolls': _new_rolls_fixed,
+    'ceil_div': ceil_div,
+    'split': split_area_by_pattern
+}
+
+
+def _ceiling_wall_room_fixed(room, has_floor_covering):
+    """Convert one room to integer mm / mm² with its wall sets from an exact perimeter division."""
+    width_mm = int(round(room.get('width_mm', 0)))
+    height_mm = int(round(room.get('height_mm', 0)))
+    perimeter_mm = m_to_mm(room.get('perimeter', 0))
+
+    wall_segment_rolls = room.get('wall_segment_rolls')
+    if wall_segment_rolls is None:
+        if height_mm > 0 and perimeter_mm > 0:
+            wall_combination, wall_1800_pattern, wall_3600_pattern = \
+                calculate_wall_roll_combination_by_dimension(height_mm, has_floor_covering)
+            wall_perimeter_sets = ceil_div(perimeter_mm, ROLL_LENGTH_MM)
+            wall_segment_rolls = (wall_combination, wall_1800_pattern * wall_perimeter_sets,
+                                  wall_3600_pattern * wall_perimeter_sets, wall_perimeter_sets)
+        else:
+            wall_segment_rolls = ([], 0, 0, 0)
+
+    return {
+        'name': room['name'],
+        'ceiling_area': m2_to_mm2(room.get('ceiling_area', 0)),
+        'wall_area': m2_to_mm2(room.get('wall_area', 0)),
+        'width_mm': width_mm,
+        'wall_segment_rolls': wall_segment_rolls
+    }
+
+
+def _floor_room_fixed(room):
+    """Convert one room's floor to integer mm²; length_m carries the rounded mm length, which only gates empty rooms."""
+    return {
+        'name': room['name'],
+        'floor_area': m2_to_mm2(room.get('floor_area', 0)),
+        'width_mm': int(round(room.get('width_mm', 0))),
+        'length_m': m_to_mm(room.get('length_m', 0))
+    }
+
+
+def calculate_optimized_multi_room_ceiling_wall_fixed(rooms_data, has_floor_covering=False, progress_callback=None):
+    """
+    Integer-exact version of calculate_optimized_multi_room_ceiling_wall.
+
+    Room areas are converted once to integer mm², dimensions to integer mm, and
+    the shared pooling kernel then runs on FIXED_POINT_POOL_ARITHMETIC, so every
+    split, pool update and ceiling division is exact integer arithmetic.
+    Results are deterministic across platforms and hash cleanly.
+
+    Args:
+        rooms_data: List of room dictionaries with ceiling_area, wall_area, width_mm, height_mm, perimeter
+        has_floor_covering: Whether floor covering is being calculated (affects wall dimension logic)
+        progress_callback: Optional callable(room_index, room_count, room_name)
+
+    Returns:
+        tuple: (results dict with areas in integer mm², total_rolls_1800, total_rolls_3600)
+    """
+    if not rooms_data:
+        return {}, 0, 0
+
+    results, total_rolls_1800, total_rolls_3600 = calculate_optimized_multi_room_ceiling_wall(
+        [_ceiling_wall_room_fixed(room, has_floor_covering) for room in rooms_data], has_floor_covering,
+        progress_callback, arithmetic=FIXED_POINT_POOL_ARITHMETIC
+    )
+    results['area_unit'] = 'mm2'
+    return results, total_rolls_1800, total_rolls_3600
+
+
+def calculate_optimized_multi_room_floor_fixed(rooms_data, progress_callback=None):
+    """
+    Integer-exact version of calculate_optimized_multi_room_floor.
+
+    Args:
+        rooms_data: List of room dictionaries with floor_area, width_mm, length_m
+        progress_callback: Optional callable(room_index, room_count, room_name)
+
+    Returns:
+        tuple: (results dict with areas in integer mm², total_rolls_1800, total_rolls_3600)
+    """
+    if not rooms_data:
+        return {}, 0, 0
+
+    results, total_rolls_1800_floor, total_rolls_3600_floor = calculate_optimized_multi_room_floor(
+        [_floor_room_fixed(room) for room in rooms_data], progress_callback,
+        arithmetic=FIXED_POINT_POOL_ARITHMETIC
+    )
+    results['area_unit'] = 'mm2'
+    return results, total_rolls_1800_floor, total_rolls_3600_floor
+
+
+def convert_fixed_point_results_to_m2(results):
+    """
+    Return a copy of fixed-point optimizer results with area fields in m².
+
+    The copy has the same shape as the float optimizers' output so the
+    sheets tab can render either engine mode.
+    """
+    if not results or results.get('area_unit') != 'mm2':
+        return results
+
+    def convert(entry):
+        return {
+            key: mm2_to_m2(value) if key in FIXED_POINT_AREA_KEYS else value
+            for key, value in entry.items()
+        }
+
+    converted = convert(results)
+    converted['area_unit'] = 'm2'
+    for list_key in ('room_results', 'floor_room_results'):
+        if list_key in converted:
+            converted[list_key] = [convert(entry) for entry in converted[list_key]]
+    return converted
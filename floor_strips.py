@@ -0,0 +1,214 @@
+from bisect import bisect_left, insort
+
+from sheet_engine import (
+    ROLL_LENGTH,
+    ROLL_WIDTH_1800,
+    ROLL_WIDTH_3600,
+    calculate_floor_rolls_by_length,
+    calculate_roll_combination_by_dimension
+)
+
+
+# ==============================================================================
+# CONSTANTS
+# ==============================================================================
+
+FLOOR_LAYERS = 2
+FLOOR_MARGIN_MM = 600  # Same 0.6m safety margin as calculate_floor_rolls_by_length
+ROLL_LENGTH_MM = ROLL_LENGTH * 1000
+
+
+# ==============================================================================
+# STRIP GENERATION
+# ==============================================================================
+
+def build_floor_strips(rooms_data):
+    """
+    Expand every room into the floor strips that have to be cut.
+
+    Each room needs its width pattern (from calculate_roll_combination_by_dimension)
+    laid in both layers, each strip running the room length plus the 0.6m margin.
+    Lengths are integer millimeters so packing is exact. Strips longer than
+    one roll are split into full-roll pieces plus a remainder.
+
+    Returns:
+        list: Strip dictionaries with room_index, name, width_mm, layer, strip, piece, length_mm
+    """
+    strips = []
+    for room_index, room in enumerate(rooms_data):
+        floor_area = room.get('floor_area', 0)
+        width_mm = room.get('width_mm', 0)
+        length_m = room.get('length_m', 0)
+        if floor_area <= 0 or width_mm <= 0 or length_m <= 0:
+            continue
+
+        _, rolls_1800_per_layer, rolls_3600_per_layer = calculate_roll_combination_by_dimension(width_mm)
+        strip_length_mm = int(round(length_m * 1000)) + FLOOR_MARGIN_MM
+
+        for layer in range(1, FLOOR_LAYERS + 1):
+            strip_number = 0
+            for roll_width, strip_count in ((ROLL_WIDTH_3600, rolls_3600_per_layer), (ROLL_WIDTH_1800, rolls_1800_per_layer)):
+                for _ in range(strip_count):
+                    strip_number += 1
+                    remaining_mm = strip_length_mm
+                    piece = 0
+                    while remaining_mm > 0:
+                        piece += 1
+                        piece_mm = min(remaining_mm, ROLL_LENGTH_MM)
+                        strips.append({
+                            'room_index': room_index,
+                            'name': room['name'],
+                            'width_mm': roll_width,
+                            'layer': layer,
+                            'strip': strip_number,
+                            'piece': piece,
+                            'length_mm': piece_mm
+                        })
+                        remaining_mm -= piece_mm
+    return strips
+
+
+# ==============================================================================
+# ROLL PACKING
+# ==============================================================================
+
+def pack_strips_into_rolls(strips, roll_length_mm=ROLL_LENGTH_MM):
+    """
+    Pack strips of one roll width into rolls with best-fit decreasing.
+
+    Open rolls are kept in a list sorted by remaining length, so choosing the
+    tightest roll that still fits a strip is a bisect.
+
+    Returns:
+        list: Rolls as dicts with roll_number, cuts (strip dicts) and remaining_mm
+    """
+    rolls = []
+    open_rolls = []  # (remaining_mm, roll_number) sorted
+    ordered = sorted(strips, key=lambda strip: (-strip['length_mm'], strip['room_index'], strip['layer'], strip['strip']))
+
+    for strip in ordered:
+        position = bisect_left(open_rolls, (strip['length_mm'], -1))
+        if position < len(open_rolls):
+            remaining_mm, roll_number = open_rolls.pop(position)
+        else:
+            roll_number = len(rolls)
+            rolls.append({'roll_number': roll_number + 1, 'cuts': [], 'remaining_mm': roll_length_mm})
+            remaining_mm = roll_length_mm
+        rolls[roll_number]['cuts'].append(strip)
+        remaining_mm -= strip['length_mm']
+        rolls[roll_number]['remaining_mm'] = remaining_mm
+        if remaining_mm > 0:
+            insort(open_rolls, (remaining_mm, roll_number))
+    return rolls
+
+
+# ==============================================================================
+# FLOOR STRIP PLAN
+# ==============================================================================
+
+def _coverage_area(length_mm, roll_width):
+    """Floor coverage in m² of a length of roll: its sheet area spread over both layers."""
+    return length_mm / 1000 * roll_width / 1000 / FLOOR_LAYERS
+
+
+def calculate_floor_strip_plan(rooms_data, progress_callback=None):
+    """
+    Length-based floor plan: cut lists of strips packed into 50m rolls across rooms.
+
+    Replaces the area-ratio split of calculate_optimized_multi_room_floor with
+    the actual running meters per layer. Returns the same shape as the floor
+    optimizer, so the sheets tab renders either method. Per room, a roll is
+    counted as new for the room whose strip opened it; strips cut from rolls
+    opened by other rooms are reported as leftover use. Leftover areas are
+    coverage m² like the area-ratio model (sheet area over FLOOR_LAYERS, so
+    a 50m 1800mm roll is 36 m²), and the two methods can be mixed freely.
+
+    Args:
+        rooms_data: List of room dictionaries with floor_area, width_mm, length_m
+        progress_callback: Optional callable(room_index, room_count, room_name)
+
+    Returns:
+        tuple: (results dict with floor_room_results and cut_lists, total_rolls_1800, total_rolls_3600)
+    """
+    if not rooms_data:
+        return {}, 0, 0
+
+    strips = build_floor_strips(rooms_data)
+    rolls_by_width = {
+        roll_width: pack_strips_into_rolls([strip for strip in strips if strip['width_mm'] == roll_width])
+        for roll_width in (ROLL_WIDTH_1800, ROLL_WIDTH_3600)
+    }
+
+    # Attribute each roll to the room of its first cut; other rooms' cuts use its leftover
+    opened = {}
+    shared_area = {}
+    for roll_width, rolls in rolls_by_width.items():
+        for roll in rolls:
+            opener = roll['cuts'][0]['room_index']
+            opened[(opener, roll_width)] = opened.get((opener, roll_width), 0) + 1
+            for cut in roll['cuts'][1:]:
+                if cut['room_index'] != opener:
+                    key = (cut['room_index'], roll_width)
+                    shared_area[key] = shared_area.get(key, 0) + _coverage_area(cut['length_mm'], roll_width)
+
+    floor_room_results = []
+    for room_index, room in enumerate(rooms_data):
+        if progress_callback is not None:
+            progress_callback(room_index, len(rooms_data), room['name'])
+        floor_area = room.get('floor_area', 0)
+        width_mm = room.get('width_mm', 0)
+        length_m = room.get('length_m', 0)
+        if floor_area <= 0 or width_mm <= 0 or length_m <= 0:
+            continue
+
+        combination, standalone_1800, standalone_3600 = calculate_floor_rolls_by_length(width_mm, length_m)
+        new_floor_1800_rolls = opened.get((room_index, ROLL_WIDTH_1800), 0)
+        new_floor_3600_rolls = opened.get((room_index, ROLL_WIDTH_3600), 0)
+        floor_room_results.append({
+            'name': room['name'],
+            'floor_1800_from_leftover': shared_area.get((room_index, ROLL_WIDTH_1800), 0),
+            'floor_3600_from_leftover': shared_area.get((room_index, ROLL_WIDTH_3600), 0),
+            'new_floor_1800_rolls': new_floor_1800_rolls,
+            'new_floor_3600_rolls': new_floor_3600_rolls,
+            'room_total_1800': new_floor_1800_rolls,
+            'room_total_3600': new_floor_3600_rolls,
+            'standalone_1800_rolls': standalone_1800,
+            'standalone_3600_rolls': standalone_3600,
+            'strip_length_m': length_m + FLOOR_MARGIN_MM / 1000,
+            'floor_combination': combination
+        })
+
+    total_rolls_1800_floor = len(rolls_by_width[ROLL_WIDTH_1800])
+    total_rolls_3600_floor = len(rolls_by_width[ROLL_WIDTH_3600])
+
+    cut_lists = []
+    for roll_width, rolls in rolls_by_width.items():
+        for roll in rolls:
+            cut_lists.append({
+                'roll': f"{roll_width}mm #{roll['roll_number']}",
+                'width_mm': roll_width,
+                'cuts': [
+                    {
+                        'name': cut['name'],
+                        'layer': cut['layer'],
+                        'strip': cut['strip'],
+                        'piece': cut['piece'],
+                        'length_m': cut['length_mm'] / 1000
+                    }
+                    for cut in roll['cuts']
+                ],
+                'remaining_m': roll['remaining_mm'] / 1000
+            })
+
+    def leftover_area(roll_width):
+        return _coverage_area(sum(roll['remaining_mm'] for roll in rolls_by_width[roll_width]), roll_width)
+
+    return {
+        'floor_room_results': floor_room_results,
+        'total_rolls_1800_floor': total_rolls_1800_floor,
+        'total_rolls_3600_floor': total_rolls_3600_floor,
+        'final_leftover_1800_floor': leftover_area(ROLL_WIDTH_1800),
+        'final_leftover_3600_floor': leftover_area(ROLL_WIDTH_3600),
+        'cut_lists': cut_lists,
+        'floor_method': 'strips'
+    }, total_rolls_1800_floor, total_rolls_3600_floor
@@ -0,0 +1,258 @@
+import math
+
+from sheet_engine import (
+    SHEET_SPECS,
+    calculate_roll_combination_by_dimension,
+    calculate_wall_rolls_by_height,
+    pool_ceiling_wall_steps,
+    split_area_by_pattern
+)
+
+
+# ==============================================================================
+# CONSTANTS
+# ==============================================================================
+
+# Cycle detection keeps at most this many pool states per run of identical floors
+TEMPLATE_CYCLE_MEMO_SIZE = 4096
+
+# Pool states are compared on this grid: float sums of the same needs drift in the last bits,
+# so a pool that returns to a state in exact arithmetic never repeats bit for bit
+TEMPLATE_CYCLE_QUANTUM_M2 = 1e-9
+
+# Closed-form floor covering totals can differ from the room-by-room float
+# optimizers by this many rolls per width (see repeat_single_pool)
+CLOSED_FORM_FLOOR_TOLERANCE_ROLLS = 1
+
+
+# ==============================================================================
+# FLOOR SEQUENCE
+# ==============================================================================
+
+def expand_floor_runs(templates):
+    """
+    Turn floor templates into runs of identical consecutive floors.
+
+    Each template is {'name', 'rooms', 'repeat', 'overrides'}, where overrides
+    maps a 1-based repeat number to the room list of that floor. Floors that
+    are not overridden use the template rooms; consecutive floors with the
+    same room list form one run.
+
+    Returns:
+        list: Runs as dicts with name, first_floor, floors and rooms
+    """
+    runs = []
+    floor_number = 0
+    for template in templates:
+        overrides = template.get('overrides') or {}
+        for repeat_number in range(1, int(template.get('repeat', 1)) + 1):
+            floor_number += 1
+            rooms = overrides.get(repeat_number, template['rooms'])
+            overridden = repeat_number in overrides
+            if runs and runs[-1]['rooms'] is rooms and not overridden and not runs[-1]['overridden']:
+                runs[-1]['floors'] += 1
+                continue
+            runs.append({
+                'name': f"{template['name']} ({repeat_number}階目 変更)" if overridden else template['name'],
+                'first_floor': floor_number,
+                'floors': 1,
+                'rooms': rooms,
+                'overridden': overridden
+            })
+    return runs
+
+
+# ==============================================================================
+# TEMPLATE COMPILATION
+# ==============================================================================
+
+def compile_floor(rooms, has_floor_covering=False):
+    """
+    Precompute everything about one distinct floor that does not depend on the pools.
+
+    Patterns and area splits are looked up once per room, exactly as the
+    mixed-width optimizers compute them, so repeating the floor only costs
+    the pool arithmetic.
+
+    Returns:
+        dict: ceiling_wall_steps (per room needs and wall patterns) and
+              floor_need_1800 / floor_need_3600 (m² of 0.15mm coverage)
+    """
+    ceiling_wall_steps = []
+    floor_need_1800 = 0
+    floor_need_3600 = 0
+
+    for room in rooms:
+        ceiling_area = room.get('ceiling_area', 0)
+        wall_area = room.get('wall_area', 0)
+        floor_area = room.get('floor_area', 0)
+        width_mm = room.get('width_mm', 0)
+        height_mm = room.get('height_mm', 0)
+        length_m = room.get('length_m', 0)
+        perimeter = room.get('perimeter', 0)
+
+        _, pattern_1800, pattern_3600 = calculate_roll_combination_by_dimension(width_mm) if width_mm > 0 else ([], 0, 0)
+
+        if ceiling_area > 0 or wall_area > 0:
+            ceiling_1800_needed, ceiling_3600_needed = split_area_by_pattern(ceiling_area, pattern_1800, pattern_3600)
+            if room.get('wall_segment_rolls') is not None:
+                _, wall_1800, wall_3600, _ = room['wall_segment_rolls']
+            elif height_mm > 0 and perimeter > 0:
+                _, wall_1800, wall_3600, _ = calculate_wall_rolls_by_height(height_mm, perimeter, has_floor_covering)
+            else:
+                wall_1800, wall_3600 = 0, 0
+            ceiling_wall_steps.append((ceiling_1800_needed, ceiling_3600_needed, wall_area, wall_1800, wall_3600))
+
+        if floor_area > 0 and width_mm > 0 and length_m > 0:
+            need_1800, need_3600 = split_area_by_pattern(floor_area, pattern_1800, pattern_3600)
+            floor_need_1800 += need_1800
+            floor_need_3600 += need_3600
+
+    return {
+        'room_count': len(rooms),
+        'ceiling_wall_steps': ceiling_wall_steps,
+        'floor_need_1800': floor_need_1800,
+        'floor_need_3600': floor_need_3600
+    }
+
+
+# ==============================================================================
+# POOLED REPEATS
+# ==============================================================================
+
+def repeat_ceiling_wall_steps(steps, floors, leftover_1800, leftover_3600):
+    """
+    Pool a run of identical floors, jumping ahead once the pool state cycles.
+
+    States are compared after rounding to TEMPLATE_CYCLE_QUANTUM_M2. Rooms
+    with round dimensions return to a state within a few hundred floors;
+    needs with long periods simply replay every floor.
+
+    Returns:
+        tuple: (leftover_1800, leftover_3600, rolls_1800, rolls_3600, floors_simulated)
+    """
+    rolls_1800 = 0
+    rolls_3600 = 0
+    seen = {}
+    floor = 0
+    while floor < floors:
+        state = (round(leftover_1800 / TEMPLATE_CYCLE_QUANTUM_M2), round(leftover_3600 / TEMPLATE_CYCLE_QUANTUM_M2))
+        if state in seen:
+            # Pools repeat: every cycle of floors buys the same rolls
+            cycle_start, rolls_1800_at_start, rolls_3600_at_start = seen[state]
+            cycle_length = floor - cycle_start
+            cycles = (floors - floor) // cycle_length
+            rolls_1800 += cycles * (rolls_1800 - rolls_1800_at_start)
+            rolls_3600 += cycles * (rolls_3600 - rolls_3600_at_start)
+            remaining = floors - floor - cycles * cycle_length
+            for _ in range(remaining):
+                leftover_1800, leftover_3600, floor_1800, floor_3600 = pool_ceiling_wall_steps(steps, leftover_1800, leftover_3600)
+                rolls_1800 += floor_1800
+                rolls_3600 += floor_3600
+            return leftover_1800, leftover_3600, rolls_1800, rolls_3600, floor + remaining
+        if len(seen) < TEMPLATE_CYCLE_MEMO_SIZE:
+            seen[state] = (floor, rolls_1800, rolls_3600)
+        leftover_1800, leftover_3600, floor_1800, floor_3600 = pool_ceiling_wall_steps(steps, leftover_1800, leftover_3600)
+        rolls_1800 += floor_1800
+        rolls_3600 += floor_3600
+        floor += 1
+    return leftover_1800, leftover_3600, rolls_1800, rolls_3600, floor
+
+
+def repeat_single_pool(need_per_floor, floors, leftover, coverage):
+    """
+    Closed form for one floor-covering pool over a run of identical floors.
+
+    A pool that is always drawn before buying holds less than one roll after
+    every purchase, so over the run it buys exactly enough rolls to cover
+    the run's total need minus what was in the pool.
+
+    This is the exact count, the one the fixed-point engine gives. The float
+    optimizers add the needs up room by room and drift by ~1e-12 m², so when
+    the run's need lands on a whole number of rolls their count can be one
+    roll higher or lower (CLOSED_FORM_FLOOR_TOLERANCE_ROLLS).
+
+    Returns:
+        tuple: (leftover, rolls)
+    """
+    total_need = need_per_floor * floors
+    if total_need <= leftover:
+        return leftover - total_need, 0
+    rolls = math.ceil((total_need - leftover) / coverage)
+    return leftover + rolls * coverage - total_need, rolls
+
+
+def calculate_floor_template_plan(templates, has_floor_covering=False):
+    """
+    Optimize a building described by typical-floor templates without expanding every room.
+
+    Each distinct floor is compiled once. Floor covering (0.15mm) pools are
+    single-width streams and are extended over each run in closed form.
+    Ceiling/wall pools are carried floor by floor from the compiled needs,
+    with no pattern lookups, and a run jumps ahead as soon as its pool state
+    repeats.
+
+    Against the float optimizers on the expanded building, ceiling/wall
+    totals match and each floor total is within
+    CLOSED_FORM_FLOOR_TOLERANCE_ROLLS (the closed form is exact, the float
+    sum is not).
+
+    Args:
+        templates: List of {'name', 'rooms', 'repeat', 'overrides'} in building order
+        has_floor_covering: Whether floor covering is being calculated (affects wall patterns)
+
+    Returns:
+        dict: Per-run results, building totals, final leftovers and work counters
+    """
+    coverage_1800_floor = SHEET_SPECS['floor_thin']['actual_coverage']
+    coverage_3600_floor = SHEET_SPECS['floor_wide']['actual_coverage']
+
+    runs = expand_floor_runs(templates)
+    compiled = {}
+    leftover_1800 = leftover_3600 = 0
+    leftover_1800_floor = leftover_3600_floor = 0
+    run_results = []
+    floors_simulated = 0
+
+    for run in runs:
+        if id(run['rooms']) not in compiled:
+            compiled[id(run['rooms'])] = compile_floor(run['rooms'], has_floor_covering)
+        program = compiled[id(run['rooms'])]
+
+        leftover_1800, leftover_3600, cw_1800, cw_3600, simulated = repeat_ceiling_wall_steps(
+            program['ceiling_wall_steps'], run['floors'], leftover_1800, leftover_3600
+        )
+        floors_simulated += simulated
+        leftover_1800_floor, floor_1800 = repeat_single_pool(
+            program['floor_need_1800'], run['floors'], leftover_1800_floor, coverage_1800_floor
+        )
+        leftover_3600_floor, floor_3600 = repeat_single_pool(
+            program['floor_need_3600'], run['floors'], leftover_3600_floor, coverage_3600_floor
+        )
+
+        run_results.append({
+            'name': run['name'],
+            'first_floor': run['first_floor'],
+            'floors': run['floors'],
+            'rooms_per_floor': program['room_count'],
+            'cw_1800': cw_1800,
+            'cw_3600': cw_3600,
+            'floor_1800': floor_1800,
+            'floor_3600': floor_3600
+        })
+
+    return {
+        'runs': run_results,
+        'total_floors': sum(run['floors'] for run in runs),
+        'total_rooms': sum(run['floors'] * len(run['rooms']) for run in runs),
+        'distinct_floors': len(compiled),
+        'floors_simulated': floors_simulated,
+        'total_cw_1800': sum(run['cw_1800'] for run in run_results),
+        'total_cw_3600': sum(run['cw_3600'] for run in run_results),
+        'total_floor_1800': sum(run['floor_1800'] for run in run_results),
+        'total_floor_3600': sum(run['floor_3600'] for run in run_results),
+        'final_leftover_1800': leftover_1800,
+        'final_leftover_3600': leftover_3600,
+        'final_leftover_1800_floor': leftover_1800_floor,
+        'final_leftover_3600_floor': leftover_3600_floor
+    }
@@ -0,0 +1,225 @@
+import itertools
+from bisect import bisect_left, insort
+
+from sheet_engine import (
+    SHEET_SPECS,
+    calculate_optimized_multi_room_ceiling_wall,
+    calculate_optimized_multi_room_floor
+)
+
+
+# ==============================================================================
+# CONSTANTS
+# ==============================================================================
+
+# (width_mm, thickness_mm) -> SHEET_SPECS key whose coverage applies to that stock
+STOCK_SPEC_KEYS = {
+    (1800, 0.1): 'ceiling_thin',
+    (3600, 0.1): 'ceiling_wide',
+    (1800, 0.15): 'floor_thin',
+    (3600, 0.15): 'floor_wide'
+}
+
+# Pieces shorter than this are treated as used up
+MIN_STOCK_LENGTH_M = 0.01
+
+
+# ==============================================================================
+# HELPER FUNCTIONS
+# ==============================================================================
+
+def stock_coverage_per_m(width_mm, thickness_mm):
+    """Actual coverage (m²) provided by one running meter of a stock roll class."""
+    spec = SHEET_SPECS[STOCK_SPEC_KEYS[(width_mm, thickness_mm)]]
+    return spec['actual_coverage'] / spec['length_m']
+
+
+# ==============================================================================
+# ROLL INVENTORY
+# ==============================================================================
+
+class RollInventory:
+    """
+    Warehouse stock of partly used rolls, indexed by width and thickness.
+
+    Each (width_mm, thickness_mm) class keeps a list of (remaining_length_m,
+    piece_id) sorted by length, so best-fit lookups are a bisect and inserts
+    and removals stay cheap with thousands of pieces.
+    """
+
+    def __init__(self, pieces=()):
+        self._index = {key: [] for key in STOCK_SPEC_KEYS}
+        self._pieces = {}
+        self._id_counter = itertools.count(1)
+        for piece in pieces:
+            self.add_piece(piece['width_mm'], piece['thickness_mm'], piece['remaining_length_m'], piece.get('piece_id'))
+
+    def add_piece(self, width_mm, thickness_mm, remaining_length_m, piece_id=None):
+        """Add a stock piece and return its id."""
+        key = (int(width_mm), float(thickness_mm))
+        if key not in self._index:
+            raise ValueError(f"Unsupported stock roll: {width_mm}mm × {thickness_mm}mm")
+        if remaining_length_m < MIN_STOCK_LENGTH_M:
+            return None
+        if piece_id is None:
+            piece_id = f"S{next(self._id_counter):05d}"
+        piece_id = str(piece_id)
+        if piece_id in self._pieces:
+            raise ValueError(f"Duplicate stock piece id: {piece_id}")
+        self._pieces[piece_id] = {
+            'piece_id': piece_id,
+            'width_mm': key[0],
+            'thickness_mm': key[1],
+            'remaining_length_m': remaining_length_m
+        }
+        insort(self._index[key], (remaining_length_m, piece_id))
+        return piece_id
+
+    def remove_piece(self, piece_id):
+        piece = self._pieces.pop(piece_id)
+        entries = self._index[(piece['width_mm'], piece['thickness_mm'])]
+        del entries[bisect_left(entries, (piece['remaining_length_m'], piece_id))]
+        return piece
+
+    def pieces(self):
+        """All pieces as dictionaries, sorted by class and length."""
+        return [self._pieces[piece_id] for key in STOCK_SPEC_KEYS for _, piece_id in self._index[key]]
+
+    def __len__(self):
+        return len(self._pieces)
+
+    def total_length_m(self, width_mm, thickness_mm):
+        return sum(length for length, _ in self._index[(width_mm, thickness_mm)])
+
+    def total_coverage(self, width_mm, thickness_mm):
+        """Total actual coverage (m²) of a stock class."""
+        return self.total_length_m(width_mm, thickness_mm) * stock_coverage_per_m(width_mm, thickness_mm)
+
+    def best_fit(self, width_mm, thickness_mm, length_needed_m):
+        """Return the id of the shortest piece with at least length_needed_m, or None."""
+        entries = self._index[(width_mm, thickness_mm)]
+        position = bisect_left(entries, (length_needed_m, ''))
+        if position == len(entries):
+            return None
+        return entries[position][1]
+
+    def longest(self, width_mm, thickness_mm):
+        entries = self._index[(width_mm, thickness_mm)]
+        return entries[-1][1] if entries else None
+
+    def select_pieces(self, width_mm, thickness_mm, length_needed_m):
+        """
+        Choose pieces that together provide length_needed_m, without modifying stock.
+
+        Best fit first: the shortest piece that covers the remaining need; if
+        none is long enough, the longest piece is pulled and the search repeats.
+
+        Returns:
+            list: Pull dictionaries (piece fields plus length_used_m)
+        """
+        entries = list(self._index[(width_mm, thickness_mm)])
+        pulls = []
+        remaining = length_needed_m
+        while remaining > MIN_STOCK_LENGTH_M and entries:
+            position = bisect_left(entries, (remaining, ''))
+            if position == len(entries):
+                position = len(entries) - 1
+            length, piece_id = entries.pop(position)
+            used = min(length, remaining)
+            pulls.append({**self._pieces[piece_id], 'length_used_m': used})
+            remaining -= used
+        return pulls
+
+    def consume(self, pulls):
+        """Shorten (or remove) pulled pieces after an order has been placed."""
+        for pull in pulls:
+            piece = self.remove_piece(pull['piece_id'])
+            remaining = piece['remaining_length_m'] - pull['length_used_m']
+            if remaining >= MIN_STOCK_LENGTH_M:
+                self.add_piece(piece['width_mm'], piece['thickness_mm'], remaining, piece['piece_id'])
+
+
+# ==============================================================================
+# INVENTORY-AWARE OPTIMIZATION
+# ==============================================================================
+
+def _stock_pulls_for(inventory, width_mm, thickness_mm, initial_coverage, consumed_coverage):
+    # Stock is drawn before new rolls, so it covers pool consumption first
+    used_coverage = min(initial_coverage, consumed_coverage)
+    if used_coverage <= 0:
+        return []
+    return inventory.select_pieces(width_mm, thickness_mm, used_coverage / stock_coverage_per_m(width_mm, thickness_mm))
+
+
+def calculate_optimized_multi_room_with_inventory(rooms_data, inventory, include_floor_calc=True):
+    """
+    Run the mixed-width optimizers with warehouse stock seeded into the leftover pools.
+
+    Stock coverage per width and thickness starts in the matching global
+    leftover pool, so rooms draw from stock before new rolls are bought.
+    Stock consumption is read back from the per-room leftover usage and
+    turned into a best-fit pull list.
+
+    Args:
+        rooms_data: Surface-filtered room dictionaries
+        inventory: RollInventory with the available stock
+        include_floor_calc: Whether floor rolls are calculated
+
+    Returns:
+        dict: Optimizer results with stock, stock_pulls, new roll totals and rolls_saved
+    """
+    stock_1800_thin = inventory.total_coverage(1800, 0.1)
+    stock_3600_thin = inventory.total_coverage(3600, 0.1)
+    stock_1800_floor = inventory.total_coverage(1800, 0.15)
+    stock_3600_floor = inventory.total_coverage(3600, 0.15)
+
+    ceiling_wall_results, total_cw_1800, total_cw_3600 = calculate_optimized_multi_room_ceiling_wall(
+        rooms_data, include_floor_calc,
+        initial_leftover_1800=stock_1800_thin,
+        initial_leftover_3600=stock_3600_thin
+    )
+    _, baseline_cw_1800, baseline_cw_3600 = calculate_optimized_multi_room_ceiling_wall(rooms_data, include_floor_calc)
+
+    room_results = ceiling_wall_results.get('room_results', [])
+    consumed_1800 = sum(r['ceiling_1800_from_leftover'] + r['wall_1800_from_leftover'] for r in room_results)
+    consumed_3600 = sum(r['ceiling_3600_from_leftover'] + r['wall_3600_from_leftover'] for r in room_results)
+
+    stock_pulls = (
+        _stock_pulls_for(inventory, 1800, 0.1, stock_1800_thin, consumed_1800) +
+        _stock_pulls_for(inventory, 3600, 0.1, stock_3600_thin, consumed_3600)
+    )
+
+    floor_results = {}
+    total_floor_1800 = total_floor_3600 = 0
+    baseline_floor_1800 = baseline_floor_3600 = 0
+    if include_floor_calc:
+        floor_results, total_floor_1800, total_floor_3600 = calculate_optimized_multi_room_floor(
+            rooms_data,
+            initial_leftover_1800_floor=stock_1800_floor,
+            initial_leftover_3600_floor=stock_3600_floor
+        )
+        _, baseline_floor_1800, baseline_floor_3600 = calculate_optimized_multi_room_floor(rooms_data)
+
+        floor_room_results = floor_results.get('floor_room_results', [])
+        consumed_floor_1800 = sum(r['floor_1800_from_leftover'] for r in floor_room_results)
+        consumed_floor_3600 = sum(r['floor_3600_from_leftover'] for r in floor_room_results)
+        stock_pulls += (
+            _stock_pulls_for(inventory, 1800, 0.15, stock_1800_floor, consumed_floor_1800) +
+            _stock_pulls_for(inventory, 3600, 0.15, stock_3600_floor, consumed_floor_3600)
+        )
+
+    new_rolls_total = total_cw_1800 + total_cw_3600 + total_floor_1800 + total_floor_3600
+    baseline_total = baseline_cw_1800 + baseline_cw_3600 + baseline_floor_1800 + baseline_floor_3600
+
+    return {
+        'ceiling_wall_results': ceiling_wall_results,
+        'floor_results': floor_results,
+        'total_cw_1800': total_cw_1800,
+        'total_cw_3600': total_cw_3600,
+        'total_floor_1800': total_floor_1800,
+        'total_floor_3600': total_floor_3600,
+        'stock_pulls': stock_pulls,
+        'new_rolls_total': new_rolls_total,
+        'baseline_rolls_total': baseline_total,
+        'rolls_saved': baseline_total - new_rolls_total
+    }
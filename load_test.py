@@ -0,0 +1,222 @@
+"""
+Load test: many concurrent headless sessions of app.py driven through AppTest.
+
+Usage:
+    python load_test.py [--sessions 1,4,16] [--rooms 10,100,500] [--typed-rooms N] [--seed N]
+
+Every session of a run behaves like a user: it opens the app, adds and
+types a few rooms in the multi-room tab, loads the rest of its project,
+imports the rooms into the sheets tab and runs the optimization until the
+result is shown. AppTest installs a process-global mock runtime for each
+run, so concurrent sessions cannot share a process: every session runs in
+its own worker process. They still share the on-disk result cache, but
+each has its own cache_resource executors and pattern tables, so the peak
+RSS reported is that of one session process (the per-process baseline
+plus one session), not of a whole deployment.
+
+For every (room count, session count) pair the report lists rerun latency
+percentiles per step, the mean session_state footprint and the process
+peak RSS. The exit status is 1 when any session failed or timed out.
+"""
+
+import argparse
+import os
+import resource
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from streamlit.testing.v1 import AppTest
+
+from background_jobs import JOB_STATUS_DONE
+from memory_footprint import format_bytes, session_memory_report
+
+
+# ==============================================================================
+# CONSTANTS
+# ==============================================================================
+
+APP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'app.py')
+
+SESSION_COUNTS_DEFAULT = '1,4,16'
+ROOM_COUNTS_DEFAULT = '10,100,500'
+
+# Rooms entered through the widgets; the rest of a project is loaded in bulk
+TYPED_ROOMS_DEFAULT = 2
+
+# Per-rerun timeout; the optimize step waits for the background job inside one run
+RERUN_TIMEOUT_S = 600
+
+LATENCY_PERCENTILES = (50, 95, 99)
+
+STEP_LOAD = 'load'
+STEP_ADD_ROOM = 'add room'
+STEP_TYPE_DIMENSION = 'type dimension'
+STEP_BULK_ROOMS = 'bulk rooms'
+STEP_IMPORT = 'import'
+STEP_OPTIMIZE = 'optimize'
+SESSION_STEPS = (STEP_LOAD, STEP_ADD_ROOM, STEP_TYPE_DIMENSION, STEP_BULK_ROOMS, STEP_IMPORT, STEP_OPTIMIZE)
+
+
+# ==============================================================================
+# SESSION SCENARIO
+# ==============================================================================
+
+def generate_project_rooms(rng, room_count):
+    """Rooms in the multi-room tab's session format, with realistic dimensions in m."""
+    return [
+        {
+            'name': f'部屋 {index + 1}',
+            'length': round(float(rng.uniform(2.0, 12.0)), 2),
+            'width': round(float(rng.uniform(2.0, 9.0)), 2),
+            'height': round(float(rng.uniform(2.2, 3.5)), 2)
+        }
+        for index in range(room_count)
+    ]
+
+
+def peak_rss_bytes():
+    """Peak resident set size of this process (ru_maxrss is KiB on Linux, bytes on macOS)."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def _find_button(app_test, label_part):
+    return next(button for button in app_test.button if label_part in button.label)
+
+
+def _timed_run(latencies, step, action):
+    started_at = time.perf_counter()
+    app_test = action()
+    latencies.setdefault(step, []).append(time.perf_counter() - started_at)
+    if app_test.exception:
+        raise RuntimeError(f"{step}: {app_test.exception[0].message}")
+    return app_test
+
+
+def run_session(project_rooms, typed_rooms=TYPED_ROOMS_DEFAULT, timeout_s=RERUN_TIMEOUT_S):
+    """
+    Drive one user session through the room, import and optimization steps.
+
+    Args:
+        project_rooms: Rooms of the session's project (generate_project_rooms)
+        typed_rooms: Rooms added and typed through the widgets before the bulk load
+        timeout_s: Timeout of a single rerun
+
+    Returns:
+        dict: latencies (step -> list of seconds), session_bytes, peak_rss_bytes, error (None on success)
+    """
+    latencies = {}
+    app_test = AppTest.from_file(APP_PATH, default_timeout=timeout_s)
+    try:
+        _timed_run(latencies, STEP_LOAD, app_test.run)
+
+        typed_rooms = max(1, min(typed_rooms, len(project_rooms)))
+        for _ in range(typed_rooms - 1):
+            _timed_run(latencies, STEP_ADD_ROOM, _find_button(app_test, '部屋を追加').click().run)
+        for index, room in enumerate(project_rooms[:typed_rooms]):
+            app_test.text_input(key=f'name_{index}').set_value(room['name'])
+            for dimension in ('length', 'width', 'height'):
+                _timed_run(latencies, STEP_TYPE_DIMENSION,
+                           app_test.number_input(key=f'{dimension}_{index}').set_value(room[dimension]).run)
+
+        # The rest of the project arrives at once, like a pasted room list
+        app_test.session_state['rooms'] = list(app_test.session_state['rooms']) + [
+            dict(room) for room in project_rooms[typed_rooms:]
+        ]
+        _timed_run(latencies, STEP_BULK_ROOMS, app_test.run)
+
+        _timed_run(latencies, STEP_IMPORT, _find_button(app_test, '多室データを取り込み').click().run)
+        # The app polls the background job with st.rerun, so this run returns with the result shown
+        _timed_run(latencies, STEP_OPTIMIZE, _find_button(app_test, '最適化ロール要件を計算').click().run)
+
+        optimization_job = app_test.session_state['optimization_job']
+        if optimization_job.status != JOB_STATUS_DONE:
+            raise RuntimeError(f"optimization job ended as {optimization_job.status}")
+        error = None
+    except Exception as session_error:
+        error = f"{type(session_error).__name__}: {session_error}"
+
+    session_bytes = session_memory_report(app_test.session_state.items())['total_bytes']
+    return {'latencies': latencies, 'session_bytes': session_bytes, 'peak_rss_bytes': peak_rss_bytes(), 'error': error}
+
+
+# ==============================================================================
+# LOAD TEST
+# ==============================================================================
+
+def run_load_level(rng, room_count, session_count, typed_rooms=TYPED_ROOMS_DEFAULT):
+    """
+    Run session_count concurrent sessions with distinct projects of room_count rooms.
+
+    Projects differ per session so the shared result cache does not hide the engine work.
+
+    Returns:
+        dict: Report row for this (room_count, session_count) pair
+    """
+    projects = [generate_project_rooms(rng, room_count) for _ in range(session_count)]
+    started_at = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=session_count) as executor:
+        sessions = list(executor.map(run_session, projects, [typed_rooms] * session_count))
+    wall_s = time.perf_counter() - started_at
+
+    latency_percentiles = {}
+    for step in SESSION_STEPS:
+        step_latencies = [latency for session in sessions for latency in session['latencies'].get(step, [])]
+        if step_latencies:
+            latency_percentiles[step] = [float(np.percentile(step_latencies, p)) for p in LATENCY_PERCENTILES]
+
+    return {
+        'rooms': room_count,
+        'sessions': session_count,
+        'failures': [session['error'] for session in sessions if session['error']],
+        'latency_percentiles': latency_percentiles,
+        'mean_session_bytes': sum(session['session_bytes'] for session in sessions) / session_count,
+        'peak_rss_bytes': max(session['peak_rss_bytes'] for session in sessions),
+        'wall_s': wall_s
+    }
+
+
+def print_report(rows):
+    percentile_header = ' '.join(f"{'p' + str(p):>8}" for p in LATENCY_PERCENTILES)
+    for row in rows:
+        print(
+            f"rooms={row['rooms']} sessions={row['sessions']} wall={row['wall_s']:.1f}s "
+            f"failures={len(row['failures'])} session_state={format_bytes(row['mean_session_bytes'])} "
+            f"peak_rss={format_bytes(row['peak_rss_bytes'])}"
+        )
+        print(f"    {'step (rerun s)':<16} {percentile_header}")
+        for step, percentiles in row['latency_percentiles'].items():
+            print(f"    {step:<16} " + ' '.join(f"{value:>8.3f}" for value in percentiles))
+        for failure in row['failures'][:3]:
+            print(f"    failure: {failure}")
+
+
+def _int_list(text):
+    return [int(part) for part in text.split(',') if part.strip()]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Drive concurrent headless sessions of app.py and report latency.")
+    parser.add_argument('--sessions', type=_int_list, default=_int_list(SESSION_COUNTS_DEFAULT),
+                        help="comma-separated concurrent session counts (default: %(default)s)")
+    parser.add_argument('--rooms', type=_int_list, default=_int_list(ROOM_COUNTS_DEFAULT),
+                        help="comma-separated rooms per project (default: %(default)s)")
+    parser.add_argument('--typed-rooms', type=int, default=TYPED_ROOMS_DEFAULT,
+                        help="rooms entered through the widgets per session (default: %(default)s)")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(args.seed)
+    rows = []
+    for room_count in args.rooms:
+        for session_count in args.sessions:
+            rows.append(run_load_level(rng, room_count, session_count, args.typed_rooms))
+            print_report(rows[-1:])
+            sys.stdout.flush()
+    return 1 if any(row['failures'] for row in rows) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
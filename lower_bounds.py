@@ -0,0 +1,151 @@
+import math
+
+import numpy as np
+
+from breakpoints import get_ceiling_floor_breakpoint_index
+from sheet_engine import ROLL_LENGTH, SHEET_SPECS
+
+
+# ==============================================================================
+# CONSTANTS
+# ==============================================================================
+
+# Summing areas in another order can move a float total across a roll boundary; the bound stays below it
+LOWER_BOUND_SLACK_M2 = 1e-6
+
+
+# ==============================================================================
+# LOWER BOUNDS
+# ==============================================================================
+
+def _rolls_at_least(need, coverage):
+    return max(math.ceil((need - LOWER_BOUND_SLACK_M2) / coverage), 0)
+
+
+def _pattern_needs(rooms_data, area_key, require_length=False):
+    """Total 1800mm / 3600mm coverage needs of area_key, split by each room's width pattern."""
+    if not rooms_data:
+        return 0.0, 0.0
+    width_mm = np.array([room.get('width_mm', 0) for room in rooms_data], dtype=np.float64)
+    area = np.array([room.get(area_key, 0) for room in rooms_data], dtype=np.float64)
+    patterns = get_ceiling_floor_breakpoint_index().lookup_many(width_mm)
+    total_pattern_units = patterns.sum(axis=1)
+
+    use = (area > 0) & (width_mm > 0) & (total_pattern_units > 0)
+    if require_length:
+        use &= np.array([room.get('length_m', 0) > 0 for room in rooms_data])
+    units = np.where(use, total_pattern_units, 1)
+    return (
+        float(np.sum(np.where(use, area * (patterns[:, 0] / units), 0.0))),
+        float(np.sum(np.where(use, area * (patterns[:, 1] / units), 0.0)))
+    )
+
+
+def ceiling_wall_lower_bound(rooms_data):
+    """
+    Fewest 0.1mm rolls any pooling of these rooms' ceilings and walls can buy.
+
+    Ceiling coverage is bound to a roll width by each room's width pattern,
+    so each width needs at least its ceiling share. Walls may use either
+    width; the bound lets them fill the rounding slack of the 1800mm rolls
+    and then the wider 3600mm rolls, which cover the most per roll. Wall
+    set patterns and leftover order are relaxed, so no plan can go below it.
+
+    Args:
+        rooms_data: Surface-filtered room dictionaries (as passed to the optimizers)
+
+    Returns:
+        dict: lower_bound, rolls_1800 and rolls_3600 of the bound
+    """
+    coverage_1800 = SHEET_SPECS['ceiling_thin']['actual_coverage']
+    coverage_3600 = SHEET_SPECS['ceiling_wide']['actual_coverage']
+    need_1800, need_3600 = _pattern_needs(rooms_data, 'ceiling_area')
+    wall_area = sum(room.get('wall_area', 0) for room in rooms_data if room.get('wall_area', 0) > 0)
+
+    rolls_1800 = _rolls_at_least(need_1800, coverage_1800)
+    remaining_need = need_1800 + need_3600 + wall_area - rolls_1800 * coverage_1800
+    rolls_3600 = max(_rolls_at_least(need_3600, coverage_3600), _rolls_at_least(remaining_need, coverage_3600))
+    return {'lower_bound': rolls_1800 + rolls_3600, 'rolls_1800': rolls_1800, 'rolls_3600': rolls_3600}
+
+
+def floor_lower_bound(rooms_data):
+    """
+    Fewest 0.15mm rolls the area-ratio floor model can buy: each width's total need over its coverage.
+
+    Returns:
+        dict: lower_bound, rolls_1800 and rolls_3600 of the bound
+    """
+    need_1800, need_3600 = _pattern_needs(rooms_data, 'floor_area', require_length=True)
+    rolls_1800 = _rolls_at_least(need_1800, SHEET_SPECS['floor_thin']['actual_coverage'])
+    rolls_3600 = _rolls_at_least(need_3600, SHEET_SPECS['floor_wide']['actual_coverage'])
+    return {'lower_bound': rolls_1800 + rolls_3600, 'rolls_1800': rolls_1800, 'rolls_3600': rolls_3600}
+
+
+def strip_floor_lower_bound(floor_results):
+    """
+    Fewest rolls a strip plan can use: each width's total strip length over the roll length.
+
+    Args:
+        floor_results: Result dict of calculate_floor_strip_plan (its cut_lists)
+
+    Returns:
+        dict: lower_bound, rolls_1800 and rolls_3600 of the bound
+    """
+    strip_length_m = {}
+    for cut_list in floor_results.get('cut_lists', []):
+        strip_length_m[cut_list['width_mm']] = strip_length_m.get(cut_list['width_mm'], 0) + sum(
+            cut['length_m'] for cut in cut_list['cuts']
+        )
+    rolls_1800 = _rolls_at_least(strip_length_m.get(1800, 0), ROLL_LENGTH)
+    rolls_3600 = _rolls_at_least(strip_length_m.get(3600, 0), ROLL_LENGTH)
+    return {'lower_bound': rolls_1800 + rolls_3600, 'rolls_1800': rolls_1800, 'rolls_3600': rolls_3600}
+
+
+def optimality_gap(plan_rolls, lower_bound):
+    """
+    How far a plan is at most from the best possible plan.
+
+    Returns:
+        dict: plan_rolls, lower_bound, gap_rolls and gap_ratio (gap / plan, 0 for an empty plan)
+    """
+    gap_rolls = max(plan_rolls - lower_bound, 0)
+    return {
+        'plan_rolls': plan_rolls,
+        'lower_bound': lower_bound,
+        'gap_rolls': gap_rolls,
+        'gap_ratio': gap_rolls / plan_rolls if plan_rolls else 0.0
+    }
+
+
+def plan_optimality_gap(rooms_data, plan_cw_rolls, plan_floor_rolls=0, include_floor_calc=True, floor_results=None,
+                        floor_rooms_data=None):
+    """
+    Lower bounds and the gap of a whole plan (ceiling/wall plus floor rolls).
+
+    Args:
+        rooms_data: Surface-filtered rooms the plan was computed for
+        plan_cw_rolls: Ceiling/wall rolls of the plan
+        plan_floor_rolls: Floor rolls of the plan
+        include_floor_calc: Whether floor rolls are part of the plan
+        floor_results: Floor optimizer results; strip plans are bounded by their cut lists
+        floor_rooms_data: Rooms as the floor optimizer saw them, when oriented apart from rooms_data
+
+    Returns:
+        dict: ceiling_wall, floor (None without floors) and total optimality_gap dicts
+    """
+    ceiling_wall = optimality_gap(plan_cw_rolls, ceiling_wall_lower_bound(rooms_data)['lower_bound'])
+    floor = None
+    if include_floor_calc:
+        if floor_results is not None and 'cut_lists' in floor_results:
+            bound = strip_floor_lower_bound(floor_results)
+        else:
+            bound = floor_lower_bound(floor_rooms_data if floor_rooms_data is not None else rooms_data)
+        floor = optimality_gap(plan_floor_rolls, bound['lower_bound'])
+    return {
+        'ceiling_wall': ceiling_wall,
+        'floor': floor,
+        'total': optimality_gap(
+            plan_cw_rolls + plan_floor_rolls,
+            ceiling_wall['lower_bound'] + (floor['lower_bound'] if floor is not None else 0)
+        )
+    }
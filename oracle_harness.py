@@ -0,0 +1,590 @@
+"""
+Differential harness: fast engine variants against the frozen reference oracles.
+
+Usage:
+    python oracle_harness.py [--pattern-cases N] [--projects N] [--seed N]
+
+Every variant is run on the same random and boundary inputs as its oracle
+from reference_oracles.py. A variant passes when all outputs match bit for
+bit, or within its documented tolerance. The report lists mismatches (with
+the first counterexample), the cases that only matched within the
+tolerance, and the speedup over the oracle. The exit status is 1 when any
+variant has mismatches.
+"""
+
+import argparse
+import math
+import sys
+import time
+
+import numpy as np
+
+import reference_oracles
+import sheet_engine
+from breakpoints import (
+    CEILING_FLOOR_SCAN_MAX_MM,
+    WALL_SCAN_MAX_MM,
+    BreakpointIndex,
+    closed_form_roll_pattern,
+    get_ceiling_floor_breakpoint_index,
+    get_wall_breakpoint_index
+)
+from floor_templates import CLOSED_FORM_FLOOR_TOLERANCE_ROLLS, calculate_floor_template_plan
+from result_frames import COMBINATION_SEPARATOR, calculate_ceiling_wall_frame, calculate_floor_frame
+from phased_plans import compile_phase_program, evaluate_phase_schedule
+from room_types import calculate_optimized_room_types, grouped_room_order
+from strategy_evaluator import STRATEGY_1800_ONLY, STRATEGY_MIXED, evaluate_strategies
+from fixed_point_engine import (
+    calculate_optimized_multi_room_ceiling_wall_fixed,
+    calculate_optimized_multi_room_floor_fixed,
+    convert_fixed_point_results_to_m2
+)
+
+
+# ==============================================================================
+# CONSTANTS
+# ==============================================================================
+
+PATTERN_CASES_DEFAULT = 1000000
+PROJECT_CASES_DEFAULT = 2000
+MAX_ROOMS_PER_PROJECT = 20
+
+# Repeated-room projects: a few room types at 0.1m resolution, each repeated
+# in a row (hotel rooms) or all of them repeated per floor (typical floors)
+REPEATED_PROJECT_CASES_DEFAULT = 2000
+MAX_ROOM_TYPES_PER_PROJECT = 4
+MAX_ROOM_REPEAT = 30
+MAX_PROJECT_FLOORS = 25
+
+# Share of generated inputs taken from the boundary set (the rest is uniform random)
+BOUNDARY_SHARE = 0.5
+
+# Fixed-point engine: areas are rounded to integer mm² per room and per pool
+# update, so m² fields may drift by this much over a project.
+FIXED_POINT_AREA_TOLERANCE_M2 = 1e-3
+
+# Repeated rooms put pool sums exactly on whole rolls, where the oracles'
+# float sums land ~1e-12 m² to either side and ceil() can flip; exact
+# variants (integer mm², closed forms) then differ by whole rolls. A floor
+# pool holds less than one roll after every purchase, so its total is off by
+# at most one roll per width.
+FIXED_POINT_FLOOR_TOLERANCE_ROLLS = 1
+# On ceiling/wall pools one flip changes what the walls draw next, so rolls
+# can move between the widths (up to 8 per width measured on 36,000
+# repeated-room projects). The coverage bought stayed within one roll of
+# each width.
+FIXED_POINT_CEILING_WALL_COVERAGE_TOLERANCE_M2 = (
+    sheet_engine.SHEET_SPECS['ceiling_thin']['actual_coverage'] +
+    sheet_engine.SHEET_SPECS['ceiling_wide']['actual_coverage']
+)
+
+# Typical-floor templates are checked against the oracles on the expanded building
+TEMPLATE_REPEAT = 12
+
+# Every room is repeated this often for the room-type optimizer check
+ROOM_TYPE_REPEAT = 5
+
+# Rooms are spread over this many construction phases (room index modulo) for the phased check
+PHASE_COUNT = 3
+
+# Offsets around every oracle threshold (thresholds compare with "<=")
+THRESHOLD_OFFSETS_MM = (-1, -0.5, -1e-6, 0, 1e-6, 0.5, 1)
+
+# Beyond the 100000mm table the ceiling/floor pattern follows the 3600mm remainder rule
+LARGE_WIDTH_CASES_MM = (
+    99999, 100000, 100000.5, 100001, 100800, 100801, 104400, 104401,
+    108000, 108000.5, 109200, 109201, 250000, 1000000
+)
+
+
+# ==============================================================================
+# INPUT GENERATION
+# ==============================================================================
+
+def oracle_thresholds(pattern_function, scan_max_mm):
+    """Upper bounds of every pattern interval of an oracle, found by a 1mm scan."""
+    return np.asarray(BreakpointIndex(pattern_function, scan_max_mm).upper_bounds[:-1], dtype=np.float64)
+
+
+def generate_dimension_cases(rng, count, thresholds, scan_max_mm, extra_cases=()):
+    """
+    Random and boundary dimensions (mm) for the pattern functions.
+
+    Boundary cases sit exactly on, and just around, each oracle threshold,
+    plus zero, negative and out-of-table values. Random cases are uniform
+    over 1.25× the scanned range, half of them at 0.1mm resolution and half
+    at whole millimeters.
+    """
+    boundary = np.concatenate([thresholds + offset for offset in THRESHOLD_OFFSETS_MM])
+    boundary = np.concatenate([boundary, [0, -1, -1000, 1e-9], extra_cases])
+
+    boundary_count = min(int(count * BOUNDARY_SHARE), count)
+    random_count = count - boundary_count
+    picked = boundary[rng.integers(0, len(boundary), boundary_count)]
+    # Every boundary value is included at least once
+    picked[:min(len(boundary), boundary_count)] = boundary[:boundary_count]
+
+    uniform = rng.uniform(0, scan_max_mm * 1.25, random_count)
+    uniform[:random_count // 2] = np.round(uniform[:random_count // 2], 1)
+    uniform[random_count // 2:] = np.round(uniform[random_count // 2:])
+
+    cases = np.concatenate([picked, uniform])
+    rng.shuffle(cases)
+    return cases
+
+
+def generate_projects(rng, count, width_cases, height_cases):
+    """
+    Random projects for the optimizers, at whole-millimeter resolution.
+
+    Widths and heights are drawn from the boundary-heavy dimension cases.
+    Rooms randomly drop surfaces (zero areas), like the surface toggles of
+    the sheets tab, and some rooms have no area at all.
+    """
+    positive_widths = width_cases[(width_cases > 0) & (width_cases == np.round(width_cases))]
+    positive_heights = height_cases[(height_cases > 0) & (height_cases == np.round(height_cases))]
+    positive_heights = positive_heights[positive_heights <= 12000]
+
+    projects = []
+    for project_index in range(count):
+        has_floor_covering = bool(rng.random() < 0.5)
+        rooms = []
+        for room_index in range(int(rng.integers(1, MAX_ROOMS_PER_PROJECT + 1))):
+            width_mm = float(positive_widths[rng.integers(len(positive_widths))])
+            height_mm = float(positive_heights[rng.integers(len(positive_heights))])
+            length_m = float(rng.integers(300, 60000)) / 1000
+            metrics = sheet_engine.calculate_room_metrics(length_m, width_mm / 1000, height_mm / 1000)
+            room = {
+                'name': f"P{project_index}-R{room_index + 1}",
+                'perimeter': metrics['perimeter'],
+                'width_mm': width_mm,
+                'height_mm': height_mm,
+                'length_m': length_m,
+                'floor_area': metrics['floor_area'] if has_floor_covering else 0,
+                'ceiling_area': metrics['ceiling_area'] if rng.random() < 0.8 else 0,
+                'wall_area': metrics['wall_area'] if rng.random() < 0.8 else 0
+            }
+            if rng.random() < 0.05:
+                room['floor_area'] = room['ceiling_area'] = room['wall_area'] = 0
+            rooms.append(room)
+        projects.append((rooms, has_floor_covering))
+    return projects
+
+
+def generate_repeated_projects(rng, count):
+    """
+    Projects of repeated rooms, where pool totals land on whole rolls.
+
+    A few room types at 0.1m resolution, the way rooms are entered, are
+    either each repeated in a row or repeated together floor after floor.
+    These are the inputs where exact variants and the float oracles can
+    part by whole rolls (see the *_TOLERANCE_* constants).
+    """
+    projects = []
+    for project_index in range(count):
+        has_floor_covering = bool(rng.random() < 0.5)
+        room_types = []
+        for type_index in range(int(rng.integers(1, MAX_ROOM_TYPES_PER_PROJECT + 1))):
+            length_m = float(rng.integers(10, 121)) / 10
+            width_m = float(rng.integers(10, 91)) / 10
+            height_m = float(rng.integers(22, 41)) / 10
+            metrics = sheet_engine.calculate_room_metrics(length_m, width_m, height_m)
+            room_types.append({
+                'name': f"P{project_index}-T{type_index + 1}",
+                'perimeter': metrics['perimeter'],
+                'width_mm': width_m * 1000,
+                'height_mm': height_m * 1000,
+                'length_m': length_m,
+                'floor_area': metrics['floor_area'] if has_floor_covering else 0,
+                'ceiling_area': metrics['ceiling_area'],
+                'wall_area': metrics['wall_area']
+            })
+
+        if rng.random() < 0.5:
+            rooms = [
+                {**room, 'name': f"{room['name']}-{copy + 1}"}
+                for room in room_types for copy in range(int(rng.integers(1, MAX_ROOM_REPEAT + 1)))
+            ]
+        else:
+            rooms = [
+                {**room, 'name': f"{room['name']}-F{floor + 1}"}
+                for floor in range(int(rng.integers(2, MAX_PROJECT_FLOORS + 1))) for room in room_types
+            ]
+        projects.append((rooms, has_floor_covering))
+    return projects
+
+
+# ==============================================================================
+# COMPARISON
+# ==============================================================================
+
+def outputs_match(expected, actual, float_tolerance=0.0, ignored_keys=()):
+    """
+    Compare oracle and variant outputs recursively.
+
+    With float_tolerance 0 this is exact equality; otherwise floats may differ
+    by float_tolerance. Keys in ignored_keys are skipped on both sides.
+    """
+    if isinstance(expected, dict) and isinstance(actual, dict):
+        expected_keys = set(expected) - set(ignored_keys)
+        if expected_keys != set(actual) - set(ignored_keys):
+            return False
+        return all(outputs_match(expected[key], actual[key], float_tolerance, ignored_keys) for key in expected_keys)
+    if isinstance(expected, (list, tuple)) and isinstance(actual, (list, tuple)):
+        return len(expected) == len(actual) and all(
+            outputs_match(e, a, float_tolerance, ignored_keys) for e, a in zip(expected, actual)
+        )
+    if isinstance(expected, float) or isinstance(actual, float):
+        if float_tolerance == 0:
+            return expected == actual
+        return math.isclose(expected, actual, rel_tol=0, abs_tol=float_tolerance)
+    return expected == actual
+
+
+def totals_within_rolls(*max_differences):
+    """Roll tolerance: every roll total, in output order, within its number of rolls of the oracle."""
+    def tolerated(expected_totals, actual_totals):
+        return all(
+            abs(actual - expected) <= max_difference
+            for expected, actual, max_difference in zip(expected_totals, actual_totals, max_differences)
+        )
+    return tolerated
+
+
+def ceiling_wall_coverage_within(max_difference_m2):
+    """Roll tolerance: the (1800mm, 3600mm) ceiling/wall totals buy coverage within max_difference_m2 of the oracle."""
+    coverage_1800 = sheet_engine.SHEET_SPECS['ceiling_thin']['actual_coverage']
+    coverage_3600 = sheet_engine.SHEET_SPECS['ceiling_wide']['actual_coverage']
+
+    def tolerated(expected_totals, actual_totals):
+        (expected_1800, expected_3600), (actual_1800, actual_3600) = expected_totals, actual_totals
+        difference = (actual_1800 - expected_1800) * coverage_1800 + (actual_3600 - expected_3600) * coverage_3600
+        return abs(difference) <= max_difference_m2
+    return tolerated
+
+
+def _pattern_counts(pattern_function):
+    """Reduce a pattern function to its (rolls_1800, rolls_3600) counts."""
+    def counts(dimension_mm):
+        _, rolls_1800, rolls_3600 = pattern_function(dimension_mm)
+        return rolls_1800, rolls_3600
+    return counts
+
+
+def _timed(function, inputs):
+    started_at = time.perf_counter()
+    outputs = [function(value) for value in inputs]
+    return outputs, time.perf_counter() - started_at
+
+
+# ==============================================================================
+# VARIANT REGISTRY
+# ==============================================================================
+
+def pattern_variants():
+    """
+    Pattern-level variants: (name, oracle, variant, mode).
+
+    mode 'scalar' calls the variant once per dimension; 'batch' passes the
+    whole case array and expects one (rolls_1800, rolls_3600) row per case.
+    """
+    ceiling_index = get_ceiling_floor_breakpoint_index()
+    ceiling_oracle = _pattern_counts(reference_oracles.calculate_roll_combination_by_dimension)
+
+    variants = [
+        ('ceiling: sheet_engine (live)', reference_oracles.calculate_roll_combination_by_dimension,
+         sheet_engine.calculate_roll_combination_by_dimension, 'scalar'),
+        ('ceiling: breakpoint bisect', ceiling_oracle, ceiling_index.lookup, 'scalar'),
+        ('ceiling: breakpoint vectorized', ceiling_oracle, ceiling_index.lookup_many, 'batch'),
+        ('ceiling: closed form', ceiling_oracle, closed_form_roll_pattern, 'scalar')
+    ]
+    for has_floor_covering in (False, True):
+        label = 'floor' if has_floor_covering else 'no floor'
+        wall_index = get_wall_breakpoint_index(has_floor_covering)
+
+        def wall_oracle(dimension_mm, has_floor_covering=has_floor_covering):
+            return reference_oracles.calculate_wall_roll_combination_by_dimension(dimension_mm, has_floor_covering)
+
+        def wall_live(dimension_mm, has_floor_covering=has_floor_covering):
+            return sheet_engine.calculate_wall_roll_combination_by_dimension(dimension_mm, has_floor_covering)
+
+        variants += [
+            (f"wall ({label}): sheet_engine (live)", wall_oracle, wall_live, 'scalar'),
+            (f"wall ({label}): breakpoint bisect", _pattern_counts(wall_oracle), wall_index.lookup, 'scalar'),
+            (f"wall ({label}): breakpoint vectorized", _pattern_counts(wall_oracle), wall_index.lookup_many, 'batch')
+        ]
+    return variants
+
+
+def _fixed_ceiling_wall(rooms, has_floor_covering):
+    results, total_1800, total_3600 = calculate_optimized_multi_room_ceiling_wall_fixed(rooms, has_floor_covering)
+    return convert_fixed_point_results_to_m2(results), total_1800, total_3600
+
+
+def _fixed_floor(rooms, has_floor_covering):
+    results, total_1800, total_3600 = calculate_optimized_multi_room_floor_fixed(rooms)
+    return convert_fixed_point_results_to_m2(results), total_1800, total_3600
+
+
+def _oracle_mixed_and_1800(rooms, has_floor_covering):
+    return (
+        reference_oracles.calculate_optimized_multi_room_ceiling_wall(rooms, has_floor_covering),
+        reference_oracles.calculate_optimized_multi_room_floor(rooms),
+        reference_oracles.calculate_optimized_multi_room_ceiling_wall_1800_only(rooms, has_floor_covering),
+        reference_oracles.calculate_optimized_multi_room_floor_1800_only(rooms)
+    )
+
+
+def _single_pass_mixed_and_1800(rooms, has_floor_covering):
+    plans = evaluate_strategies(rooms, has_floor_covering, strategies=(STRATEGY_MIXED, STRATEGY_1800_ONLY))
+    return tuple(
+        (plans[strategy][results_key], plans[strategy][total_1800_key], plans[strategy][total_3600_key])
+        for strategy in (STRATEGY_MIXED, STRATEGY_1800_ONLY)
+        for results_key, total_1800_key, total_3600_key in (
+            ('ceiling_wall_results', 'total_cw_1800', 'total_cw_3600'),
+            ('floor_results', 'total_floor_1800', 'total_floor_3600')
+        )
+    )
+
+
+def _oracle_expanded_building(rooms, has_floor_covering):
+    expanded = rooms * TEMPLATE_REPEAT
+    _, cw_1800, cw_3600 = reference_oracles.calculate_optimized_multi_room_ceiling_wall(expanded, has_floor_covering)
+    _, floor_1800, floor_3600 = reference_oracles.calculate_optimized_multi_room_floor(expanded)
+    return None, cw_1800, cw_3600, floor_1800, floor_3600
+
+
+def _floor_template_totals(rooms, has_floor_covering):
+    plan = calculate_floor_template_plan(
+        [{'name': 'template', 'rooms': rooms, 'repeat': TEMPLATE_REPEAT}], has_floor_covering
+    )
+    return None, plan['total_cw_1800'], plan['total_cw_3600'], plan['total_floor_1800'], plan['total_floor_3600']
+
+
+def _oracle_grouped_duplicates(rooms, has_floor_covering):
+    expanded = rooms * ROOM_TYPE_REPEAT
+    grouped = [expanded[index] for index in grouped_room_order(expanded)]
+    _, cw_1800, cw_3600 = reference_oracles.calculate_optimized_multi_room_ceiling_wall(grouped, has_floor_covering)
+    _, floor_1800, floor_3600 = reference_oracles.calculate_optimized_multi_room_floor(grouped)
+    return None, cw_1800, cw_3600, floor_1800, floor_3600
+
+
+def _room_type_totals(rooms, has_floor_covering):
+    result = calculate_optimized_room_types(rooms * ROOM_TYPE_REPEAT, has_floor_covering)
+    return (
+        None, result['total_cw_1800'], result['total_cw_3600'],
+        result['total_floor_1800'], result['total_floor_3600']
+    )
+
+
+def _oracle_phase_order(rooms, has_floor_covering):
+    # Phases run in order and rooms keep their order within a phase (sorted() is stable)
+    phased = [rooms[index] for index in sorted(range(len(rooms)), key=lambda index: index % PHASE_COUNT)]
+    _, cw_1800, cw_3600 = reference_oracles.calculate_optimized_multi_room_ceiling_wall(phased, has_floor_covering)
+    _, floor_1800, floor_3600 = reference_oracles.calculate_optimized_multi_room_floor(phased)
+    return None, cw_1800, cw_3600, floor_1800, floor_3600
+
+
+def _phased_totals(rooms, has_floor_covering):
+    plan = evaluate_phase_schedule(
+        compile_phase_program(rooms, has_floor_covering),
+        [index % PHASE_COUNT + 1 for index in range(len(rooms))]
+    )
+    return None, plan['total_cw_1800'], plan['total_cw_3600'], plan['total_floor_1800'], plan['total_floor_3600']
+
+
+def _frame_records(room_frame):
+    """Room result dicts back from a columnar frame (combination categories split into lists)."""
+    records = room_frame.to_dict('records')
+    for record in records:
+        for column in record:
+            if column.endswith('_combination'):
+                record[column] = record[column].split(COMBINATION_SEPARATOR) if record[column] else []
+    return records
+
+
+def _frame_ceiling_wall(rooms, has_floor_covering):
+    result, total_1800, total_3600 = calculate_ceiling_wall_frame(rooms, has_floor_covering)
+    return {'room_results': _frame_records(result.pop('room_frame')), **result}, total_1800, total_3600
+
+
+def _frame_floor(rooms, has_floor_covering):
+    result, total_1800, total_3600 = calculate_floor_frame(rooms)
+    return {'floor_room_results': _frame_records(result.pop('room_frame')), **result}, total_1800, total_3600
+
+
+def optimizer_variants():
+    """
+    Optimizer-level variants: (name, oracle, variant, float_tolerance, roll_tolerance).
+
+    Oracles and variants are called as function(rooms, has_floor_covering).
+    roll_tolerance is None when outputs must match, or a check on the roll
+    totals (outputs after the first) for cases where they do not; the
+    per-room breakdown of such a case is not compared.
+    """
+    closed_form_floor = totals_within_rolls(
+        0, 0, CLOSED_FORM_FLOOR_TOLERANCE_ROLLS, CLOSED_FORM_FLOOR_TOLERANCE_ROLLS
+    )
+    oracle_cw = reference_oracles.calculate_optimized_multi_room_ceiling_wall
+    oracle_cw_1800 = reference_oracles.calculate_optimized_multi_room_ceiling_wall_1800_only
+
+    def oracle_floor(rooms, has_floor_covering):
+        return reference_oracles.calculate_optimized_multi_room_floor(rooms)
+
+    def oracle_floor_1800(rooms, has_floor_covering):
+        return reference_oracles.calculate_optimized_multi_room_floor_1800_only(rooms)
+
+    def live_floor(rooms, has_floor_covering):
+        return sheet_engine.calculate_optimized_multi_room_floor(rooms)
+
+    def live_floor_1800(rooms, has_floor_covering):
+        return sheet_engine.calculate_optimized_multi_room_floor_1800_only(rooms)
+
+    return [
+        ('ceiling/wall: sheet_engine (live)', oracle_cw,
+         sheet_engine.calculate_optimized_multi_room_ceiling_wall, 0.0, None),
+        ('floor: sheet_engine (live)', oracle_floor, live_floor, 0.0, None),
+        ('ceiling/wall 1800: sheet_engine (live)', oracle_cw_1800,
+         sheet_engine.calculate_optimized_multi_room_ceiling_wall_1800_only, 0.0, None),
+        ('floor 1800: sheet_engine (live)', oracle_floor_1800, live_floor_1800, 0.0, None),
+        ('ceiling/wall: fixed point', oracle_cw, _fixed_ceiling_wall, FIXED_POINT_AREA_TOLERANCE_M2,
+         ceiling_wall_coverage_within(FIXED_POINT_CEILING_WALL_COVERAGE_TOLERANCE_M2)),
+        ('floor: fixed point', oracle_floor, _fixed_floor, FIXED_POINT_AREA_TOLERANCE_M2,
+         totals_within_rolls(FIXED_POINT_FLOOR_TOLERANCE_ROLLS, FIXED_POINT_FLOOR_TOLERANCE_ROLLS)),
+        ('ceiling/wall: columnar frame', oracle_cw, _frame_ceiling_wall, 0.0, None),
+        ('floor: columnar frame', oracle_floor, _frame_floor, 0.0, None),
+        ('all four: single-pass strategies', _oracle_mixed_and_1800, _single_pass_mixed_and_1800, 0.0, None),
+        ('totals: floor template ×12', _oracle_expanded_building, _floor_template_totals, 0.0, closed_form_floor),
+        ('totals: room types ×5', _oracle_grouped_duplicates, _room_type_totals, 0.0, closed_form_floor),
+        ('totals: phased schedule, no loss', _oracle_phase_order, _phased_totals, 0.0, None)
+    ]
+
+
+# ==============================================================================
+# HARNESS
+# ==============================================================================
+
+def run_pattern_checks(cases_by_kind):
+    """Run every pattern variant against its oracle and return report rows."""
+    rows = []
+    oracle_runs = {}
+    for name, oracle, variant, mode in pattern_variants():
+        cases = cases_by_kind['wall' if name.startswith('wall') else 'ceiling']
+        case_list = cases.tolist()
+
+        run_key = (id(cases), name.split(':')[0], oracle.__name__)
+        if run_key not in oracle_runs:
+            oracle_runs[run_key] = _timed(oracle, case_list)
+        expected, oracle_s = oracle_runs[run_key]
+
+        if mode == 'batch':
+            started_at = time.perf_counter()
+            batch_output = variant(cases)
+            variant_s = time.perf_counter() - started_at
+            actual = [tuple(row) for row in batch_output.tolist()]
+        else:
+            actual, variant_s = _timed(variant, case_list)
+
+        mismatches = [i for i, (e, a) in enumerate(zip(expected, actual)) if tuple(e) != tuple(a)]
+        rows.append(_report_row(name, len(case_list), mismatches, case_list, expected, actual, oracle_s, variant_s))
+    return rows
+
+
+def run_optimizer_checks(projects):
+    """Run every optimizer variant against its oracle and return report rows."""
+    rows = []
+    oracle_runs = {}
+    for name, oracle, variant, float_tolerance, roll_tolerance in optimizer_variants():
+        inputs = [(rooms, has_floor_covering) for rooms, has_floor_covering in projects]
+
+        if oracle not in oracle_runs:
+            oracle_runs[oracle] = _timed(lambda args: oracle(*args), inputs)
+        expected, oracle_s = oracle_runs[oracle]
+        actual, variant_s = _timed(lambda args: variant(*args), inputs)
+
+        mismatches = []
+        tolerated = 0
+        for i, (e, a) in enumerate(zip(expected, actual)):
+            if outputs_match(e, a, float_tolerance, ignored_keys=('area_unit',)):
+                continue
+            if roll_tolerance is not None and roll_tolerance(e[1:], a[1:]):
+                tolerated += 1
+            else:
+                mismatches.append(i)
+        summaries = [(len(rooms), has_floor_covering) for rooms, has_floor_covering in projects]
+        rows.append(_report_row(name, len(inputs), mismatches, summaries,
+                                [e[1:] for e in expected], [a[1:] for a in actual], oracle_s, variant_s,
+                                tolerated))
+    return rows
+
+
+def _report_row(name, case_count, mismatches, inputs, expected, actual, oracle_s, variant_s, tolerated=0):
+    first = mismatches[0] if mismatches else None
+    return {
+        'name': name,
+        'cases': case_count,
+        'mismatches': len(mismatches),
+        'tolerated': tolerated,
+        'first_mismatch': None if first is None else {
+            'input': inputs[first],
+            'expected': expected[first],
+            'actual': actual[first]
+        },
+        'oracle_s': oracle_s,
+        'variant_s': variant_s,
+        'speedup': oracle_s / variant_s if variant_s > 0 else float('inf')
+    }
+
+
+def print_report(rows):
+    print(f"{'variant':<42} {'cases':>9} {'mismatch':>9} {'tolerated':>9} {'oracle s':>9} {'variant s':>10} "
+          f"{'speedup':>8}")
+    for row in rows:
+        print(
+            f"{row['name']:<42} {row['cases']:>9} {row['mismatches']:>9} {row['tolerated']:>9} "
+            f"{row['oracle_s']:>9.3f} {row['variant_s']:>10.3f} {row['speedup']:>7.2f}x"
+        )
+        if row['first_mismatch']:
+            mismatch = row['first_mismatch']
+            print(f"    first mismatch: input={mismatch['input']!r} "
+                  f"expected={mismatch['expected']!r} actual={mismatch['actual']!r}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare fast engine variants with the frozen reference oracles.")
+    parser.add_argument('--pattern-cases', type=int, default=PATTERN_CASES_DEFAULT,
+                        help="dimensions per pattern function (default: %(default)s)")
+    parser.add_argument('--projects', type=int, default=PROJECT_CASES_DEFAULT,
+                        help="random projects per optimizer (default: %(default)s)")
+    parser.add_argument('--repeated-projects', type=int, default=REPEATED_PROJECT_CASES_DEFAULT,
+                        help="repeated-room and multi-floor projects per optimizer (default: %(default)s)")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(args.seed)
+    ceiling_cases = generate_dimension_cases(
+        rng, args.pattern_cases,
+        oracle_thresholds(reference_oracles.calculate_roll_combination_by_dimension, CEILING_FLOOR_SCAN_MAX_MM),
+        CEILING_FLOOR_SCAN_MAX_MM,
+        LARGE_WIDTH_CASES_MM
+    )
+    wall_thresholds = np.union1d(*[
+        oracle_thresholds(
+            lambda dimension_mm, has_floor_covering=has_floor_covering:
+                reference_oracles.calculate_wall_roll_combination_by_dimension(dimension_mm, has_floor_covering),
+            WALL_SCAN_MAX_MM
+        )
+        for has_floor_covering in (False, True)
+    ])
+    wall_cases = generate_dimension_cases(rng, args.pattern_cases, wall_thresholds, WALL_SCAN_MAX_MM)
+
+    rows = run_pattern_checks({'ceiling': ceiling_cases, 'wall': wall_cases})
+    projects = generate_projects(rng, args.projects, ceiling_cases, wall_cases)
+    projects += generate_repeated_projects(rng, args.repeated_projects)
+    rows += run_optimizer_checks(projects)
+    print_report(rows)
+    return 1 if any(row['mismatches'] for row in rows) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
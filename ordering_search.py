@@ -0,0 +1,263 @@
+import os
+import random
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from lower_bounds import plan_optimality_gap
+from sheet_engine import (
+    calculate_optimized_multi_room_ceiling_wall,
+    calculate_optimized_multi_room_floor,
+    calculate_roll_combination_by_dimension
+)
+
+
+# ==============================================================================
+# CONSTANTS
+# ==============================================================================
+
+ORDERING_TIME_LIMIT_S = 2.0
+ORDERING_BATCH_SIZE = 16
+ORDERING_MAX_WORKERS = max(1, min(4, (os.cpu_count() or 1)))
+
+# Stop local search after this many consecutive rounds without improvement
+ORDERING_STALL_ROUNDS = 8
+
+
+# ==============================================================================
+# ORDER EVALUATION (runs in worker processes)
+# ==============================================================================
+
+def evaluate_room_order(rooms_data, order, include_floor_calc):
+    """
+    Evaluate one room order with the mixed-width optimizers.
+
+    Args:
+        rooms_data: Surface-filtered room dictionaries
+        order: Sequence of indices into rooms_data
+        include_floor_calc: Whether floor rolls are part of the total
+
+    Returns:
+        tuple: (total_rolls, total_3600_rolls) - smaller is better, compared in that order
+    """
+    ordered_rooms = [rooms_data[index] for index in order]
+    _, cw_1800, cw_3600 = calculate_optimized_multi_room_ceiling_wall(ordered_rooms, include_floor_calc)
+    floor_1800 = 0
+    floor_3600 = 0
+    if include_floor_calc:
+        _, floor_1800, floor_3600 = calculate_optimized_multi_room_floor(ordered_rooms)
+    return cw_1800 + cw_3600 + floor_1800 + floor_3600, cw_3600 + floor_3600
+
+
+def _evaluate_order_batch(rooms_data, orders, include_floor_calc):
+    return [(tuple(order), evaluate_room_order(rooms_data, order, include_floor_calc)) for order in orders]
+
+
+# ==============================================================================
+# CANDIDATE ORDERS
+# ==============================================================================
+
+def _room_coverage_need(room):
+    return room.get('floor_area', 0) + room.get('ceiling_area', 0) + room.get('wall_area', 0)
+
+
+def _standalone_leftover(room, include_floor_calc):
+    """Leftover area a room produces when it is optimized on its own."""
+    cw_results, _, _ = calculate_optimized_multi_room_ceiling_wall([room], include_floor_calc)
+    leftover = cw_results.get('final_leftover_1800', 0) + cw_results.get('final_leftover_3600', 0)
+    if include_floor_calc:
+        floor_results, _, _ = calculate_optimized_multi_room_floor([room])
+        leftover += floor_results.get('final_leftover_1800_floor', 0) + floor_results.get('final_leftover_3600_floor', 0)
+    return leftover
+
+
+def build_candidate_orders(rooms_data, include_floor_calc, deadline=None):
+    """
+    Build the heuristic starting orders.
+
+    The leftover-based orders need one optimizer run per room; they are
+    left out when the deadline passes before every room has been run.
+
+    Returns:
+        list: (strategy_name, order_tuple) pairs, original order first
+    """
+    indices = list(range(len(rooms_data)))
+    needs = [_room_coverage_need(room) for room in rooms_data]
+    widths_3600 = [calculate_roll_combination_by_dimension(room.get('width_mm', 0))[2] for room in rooms_data]
+
+    candidates = [
+        ('入力順', tuple(indices)),
+        ('必要面積 大→小', tuple(sorted(indices, key=lambda i: -needs[i]))),
+        ('必要面積 小→大', tuple(sorted(indices, key=lambda i: needs[i]))),
+        ('3600mm比率 大→小', tuple(sorted(indices, key=lambda i: (-widths_3600[i], -needs[i]))))
+    ]
+
+    leftovers = []
+    for room in rooms_data:
+        if deadline is not None and time.time() >= deadline:
+            leftovers = None
+            break
+        leftovers.append(_standalone_leftover(room, include_floor_calc))
+    if leftovers is not None:
+        candidates[3:3] = [
+            ('余り 大→小', tuple(sorted(indices, key=lambda i: -leftovers[i]))),
+            ('余り 小→大', tuple(sorted(indices, key=lambda i: leftovers[i])))
+        ]
+
+    unique_candidates = []
+    seen = set()
+    for name, order in candidates:
+        if order not in seen:
+            seen.add(order)
+            unique_candidates.append((name, order))
+    return unique_candidates
+
+
+def _swap_neighbors(order, count, rng):
+    """Generate up to count distinct orders that differ from order by one swap."""
+    room_count = len(order)
+    neighbors = []
+    seen = set()
+    attempts = 0
+    while len(neighbors) < count and attempts < count * 4:
+        attempts += 1
+        i, j = rng.sample(range(room_count), 2)
+        neighbor = list(order)
+        neighbor[i], neighbor[j] = neighbor[j], neighbor[i]
+        neighbor = tuple(neighbor)
+        if neighbor not in seen:
+            seen.add(neighbor)
+            neighbors.append(neighbor)
+    return neighbors
+
+
+# ==============================================================================
+# PARALLEL ORDERING SEARCH
+# ==============================================================================
+
+def create_ordering_executor(max_workers=ORDERING_MAX_WORKERS):
+    """Create the process pool used to evaluate candidate room orders."""
+    return ProcessPoolExecutor(max_workers=max_workers)
+
+
+def _evaluate_batches(rooms_data, batches, include_floor_calc, executor, deadline):
+    """
+    Evaluate batches of orders, in parallel when an executor is given.
+
+    Stops at the deadline with the orders evaluated by then (in-process the
+    deadline is checked between orders, in parallel between batches); a
+    deadline of None waits for every batch.
+    """
+    results = []
+    if executor is None:
+        for batch in batches:
+            for order in batch:
+                if deadline is not None and time.time() >= deadline:
+                    return results
+                results.append((tuple(order), evaluate_room_order(rooms_data, order, include_floor_calc)))
+        return results
+
+    pending = {executor.submit(_evaluate_order_batch, rooms_data, batch, include_floor_calc) for batch in batches}
+    while pending:
+        timeout = None if deadline is None else max(deadline - time.time(), 0)
+        done, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+        for future in done:
+            results.extend(future.result())
+        if deadline is not None and time.time() >= deadline:
+            for future in pending:
+                future.cancel()
+            break
+    return results
+
+
+def optimize_room_order(rooms_data, include_floor_calc=True, time_limit_s=ORDERING_TIME_LIMIT_S,
+                        executor=None, seed=0):
+    """
+    Search for the room order that needs the fewest rolls.
+
+    Leftovers are consumed greedily in room order, so the order changes the
+    totals. Heuristic orders are evaluated first, then the best one is
+    improved by pairwise swaps until the time limit, a stall, or the
+    lower bound (no order can beat it).
+
+    Args:
+        rooms_data: Surface-filtered room dictionaries
+        include_floor_calc: Whether floor rolls are part of the total
+        time_limit_s: Wall-clock budget for the search
+        executor: Optional ProcessPoolExecutor; evaluated in-process when None
+        seed: Seed for the local-search swap generator
+
+    Returns:
+        dict: best_order (indices), best_rooms, strategy, baseline/best totals,
+              rolls_saved, lower_bound, candidates_evaluated and elapsed_s
+    """
+    started_at = time.time()
+    deadline = started_at + time_limit_s
+    room_count = len(rooms_data)
+
+    if room_count == 0:
+        return {
+            'best_order': [],
+            'best_rooms': [],
+            'strategy': '入力順',
+            'baseline_total': 0,
+            'best_total': 0,
+            'rolls_saved': 0,
+            'lower_bound': 0,
+            'candidates_evaluated': 0,
+            'elapsed_s': 0.0
+        }
+
+    candidates = build_candidate_orders(rooms_data, include_floor_calc, deadline)
+    strategy_by_order = {order: name for name, order in candidates}
+    worker_count = ORDERING_MAX_WORKERS if executor is not None else 1
+
+    # The input order is the baseline every result is compared with, so it is always evaluated
+    baseline_order = candidates[0][1]
+    baseline_score = evaluate_room_order(rooms_data, baseline_order, include_floor_calc)
+    evaluated = {baseline_order: baseline_score}
+    batches = [[order] for _, order in candidates[1:]]
+    evaluated.update(_evaluate_batches(rooms_data, batches, include_floor_calc, executor, deadline))
+    best_order = min(evaluated, key=lambda order: (evaluated[order], order != baseline_order))
+    best_score = evaluated[best_order]
+    best_strategy = strategy_by_order[best_order]
+    # Order-independent bound on the total (the plan roll counts do not affect it)
+    lower_bound = plan_optimality_gap(rooms_data, 0, 0, include_floor_calc)['total']['lower_bound']
+
+    # Local search: parallel batches of single-swap neighbors around the best order
+    rng = random.Random(seed)
+    stall_rounds = 0
+    while (room_count > 1 and time.time() < deadline and stall_rounds < ORDERING_STALL_ROUNDS
+           and best_score[0] > lower_bound):
+        neighbors = [
+            order for order in _swap_neighbors(best_order, ORDERING_BATCH_SIZE * worker_count, rng)
+            if order not in evaluated
+        ]
+        if not neighbors:
+            stall_rounds += 1
+            continue
+        batches = [neighbors[i:i + ORDERING_BATCH_SIZE] for i in range(0, len(neighbors), ORDERING_BATCH_SIZE)]
+        round_results = _evaluate_batches(rooms_data, batches, include_floor_calc, executor, deadline)
+        evaluated.update(round_results)
+
+        improved = False
+        for order, score in round_results:
+            if score < best_score:
+                best_order, best_score = order, score
+                improved = True
+        if improved:
+            best_strategy = '局所探索 (入れ替え)'
+            stall_rounds = 0
+        else:
+            stall_rounds += 1
+
+    return {
+        'best_order': list(best_order),
+        'best_rooms': [rooms_data[index] for index in best_order],
+        'strategy': best_strategy,
+        'baseline_total': baseline_score[0],
+        'best_total': best_score[0],
+        'rolls_saved': baseline_score[0] - best_score[0],
+        'lower_bound': lower_bound,
+        'candidates_evaluated': len(evaluated),
+        'elapsed_s': time.time() - started_at
+    }
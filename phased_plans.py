@@ -0,0 +1,206 @@
+from floor_templates import compile_floor
+from sheet_engine import pool_ceiling_wall_steps, pool_floor_needs
+
+
+# ==============================================================================
+# CONSTANTS
+# ==============================================================================
+
+# Surfaces that can be scheduled separately; ceilings and walls share one pool and are installed together
+PHASE_SURFACE_FLOOR = 'floor'
+PHASE_SURFACE_CEILING_WALL = 'ceiling_wall'
+
+DEFAULT_PHASE = 1
+
+# Pool checkpoints kept per program; older entries are dropped first
+PHASE_CHECKPOINT_MAX_ENTRIES = 4096
+
+
+# ==============================================================================
+# PHASE PROGRAM
+# ==============================================================================
+
+def compile_phase_program(rooms_data, has_floor_covering=False):
+    """
+    Precompute every room's pooled needs once, so schedules only cost the pool arithmetic.
+
+    Args:
+        rooms_data: Surface-filtered room dictionaries
+        has_floor_covering: Whether floor covering is being calculated (affects wall patterns)
+
+    Returns:
+        dict: names, ceiling_wall_steps (one step or None per room),
+              floor_needs ((need_1800, need_3600) or None per room) and checkpoints
+    """
+    ceiling_wall_steps = []
+    floor_needs = []
+    for room in rooms_data:
+        program = compile_floor([room], has_floor_covering)
+        ceiling_wall_steps.append(program['ceiling_wall_steps'][0] if program['ceiling_wall_steps'] else None)
+        has_floor_need = program['floor_need_1800'] > 0 or program['floor_need_3600'] > 0
+        floor_needs.append((program['floor_need_1800'], program['floor_need_3600']) if has_floor_need else None)
+    return {
+        'names': [room['name'] for room in rooms_data],
+        'ceiling_wall_steps': ceiling_wall_steps,
+        'floor_needs': floor_needs,
+        'checkpoints': PhaseCheckpoints()
+    }
+
+
+class PhaseCheckpoints:
+    """
+    Pool states at the end of each phase, keyed by everything that led to them.
+
+    A key is the id of the checkpoint before the phase plus the phase's
+    contents and leftover loss, so schedules that agree on their first
+    phases resume from the last shared checkpoint and only replay the
+    phases after it. Ids are never reused, so an evicted checkpoint only
+    orphans the checkpoints built on it.
+    """
+
+    def __init__(self, max_entries=PHASE_CHECKPOINT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = {}
+        self._next_id = 0
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return entry
+
+    def put(self, key, entry):
+        """Store a phase result under key and give it the id that later phases are keyed on."""
+        if len(self._entries) >= self.max_entries:
+            # Dicts keep insertion order: drop the oldest checkpoint
+            del self._entries[next(iter(self._entries))]
+        entry['checkpoint_id'] = self._next_id
+        self._next_id += 1
+        self._entries[key] = entry
+
+
+# ==============================================================================
+# PHASED POOLING
+# ==============================================================================
+
+def _surface_phase(room_phase, surface):
+    if isinstance(room_phase, dict):
+        return room_phase.get(surface, DEFAULT_PHASE)
+    return room_phase
+
+
+def _phase_loss(phase_loss, phase):
+    if isinstance(phase_loss, dict):
+        return phase_loss.get(phase, 0.0)
+    return phase_loss
+
+
+def evaluate_phase_schedule(program, room_phases, phase_loss=0.0):
+    """
+    Pool leftovers across construction phases and report the purchases of each phase.
+
+    Phases run in ascending order; within a phase rooms keep their order.
+    Leftovers carry forward to the next phase, less the lost fraction of
+    that phase (offcuts damaged, discarded or taken off site meanwhile).
+    With one phase and no loss the totals equal the mixed-width optimizers.
+
+    Args:
+        program: Result of compile_phase_program
+        room_phases: Per room, a phase number for all its surfaces or a dict
+                     {'floor': phase, 'ceiling_wall': phase}
+        phase_loss: Fraction (0-1) of the carried leftovers lost before each
+                    phase, or {phase: fraction}; the first phase loses nothing
+
+    Returns:
+        dict: phases (per-phase purchases and leftovers), roll totals, final
+              leftovers, checkpoint_hits and phases_replayed
+    """
+    phase_rooms = {}
+    for room_index, room_phase in enumerate(room_phases):
+        for surface in (PHASE_SURFACE_CEILING_WALL, PHASE_SURFACE_FLOOR):
+            phase_rooms.setdefault(_surface_phase(room_phase, surface), ([], []))
+        phase_rooms[_surface_phase(room_phase, PHASE_SURFACE_CEILING_WALL)][0].append(room_index)
+        phase_rooms[_surface_phase(room_phase, PHASE_SURFACE_FLOOR)][1].append(room_index)
+
+    checkpoints = program['checkpoints']
+    checkpoint_id = None
+    pools = (0, 0, 0, 0)
+    phase_results = []
+    checkpoint_hits = 0
+    phases_replayed = 0
+
+    for position, phase in enumerate(sorted(phase_rooms)):
+        ceiling_wall_rooms, floor_rooms = phase_rooms[phase]
+        loss = _phase_loss(phase_loss, phase) if position > 0 else 0.0
+        checkpoint_key = (checkpoint_id, phase, tuple(ceiling_wall_rooms), tuple(floor_rooms), loss)
+
+        entry = checkpoints.get(checkpoint_key)
+        if entry is not None:
+            checkpoint_hits += 1
+        else:
+            phases_replayed += 1
+            carried = tuple(leftover * (1 - loss) for leftover in pools)
+            leftover_1800, leftover_3600, cw_1800, cw_3600 = pool_ceiling_wall_steps(
+                [program['ceiling_wall_steps'][index] for index in ceiling_wall_rooms
+                 if program['ceiling_wall_steps'][index] is not None],
+                carried[0], carried[1]
+            )
+            leftover_1800_floor, leftover_3600_floor, floor_1800, floor_3600 = pool_floor_needs(
+                [program['floor_needs'][index] for index in floor_rooms
+                 if program['floor_needs'][index] is not None],
+                carried[2], carried[3]
+            )
+            entry = {
+                'phase': phase,
+                'ceiling_wall_rooms': len(ceiling_wall_rooms),
+                'floor_rooms': len(floor_rooms),
+                'cw_1800': cw_1800,
+                'cw_3600': cw_3600,
+                'floor_1800': floor_1800,
+                'floor_3600': floor_3600,
+                'lost_area': sum(pools) - sum(carried),
+                'pools': (leftover_1800, leftover_3600, leftover_1800_floor, leftover_3600_floor)
+            }
+            checkpoints.put(checkpoint_key, entry)
+        checkpoint_id = entry['checkpoint_id']
+        pools = entry['pools']
+        phase_results.append(entry)
+
+    return {
+        'phases': phase_results,
+        'total_cw_1800': sum(result['cw_1800'] for result in phase_results),
+        'total_cw_3600': sum(result['cw_3600'] for result in phase_results),
+        'total_floor_1800': sum(result['floor_1800'] for result in phase_results),
+        'total_floor_3600': sum(result['floor_3600'] for result in phase_results),
+        'total_rolls': sum(result['cw_1800'] + result['cw_3600'] + result['floor_1800'] + result['floor_3600']
+                           for result in phase_results),
+        'lost_area': sum(result['lost_area'] for result in phase_results),
+        'final_leftover_1800': pools[0],
+        'final_leftover_3600': pools[1],
+        'final_leftover_1800_floor': pools[2],
+        'final_leftover_3600_floor': pools[3],
+        'checkpoint_hits': checkpoint_hits,
+        'phases_replayed': phases_replayed
+    }
+
+
+def compare_phase_schedules(program, schedules, phase_loss=0.0):
+    """
+    Evaluate several named schedules on one program, sharing its checkpoints.
+
+    Args:
+        program: Result of compile_phase_program
+        schedules: Dict of schedule name → room_phases
+        phase_loss: As in evaluate_phase_schedule
+
+    Returns:
+        list: (name, evaluate_phase_schedule result) sorted by total rolls
+    """
+    results = [(name, evaluate_phase_schedule(program, room_phases, phase_loss))
+               for name, room_phases in schedules.items()]
+    results.sort(key=lambda item: item[1]['total_rolls'])
+    return results
@@ -0,0 +1,400 @@
+"""
+Compact binary project format for very large takeoffs.
+
+Usage:
+    python project_format.py convert ROOMS.csv PROJECT.sheetprj
+    python project_format.py totals PROJECT.sheetprj [--no-floor] [--no-ceiling] [--no-wall]
+
+A project file holds one fixed-width column per room field, a surface flag
+byte per room and a UTF-8 string table for the room names:
+
+    header      <8sIIQQ: magic, version, reserved, room_count, string table bytes
+    columns     PROJECT_COLUMNS in order, little-endian, each padded to 8 bytes
+    surfaces    uint8 per room (SURFACE_FLOOR | SURFACE_CEILING | SURFACE_WALL)
+    offsets     uint64 × (room_count + 1) into the string table
+    names       UTF-8 room names, back to back
+
+Column positions follow from the room count alone, so opening a file
+maps it and wraps every column with numpy.frombuffer without copying or
+parsing anything. Areas are derived once when the file is written.
+Wall segments and openings are not stored: rooms carry their net wall
+area and wall run length, and walls use the height pattern.
+"""
+
+import argparse
+import mmap
+import struct
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from breakpoints import get_ceiling_floor_breakpoint_index, get_wall_breakpoint_index
+from sheet_engine import ROLL_LENGTH, pool_ceiling_wall_steps, pool_floor_needs
+
+
+# ==============================================================================
+# CONSTANTS
+# ==============================================================================
+
+PROJECT_MAGIC = b'SHEETPRJ'
+PROJECT_VERSION = 1
+PROJECT_HEADER = struct.Struct('<8sIIQQ')
+
+# Fixed-width columns under the room dict keys the optimizers read
+PROJECT_COLUMNS = (
+    ('length_m', '<f8'),
+    ('width_mm', '<f8'),
+    ('height_mm', '<f8'),
+    ('perimeter', '<f8'),
+    ('floor_area', '<f8'),
+    ('ceiling_area', '<f8'),
+    ('wall_area', '<f8')
+)
+
+SURFACE_FLOOR = 1
+SURFACE_CEILING = 2
+SURFACE_WALL = 4
+SURFACE_ALL = SURFACE_FLOOR | SURFACE_CEILING | SURFACE_WALL
+
+# Rooms per batch in the batch optimizer: bounds the Python objects alive at once
+PROJECT_BATCH_ROOMS = 65536
+
+
+# ==============================================================================
+# BATCH ROOM METRICS
+# ==============================================================================
+
+def calculate_room_metrics_batch(length_m, width_m, height_m):
+    """
+    Vectorized calculate_room_metrics over arrays of room dimensions in meters.
+
+    Returns:
+        dict: floor_area, ceiling_area, perimeter, wall_area arrays and a valid
+              mask; rooms with a non-positive dimension have all values 0
+    """
+    length_m = np.asarray(length_m, dtype=np.float64)
+    width_m = np.asarray(width_m, dtype=np.float64)
+    height_m = np.asarray(height_m, dtype=np.float64)
+    valid = (length_m > 0) & (width_m > 0) & (height_m > 0)
+
+    floor_area = np.where(valid, length_m * width_m, 0.0)
+    perimeter = np.where(valid, 2 * (length_m + width_m), 0.0)
+    return {
+        'floor_area': floor_area,
+        'ceiling_area': floor_area.copy(),
+        'perimeter': perimeter,
+        'wall_area': np.where(valid, perimeter * height_m, 0.0),
+        'valid': valid
+    }
+
+
+# ==============================================================================
+# WRITING
+# ==============================================================================
+
+def _padding(size):
+    return b'\0' * (-size % 8)
+
+
+def write_project_columns(path, names, columns, surfaces=None):
+    """
+    Write a binary project file from whole columns.
+
+    Args:
+        path: Output file path
+        names: Room names
+        columns: Array-like per PROJECT_COLUMNS key
+        surfaces: Optional per-room surface flags (default SURFACE_ALL)
+
+    Returns:
+        int: Number of rooms written
+    """
+    room_count = len(names)
+    surface_flags = np.full(room_count, SURFACE_ALL, dtype=np.uint8) if surfaces is None \
+        else np.asarray(surfaces, dtype=np.uint8)
+    encoded_names = [str(name).encode('utf-8') for name in names]
+    name_offsets = np.zeros(room_count + 1, dtype='<u8')
+    np.cumsum([len(name) for name in encoded_names], out=name_offsets[1:])
+    names_blob = b''.join(encoded_names)
+
+    with open(path, 'wb') as project_file:
+        project_file.write(PROJECT_HEADER.pack(PROJECT_MAGIC, PROJECT_VERSION, 0, room_count, len(names_blob)))
+        for key, dtype in PROJECT_COLUMNS:
+            project_file.write(np.asarray(columns[key], dtype=dtype).tobytes())
+        project_file.write(surface_flags.tobytes() + _padding(room_count))
+        project_file.write(name_offsets.tobytes())
+        project_file.write(names_blob)
+    return room_count
+
+
+def write_project(path, rooms, surfaces=None):
+    """
+    Write room dictionaries as a binary project file.
+
+    Args:
+        path: Output file path
+        rooms: Room dictionaries with name and the PROJECT_COLUMNS keys (as
+               derived for the optimizers; missing areas are computed here)
+        surfaces: Optional per-room surface flags (default SURFACE_ALL)
+
+    Returns:
+        int: Number of rooms written
+    """
+    columns = {
+        key: np.array([room.get(key, 0) for room in rooms], dtype=dtype)
+        for key, dtype in PROJECT_COLUMNS
+    }
+    metrics = calculate_room_metrics_batch(
+        columns['length_m'], columns['width_mm'] / 1000, columns['height_mm'] / 1000
+    )
+    for key in ('floor_area', 'ceiling_area', 'wall_area', 'perimeter'):
+        missing = np.array([key not in room for room in rooms], dtype=bool)
+        columns[key][missing] = metrics[key][missing]
+    return write_project_columns(path, [room['name'] for room in rooms], columns, surfaces)
+
+
+def convert_rooms_csv(csv_path, project_path):
+    """
+    Convert a room list CSV (name, length, width, height in m, as in the multi-room tab) once.
+
+    Rooms with a non-positive dimension are dropped, like on import.
+
+    Returns:
+        int: Number of rooms written
+    """
+    frame = pd.read_csv(csv_path)
+    metrics = calculate_room_metrics_batch(frame['length'], frame['width'], frame['height'])
+    valid = metrics['valid']
+    frame = frame[valid]
+    columns = {
+        'length_m': frame['length'].to_numpy(),
+        'width_mm': frame['width'].to_numpy() * 1000,
+        'height_mm': frame['height'].to_numpy() * 1000,
+        **{key: metrics[key][valid] for key in ('floor_area', 'ceiling_area', 'wall_area', 'perimeter')}
+    }
+    return write_project_columns(project_path, frame['name'].astype(str).tolist(), columns)
+
+
+# ==============================================================================
+# READING
+# ==============================================================================
+
+class ProjectFile:
+    """
+    Read-only, memory-mapped view of a binary project file.
+
+    Columns are numpy arrays over the mapping (no copies); they are only
+    valid until close(). Use as a context manager and drop the arrays
+    before leaving it.
+    """
+
+    def __init__(self, path):
+        self._file = open(path, 'rb')
+        try:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty files cannot be mapped
+            self._file.close()
+            raise ValueError(f"{path} is not a project file")
+        buffer = memoryview(self._mmap)
+
+        magic, version, _, room_count, names_size = PROJECT_HEADER.unpack_from(buffer, 0)
+        if magic != PROJECT_MAGIC or version != PROJECT_VERSION:
+            buffer.release()
+            self.close()
+            raise ValueError(f"{path} is not a version {PROJECT_VERSION} project file")
+        self.room_count = room_count
+
+        offset = PROJECT_HEADER.size
+        self.columns = {}
+        for key, dtype in PROJECT_COLUMNS:
+            self.columns[key] = np.frombuffer(buffer, dtype=dtype, count=room_count, offset=offset)
+            offset += room_count * np.dtype(dtype).itemsize
+        self.surfaces = np.frombuffer(buffer, dtype=np.uint8, count=room_count, offset=offset)
+        offset += room_count + (-room_count % 8)
+        self.name_offsets = np.frombuffer(buffer, dtype='<u8', count=room_count + 1, offset=offset)
+        offset += (room_count + 1) * 8
+        self._names = buffer[offset:offset + names_size]
+
+    def __len__(self):
+        return self.room_count
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Unmap the file; raises BufferError while column arrays are still referenced."""
+        self.columns = {}
+        self.surfaces = self.name_offsets = self._names = None
+        if getattr(self, '_mmap', None) is not None:
+            self._mmap.close()
+            self._mmap = None
+        self._file.close()
+
+    def name(self, room_index):
+        start, end = self.name_offsets[room_index], self.name_offsets[room_index + 1]
+        return bytes(self._names[start:end]).decode('utf-8')
+
+    def surface_filtered_areas(self, include_floor=True, include_ceiling=True, include_wall=True, start=0, stop=None):
+        """
+        Area columns of rooms [start, stop) with disabled surfaces set to 0.
+
+        Surfaces are disabled per room by the file's flags and for all rooms by
+        the include_* arguments, like the surface checkboxes of the sheets tab.
+        """
+        surfaces = self.surfaces[start:stop]
+        areas = {}
+        for key, flag, included in (('floor_area', SURFACE_FLOOR, include_floor),
+                                    ('ceiling_area', SURFACE_CEILING, include_ceiling),
+                                    ('wall_area', SURFACE_WALL, include_wall)):
+            column = self.columns[key][start:stop]
+            areas[key] = np.where(surfaces & flag, column, 0.0) if included else np.zeros_like(column)
+        return areas
+
+    def iter_rooms(self, include_floor=True, include_ceiling=True, include_wall=True):
+        """
+        Yield surface-filtered room dicts one at a time, e.g. into iter_optimized_multi_room_ceiling_wall.
+
+        Only one batch of rooms is materialized at a time.
+        """
+        for start in range(0, self.room_count, PROJECT_BATCH_ROOMS):
+            stop = min(start + PROJECT_BATCH_ROOMS, self.room_count)
+            areas = self.surface_filtered_areas(include_floor, include_ceiling, include_wall, start, stop)
+            batch = {key: self.columns[key][start:stop].tolist()
+                     for key in ('length_m', 'width_mm', 'height_mm', 'perimeter')}
+            batch.update({key: values.tolist() for key, values in areas.items()})
+            for offset in range(stop - start):
+                yield {'name': self.name(start + offset), **{key: values[offset] for key, values in batch.items()}}
+
+
+# ==============================================================================
+# BATCH OPTIMIZER
+# ==============================================================================
+
+def _area_split(area, pattern_1800, pattern_3600, mask):
+    """Per-room coverage split by pattern ratio, with the optimizers' float arithmetic."""
+    total_pattern_units = pattern_1800 + pattern_3600
+    use = mask & (area > 0) & (total_pattern_units > 0)
+    safe_units = np.where(use, total_pattern_units, 1)
+    return (
+        np.where(use, area * (pattern_1800 / safe_units), 0.0),
+        np.where(use, area * (pattern_3600 / safe_units), 0.0)
+    )
+
+
+def calculate_project_roll_totals(project, has_floor_covering=False, include_floor=True, include_ceiling=True,
+                                  include_wall=True):
+    """
+    Mixed-width roll totals for every room of a project file, in batches.
+
+    Patterns and area splits are computed per batch with vectorized lookups;
+    only the pool arithmetic runs room by room. Totals equal the mixed-width
+    optimizers on project.iter_rooms() (height-pattern walls).
+
+    Args:
+        project: Open ProjectFile
+        has_floor_covering: Whether floor covering is being calculated (affects wall patterns)
+        include_floor, include_ceiling, include_wall: Surface selection
+
+    Returns:
+        dict: room_count, roll totals and final leftovers of the ceiling/wall and floor pools
+    """
+    ceiling_floor_index = get_ceiling_floor_breakpoint_index()
+    wall_index = get_wall_breakpoint_index(has_floor_covering)
+    leftover_1800 = leftover_3600 = 0
+    leftover_1800_floor = leftover_3600_floor = 0
+    totals = {'total_cw_1800': 0, 'total_cw_3600': 0, 'total_floor_1800': 0, 'total_floor_3600': 0}
+
+    for start in range(0, project.room_count, PROJECT_BATCH_ROOMS):
+        stop = min(start + PROJECT_BATCH_ROOMS, project.room_count)
+        width_mm = project.columns['width_mm'][start:stop]
+        height_mm = project.columns['height_mm'][start:stop]
+        length_m = project.columns['length_m'][start:stop]
+        perimeter = project.columns['perimeter'][start:stop]
+        areas = project.surface_filtered_areas(include_floor, include_ceiling, include_wall, start, stop)
+
+        patterns = ceiling_floor_index.lookup_many(width_mm)
+        pattern_1800, pattern_3600 = patterns[:, 0], patterns[:, 1]
+
+        # Ceiling/wall steps of the rooms the optimizer visits
+        visited = (areas['ceiling_area'] > 0) | (areas['wall_area'] > 0)
+        ceiling_1800, ceiling_3600 = _area_split(areas['ceiling_area'], pattern_1800, pattern_3600, width_mm > 0)
+        has_walls = (height_mm > 0) & (perimeter > 0)
+        wall_sets = np.where(has_walls, np.ceil(perimeter / ROLL_LENGTH), 0).astype(np.int64)
+        wall_patterns = wall_index.lookup_many(np.where(has_walls, height_mm, 0))
+        steps = zip(
+            ceiling_1800[visited].tolist(),
+            ceiling_3600[visited].tolist(),
+            areas['wall_area'][visited].tolist(),
+            (wall_patterns[:, 0] * wall_sets)[visited].tolist(),
+            (wall_patterns[:, 1] * wall_sets)[visited].tolist()
+        )
+        leftover_1800, leftover_3600, rolls_1800, rolls_3600 = pool_ceiling_wall_steps(
+            steps, leftover_1800, leftover_3600
+        )
+        totals['total_cw_1800'] += rolls_1800
+        totals['total_cw_3600'] += rolls_3600
+
+        if include_floor:
+            floor_rooms = (width_mm > 0) & (length_m > 0)
+            floor_1800, floor_3600 = _area_split(areas['floor_area'], pattern_1800, pattern_3600, floor_rooms)
+            leftover_1800_floor, leftover_3600_floor, rolls_1800, rolls_3600 = pool_floor_needs(
+                zip(floor_1800.tolist(), floor_3600.tolist()), leftover_1800_floor, leftover_3600_floor
+            )
+            totals['total_floor_1800'] += rolls_1800
+            totals['total_floor_3600'] += rolls_3600
+
+    return {
+        'room_count': project.room_count,
+        **totals,
+        'final_leftover_1800': leftover_1800,
+        'final_leftover_3600': leftover_3600,
+        'final_leftover_1800_floor': leftover_1800_floor,
+        'final_leftover_3600_floor': leftover_3600_floor
+    }
+
+
+# ==============================================================================
+# COMMAND LINE
+# ==============================================================================
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Convert and analyze binary project files.")
+    commands = parser.add_subparsers(dest='command', required=True)
+    convert = commands.add_parser('convert', help="convert a room CSV (name,length,width,height in m)")
+    convert.add_argument('csv_path')
+    convert.add_argument('project_path')
+    totals = commands.add_parser('totals', help="mixed-width roll totals of a project file")
+    totals.add_argument('project_path')
+    totals.add_argument('--no-floor', action='store_true')
+    totals.add_argument('--no-ceiling', action='store_true')
+    totals.add_argument('--no-wall', action='store_true')
+    args = parser.parse_args(argv)
+
+    started_at = time.perf_counter()
+    if args.command == 'convert':
+        room_count = convert_rooms_csv(args.csv_path, args.project_path)
+        print(f"wrote {room_count} rooms to {args.project_path} in {time.perf_counter() - started_at:.2f}s")
+        return 0
+
+    with ProjectFile(args.project_path) as project:
+        result = calculate_project_roll_totals(
+            project,
+            has_floor_covering=not args.no_floor,
+            include_floor=not args.no_floor,
+            include_ceiling=not args.no_ceiling,
+            include_wall=not args.no_wall
+        )
+    for key, value in result.items():
+        print(f"{key}: {value:.3f}" if isinstance(value, float) else f"{key}: {value}")
+    print(f"elapsed: {time.perf_counter() - started_at:.2f}s")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
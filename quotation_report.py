@@ -0,0 +1,229 @@
+import datetime
+from html import escape
+from string import Template
+
+from sheet_engine import SHEET_SPECS
+
+
+# ==============================================================================
+# CONSTANTS
+# ==============================================================================
+
+REPORT_TITLE = '養生シート見積書'
+
+# Rooms per chunk: rows are formatted and joined in batches instead of one write per row
+REPORT_ROWS_PER_CHUNK = 200
+
+# Templates are parsed once at import; rendering only substitutes values
+_DOCUMENT_START = Template("""<!DOCTYPE html>
+<html lang="ja">
+<head>
+<meta charset="utf-8">
+<title>$title</title>
+<style>
+body { font-family: "Hiragino Sans", "Noto Sans JP", "Yu Gothic", sans-serif; font-size: 10pt; color: #222; margin: 16mm; }
+h1 { font-size: 18pt; margin: 0 0 4mm; }
+h2 { font-size: 12pt; margin: 8mm 0 2mm; border-bottom: 1px solid #888; }
+table { border-collapse: collapse; width: 100%; margin-bottom: 4mm; }
+th, td { border: 1px solid #bbb; padding: 1.2mm 2mm; }
+th { background: #f0f0f0; text-align: left; }
+td.num { text-align: right; font-variant-numeric: tabular-nums; }
+tr.total td { font-weight: bold; background: #fafafa; }
+.meta { color: #555; margin-bottom: 6mm; }
+@page { size: A4; margin: 12mm; }
+@media print {
+  body { margin: 0; }
+  h2 { break-after: avoid; }
+  tr { break-inside: avoid; }
+  thead { display: table-header-group; }
+}
+</style>
+</head>
+<body>
+<h1>$title</h1>
+<div class="meta">$project_line発行日: $issued_on ・ 対象: $room_count室</div>
+""")
+_DOCUMENT_END = "</body>\n</html>\n"
+
+_SECTION_START = Template("<h2>$heading</h2>\n<table>\n<thead><tr>$header_cells</tr></thead>\n<tbody>\n")
+_SECTION_END = "</tbody>\n</table>\n"
+
+_ROLL_ROW = Template(
+    '<tr><td>$usage</td><td>$sheet</td><td class="num">$rolls</td></tr>\n'
+)
+_ROLL_TOTAL_ROW = Template('<tr class="total"><td colspan="2">$label</td><td class="num">$rolls</td></tr>\n')
+_LEFTOVER_ROW = Template('<tr><td>$usage</td><td class="num">$leftover_1800</td><td class="num">$leftover_3600</td></tr>\n')
+_CEILING_WALL_ROW = Template(
+    '<tr><td>$name</td><td class="num">$ceiling_from_leftover</td><td class="num">$new_ceiling</td>'
+    '<td class="num">$wall_from_leftover</td><td class="num">$new_wall</td>'
+    '<td class="num">$total_1800</td><td class="num">$total_3600</td></tr>\n'
+)
+_FLOOR_ROW = Template(
+    '<tr><td>$name</td><td class="num">$from_leftover</td><td class="num">$new_1800</td>'
+    '<td class="num">$new_3600</td></tr>\n'
+)
+_VALUE_ROW = Template('<tr><th>$label</th><td class="num">$value</td></tr>\n')
+
+
+# ==============================================================================
+# REPORT
+# ==============================================================================
+
+def _header_cells(labels):
+    return ''.join(f'<th>{label}</th>' for label in labels)
+
+
+def _area(value):
+    return f'{value:,.1f} m²'
+
+
+def _rolls_by_width(rolls_1800, rolls_3600):
+    return ' + '.join(part for part in (
+        f'{rolls_1800} × 1800mm' if rolls_1800 else '',
+        f'{rolls_3600} × 3600mm' if rolls_3600 else ''
+    ) if part) or '—'
+
+
+def _roll_rows(optimization, scaffolding):
+    include_floor = optimization['include_floor_calc']
+    rows = [
+        ('天井・壁', SHEET_SPECS['ceiling_thin']['name'], optimization['total_cw_1800']),
+        ('天井・壁', SHEET_SPECS['ceiling_wide']['name'], optimization['total_cw_3600'])
+    ]
+    if include_floor:
+        rows.append(('床 (2層)', SHEET_SPECS['floor_thin']['name'], optimization['total_floor_1800']))
+        rows.append(('床 (2層)', SHEET_SPECS['floor_wide']['name'], optimization['total_floor_3600']))
+    if scaffolding is not None:
+        # Scaffolding is covered with 1800mm rolls only
+        rows.append(('足場 上面', SHEET_SPECS['floor_thin']['name'], scaffolding['total_top_rolls']))
+        rows.append(('足場 下面', SHEET_SPECS['ceiling_thin']['name'], scaffolding['total_bottom_rolls']))
+        rows.append(('足場 側壁', SHEET_SPECS['ceiling_thin']['name'], scaffolding['total_side_wall_rolls']))
+    return rows
+
+
+def _chunked_rows(room_results, row_template, row_values):
+    for start in range(0, len(room_results), REPORT_ROWS_PER_CHUNK):
+        yield ''.join([
+            row_template.substitute(row_values(room_result))
+            for room_result in room_results[start:start + REPORT_ROWS_PER_CHUNK]
+        ])
+
+
+def _ceiling_wall_row_values(room_result):
+    return {
+        'name': escape(str(room_result['name'])),
+        'ceiling_from_leftover': _area(room_result.get('ceiling_1800_from_leftover', 0) +
+                                       room_result.get('ceiling_3600_from_leftover', 0)),
+        'new_ceiling': _rolls_by_width(room_result.get('new_ceiling_1800_rolls', 0),
+                                       room_result.get('new_ceiling_3600_rolls', 0)),
+        'wall_from_leftover': _area(room_result.get('wall_1800_from_leftover', 0) +
+                                    room_result.get('wall_3600_from_leftover', 0)),
+        'new_wall': _rolls_by_width(room_result.get('additional_wall_1800_rolls', 0),
+                                    room_result.get('additional_wall_3600_rolls', 0)),
+        'total_1800': room_result.get('room_total_1800', 0),
+        'total_3600': room_result.get('room_total_3600', 0)
+    }
+
+
+def _floor_row_values(room_result):
+    return {
+        'name': escape(str(room_result['name'])),
+        'from_leftover': _area(room_result.get('floor_1800_from_leftover', 0) +
+                               room_result.get('floor_3600_from_leftover', 0)),
+        'new_1800': room_result.get('new_floor_1800_rolls', 0),
+        'new_3600': room_result.get('new_floor_3600_rolls', 0)
+    }
+
+
+def iter_quotation_html(optimization, scaffolding=None, project_name='', issued_on=None):
+    """
+    Stream a printable HTML quotation from finished results, chunk by chunk.
+
+    Nothing is recomputed: the document is filled from an optimization job
+    result and, optionally, the scaffolding requirements of the building tab.
+
+    Args:
+        optimization: Result dict of a finished optimization job (run_optimization_job)
+        scaffolding: Optional dict of calculate_scaffolding_requirements or
+                     calculate_mixed_scaffolding_requirements
+        project_name: Project or customer name shown in the header
+        issued_on: Issue date (defaults to today)
+
+    Yields:
+        str: Consecutive pieces of the HTML document
+    """
+    ceiling_wall_results = optimization['ceiling_wall_results'] or {}
+    floor_results = optimization['floor_results'] or {}
+    room_results = ceiling_wall_results.get('room_results', [])
+    floor_room_results = floor_results.get('floor_room_results', [])
+    include_floor = optimization['include_floor_calc']
+
+    yield _DOCUMENT_START.substitute(
+        title=REPORT_TITLE,
+        project_line=f'{escape(project_name)} ・ ' if project_name else '',
+        issued_on=(issued_on or datetime.date.today()).isoformat(),
+        room_count=len(room_results)
+    )
+
+    # Roll totals by width and thickness
+    roll_rows = _roll_rows(optimization, scaffolding)
+    yield _SECTION_START.substitute(heading='ロール数量 (幅・厚さ別)', header_cells=_header_cells(('用途', 'シート', 'ロール数')))
+    yield ''.join([_ROLL_ROW.substitute(usage=usage, sheet=sheet, rolls=rolls) for usage, sheet, rolls in roll_rows])
+    yield _ROLL_TOTAL_ROW.substitute(label='合計', rolls=sum(rolls for _, _, rolls in roll_rows))
+    yield _SECTION_END
+
+    # Leftovers after the last room
+    yield _SECTION_START.substitute(heading='余り材料 (最終)', header_cells=_header_cells(('用途', '1800mm', '3600mm')))
+    yield _LEFTOVER_ROW.substitute(
+        usage='天井・壁 (0.1mm)',
+        leftover_1800=_area(ceiling_wall_results.get('final_leftover_1800', 0)),
+        leftover_3600=_area(ceiling_wall_results.get('final_leftover_3600', 0))
+    )
+    if include_floor:
+        yield _LEFTOVER_ROW.substitute(
+            usage='床 (0.15mm)',
+            leftover_1800=_area(floor_results.get('final_leftover_1800_floor', 0)),
+            leftover_3600=_area(floor_results.get('final_leftover_3600_floor', 0))
+        )
+    yield _SECTION_END
+
+    # Room breakdowns
+    yield _SECTION_START.substitute(heading='部屋別内訳 (天井・壁)', header_cells=_header_cells(
+        ('部屋名', '天井 余りから', '天井 新規ロール', '壁 余りから', '壁 追加ロール', '1800mm', '3600mm')
+    ))
+    yield from _chunked_rows(room_results, _CEILING_WALL_ROW, _ceiling_wall_row_values)
+    yield _SECTION_END
+
+    if include_floor and floor_room_results:
+        yield _SECTION_START.substitute(heading='部屋別内訳 (床)', header_cells=_header_cells(
+            ('部屋名', '余りから', '新規 1800mm', '新規 3600mm')
+        ))
+        yield from _chunked_rows(floor_room_results, _FLOOR_ROW, _floor_row_values)
+        yield _SECTION_END
+
+    if scaffolding is not None:
+        yield _SECTION_START.substitute(heading='外壁足場', header_cells=_header_cells(('項目', '値')))
+        yield ''.join([_VALUE_ROW.substitute(label=label, value=value) for label, value in (
+            ('足場総長さ', f"{scaffolding['total_scaffolding_length']:.3f} m"),
+            ('足場総高さ', f"{scaffolding['total_scaffolding_height']:.3f} m"),
+            ('長さ方向 × 高さ方向ユニット', f"{scaffolding['units_along_length']} × {scaffolding['units_along_height']}"),
+            ('上面カバー面積', _area(scaffolding['total_top_area'])),
+            ('下面カバー面積', _area(scaffolding['total_bottom_area'])),
+            ('側壁面積', _area(scaffolding['side_wall_area'])),
+            ('総カバー面積', _area(scaffolding['total_coverage_area'])),
+            ('足場ロール合計 (1800mm)', scaffolding['total_all_rolls'])
+        )])
+        yield _SECTION_END
+
+    yield _DOCUMENT_END
+
+
+def render_quotation_html(optimization, scaffolding=None, project_name='', issued_on=None):
+    """Return the whole quotation document as one string (see iter_quotation_html)."""
+    return ''.join(iter_quotation_html(optimization, scaffolding, project_name, issued_on))
+
+
+def write_quotation_html(output_file, optimization, scaffolding=None, project_name='', issued_on=None):
+    """Stream the quotation into an open text file without building the whole document in memory."""
+    for chunk in iter_quotation_html(optimization, scaffolding, project_name, issued_on):
+        output_file.write(chunk)
@@ -0,0 +1,842 @@
+"""
+Frozen reference oracles for the differential harness (oracle_harness.py).
+
+Verbatim copies of the roll pattern functions and optimizers as they were
+before any fast engine variant existed. Do not edit: every faster variant
+is checked against these, not against the live sheet_engine code.
+"""
+
+import math
+
+# ==============================================================================
+# CONSTANTS & SPECIFICATIONS
+# ==============================================================================
+
+SHEET_SPECS = {
+    'ceiling_thin': {
+        'name': '養生シート 0.1mm × 1800mm × 50m',
+        'width_mm': 1800,
+        'length_m': 50,
+        'thickness_mm': 0.1,
+        'nominal_coverage': 90,
+        'overlap_factor': 0.8,  # 20%重複
+        'actual_coverage': 72,
+        'description': '天井用 (1層)'
+    },
+    'ceiling_wide': {
+        'name': '養生シート 0.1mm × 3600mm × 50m',
+        'width_mm': 3600,
+        'length_m': 50,
+        'thickness_mm': 0.1,
+        'nominal_coverage': 180,
+        'overlap_factor': 0.8,  # 20%重複
+        'actual_coverage': 144,
+        'description': '天井用 (1層)'
+    },
+    'wall_thin': {
+        'name': '養生シート 0.1mm × 1800mm × 50m',
+        'width_mm': 1800,
+        'length_m': 50,
+        'thickness_mm': 0.1,
+        'nominal_coverage': 90,
+        'overlap_factor': 0.8,  # 20%重複
+        'actual_coverage': 72,
+        'description': '壁面用 (1層)'
+    },
+    'wall_wide': {
+        'name': '養生シート 0.1mm × 3600mm × 50m',
+        'width_mm': 3600,
+        'length_m': 50,
+        'thickness_mm': 0.1,
+        'nominal_coverage': 180,
+        'overlap_factor': 0.8,  # 20%重複
+        'actual_coverage': 144,
+        'description': '壁面用 (1層)'
+    },
+    'floor_thin': {
+        'name': '養生シート 0.15mm × 1800mm × 50m',
+        'width_mm': 1800,
+        'length_m': 50,
+        'thickness_mm': 0.15,
+        'nominal_coverage': 90,
+        'layers_required': 2,
+        'actual_coverage': 36,  # 2層必要のため半分
+        'description': '床面用 (2層必要)'
+    },
+    'floor_wide': {
+        'name': '養生シート 0.15mm × 3600mm × 50m',
+        'width_mm': 3600,
+        'length_m': 50,
+        'thickness_mm': 0.15,
+        'nominal_coverage': 180,
+        'layers_required': 2,
+        'actual_coverage': 72,  # 2層必要のため半分
+        'description': '床面用 (2層必要)'
+    }
+}
+
+ROLL_WIDTH_1800 = 1800
+ROLL_WIDTH_3600 = 3600
+ROLL_LENGTH = 50
+
+# ==============================================================================
+# HELPER FUNCTIONS - ROLL CALCULATIONS
+# ==============================================================================
+
+def calculate_roll_combination_by_dimension(dimension_mm):
+    """
+    Calculate optimal roll combination based on a dimension (width for ceiling/floor).
+    Returns the combination pattern, number of 1800mm rolls, and number of 3600mm rolls.
+    
+    Logic follows the specific pattern:
+    - dimension ≤ 1200mm: use 1×1800mm
+    - dimension ≤ 3000mm: use 1×3600mm
+    - dimension 3000mm < 4500mm: use 1×3600mm + 1×1800mm
+    - dimension 4500mm < 6300mm: use 2×3600mm
+    - dimension 6300mm < 7800mm: use 2×3600mm + 1×1800mm
+    - dimension 7800mm < 9600mm: use 3×3600mm
+    - dimension 9600mm < 11100mm: use 3×3600mm + 1×1800mm
+    - dimension 11100mm < 12900mm: use 4×3600mm
+    - Continue pattern: alternate adding 3600mm then 1800mm until 100000mm
+    """
+    if dimension_mm <= 0:
+        return [], 0, 0
+    
+    # Handle dimensions up to 100000mm with the specified pattern
+    if dimension_mm <= 1200:
+        rolls_1800, rolls_3600 = 1, 0
+    elif dimension_mm <= 3000:
+        rolls_1800, rolls_3600 = 0, 1
+    elif dimension_mm <= 4500:
+        rolls_1800, rolls_3600 = 1, 1
+    elif dimension_mm <= 6300:
+        rolls_1800, rolls_3600 = 0, 2
+    elif dimension_mm <= 7800:
+        rolls_1800, rolls_3600 = 1, 2
+    elif dimension_mm <= 9600:
+        rolls_1800, rolls_3600 = 0, 3
+    elif dimension_mm <= 11100:
+        rolls_1800, rolls_3600 = 1, 3
+    elif dimension_mm <= 12900:
+        rolls_1800, rolls_3600 = 0, 4
+    elif dimension_mm <= 14400:
+        rolls_1800, rolls_3600 = 1, 4
+    elif dimension_mm <= 16200:
+        rolls_1800, rolls_3600 = 0, 5
+    elif dimension_mm <= 17700:
+        rolls_1800, rolls_3600 = 1, 5
+    elif dimension_mm <= 19500:
+        rolls_1800, rolls_3600 = 0, 6
+    elif dimension_mm <= 21000:
+        rolls_1800, rolls_3600 = 1, 6
+    elif dimension_mm <= 22800:
+        rolls_1800, rolls_3600 = 0, 7
+    elif dimension_mm <= 24300:
+        rolls_1800, rolls_3600 = 1, 7
+    elif dimension_mm <= 26100:
+        rolls_1800, rolls_3600 = 0, 8
+    elif dimension_mm <= 27600:
+        rolls_1800, rolls_3600 = 1, 8
+    elif dimension_mm <= 29400:
+        rolls_1800, rolls_3600 = 0, 9
+    elif dimension_mm <= 30900:
+        rolls_1800, rolls_3600 = 1, 9
+    elif dimension_mm <= 32700:
+        rolls_1800, rolls_3600 = 0, 10
+    elif dimension_mm <= 34200:
+        rolls_1800, rolls_3600 = 1, 10
+    elif dimension_mm <= 36000:
+        rolls_1800, rolls_3600 = 0, 11
+    elif dimension_mm <= 37500:
+        rolls_1800, rolls_3600 = 1, 11
+    elif dimension_mm <= 39300:
+        rolls_1800, rolls_3600 = 0, 12
+    elif dimension_mm <= 40800:
+        rolls_1800, rolls_3600 = 1, 12
+    elif dimension_mm <= 42600:
+        rolls_1800, rolls_3600 = 0, 13
+    elif dimension_mm <= 44100:
+        rolls_1800, rolls_3600 = 1, 13
+    elif dimension_mm <= 45900:
+        rolls_1800, rolls_3600 = 0, 14
+    elif dimension_mm <= 47400:
+        rolls_1800, rolls_3600 = 1, 14
+    elif dimension_mm <= 49200:
+        rolls_1800, rolls_3600 = 0, 15
+    elif dimension_mm <= 50700:
+        rolls_1800, rolls_3600 = 1, 15
+    elif dimension_mm <= 52500:
+        rolls_1800, rolls_3600 = 0, 16
+    elif dimension_mm <= 54000:
+        rolls_1800, rolls_3600 = 1, 16
+    elif dimension_mm <= 55800:
+        rolls_1800, rolls_3600 = 0, 17
+    elif dimension_mm <= 57300:
+        rolls_1800, rolls_3600 = 1, 17
+    elif dimension_mm <= 59100:
+        rolls_1800, rolls_3600 = 0, 18
+    elif dimension_mm <= 60600:
+        rolls_1800, rolls_3600 = 1, 18
+    elif dimension_mm <= 62400:
+        rolls_1800, rolls_3600 = 0, 19
+    elif dimension_mm <= 63900:
+        rolls_1800, rolls_3600 = 1, 19
+    elif dimension_mm <= 65700:
+        rolls_1800, rolls_3600 = 0, 20
+    elif dimension_mm <= 67200:
+        rolls_1800, rolls_3600 = 1, 20
+    elif dimension_mm <= 69000:
+        rolls_1800, rolls_3600 = 0, 21
+    elif dimension_mm <= 70500:
+        rolls_1800, rolls_3600 = 1, 21
+    elif dimension_mm <= 72300:
+        rolls_1800, rolls_3600 = 0, 22
+    elif dimension_mm <= 73800:
+        rolls_1800, rolls_3600 = 1, 22
+    elif dimension_mm <= 75600:
+        rolls_1800, rolls_3600 = 0, 23
+    elif dimension_mm <= 77100:
+        rolls_1800, rolls_3600 = 1, 23
+    elif dimension_mm <= 78900:
+        rolls_1800, rolls_3600 = 0, 24
+    elif dimension_mm <= 80400:
+        rolls_1800, rolls_3600 = 1, 24
+    elif dimension_mm <= 82200:
+        rolls_1800, rolls_3600 = 0, 25
+    elif dimension_mm <= 83700:
+        rolls_1800, rolls_3600 = 1, 25
+    elif dimension_mm <= 85500:
+        rolls_1800, rolls_3600 = 0, 26
+    elif dimension_mm <= 87000:
+        rolls_1800, rolls_3600 = 1, 26
+    elif dimension_mm <= 88800:
+        rolls_1800, rolls_3600 = 0, 27
+    elif dimension_mm <= 90300:
+        rolls_1800, rolls_3600 = 1, 27
+    elif dimension_mm <= 92100:
+        rolls_1800, rolls_3600 = 0, 28
+    elif dimension_mm <= 93600:
+        rolls_1800, rolls_3600 = 1, 28
+    elif dimension_mm <= 95400:
+        rolls_1800, rolls_3600 = 0, 29
+    elif dimension_mm <= 96900:
+        rolls_1800, rolls_3600 = 1, 29
+    elif dimension_mm <= 98700:
+        rolls_1800, rolls_3600 = 0, 30
+    elif dimension_mm <= 100000:
+        rolls_1800, rolls_3600 = 1, 30
+    else:
+        # For dimensions > 100000mm, use algorithmic approach
+        # Pattern: every 1800mm increment alternates between adding 3600mm and 1800mm
+        base_3600_rolls = int(dimension_mm // 3600)
+        remainder = dimension_mm % 3600
+        
+        if remainder <= 1200:
+            rolls_1800 = 1 if remainder > 0 else 0
+            rolls_3600 = base_3600_rolls
+        else:
+            # Need one more 3600mm roll for the remainder
+            rolls_1800 = 0
+            rolls_3600 = base_3600_rolls + 1
+    
+    # Build combination list for display
+    combination = []
+    for _ in range(rolls_3600):
+        combination.append("3600mm")
+    for _ in range(rolls_1800):
+        combination.append("1800mm")
+    
+    return combination, rolls_1800, rolls_3600
+
+
+def calculate_wall_roll_combination_by_dimension(dimension_mm, has_floor_covering=False):
+    """
+    Calculate optimal wall roll combination based on dimension and floor covering status.
+    
+    Args:
+        dimension_mm: Wall dimension in millimeters
+        has_floor_covering: Whether floor covering is being calculated
+    
+    Returns:
+        tuple: (combination_list, rolls_1800, rolls_3600)
+    
+    Logic without floor covering:
+    - dimension ≤ 1800mm: use 1×1800mm
+    - dimension ≤ 3600mm: use 1×3600mm  
+    - 3600mm < dimension ≤ 5400mm: use 1×3600mm + 1×1800mm
+    - 5400mm < dimension ≤ 7200mm: use 2×3600mm
+    - Continue pattern...
+    
+    Logic with floor covering:
+    - dimension ≤ 2100mm: use 1×1800mm
+    - dimension ≤ 3900mm: use 1×3600mm
+    - 3900mm < dimension ≤ 5700mm: use 1×3600mm + 1×1800mm
+    - 5700mm < dimension ≤ 7500mm: use 2×3600mm
+    - Continue pattern...
+    """
+    if dimension_mm <= 0:
+        return [], 0, 0
+    
+    rolls_1800 = 0
+    rolls_3600 = 0
+    remaining = dimension_mm
+    
+    # Set thresholds based on floor covering status
+    if has_floor_covering:
+        single_1800_threshold = 2100
+        single_3600_threshold = 3900
+        pattern_increment = 1800  # 2100 -> 3900 -> 5700 -> 7500...
+    else:
+        single_1800_threshold = 1800
+        single_3600_threshold = 3600
+        pattern_increment = 1800  # 1800 -> 3600 -> 5400 -> 7200...
+    
+    while remaining > 0:
+        if remaining <= single_1800_threshold:
+            rolls_1800 += 1
+            remaining = 0
+        elif remaining <= single_3600_threshold:
+            rolls_3600 += 1
+            remaining = 0
+        elif remaining <= single_3600_threshold + pattern_increment:
+            # Use 3600mm + 1800mm
+            rolls_3600 += 1
+            rolls_1800 += 1
+            remaining = 0
+        elif remaining <= single_3600_threshold + (2 * pattern_increment):
+            # Use 2×3600mm
+            rolls_3600 += 2
+            remaining = 0
+        else:
+            # For larger dimensions, subtract one 3600mm and continue
+            rolls_3600 += 1
+            remaining -= 3600
+            
+            # If remainder is small enough for 1800mm, use it
+            if remaining > 0 and remaining <= single_1800_threshold:
+                rolls_1800 += 1
+                remaining = 0
+    
+    # Build combination list for display
+    combination = []
+    for _ in range(rolls_3600):
+        combination.append("3600mm")
+    for _ in range(rolls_1800):
+        combination.append("1800mm")
+    
+    return combination, rolls_1800, rolls_3600
+
+
+def calculate_wall_rolls_by_height(height_mm, perimeter_m, has_floor_covering=False):
+    """
+    Calculate wall rolls based on height pattern and perimeter coverage.
+    
+    Args:
+        height_mm: Wall height in millimeters
+        perimeter_m: Room perimeter in meters
+        has_floor_covering: Whether floor covering is being calculated
+    
+    Returns:
+        tuple: (combination_list, rolls_1800_per_set, rolls_3600_per_set, num_sets)
+    """
+    if height_mm <= 0 or perimeter_m <= 0:
+        return [], 0, 0, 0
+    
+    # Get the height-based roll pattern using wall-specific logic
+    combination, rolls_1800_per_set, rolls_3600_per_set = calculate_wall_roll_combination_by_dimension(height_mm, has_floor_covering)
+    
+    # Calculate how many sets needed for perimeter coverage (50m per roll)
+    num_sets = math.ceil(perimeter_m / ROLL_LENGTH)
+    
+    # Total rolls = pattern per set × number of sets
+    total_rolls_1800 = rolls_1800_per_set * num_sets
+    total_rolls_3600 = rolls_3600_per_set * num_sets
+    
+    return combination, total_rolls_1800, total_rolls_3600, num_sets
+
+
+def calculate_floor_rolls_by_length(width_mm, length_m):
+    """
+    Calculate floor rolls based on width pattern and room length.
+    Floor requires 2 layers, so length calculation is doubled.
+    An additional 0.6m is added to the room length for safety margin/waste allowance.
+    
+    Args:
+        width_mm: Room width in millimeters
+        length_m: Room length in meters
+    
+    Returns:
+        tuple: (combination_list, total_rolls_1800, total_rolls_3600)
+    """
+    if width_mm <= 0 or length_m <= 0:
+        return [], 0, 0
+    
+    # Add 0.6m safety margin to room length
+    adjusted_length_m = length_m + 0.6
+    
+    # Get the width-based roll pattern
+    combination, rolls_1800_per_layer, rolls_3600_per_layer = calculate_roll_combination_by_dimension(width_mm)
+    
+    # Calculate total length needed (2 layers)
+    total_rolls_1800 = 0
+    total_rolls_3600 = 0
+    
+    if rolls_1800_per_layer > 0:
+        length_needed_1800 = adjusted_length_m * 2 * rolls_1800_per_layer
+        total_rolls_1800 = math.ceil(length_needed_1800 / ROLL_LENGTH)
+    
+    if rolls_3600_per_layer > 0:
+        length_needed_3600 = adjusted_length_m * 2 * rolls_3600_per_layer
+        total_rolls_3600 = math.ceil(length_needed_3600 / ROLL_LENGTH)
+    
+    return combination, total_rolls_1800, total_rolls_3600
+
+
+def calculate_optimized_multi_room_floor(rooms_data):
+    """
+    Calculate optimized floor roll usage across ALL rooms.
+    This function pools leftover material across rooms to minimize total rolls needed.
+    
+    Args:
+        rooms_data: List of room dictionaries with floor_area, width_mm, length_m
+    
+    Returns:
+        dict: Detailed breakdown including per-room usage and cross-room optimization
+    """
+    if not rooms_data:
+        return {}, 0, 0
+    
+    # Track global leftover coverage that can be shared between rooms (in m²)
+    global_leftover_1800_floor = 0
+    global_leftover_3600_floor = 0
+    
+    # Track total rolls needed
+    total_rolls_1800_floor = 0
+    total_rolls_3600_floor = 0
+    
+    # Track detailed results per room
+    floor_room_results = []
+    
+    # Floor coverage values (0.15mm thickness, 2 layers required)
+    coverage_1800_floor = SHEET_SPECS['floor_thin']['actual_coverage']
+    coverage_3600_floor = SHEET_SPECS['floor_wide']['actual_coverage']
+    
+    for room in rooms_data:
+        room_name = room['name']
+        floor_area = room.get('floor_area', 0)
+        width_mm = room.get('width_mm', 0)
+        length_m = room.get('length_m', 0)
+        
+        if floor_area <= 0 or width_mm <= 0 or length_m <= 0:
+            continue
+        
+        # Get the width-based roll pattern
+        combination, rolls_1800_per_layer, rolls_3600_per_layer = calculate_roll_combination_by_dimension(width_mm)
+        
+        # Calculate floor coverage needed (the actual_coverage already accounts for 2 layers)
+        floor_1800_coverage_needed = 0
+        floor_3600_coverage_needed = 0
+        
+        if floor_area > 0 and width_mm > 0:
+            total_pattern_units = rolls_1800_per_layer + rolls_3600_per_layer
+            if total_pattern_units > 0:
+                # Do NOT double the area - actual_coverage already accounts for 2 layers
+                floor_1800_coverage_needed = floor_area * (rolls_1800_per_layer / total_pattern_units)
+                floor_3600_coverage_needed = floor_area * (rolls_3600_per_layer / total_pattern_units)
+        
+        # === TRY TO USE GLOBAL LEFTOVER FOR FLOOR FIRST ===
+        floor_1800_from_leftover = 0
+        floor_3600_from_leftover = 0
+        
+        if floor_1800_coverage_needed > 0 and global_leftover_1800_floor > 0:
+            floor_1800_from_leftover = min(global_leftover_1800_floor, floor_1800_coverage_needed)
+            global_leftover_1800_floor -= floor_1800_from_leftover
+            floor_1800_coverage_needed -= floor_1800_from_leftover
+        
+        if floor_3600_coverage_needed > 0 and global_leftover_3600_floor > 0:
+            floor_3600_from_leftover = min(global_leftover_3600_floor, floor_3600_coverage_needed)
+            global_leftover_3600_floor -= floor_3600_from_leftover
+            floor_3600_coverage_needed -= floor_3600_from_leftover
+        
+        # Calculate NEW rolls needed for remaining floor coverage
+        new_floor_1800_rolls = 0
+        new_floor_3600_rolls = 0
+        new_leftover_1800_floor = 0
+        new_leftover_3600_floor = 0
+        
+        # Use same approach as ceiling/wall: work entirely in coverage area (m²)
+        if floor_1800_coverage_needed > 0:
+            rolls_exact = floor_1800_coverage_needed / coverage_1800_floor
+            new_floor_1800_rolls = math.ceil(rolls_exact)
+            new_leftover_1800_floor = (new_floor_1800_rolls - rolls_exact) * coverage_1800_floor
+        
+        if floor_3600_coverage_needed > 0:
+            rolls_exact = floor_3600_coverage_needed / coverage_3600_floor
+            new_floor_3600_rolls = math.ceil(rolls_exact)
+            new_leftover_3600_floor = (new_floor_3600_rolls - rolls_exact) * coverage_3600_floor
+        
+        # Add new leftovers to global pool
+        global_leftover_1800_floor += new_leftover_1800_floor
+        global_leftover_3600_floor += new_leftover_3600_floor
+        
+        # Update totals
+        total_rolls_1800_floor += new_floor_1800_rolls
+        total_rolls_3600_floor += new_floor_3600_rolls
+        
+        # Store results
+        floor_room_results.append({
+            'name': room_name,
+            'floor_1800_from_leftover': floor_1800_from_leftover,
+            'floor_3600_from_leftover': floor_3600_from_leftover,
+            'new_floor_1800_rolls': new_floor_1800_rolls,
+            'new_floor_3600_rolls': new_floor_3600_rolls,
+            'room_total_1800': new_floor_1800_rolls,
+            'room_total_3600': new_floor_3600_rolls,
+            'floor_combination': combination
+        })
+    
+    return {
+        'floor_room_results': floor_room_results,
+        'total_rolls_1800_floor': total_rolls_1800_floor,
+        'total_rolls_3600_floor': total_rolls_3600_floor,
+        'final_leftover_1800_floor': global_leftover_1800_floor,
+        'final_leftover_3600_floor': global_leftover_3600_floor
+    }, total_rolls_1800_floor, total_rolls_3600_floor
+
+
+def calculate_optimized_multi_room_ceiling_wall(rooms_data, has_floor_covering=False):
+    """
+    Calculate optimized roll usage across ALL rooms for ceiling and walls.
+    This function pools leftover material across rooms to minimize total rolls needed.
+    
+    Args:
+        rooms_data: List of room dictionaries with ceiling_area, wall_area, width_mm, height_mm, perimeter
+        has_floor_covering: Whether floor covering is being calculated (affects wall dimension logic)
+    
+    Returns:
+        dict: Detailed breakdown including per-room usage and cross-room optimization
+    """
+    if not rooms_data:
+        return {}, 0, 0
+    
+    # Track global leftover coverage that can be shared between rooms
+    global_leftover_1800 = 0
+    global_leftover_3600 = 0
+    
+    # Track total rolls needed
+    total_rolls_1800 = 0
+    total_rolls_3600 = 0
+    
+    # Track detailed results per room
+    room_results = []
+    
+    # Coverage values
+    coverage_1800 = SHEET_SPECS['ceiling_thin']['actual_coverage']
+    coverage_3600 = SHEET_SPECS['ceiling_wide']['actual_coverage']
+    
+    for room in rooms_data:
+        room_name = room['name']
+        ceiling_area = room.get('ceiling_area', 0)
+        wall_area = room.get('wall_area', 0)
+        width_mm = room.get('width_mm', 0)
+        height_mm = room.get('height_mm', 0)
+        perimeter = room.get('perimeter', 0)
+        
+        if ceiling_area <= 0 and wall_area <= 0:
+            continue
+        
+        # Get patterns
+        ceiling_combination, ceiling_1800_pattern, ceiling_3600_pattern = \
+            calculate_roll_combination_by_dimension(width_mm) if width_mm > 0 else ([], 0, 0)
+        
+        wall_combination, wall_1800_per_set, wall_3600_per_set, wall_perimeter_sets = \
+            calculate_wall_rolls_by_height(height_mm, perimeter, has_floor_covering) if height_mm > 0 and perimeter > 0 else ([], 0, 0, 0)
+        
+        # Calculate ceiling coverage needed
+        ceiling_1800_coverage_needed = 0
+        ceiling_3600_coverage_needed = 0
+        
+        if ceiling_area > 0 and width_mm > 0:
+            total_pattern_units = ceiling_1800_pattern + ceiling_3600_pattern
+            if total_pattern_units > 0:
+                ceiling_1800_coverage_needed = ceiling_area * (ceiling_1800_pattern / total_pattern_units)
+                ceiling_3600_coverage_needed = ceiling_area * (ceiling_3600_pattern / total_pattern_units)
+        
+        # === TRY TO USE GLOBAL LEFTOVER FOR CEILING FIRST ===
+        ceiling_1800_from_leftover = 0
+        ceiling_3600_from_leftover = 0
+        
+        if ceiling_1800_coverage_needed > 0 and global_leftover_1800 > 0:
+            ceiling_1800_from_leftover = min(global_leftover_1800, ceiling_1800_coverage_needed)
+            global_leftover_1800 -= ceiling_1800_from_leftover
+            ceiling_1800_coverage_needed -= ceiling_1800_from_leftover
+        
+        if ceiling_3600_coverage_needed > 0 and global_leftover_3600 > 0:
+            ceiling_3600_from_leftover = min(global_leftover_3600, ceiling_3600_coverage_needed)
+            global_leftover_3600 -= ceiling_3600_from_leftover
+            ceiling_3600_coverage_needed -= ceiling_3600_from_leftover
+        
+        # Calculate NEW rolls needed for remaining ceiling coverage
+        new_ceiling_1800_rolls = 0
+        new_ceiling_3600_rolls = 0
+        new_leftover_1800 = 0
+        new_leftover_3600 = 0
+        
+        if ceiling_1800_coverage_needed > 0:
+            rolls_exact = ceiling_1800_coverage_needed / coverage_1800
+            new_ceiling_1800_rolls = math.ceil(rolls_exact)
+            new_leftover_1800 = (new_ceiling_1800_rolls - rolls_exact) * coverage_1800
+        
+        if ceiling_3600_coverage_needed > 0:
+            rolls_exact = ceiling_3600_coverage_needed / coverage_3600
+            new_ceiling_3600_rolls = math.ceil(rolls_exact)
+            new_leftover_3600 = (new_ceiling_3600_rolls - rolls_exact) * coverage_3600
+        
+        # Add new leftovers to global pool
+        global_leftover_1800 += new_leftover_1800
+        global_leftover_3600 += new_leftover_3600
+        
+        # === CALCULATE WALL NEEDS ===
+        remaining_wall_area = wall_area
+        
+        # Try to use global leftover for walls
+        wall_1800_from_leftover = 0
+        wall_3600_from_leftover = 0
+        
+        if remaining_wall_area > 0 and global_leftover_1800 > 0:
+            wall_1800_from_leftover = min(global_leftover_1800, remaining_wall_area)
+            global_leftover_1800 -= wall_1800_from_leftover
+            remaining_wall_area -= wall_1800_from_leftover
+        
+        if remaining_wall_area > 0 and global_leftover_3600 > 0:
+            wall_3600_from_leftover = min(global_leftover_3600, remaining_wall_area)
+            global_leftover_3600 -= wall_3600_from_leftover
+            remaining_wall_area -= wall_3600_from_leftover
+        
+        # Calculate additional rolls for remaining wall area
+        additional_wall_1800_rolls = 0
+        additional_wall_3600_rolls = 0
+        
+        if remaining_wall_area > 0:
+            if wall_1800_per_set > 0 or wall_3600_per_set > 0:
+                pattern_coverage_per_set = (wall_3600_per_set * coverage_3600) + (wall_1800_per_set * coverage_1800)
+                if pattern_coverage_per_set > 0:
+                    sets_needed = math.ceil(remaining_wall_area / pattern_coverage_per_set)
+                    additional_wall_3600_rolls = wall_3600_per_set * sets_needed
+                    additional_wall_1800_rolls = wall_1800_per_set * sets_needed
+                    
+                    # Calculate leftover from these additional wall rolls
+                    wall_coverage_provided = sets_needed * pattern_coverage_per_set
+                    wall_leftover = wall_coverage_provided - remaining_wall_area
+                    
+                    # Distribute leftover proportionally
+                    if wall_leftover > 0 and (wall_1800_per_set + wall_3600_per_set) > 0:
+                        leftover_1800_portion = wall_leftover * (wall_1800_per_set / (wall_1800_per_set + wall_3600_per_set))
+                        leftover_3600_portion = wall_leftover * (wall_3600_per_set / (wall_1800_per_set + wall_3600_per_set))
+                        global_leftover_1800 += leftover_1800_portion
+                        global_leftover_3600 += leftover_3600_portion
+            else:
+                # Fallback
+                if remaining_wall_area >= coverage_3600:
+                    additional_wall_3600_rolls = int(remaining_wall_area // coverage_3600)
+                    remaining_after_3600 = remaining_wall_area % coverage_3600
+                    if remaining_after_3600 > 0:
+                        additional_wall_1800_rolls = 1
+                        global_leftover_1800 += (coverage_1800 - remaining_after_3600)
+                else:
+                    additional_wall_1800_rolls = 1
+                    global_leftover_1800 += (coverage_1800 - remaining_wall_area)
+        
+        # Update totals
+        room_total_1800 = new_ceiling_1800_rolls + additional_wall_1800_rolls
+        room_total_3600 = new_ceiling_3600_rolls + additional_wall_3600_rolls
+        
+        total_rolls_1800 += room_total_1800
+        total_rolls_3600 += room_total_3600
+        
+        # Store results
+        room_results.append({
+            'name': room_name,
+            'ceiling_1800_from_leftover': ceiling_1800_from_leftover,
+            'ceiling_3600_from_leftover': ceiling_3600_from_leftover,
+            'new_ceiling_1800_rolls': new_ceiling_1800_rolls,
+            'new_ceiling_3600_rolls': new_ceiling_3600_rolls,
+            'wall_1800_from_leftover': wall_1800_from_leftover,
+            'wall_3600_from_leftover': wall_3600_from_leftover,
+            'additional_wall_1800_rolls': additional_wall_1800_rolls,
+            'additional_wall_3600_rolls': additional_wall_3600_rolls,
+            'room_total_1800': room_total_1800,
+            'room_total_3600': room_total_3600,
+            'ceiling_combination': ceiling_combination,
+            'wall_combination': wall_combination,
+            'wall_perimeter_sets': wall_perimeter_sets
+        })
+    
+    return {
+        'room_results': room_results,
+        'total_rolls_1800': total_rolls_1800,
+        'total_rolls_3600': total_rolls_3600,
+        'final_leftover_1800': global_leftover_1800,
+        'final_leftover_3600': global_leftover_3600
+    }, total_rolls_1800, total_rolls_3600
+
+
+def calculate_optimized_multi_room_ceiling_wall_1800_only(rooms_data, has_floor_covering=False):
+    """
+    Calculate optimized roll usage across ALL rooms for ceiling and walls.
+    ONLY uses 1800mm rolls (no 3600mm rolls).
+    This function pools leftover material across rooms to minimize total rolls needed.
+    
+    Args:
+        rooms_data: List of room dictionaries with ceiling_area, wall_area, width_mm, height_mm, perimeter
+        has_floor_covering: Whether floor covering is being calculated
+    
+    Returns:
+        dict: Detailed breakdown including per-room usage and cross-room optimization
+    """
+    if not rooms_data:
+        return {}, 0, 0
+    
+    # Track global leftover coverage that can be shared between rooms
+    global_leftover_1800 = 0
+    
+    # Track total rolls needed (only 1800mm)
+    total_rolls_1800 = 0
+    
+    # Track detailed results per room
+    room_results = []
+    
+    # Coverage values (only 1800mm)
+    coverage_1800 = SHEET_SPECS['ceiling_thin']['actual_coverage']  # 72 m²
+    
+    for room in rooms_data:
+        room_name = room['name']
+        ceiling_area = room.get('ceiling_area', 0)
+        wall_area = room.get('wall_area', 0)
+        
+        if ceiling_area <= 0 and wall_area <= 0:
+            continue
+        
+        total_area_needed = ceiling_area + wall_area
+        
+        # === TRY TO USE GLOBAL LEFTOVER FIRST ===
+        area_from_leftover = 0
+        
+        if total_area_needed > 0 and global_leftover_1800 > 0:
+            area_from_leftover = min(global_leftover_1800, total_area_needed)
+            global_leftover_1800 -= area_from_leftover
+            total_area_needed -= area_from_leftover
+        
+        # Calculate NEW rolls needed for remaining area
+        new_rolls_1800 = 0
+        new_leftover_1800 = 0
+        
+        if total_area_needed > 0:
+            rolls_exact = total_area_needed / coverage_1800
+            new_rolls_1800 = math.ceil(rolls_exact)
+            new_leftover_1800 = (new_rolls_1800 - rolls_exact) * coverage_1800
+        
+        # Add new leftovers to global pool
+        global_leftover_1800 += new_leftover_1800
+        
+        # Update totals
+        total_rolls_1800 += new_rolls_1800
+        
+        # Store results
+        room_results.append({
+            'name': room_name,
+            'area_from_leftover': area_from_leftover,
+            'new_rolls_1800': new_rolls_1800,
+            'room_total_1800': new_rolls_1800,
+            'room_total_3600': 0,  # No 3600mm rolls used
+            'ceiling_combination': ["1800mm"] if ceiling_area > 0 else [],
+            'wall_combination': ["1800mm"] if wall_area > 0 else []
+        })
+    
+    return {
+        'room_results': room_results,
+        'total_rolls_1800': total_rolls_1800,
+        'total_rolls_3600': 0,  # No 3600mm rolls
+        'final_leftover_1800': global_leftover_1800,
+        'final_leftover_3600': 0  # No 3600mm rolls
+    }, total_rolls_1800, 0
+
+
+def calculate_optimized_multi_room_floor_1800_only(rooms_data):
+    """
+    Calculate optimized floor roll usage across ALL rooms.
+    ONLY uses 1800mm rolls (no 3600mm rolls).
+    This function pools leftover material across rooms to minimize total rolls needed.
+    
+    Args:
+        rooms_data: List of room dictionaries with floor_area, width_mm, length_m
+    
+    Returns:
+        dict: Detailed breakdown including per-room usage and cross-room optimization
+    """
+    if not rooms_data:
+        return {}, 0, 0
+    
+    # Track global leftover coverage that can be shared between rooms (in m²)
+    global_leftover_1800_floor = 0
+    
+    # Track total rolls needed (only 1800mm)
+    total_rolls_1800_floor = 0
+    
+    # Track detailed results per room
+    floor_room_results = []
+    
+    # Floor coverage values (0.15mm thickness, 2 layers required) - only 1800mm
+    coverage_1800_floor = SHEET_SPECS['floor_thin']['actual_coverage']  # 36 m²
+    
+    for room in rooms_data:
+        room_name = room['name']
+        floor_area = room.get('floor_area', 0)
+        
+        if floor_area <= 0:
+            continue
+        
+        floor_coverage_needed = floor_area
+        
+        # === TRY TO USE GLOBAL LEFTOVER FOR FLOOR FIRST ===
+        floor_from_leftover = 0
+        
+        if floor_coverage_needed > 0 and global_leftover_1800_floor > 0:
+            floor_from_leftover = min(global_leftover_1800_floor, floor_coverage_needed)
+            global_leftover_1800_floor -= floor_from_leftover
+            floor_coverage_needed -= floor_from_leftover
+        
+        # Calculate NEW rolls needed for remaining floor coverage
+        new_floor_1800_rolls = 0
+        new_leftover_1800_floor = 0
+        
+        if floor_coverage_needed > 0:
+            rolls_exact = floor_coverage_needed / coverage_1800_floor
+            new_floor_1800_rolls = math.ceil(rolls_exact)
+            new_leftover_1800_floor = (new_floor_1800_rolls - rolls_exact) * coverage_1800_floor
+        
+        # Add new leftovers to global pool
+        global_leftover_1800_floor += new_leftover_1800_floor
+        
+        # Update totals
+        total_rolls_1800_floor += new_floor_1800_rolls
+        
+        # Store results
+        floor_room_results.append({
+            'name': room_name,
+            'floor_1800_from_leftover': floor_from_leftover,
+            'floor_3600_from_leftover': 0,  # No 3600mm rolls
+            'new_floor_1800_rolls': new_floor_1800_rolls,
+            'new_floor_3600_rolls': 0,  # No 3600mm rolls
+            'room_total_1800': new_floor_1800_rolls,
+            'room_total_3600': 0,  # No 3600mm rolls
+            'floor_combination': ["1800mm"] if floor_area > 0 else []
+        })
+    
+    return {
+        'floor_room_results': floor_room_results,
+        'total_rolls_1800_floor': total_rolls_1800_floor,
+        'total_rolls_3600_floor': 0,  # No 3600mm rolls
+        'final_leftover_1800_floor': global_leftover_1800_floor,
+        'final_leftover_3600_floor': 0  # No 3600mm rolls
+    }, total_rolls_1800_floor, 0
@@ -0,0 +1,202 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+
+from sheet_engine import SHEET_SPECS, SHEET_SPECS_VERSION
+
+
+# ==============================================================================
+# CONSTANTS
+# ==============================================================================
+
+RESULT_CACHE_DIR = os.environ.get('SHEET_CACHE_DIR', '.sheet_cache')
+RESULT_CACHE_MAX_BYTES = int(os.environ.get('SHEET_CACHE_MAX_BYTES', 64 * 1024 * 1024))
+
+# Floats are rounded before hashing so that 4.0 and 4.000000000001 share a key
+CACHE_KEY_FLOAT_DIGITS = 9
+
+_CACHE_FILE_SUFFIX = '.json'
+
+
+# ==============================================================================
+# CACHE KEYS
+# ==============================================================================
+
+def normalize_cache_input(value):
+    """
+    Convert an input value into a canonical JSON-compatible form.
+
+    Dict keys are sorted by json.dumps later; here floats are rounded,
+    integral floats collapse to ints and tuples become lists.
+    """
+    if isinstance(value, bool) or value is None or isinstance(value, str):
+        return value
+    if isinstance(value, int):
+        return value
+    if isinstance(value, float):
+        rounded = round(value, CACHE_KEY_FLOAT_DIGITS)
+        if rounded == int(rounded):
+            return int(rounded)
+        return rounded
+    if isinstance(value, dict):
+        return {str(key): normalize_cache_input(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [normalize_cache_input(item) for item in value]
+    raise TypeError(f"Unsupported cache input type: {type(value).__name__}")
+
+
+def _sheet_specs_digest():
+    specs_json = json.dumps(normalize_cache_input(SHEET_SPECS), sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(specs_json.encode('utf-8')).hexdigest()[:16]
+
+
+SHEET_SPECS_DIGEST = _sheet_specs_digest()
+
+
+def make_cache_key(namespace, inputs):
+    """
+    Build a content-addressed key for an engine call.
+
+    Args:
+        namespace: Engine name (e.g. 'ceiling_wall', 'floor', 'scaffolding')
+        inputs: JSON-compatible inputs of the call (room lists, options)
+
+    Returns:
+        str: SHA-256 hex digest of the normalized inputs plus the SHEET_SPECS version
+    """
+    payload = {
+        'namespace': namespace,
+        'sheet_specs_version': SHEET_SPECS_VERSION,
+        'sheet_specs_digest': SHEET_SPECS_DIGEST,
+        'inputs': normalize_cache_input(inputs)
+    }
+    canonical = json.dumps(payload, sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+# ==============================================================================
+# ON-DISK RESULT CACHE
+# ==============================================================================
+
+class ResultCache:
+    """
+    Persistent content-addressed cache for engine outputs.
+
+    Each entry is one JSON file named after its key. File modification
+    times record the last access, and the least recently used entries are
+    evicted once the directory exceeds max_bytes. Safe to share between
+    sessions and threads of one server process; writes are atomic renames
+    so concurrent processes never see partial entries.
+    """
+
+    def __init__(self, cache_dir=RESULT_CACHE_DIR, max_bytes=RESULT_CACHE_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, key + _CACHE_FILE_SUFFIX)
+
+    def get(self, key, default=None):
+        """Return the cached value for key (and mark it recently used), or default."""
+        path = self._path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as cache_file:
+                value = json.load(cache_file)
+            os.utime(path)
+        except (OSError, ValueError):
+            with self._lock:
+                self.misses += 1
+            return default
+        with self._lock:
+            self.hits += 1
+        return value
+
+    def put(self, key, value):
+        """Store a JSON-serializable value under key, then enforce the size budget."""
+        encoded = json.dumps(value, ensure_ascii=False).encode('utf-8')
+        if len(encoded) > self.max_bytes:
+            return
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as tmp_file:
+                tmp_file.write(encoded)
+            os.replace(tmp_path, self._path(key))
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return
+        self.evict()
+
+    def get_or_compute(self, namespace, inputs, compute):
+        """
+        Return the cached result for (namespace, inputs), computing and storing it on a miss.
+
+        Tuples returned by compute come back as lists on later hits, so callers
+        should unpack results rather than compare their types.
+        """
+        key = make_cache_key(namespace, inputs)
+        missing = object()
+        value = self.get(key, missing)
+        if value is not missing:
+            return value
+        value = compute()
+        self.put(key, value)
+        return value
+
+    def _entries(self):
+        entries = []
+        try:
+            names = os.listdir(self.cache_dir)
+        except OSError:
+            return entries
+        for name in names:
+            if not name.endswith(_CACHE_FILE_SUFFIX):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def size_bytes(self):
+        return sum(size for _, size, _ in self._entries())
+
+    def evict(self):
+        """Delete least recently used entries until the cache fits in max_bytes."""
+        with self._lock:
+            entries = self._entries()
+            total = sum(size for _, size, _ in entries)
+            if total <= self.max_bytes:
+                return 0
+            removed = 0
+            for _, size, path in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.remove(path)
+                except OSError:
+                    continue
+                total -= size
+                removed += 1
+            return removed
+
+    def clear(self):
+        with self._lock:
+            for _, _, path in self._entries():
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+    def hit_rate(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return self.hits / lookups if lookups else 0.0
@@ -0,0 +1,199 @@
+from operator import itemgetter
+
+import numpy as np
+import pandas as pd
+
+from sheet_engine import iter_optimized_multi_room_ceiling_wall, iter_optimized_multi_room_floor
+
+
+# ==============================================================================
+# CONSTANTS
+# ==============================================================================
+
+# Column dtypes of the per-room result frames; combinations are stored as categories
+CEILING_WALL_COLUMNS = {
+    'name': 'string',
+    'ceiling_1800_from_leftover': 'float64',
+    'ceiling_3600_from_leftover': 'float64',
+    'new_ceiling_1800_rolls': 'int32',
+    'new_ceiling_3600_rolls': 'int32',
+    'wall_1800_from_leftover': 'float64',
+    'wall_3600_from_leftover': 'float64',
+    'additional_wall_1800_rolls': 'int32',
+    'additional_wall_3600_rolls': 'int32',
+    'room_total_1800': 'int32',
+    'room_total_3600': 'int32',
+    'ceiling_combination': 'category',
+    'wall_combination': 'category',
+    'wall_perimeter_sets': 'int32'
+}
+
+FLOOR_COLUMNS = {
+    'name': 'string',
+    'floor_1800_from_leftover': 'float64',
+    'floor_3600_from_leftover': 'float64',
+    'new_floor_1800_rolls': 'int32',
+    'new_floor_3600_rolls': 'int32',
+    'room_total_1800': 'int32',
+    'room_total_3600': 'int32',
+    'floor_combination': 'category'
+}
+
+COMBINATION_SEPARATOR = ' + '
+
+
+# ==============================================================================
+# RESULT FRAMES
+# ==============================================================================
+
+def _combination_categorical(combinations):
+    """Categorical of combination lists; the few distinct combinations are joined once each."""
+    codes_by_key = {}
+    codes = [codes_by_key.setdefault(key, len(codes_by_key)) for key in map(tuple, combinations)]
+    return pd.Categorical.from_codes(codes, categories=[COMBINATION_SEPARATOR.join(key) for key in codes_by_key])
+
+
+def _frame_from_rows(rows, columns):
+    # Columns are built as arrays of their final dtype: a typed Series per column costs
+    # more than the optimizer itself on small projects
+    values_by_column = zip(*rows) if rows else ([] for _ in columns)
+    data = {}
+    for (column, dtype), values in zip(columns.items(), values_by_column):
+        if dtype == 'category':
+            data[column] = _combination_categorical(values)
+        elif dtype == 'string':
+            data[column] = pd.array(list(values), dtype=dtype)
+        else:
+            data[column] = np.array(values, dtype=dtype)
+    return pd.DataFrame(data, copy=False)
+
+
+def room_results_frame(room_results, columns):
+    """
+    Typed per-room frame from an optimizer's list of room result dicts.
+
+    Keys outside columns (e.g. strip lengths) are dropped; missing keys default to 0.
+
+    Args:
+        room_results: room_results or floor_room_results of any engine mode or floor method
+        columns: CEILING_WALL_COLUMNS or FLOOR_COLUMNS
+
+    Returns:
+        pandas.DataFrame: One row per room
+    """
+    defaults = [[] if column.endswith('_combination') else 0 for column in columns]
+    return _frame_from_rows(
+        [tuple(room_result.get(column, default) for column, default in zip(columns, defaults))
+         for room_result in room_results],
+        columns
+    )
+
+
+def stream_to_frame(stream, columns):
+    """
+    Collect a streaming optimizer's (room_result, pool_state) pairs straight into columns.
+
+    Each room result dict is reduced to a tuple of its column values as it
+    arrives, so the per-room dicts are never held all at once.
+
+    Returns:
+        tuple: (frame, last pool_state or None when no room produced a result)
+    """
+    row_values = itemgetter(*columns)
+    rows = []
+    pool_state = None
+    for room_result, pool_state in stream:
+        rows.append(row_values(room_result))
+    return _frame_from_rows(rows, columns), pool_state
+
+
+def calculate_ceiling_wall_frame(rooms_data, has_floor_covering=False, initial_leftover_1800=0, initial_leftover_3600=0):
+    """
+    calculate_optimized_multi_room_ceiling_wall returning a columnar result.
+
+    Returns:
+        tuple: (results dict with room_frame in place of room_results, total_1800, total_3600)
+    """
+    frame, pool_state = stream_to_frame(
+        iter_optimized_multi_room_ceiling_wall(rooms_data, has_floor_covering, initial_leftover_1800, initial_leftover_3600),
+        CEILING_WALL_COLUMNS
+    )
+    if pool_state is None:
+        pool_state = {
+            'total_rolls_1800': 0,
+            'total_rolls_3600': 0,
+            'final_leftover_1800': initial_leftover_1800,
+            'final_leftover_3600': initial_leftover_3600
+        }
+    return {'room_frame': frame, **pool_state}, pool_state['total_rolls_1800'], pool_state['total_rolls_3600']
+
+
+def calculate_floor_frame(rooms_data, initial_leftover_1800_floor=0, initial_leftover_3600_floor=0):
+    """
+    calculate_optimized_multi_room_floor returning a columnar result.
+
+    Returns:
+        tuple: (results dict with room_frame in place of floor_room_results, total_1800, total_3600)
+    """
+    frame, pool_state = stream_to_frame(
+        iter_optimized_multi_room_floor(rooms_data, initial_leftover_1800_floor, initial_leftover_3600_floor),
+        FLOOR_COLUMNS
+    )
+    if pool_state is None:
+        pool_state = {
+            'total_rolls_1800_floor': 0,
+            'total_rolls_3600_floor': 0,
+            'final_leftover_1800_floor': initial_leftover_1800_floor,
+            'final_leftover_3600_floor': initial_leftover_3600_floor
+        }
+    return {'room_frame': frame, **pool_state}, pool_state['total_rolls_1800_floor'], pool_state['total_rolls_3600_floor']
+
+
+# ==============================================================================
+# VECTORIZED ANALYSIS
+# ==============================================================================
+
+def combined_room_frame(ceiling_wall_frame, floor_frame=None):
+    """
+    One row per room with ceiling/wall and floor rolls side by side.
+
+    Rooms are matched by name and, for repeated names, by occurrence; a room
+    without one of the surfaces gets 0 rolls for it.
+
+    Returns:
+        pandas.DataFrame: name, cw_1800, cw_3600, floor_1800, floor_3600,
+                          leftover_used_m2, total_rolls
+    """
+    combined = pd.DataFrame({
+        'name': ceiling_wall_frame['name'],
+        'occurrence': ceiling_wall_frame.groupby('name').cumcount(),
+        'cw_1800': ceiling_wall_frame['room_total_1800'],
+        'cw_3600': ceiling_wall_frame['room_total_3600'],
+        'leftover_used_m2': ceiling_wall_frame[[
+            'ceiling_1800_from_leftover', 'ceiling_3600_from_leftover',
+            'wall_1800_from_leftover', 'wall_3600_from_leftover'
+        ]].sum(axis=1)
+    })
+    if floor_frame is not None and len(floor_frame):
+        floors = pd.DataFrame({
+            'name': floor_frame['name'],
+            'occurrence': floor_frame.groupby('name').cumcount(),
+            'floor_1800': floor_frame['room_total_1800'],
+            'floor_3600': floor_frame['room_total_3600'],
+            'floor_leftover_used_m2': floor_frame['floor_1800_from_leftover'] + floor_frame['floor_3600_from_leftover']
+        })
+        combined = combined.merge(floors, on=['name', 'occurrence'], how='outer', sort=False)
+        combined['leftover_used_m2'] = combined['leftover_used_m2'].fillna(0) + combined.pop('floor_leftover_used_m2').fillna(0)
+    else:
+        combined['floor_1800'] = 0
+        combined['floor_3600'] = 0
+
+    roll_columns = ['cw_1800', 'cw_3600', 'floor_1800', 'floor_3600']
+    combined[roll_columns] = combined[roll_columns].fillna(0).astype('int32')
+    combined['total_rolls'] = combined[roll_columns].sum(axis=1).astype('int32')
+    return combined[['name', *roll_columns, 'leftover_used_m2', 'total_rolls']]
+
+
+def frame_roll_totals(room_frame):
+    """Total new rolls per width of a ceiling/wall or floor room frame: (total_1800, total_3600)."""
+    return int(room_frame['room_total_1800'].sum()), int(room_frame['room_total_3600'].sum())
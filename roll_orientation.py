@@ -0,0 +1,236 @@
+import math
+
+import numpy as np
+
+from breakpoints import get_ceiling_floor_breakpoint_index, get_wall_breakpoint_index
+from floor_templates import repeat_single_pool
+from sheet_engine import ROLL_LENGTH, SHEET_SPECS, pool_ceiling_wall_steps, split_area_by_pattern
+
+
+# ==============================================================================
+# CONSTANTS
+# ==============================================================================
+
+# Rolls run along the room length and the pattern spans the width (the optimizers' default)
+ORIENTATION_ACROSS_WIDTH = 'width'
+# Rotated 90°: the pattern spans the room length
+ORIENTATION_ACROSS_LENGTH = 'length'
+
+ORIENTATION_LABELS = {
+    ORIENTATION_ACROSS_WIDTH: '幅方向',
+    ORIENTATION_ACROSS_LENGTH: '長さ方向 (90°回転)'
+}
+
+
+# ==============================================================================
+# PATTERNS
+# ==============================================================================
+
+def orientation_patterns(rooms_data):
+    """
+    Ceiling/floor roll patterns of every room for both orientations, in one vectorized lookup each.
+
+    Returns:
+        tuple: (across_width, across_length) as (n, 2) int64 arrays of (rolls_1800, rolls_3600)
+    """
+    index = get_ceiling_floor_breakpoint_index()
+    widths_mm = np.array([room.get('width_mm', 0) for room in rooms_data], dtype=np.float64)
+    lengths_mm = np.array([room.get('length_m', 0) * 1000 for room in rooms_data], dtype=np.float64)
+    return index.lookup_many(widths_mm), index.lookup_many(lengths_mm)
+
+
+def _prefers_length(across_width, across_length):
+    """Rooms whose rotated pattern puts a larger share of the area on 3600mm rolls."""
+    width_total = across_width.sum(axis=1)
+    length_total = across_length.sum(axis=1)
+    # Compare 3600mm shares by cross-multiplying the integer pattern counts
+    return (length_total > 0) & (width_total > 0) & (across_length[:, 1] * width_total > across_width[:, 1] * length_total)
+
+
+# ==============================================================================
+# ORIENTATION CHOICE
+# ==============================================================================
+
+def _ceiling_wall_candidates(rooms_data, has_floor_covering, across_width, across_length, share_choice):
+    """Per-room (step across width, step across length) for the rooms the ceiling/wall pass visits."""
+    wall_index = get_wall_breakpoint_index(has_floor_covering)
+    heights_mm = np.array([room.get('height_mm', 0) for room in rooms_data], dtype=np.float64)
+    wall_patterns = wall_index.lookup_many(heights_mm).tolist()
+
+    candidates = []
+    for room_index, room in enumerate(rooms_data):
+        ceiling_area = room.get('ceiling_area', 0)
+        wall_area = room.get('wall_area', 0)
+        if ceiling_area <= 0 and wall_area <= 0:
+            continue
+
+        if room.get('wall_segment_rolls') is not None:
+            _, wall_1800, wall_3600, _ = room['wall_segment_rolls']
+        elif room.get('height_mm', 0) > 0 and room.get('perimeter', 0) > 0:
+            sets = math.ceil(room['perimeter'] / ROLL_LENGTH)
+            wall_1800, wall_3600 = wall_patterns[room_index][0] * sets, wall_patterns[room_index][1] * sets
+        else:
+            wall_1800, wall_3600 = 0, 0
+
+        if room.get('width_mm', 0) > 0:
+            width_needs = split_area_by_pattern(ceiling_area, *across_width[room_index])
+        else:
+            width_needs = (0, 0)
+        length_needs = split_area_by_pattern(ceiling_area, *across_length[room_index])
+        candidates.append((
+            room_index,
+            (*width_needs, wall_area, wall_1800, wall_3600),
+            (*length_needs, wall_area, wall_1800, wall_3600),
+            bool(share_choice[room_index]) and room.get('width_mm', 0) > 0
+        ))
+    return candidates
+
+
+def _choose_ceiling_wall(candidates):
+    """
+    Ceiling/wall orientations: the better of all-width, larger-3600-share and a greedy pooled pass.
+
+    The greedy pass runs the pooled arithmetic of the optimizer and, room by
+    room, keeps the orientation that buys fewer rolls (ties: more leftover).
+
+    Returns:
+        tuple: (rotated room indices, baseline rolls, chosen rolls)
+    """
+    def pooled_total(rotated):
+        steps = [length_step if room_index in rotated else width_step
+                 for room_index, width_step, length_step, _ in candidates]
+        _, _, rolls_1800, rolls_3600 = pool_ceiling_wall_steps(steps, 0, 0)
+        return rolls_1800 + rolls_3600
+
+    greedy = set()
+    leftover_1800 = leftover_3600 = 0
+    for room_index, width_step, length_step, _ in candidates:
+        width_state = pool_ceiling_wall_steps([width_step], leftover_1800, leftover_3600)
+        if width_step[:2] == length_step[:2]:
+            leftover_1800, leftover_3600 = width_state[:2]
+            continue
+        length_state = pool_ceiling_wall_steps([length_step], leftover_1800, leftover_3600)
+        width_key = (width_state[2] + width_state[3], -(width_state[0] + width_state[1]))
+        length_key = (length_state[2] + length_state[3], -(length_state[0] + length_state[1]))
+        if length_key < width_key:
+            greedy.add(room_index)
+            leftover_1800, leftover_3600 = length_state[:2]
+        else:
+            leftover_1800, leftover_3600 = width_state[:2]
+
+    share = {room_index for room_index, _, _, prefers_length in candidates if prefers_length}
+    baseline_total = pooled_total(set())
+    options = [(baseline_total, set())]
+    if share:
+        options.append((pooled_total(share), share))
+    if greedy:
+        options.append((pooled_total(greedy), greedy))
+    # Ties keep the earlier option: unrotated first
+    chosen_total, chosen = min(options, key=lambda option: option[0])
+    return chosen, baseline_total, chosen_total
+
+
+def _choose_floor(rooms_data, across_width, across_length, share_choice):
+    """
+    Floor orientations. Floor pools are drawn before buying, so their roll
+    count only depends on the total need per width; the larger 3600mm share
+    is used when it lowers that count.
+
+    Returns:
+        tuple: (rotated room indices, baseline rolls, chosen rolls)
+    """
+    coverage_1800_floor = SHEET_SPECS['floor_thin']['actual_coverage']
+    coverage_3600_floor = SHEET_SPECS['floor_wide']['actual_coverage']
+
+    def total_rolls(rotated):
+        need_1800 = need_3600 = 0
+        for room_index, room in enumerate(rooms_data):
+            if room.get('floor_area', 0) <= 0 or room.get('width_mm', 0) <= 0 or room.get('length_m', 0) <= 0:
+                continue
+            pattern = across_length[room_index] if room_index in rotated else across_width[room_index]
+            room_1800, room_3600 = split_area_by_pattern(room['floor_area'], *pattern)
+            need_1800 += room_1800
+            need_3600 += room_3600
+        _, rolls_1800 = repeat_single_pool(need_1800, 1, 0, coverage_1800_floor)
+        _, rolls_3600 = repeat_single_pool(need_3600, 1, 0, coverage_3600_floor)
+        return rolls_1800 + rolls_3600
+
+    share = {int(room_index) for room_index in np.flatnonzero(share_choice)}
+    baseline_total = total_rolls(set())
+    if not share:
+        return set(), baseline_total, baseline_total
+    share_total = total_rolls(share)
+    if share_total < baseline_total:
+        return share, baseline_total, share_total
+    return set(), baseline_total, baseline_total
+
+
+def choose_roll_orientations(rooms_data, has_floor_covering=False):
+    """
+    Choose per room whether ceiling and floor rolls run across the width or across the length.
+
+    Patterns for both axes are looked up for all rooms at once. Ceilings
+    share pools with walls, so their choice is checked against the pooled
+    ceiling/wall arithmetic; floors use their closed form. A choice is only
+    applied when it buys fewer rolls than leaving every room unrotated.
+
+    Args:
+        rooms_data: Surface-filtered room dictionaries
+        has_floor_covering: Whether floor covering is being calculated (affects wall patterns)
+
+    Returns:
+        dict: ceiling / floor orientation per room, and the rolls before and after
+              (ceiling_wall_rolls, floor_rolls as (baseline, chosen))
+    """
+    if not rooms_data:
+        return {'ceiling': [], 'floor': [], 'ceiling_wall_rolls': (0, 0), 'floor_rolls': (0, 0)}
+
+    across_width, across_length = orientation_patterns(rooms_data)
+    share_choice = _prefers_length(across_width, across_length)
+    across_width = across_width.tolist()
+    across_length = across_length.tolist()
+
+    candidates = _ceiling_wall_candidates(rooms_data, has_floor_covering, across_width, across_length, share_choice)
+    ceiling_rotated, ceiling_baseline, ceiling_chosen = _choose_ceiling_wall(candidates)
+    floor_rotated, floor_baseline, floor_chosen = _choose_floor(rooms_data, across_width, across_length, share_choice)
+
+    return {
+        'ceiling': [ORIENTATION_ACROSS_LENGTH if index in ceiling_rotated else ORIENTATION_ACROSS_WIDTH
+                    for index in range(len(rooms_data))],
+        'floor': [ORIENTATION_ACROSS_LENGTH if index in floor_rotated else ORIENTATION_ACROSS_WIDTH
+                  for index in range(len(rooms_data))],
+        'ceiling_wall_rolls': (ceiling_baseline, ceiling_chosen),
+        'floor_rolls': (floor_baseline, floor_chosen)
+    }
+
+
+def apply_roll_orientation(rooms_data, orientations):
+    """
+    Rooms as the optimizers should see them: rotated rooms swap width_mm and length_m.
+
+    Unrotated rooms are passed through unchanged (same objects).
+    """
+    oriented = []
+    for room, orientation in zip(rooms_data, orientations):
+        if orientation == ORIENTATION_ACROSS_LENGTH:
+            room = {**room, 'width_mm': room['length_m'] * 1000, 'length_m': room['width_mm'] / 1000}
+        oriented.append(room)
+    return oriented
+
+
+def annotate_orientation(room_results, rooms_data, orientations, key):
+    """
+    Record each room's orientation under key in the optimizer's per-room results.
+
+    The optimizers skip rooms without the surface, so results are matched to
+    rooms by walking both lists in order.
+    """
+    annotated = []
+    room_index = 0
+    for room_result in room_results:
+        while room_index < len(rooms_data) and rooms_data[room_index]['name'] != room_result['name']:
+            room_index += 1
+        orientation = orientations[room_index] if room_index < len(rooms_data) else ORIENTATION_ACROSS_WIDTH
+        annotated.append({**room_result, key: orientation})
+        room_index += 1
+    return annotated
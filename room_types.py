@@ -0,0 +1,153 @@
+from floor_templates import compile_floor, repeat_ceiling_wall_steps, repeat_single_pool
+from sheet_engine import (
+    SHEET_SPECS,
+    calculate_optimized_multi_room_ceiling_wall,
+    calculate_optimized_multi_room_floor
+)
+
+
+# ==============================================================================
+# ROOM TYPES
+# ==============================================================================
+
+def room_type_key(room):
+    """
+    Key under which rooms are interchangeable for the optimizers.
+
+    Dimensions plus the surface areas (a disabled surface has area 0) and
+    the wall segment patterns; the room name does not matter. Values are
+    compared exactly: identical dimensions always produce identical areas.
+    """
+    get = room.get
+    wall_segment_rolls = get('wall_segment_rolls')
+    return (
+        (get('width_mm', 0), get('height_mm', 0), get('length_m', 0), get('perimeter', 0),
+         get('floor_area', 0), get('ceiling_area', 0), get('wall_area', 0)),
+        None if wall_segment_rolls is None else tuple(wall_segment_rolls[1:])
+    )
+
+
+def group_room_types(rooms_data):
+    """
+    Group identical rooms into types, in order of first appearance.
+
+    Returns:
+        list: Types as dicts with room (representative), indices and count
+    """
+    types = {}
+    for index, room in enumerate(rooms_data):
+        key = room_type_key(room)
+        if key not in types:
+            types[key] = {'room': room, 'indices': []}
+        types[key]['indices'].append(index)
+    return [{**room_type, 'count': len(room_type['indices'])} for room_type in types.values()]
+
+
+def grouped_room_order(rooms_data):
+    """Room indices with every type's rooms consecutive: the order the type optimizer pools in."""
+    return [index for room_type in group_room_types(rooms_data) for index in room_type['indices']]
+
+
+# ==============================================================================
+# MULTIPLICITY-AWARE OPTIMIZER
+# ==============================================================================
+
+def calculate_optimized_room_types(rooms_data, has_floor_covering=False):
+    """
+    Mixed-width optimization over (room type, count) instead of individual rooms.
+
+    Each type is compiled once (pattern lookup and coverage split). Floor
+    covering pools are extended over a type's rooms in closed form;
+    ceiling/wall pools are replayed from the compiled needs and jump ahead
+    once the (quantized) pool state repeats, so a type of round dimensions
+    replays a few hundred rooms whatever its count.
+
+    Against the mixed-width optimizers on grouped_room_order(rooms_data),
+    ceiling/wall totals match and each floor total is within
+    floor_templates.CLOSED_FORM_FLOOR_TOLERANCE_ROLLS: the closed form is exact where the
+    float optimizers' room-by-room sums can land one roll off.
+
+    Args:
+        rooms_data: Surface-filtered room dictionaries
+        has_floor_covering: Whether floor covering is being calculated (affects wall patterns)
+
+    Returns:
+        dict: room_types (per-type rolls and the pools it started from), roll totals,
+              final leftovers, the number of rooms and types and rooms_simulated
+    """
+    coverage_1800_floor = SHEET_SPECS['floor_thin']['actual_coverage']
+    coverage_3600_floor = SHEET_SPECS['floor_wide']['actual_coverage']
+    leftover_1800 = leftover_3600 = 0
+    leftover_1800_floor = leftover_3600_floor = 0
+    type_results = []
+
+    for room_type in group_room_types(rooms_data):
+        program = compile_floor([room_type['room']], has_floor_covering)
+        count = room_type['count']
+        entry_leftovers = (leftover_1800, leftover_3600, leftover_1800_floor, leftover_3600_floor)
+
+        leftover_1800, leftover_3600, cw_1800, cw_3600, simulated = repeat_ceiling_wall_steps(
+            program['ceiling_wall_steps'], count, leftover_1800, leftover_3600
+        )
+        leftover_1800_floor, floor_1800 = repeat_single_pool(
+            program['floor_need_1800'], count, leftover_1800_floor, coverage_1800_floor
+        )
+        leftover_3600_floor, floor_3600 = repeat_single_pool(
+            program['floor_need_3600'], count, leftover_3600_floor, coverage_3600_floor
+        )
+
+        type_results.append({
+            'name': room_type['room']['name'],
+            'names': [rooms_data[index]['name'] for index in room_type['indices']],
+            'indices': room_type['indices'],
+            'count': count,
+            'width_mm': room_type['room'].get('width_mm', 0),
+            'height_mm': room_type['room'].get('height_mm', 0),
+            'length_m': room_type['room'].get('length_m', 0),
+            'cw_1800': cw_1800,
+            'cw_3600': cw_3600,
+            'floor_1800': floor_1800,
+            'floor_3600': floor_3600,
+            'rooms_simulated': simulated,
+            'entry_leftovers': entry_leftovers
+        })
+
+    return {
+        'room_types': type_results,
+        'room_count': len(rooms_data),
+        'type_count': len(type_results),
+        'rooms_simulated': sum(result['rooms_simulated'] for result in type_results),
+        'total_cw_1800': sum(result['cw_1800'] for result in type_results),
+        'total_cw_3600': sum(result['cw_3600'] for result in type_results),
+        'total_floor_1800': sum(result['floor_1800'] for result in type_results),
+        'total_floor_3600': sum(result['floor_3600'] for result in type_results),
+        'final_leftover_1800': leftover_1800,
+        'final_leftover_3600': leftover_3600,
+        'final_leftover_1800_floor': leftover_1800_floor,
+        'final_leftover_3600_floor': leftover_3600_floor
+    }
+
+
+def expand_room_type_results(type_result, rooms_data, has_floor_covering=False):
+    """
+    Per-room results of one room type, computed on demand.
+
+    The type's rooms are replayed through the mixed-width optimizers starting
+    from the pools the type found, so the entries have the usual shapes.
+
+    Returns:
+        tuple: (room_results, floor_room_results)
+    """
+    rooms = [rooms_data[index] for index in type_result['indices']]
+    leftover_1800, leftover_3600, leftover_1800_floor, leftover_3600_floor = type_result['entry_leftovers']
+    ceiling_wall_results, _, _ = calculate_optimized_multi_room_ceiling_wall(
+        rooms, has_floor_covering,
+        initial_leftover_1800=leftover_1800,
+        initial_leftover_3600=leftover_3600
+    )
+    floor_results, _, _ = calculate_optimized_multi_room_floor(
+        rooms,
+        initial_leftover_1800_floor=leftover_1800_floor,
+        initial_leftover_3600_floor=leftover_3600_floor
+    )
+    return ceiling_wall_results.get('room_results', []), floor_results.get('floor_room_results', [])
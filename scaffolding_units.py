@@ -0,0 +1,260 @@
+import heapq
+import math
+import threading
+from functools import lru_cache
+
+from sheet_engine import calculate_scaffolding_rolls
+
+
+# ==============================================================================
+# CONSTANTS
+# ==============================================================================
+
+# Standard frame scaffolding sizes (布板 spans and 建枠 heights) in meters
+SCAFFOLDING_UNIT_LENGTHS_M = (1.829, 1.524, 1.219, 0.914, 0.610)
+SCAFFOLDING_UNIT_HEIGHTS_M = (1.725, 1.524, 1.219, 0.914)
+
+# Layouts within this much of the least over-coverage are treated as equal; the fewest units wins
+SCAFFOLDING_OVERSHOOT_TOLERANCE_MM = 50
+
+# Unit tables are process-wide; the lock keeps concurrent sessions from building one twice
+_UNIT_TABLE_BUILD_LOCK = threading.Lock()
+
+
+# ==============================================================================
+# UNIT TABLE
+# ==============================================================================
+
+class UnitSizeTable:
+    """
+    Precomputed selector for the combination of unit sizes that covers a run.
+
+    A layout covers a target when its total is at least the target. The
+    selector minimizes the layout cost (total plus an optional cost per
+    unit) first and the number of units second, over all combinations of
+    the sizes (integer mm).
+
+    Two tables are built once per set of sizes:
+
+    - a residue table: for every residue modulo the largest size, the
+      combination of the other sizes with that residue that costs the
+      fewest units once the rest is filled with the largest size (a
+      shortest path over residues, every size adding largest - size);
+    - an exact DP table of the fewest units for every total up to the
+      point where the residue table alone is optimal.
+
+    Any target is then answered with one table lookup and a short walk
+    back through the chosen sizes, however long the facade.
+    """
+
+    def __init__(self, unit_sizes_mm):
+        self.unit_sizes_mm = tuple(sorted(set(unit_sizes_mm), reverse=True))
+        largest = self.unit_sizes_mm[0]
+        others = self.unit_sizes_mm[1:]
+
+        # Residue table: cost is (units × largest - total) of the non-largest part
+        self.residue_cost = [math.inf] * largest
+        self.residue_total = [0] * largest
+        self.residue_last_unit = [0] * largest
+        self.residue_cost[0] = 0
+        heap = [(0, 0)]
+        while heap:
+            cost, residue = heapq.heappop(heap)
+            if cost > self.residue_cost[residue]:
+                continue
+            for unit_mm in others:
+                next_residue = (residue + unit_mm) % largest
+                next_cost = cost + largest - unit_mm
+                if next_cost < self.residue_cost[next_residue]:
+                    self.residue_cost[next_residue] = next_cost
+                    self.residue_total[next_residue] = self.residue_total[residue] + unit_mm
+                    self.residue_last_unit[next_residue] = unit_mm
+                    heapq.heappush(heap, (next_cost, next_residue))
+
+        # Smallest step from each residue to a reachable one
+        self.residue_step = [0] * largest
+        for residue in range(largest):
+            step = 0
+            while self.residue_cost[(residue + step) % largest] == math.inf:
+                step += 1
+            self.residue_step[residue] = step
+
+        # Beyond this total every reachable total uses the residue-optimal part
+        self.table_max_mm = max(
+            total for total, cost in zip(self.residue_total, self.residue_cost) if cost != math.inf
+        ) + largest
+
+        # Exact DP: fewest units per total and the last unit of one such combination
+        self.unit_counts = [math.inf] * (self.table_max_mm + 1)
+        self.last_unit = [0] * (self.table_max_mm + 1)
+        self.unit_counts[0] = 0
+        for total_mm in range(1, self.table_max_mm + 1):
+            for unit_mm in self.unit_sizes_mm:
+                if unit_mm <= total_mm and self.unit_counts[total_mm - unit_mm] + 1 < self.unit_counts[total_mm]:
+                    self.unit_counts[total_mm] = self.unit_counts[total_mm - unit_mm] + 1
+                    self.last_unit[total_mm] = unit_mm
+
+        # Smallest reachable total at or above each total (None past the last one in the table)
+        self.next_reachable = [None] * (self.table_max_mm + 2)
+        for total_mm in range(self.table_max_mm, -1, -1):
+            if self.unit_counts[total_mm] != math.inf:
+                self.next_reachable[total_mm] = total_mm
+            else:
+                self.next_reachable[total_mm] = self.next_reachable[total_mm + 1]
+
+    def unit_count(self, total_mm):
+        """Fewest units summing to exactly total_mm (math.inf when no combination does)."""
+        if total_mm <= self.table_max_mm:
+            return self.unit_counts[total_mm]
+        largest = self.unit_sizes_mm[0]
+        residue_cost = self.residue_cost[total_mm % largest]
+        if residue_cost == math.inf:
+            return math.inf
+        return (residue_cost + total_mm) // largest
+
+    def _layout(self, total_mm):
+        counts = {unit_mm: 0 for unit_mm in self.unit_sizes_mm}
+        if total_mm <= self.table_max_mm:
+            remaining_mm = total_mm
+            while remaining_mm > 0:
+                counts[self.last_unit[remaining_mm]] += 1
+                remaining_mm -= self.last_unit[remaining_mm]
+        else:
+            largest = self.unit_sizes_mm[0]
+            residue = total_mm % largest
+            counts[largest] = (total_mm - self.residue_total[residue]) // largest
+            while residue != 0:
+                unit_mm = self.residue_last_unit[residue]
+                counts[unit_mm] += 1
+                residue = (residue - unit_mm) % largest
+        return counts
+
+    def _next_reachable(self, total_mm):
+        if total_mm <= self.table_max_mm and self.next_reachable[total_mm] is not None:
+            return self.next_reachable[total_mm]
+        return total_mm + self.residue_step[total_mm % self.unit_sizes_mm[0]]
+
+    def select(self, target_mm, unit_cost_mm=0, tolerance_mm=0):
+        """
+        Choose unit sizes covering target_mm at the lowest cost.
+
+        The cost of a layout is its total plus unit_cost_mm per unit. Among
+        layouts within tolerance_mm of the lowest cost, the one with the
+        fewest units wins (then the lower cost).
+
+        Returns:
+            dict: unit_counts ({size_mm: count}, largest first), unit_count, total_mm, overshoot_mm
+        """
+        target_mm = max(int(target_mm), 0)
+        largest = self.unit_sizes_mm[0]
+
+        # Costs grow with the total at least as fast as total + unit_cost × ceil(total / largest)
+        candidates = []
+        best_cost = math.inf
+        total_mm = self._next_reachable(target_mm)
+        while total_mm + unit_cost_mm * -(-total_mm // largest) <= best_cost + tolerance_mm:
+            count = self.unit_count(total_mm)
+            cost = total_mm + unit_cost_mm * count
+            candidates.append((cost, count, total_mm))
+            best_cost = min(best_cost, cost)
+            total_mm = self._next_reachable(total_mm + 1)
+
+        _, count, total_mm = min(
+            (candidate for candidate in candidates if candidate[0] <= best_cost + tolerance_mm),
+            key=lambda candidate: (candidate[1], candidate[0])
+        )
+        return {
+            'unit_counts': self._layout(total_mm),
+            'unit_count': count,
+            'total_mm': total_mm,
+            'overshoot_mm': total_mm - target_mm
+        }
+
+
+@lru_cache(maxsize=8)
+def _build_unit_size_table(unit_sizes_mm):
+    return UnitSizeTable(unit_sizes_mm)
+
+
+def get_unit_size_table(unit_sizes_m):
+    """Process-wide UnitSizeTable for a set of unit sizes in meters."""
+    unit_sizes_mm = tuple(sorted({round(unit_m * 1000) for unit_m in unit_sizes_m if unit_m > 0}))
+    with _UNIT_TABLE_BUILD_LOCK:
+        return _build_unit_size_table(unit_sizes_mm)
+
+
+# ==============================================================================
+# MIXED-UNIT SCAFFOLDING
+# ==============================================================================
+
+def calculate_mixed_scaffolding_requirements(building_length_m, building_height_m, scaffolding_width_m,
+                                             unit_lengths_m=SCAFFOLDING_UNIT_LENGTHS_M,
+                                             unit_heights_m=SCAFFOLDING_UNIT_HEIGHTS_M):
+    """
+    Scaffolding for one facade side built from a mix of standard unit lengths and heights.
+
+    Every lift has platforms along the whole layout length, so the covered
+    area is length × (height + 2 × width × lifts). Lengths are chosen for
+    the least over-length; heights for the least height + 2 × width × lifts,
+    since an extra lift adds top and bottom covering. Layouts within
+    SCAFFOLDING_OVERSHOOT_TOLERANCE_MM of the best count as equal and the
+    one with the fewest units is used. Roll counts come from the chosen layout.
+
+    Args:
+        building_length_m: Building facade length in meters
+        building_height_m: Building height in meters
+        scaffolding_width_m: Width (depth) of the scaffolding in meters
+        unit_lengths_m: Available unit lengths in meters
+        unit_heights_m: Available unit (lift) heights in meters
+
+    Returns:
+        dict: The keys of calculate_scaffolding_requirements plus the chosen
+              length_units / height_units ([(size_m, count)]) and overshoots,
+              or None for invalid input
+    """
+    if (building_length_m <= 0 or building_height_m <= 0 or scaffolding_width_m <= 0 or
+            not any(unit_m > 0 for unit_m in unit_lengths_m) or not any(unit_m > 0 for unit_m in unit_heights_m)):
+        return None
+
+    # Targets in whole mm, rounded up so the layout never falls short
+    length_layout = get_unit_size_table(unit_lengths_m).select(
+        math.ceil(round(building_length_m * 1000, 6)),
+        tolerance_mm=SCAFFOLDING_OVERSHOOT_TOLERANCE_MM
+    )
+    height_layout = get_unit_size_table(unit_heights_m).select(
+        math.ceil(round(building_height_m * 1000, 6)),
+        unit_cost_mm=2 * scaffolding_width_m * 1000,
+        tolerance_mm=SCAFFOLDING_OVERSHOOT_TOLERANCE_MM
+    )
+
+    units_along_length = length_layout['unit_count']
+    units_along_height = height_layout['unit_count']
+    total_side_units = units_along_length * units_along_height
+    total_scaffolding_length = length_layout['total_mm'] / 1000
+    total_scaffolding_height = height_layout['total_mm'] / 1000
+
+    # Each lift carries platforms along the whole length: top (floor) and bottom (ceiling) covering
+    total_top_area = units_along_height * total_scaffolding_length * scaffolding_width_m
+    total_bottom_area = total_top_area
+    side_wall_area = total_scaffolding_length * total_scaffolding_height
+    total_coverage_area = total_top_area + total_bottom_area + side_wall_area
+
+    return {
+        'units_along_length': units_along_length,
+        'units_along_height': units_along_height,
+        'total_side_units': total_side_units,
+        # Units differ in length, so this is the mean platform area per unit
+        'unit_coverage_area': total_top_area / total_side_units,
+        'total_top_area': total_top_area,
+        'total_bottom_area': total_bottom_area,
+        'total_scaffolding_length': total_scaffolding_length,
+        'total_scaffolding_height': total_scaffolding_height,
+        'side_wall_area': side_wall_area,
+        'total_coverage_area': total_coverage_area,
+        'length_units': [(unit_mm / 1000, count) for unit_mm, count in length_layout['unit_counts'].items() if count],
+        'height_units': [(unit_mm / 1000, count) for unit_mm, count in height_layout['unit_counts'].items() if count],
+        'length_overshoot_m': length_layout['overshoot_mm'] / 1000,
+        'height_overshoot_m': height_layout['overshoot_mm'] / 1000,
+        **calculate_scaffolding_rolls(total_top_area, total_bottom_area,
+                                      total_scaffolding_length, total_scaffolding_height)
+    }
@@ -0,0 +1,1106 @@
+import math
+
+
+# ==============================================================================
+# CONSTANTS & SPECIFICATIONS
+# ==============================================================================
+
+SHEET_SPECS = {
+    'ceiling_thin': {
+        'name': '養生シート 0.1mm × 1800mm × 50m',
+        'width_mm': 1800,
+        'length_m': 50,
+        'thickness_mm': 0.1,
+        'nominal_coverage': 90,
+        'overlap_factor': 0.8,  # 20%重複
+        'actual_coverage': 72,
+        'description': '天井用 (1層)'
+    },
+    'ceiling_wide': {
+        'name': '養生シート 0.1mm × 3600mm × 50m',
+        'width_mm': 3600,
+        'length_m': 50,
+        'thickness_mm': 0.1,
+        'nominal_coverage': 180,
+        'overlap_factor': 0.8,  # 20%重複
+        'actual_coverage': 144,
+        'description': '天井用 (1層)'
+    },
+    'wall_thin': {
+        'name': '養生シート 0.1mm × 1800mm × 50m',
+        'width_mm': 1800,
+        'length_m': 50,
+        'thickness_mm': 0.1,
+        'nominal_coverage': 90,
+        'overlap_factor': 0.8,  # 20%重複
+        'actual_coverage': 72,
+        'description': '壁面用 (1層)'
+    },
+    'wall_wide': {
+        'name': '養生シート 0.1mm × 3600mm × 50m',
+        'width_mm': 3600,
+        'length_m': 50,
+        'thickness_mm': 0.1,
+        'nominal_coverage': 180,
+        'overlap_factor': 0.8,  # 20%重複
+        'actual_coverage': 144,
+        'description': '壁面用 (1層)'
+    },
+    'floor_thin': {
+        'name': '養生シート 0.15mm × 1800mm × 50m',
+        'width_mm': 1800,
+        'length_m': 50,
+        'thickness_mm': 0.15,
+        'nominal_coverage': 90,
+        'layers_required': 2,
+        'actual_coverage': 36,  # 2層必要のため半分
+        'description': '床面用 (2層必要)'
+    },
+    'floor_wide': {
+        'name': '養生シート 0.15mm × 3600mm × 50m',
+        'width_mm': 3600,
+        'length_m': 50,
+        'thickness_mm': 0.15,
+        'nominal_coverage': 180,
+        'layers_required': 2,
+        'actual_coverage': 72,  # 2層必要のため半分
+        'description': '床面用 (2層必要)'
+    }
+}
+
+ROLL_WIDTH_1800 = 1800
+ROLL_WIDTH_3600 = 3600
+ROLL_LENGTH = 50
+
+# Bump whenever SHEET_SPECS, the roll pattern logic or result units change (invalidates cached results)
+SHEET_SPECS_VERSION = 2
+
+# ==============================================================================
+# HELPER FUNCTIONS - ROLL CALCULATIONS
+# ==============================================================================
+
+def calculate_roll_combination_by_dimension(dimension_mm):
+    """
+    Calculate optimal roll combination based on a dimension (width for ceiling/floor).
+    Returns the combination pattern, number of 1800mm rolls, and number of 3600mm rolls.
+    
+    Logic follows the specific pattern:
+    - dimension ≤ 1200mm: use 1×1800mm
+    - dimension ≤ 3000mm: use 1×3600mm
+    - dimension 3000mm < 4500mm: use 1×3600mm + 1×1800mm
+    - dimension 4500mm < 6300mm: use 2×3600mm
+    - dimension 6300mm < 7800mm: use 2×3600mm + 1×1800mm
+    - dimension 7800mm < 9600mm: use 3×3600mm
+    - dimension 9600mm < 11100mm: use 3×3600mm + 1×1800mm
+    - dimension 11100mm < 12900mm: use 4×3600mm
+    - Continue pattern: alternate adding 3600mm then 1800mm until 100000mm
+    """
+    if dimension_mm <= 0:
+        return [], 0, 0
+    
+    # Handle dimensions up to 100000mm with the specified pattern
+    if dimension_mm <= 1200:
+        rolls_1800, rolls_3600 = 1, 0
+    elif dimension_mm <= 3000:
+        rolls_1800, rolls_3600 = 0, 1
+    elif dimension_mm <= 4500:
+        rolls_1800, rolls_3600 = 1, 1
+    elif dimension_mm <= 6300:
+        rolls_1800, rolls_3600 = 0, 2
+    elif dimension_mm <= 7800:
+        rolls_1800, rolls_3600 = 1, 2
+    elif dimension_mm <= 9600:
+        rolls_1800, rolls_3600 = 0, 3
+    elif dimension_mm <= 11100:
+        rolls_1800, rolls_3600 = 1, 3
+    elif dimension_mm <= 12900:
+        rolls_1800, rolls_3600 = 0, 4
+    elif dimension_mm <= 14400:
+        rolls_1800, rolls_3600 = 1, 4
+    elif dimension_mm <= 16200:
+        rolls_1800, rolls_3600 = 0, 5
+    elif dimension_mm <= 17700:
+        rolls_1800, rolls_3600 = 1, 5
+    elif dimension_mm <= 19500:
+        rolls_1800, rolls_3600 = 0, 6
+    elif dimension_mm <= 21000:
+        rolls_1800, rolls_3600 = 1, 6
+    elif dimension_mm <= 22800:
+        rolls_1800, rolls_3600 = 0, 7
+    elif dimension_mm <= 24300:
+        rolls_1800, rolls_3600 = 1, 7
+    elif dimension_mm <= 26100:
+        rolls_1800, rolls_3600 = 0, 8
+    elif dimension_mm <= 27600:
+        rolls_1800, rolls_3600 = 1, 8
+    elif dimension_mm <= 29400:
+        rolls_1800, rolls_3600 = 0, 9
+    elif dimension_mm <= 30900:
+        rolls_1800, rolls_3600 = 1, 9
+    elif dimension_mm <= 32700:
+        rolls_1800, rolls_3600 = 0, 10
+    elif dimension_mm <= 34200:
+        rolls_1800, rolls_3600 = 1, 10
+    elif dimension_mm <= 36000:
+        rolls_1800, rolls_3600 = 0, 11
+    elif dimension_mm <= 37500:
+        rolls_1800, rolls_3600 = 1, 11
+    elif dimension_mm <= 39300:
+        rolls_1800, rolls_3600 = 0, 12
+    elif dimension_mm <= 40800:
+        rolls_1800, rolls_3600 = 1, 12
+    elif dimension_mm <= 42600:
+        rolls_1800, rolls_3600 = 0, 13
+    elif dimension_mm <= 44100:
+        rolls_1800, rolls_3600 = 1, 13
+    elif dimension_mm <= 45900:
+        rolls_1800, rolls_3600 = 0, 14
+    elif dimension_mm <= 47400:
+        rolls_1800, rolls_3600 = 1, 14
+    elif dimension_mm <= 49200:
+        rolls_1800, rolls_3600 = 0, 15
+    elif dimension_mm <= 50700:
+        rolls_1800, rolls_3600 = 1, 15
+    elif dimension_mm <= 52500:
+        rolls_1800, rolls_3600 = 0, 16
+    elif dimension_mm <= 54000:
+        rolls_1800, rolls_3600 = 1, 16
+    elif dimension_mm <= 55800:
+        rolls_1800, rolls_3600 = 0, 17
+    elif dimension_mm <= 57300:
+        rolls_1800, rolls_3600 = 1, 17
+    elif dimension_mm <= 59100:
+        rolls_1800, rolls_3600 = 0, 18
+    elif dimension_mm <= 60600:
+        rolls_1800, rolls_3600 = 1, 18
+    elif dimension_mm <= 62400:
+        rolls_1800, rolls_3600 = 0, 19
+    elif dimension_mm <= 63900:
+        rolls_1800, rolls_3600 = 1, 19
+    elif dimension_mm <= 65700:
+        rolls_1800, rolls_3600 = 0, 20
+    elif dimension_mm <= 67200:
+        rolls_1800, rolls_3600 = 1, 20
+    elif dimension_mm <= 69000:
+        rolls_1800, rolls_3600 = 0, 21
+    elif dimension_mm <= 70500:
+        rolls_1800, rolls_3600 = 1, 21
+    elif dimension_mm <= 72300:
+        rolls_1800, rolls_3600 = 0, 22
+    elif dimension_mm <= 73800:
+        rolls_1800, rolls_3600 = 1, 22
+    elif dimension_mm <= 75600:
+        rolls_1800, rolls_3600 = 0, 23
+    elif dimension_mm <= 77100:
+        rolls_1800, rolls_3600 = 1, 23
+    elif dimension_mm <= 78900:
+        rolls_1800, rolls_3600 = 0, 24
+    elif dimension_mm <= 80400:
+        rolls_1800, rolls_3600 = 1, 24
+    elif dimension_mm <= 82200:
+        rolls_1800, rolls_3600 = 0, 25
+    elif dimension_mm <= 83700:
+        rolls_1800, rolls_3600 = 1, 25
+    elif dimension_mm <= 85500:
+        rolls_1800, rolls_3600 = 0, 26
+    elif dimension_mm <= 87000:
+        rolls_1800, rolls_3600 = 1, 26
+    elif dimension_mm <= 88800:
+        rolls_1800, rolls_3600 = 0, 27
+    elif dimension_mm <= 90300:
+        rolls_1800, rolls_3600 = 1, 27
+    elif dimension_mm <= 92100:
+        rolls_1800, rolls_3600 = 0, 28
+    elif dimension_mm <= 93600:
+        rolls_1800, rolls_3600 = 1, 28
+    elif dimension_mm <= 95400:
+        rolls_1800, rolls_3600 = 0, 29
+    elif dimension_mm <= 96900:
+        rolls_1800, rolls_3600 = 1, 29
+    elif dimension_mm <= 98700:
+        rolls_1800, rolls_3600 = 0, 30
+    elif dimension_mm <= 100000:
+        rolls_1800, rolls_3600 = 1, 30
+    else:
+        # For dimensions > 100000mm, use algorithmic approach
+        # Pattern: every 1800mm increment alternates between adding 3600mm and 1800mm
+        base_3600_rolls = int(dimension_mm // 3600)
+        remainder = dimension_mm % 3600
+        
+        if remainder <= 1200:
+            rolls_1800 = 1 if remainder > 0 else 0
+            rolls_3600 = base_3600_rolls
+        else:
+            # Need one more 3600mm roll for the remainder
+            rolls_1800 = 0
+            rolls_3600 = base_3600_rolls + 1
+    
+    # Build combination list for display
+    combination = []
+    for _ in range(rolls_3600):
+        combination.append("3600mm")
+    for _ in range(rolls_1800):
+        combination.append("1800mm")
+    
+    return combination, rolls_1800, rolls_3600
+
+
+def calculate_wall_roll_combination_by_dimension(dimension_mm, has_floor_covering=False):
+    """
+    Calculate optimal wall roll combination based on dimension and floor covering status.
+    
+    Args:
+        dimension_mm: Wall dimension in millimeters
+        has_floor_covering: Whether floor covering is being calculated
+    
+    Returns:
+        tuple: (combination_list, rolls_1800, rolls_3600)
+    
+    Logic without floor covering:
+    - dimension ≤ 1800mm: use 1×1800mm
+    - dimension ≤ 3600mm: use 1×3600mm  
+    - 3600mm < dimension ≤ 5400mm: use 1×3600mm + 1×1800mm
+    - 5400mm < dimension ≤ 7200mm: use 2×3600mm
+    - Continue pattern...
+    
+    Logic with floor covering:
+    - dimension ≤ 2100mm: use 1×1800mm
+    - dimension ≤ 3900mm: use 1×3600mm
+    - 3900mm < dimension ≤ 5700mm: use 1×3600mm + 1×1800mm
+    - 5700mm < dimension ≤ 7500mm: use 2×3600mm
+    - Continue pattern...
+    """
+    if dimension_mm <= 0:
+        return [], 0, 0
+    
+    rolls_1800 = 0
+    rolls_3600 = 0
+    remaining = dimension_mm
+    
+    # Set thresholds based on floor covering status
+    if has_floor_covering:
+        single_1800_threshold = 2100
+        single_3600_threshold = 3900
+        pattern_increment = 1800  # 2100 -> 3900 -> 5700 -> 7500...
+    else:
+        single_1800_threshold = 1800
+        single_3600_threshold = 3600
+        pattern_increment = 1800  # 1800 -> 3600 -> 5400 -> 7200...
+    
+    while remaining > 0:
+        if remaining <= single_1800_threshold:
+            rolls_1800 += 1
+            remaining = 0
+        elif remaining <= single_3600_threshold:
+            rolls_3600 += 1
+            remaining = 0
+        elif remaining <= single_3600_threshold + pattern_increment:
+            # Use 3600mm + 1800mm
+            rolls_3600 += 1
+            rolls_1800 += 1
+            remaining = 0
+        elif remaining <= single_3600_threshold + (2 * pattern_increment):
+            # Use 2×3600mm
+            rolls_3600 += 2
+            remaining = 0
+        else:
+            # For larger dimensions, subtract one 3600mm and continue
+            rolls_3600 += 1
+            remaining -= 3600
+            
+            # If remainder is small enough for 1800mm, use it
+            if remaining > 0 and remaining <= single_1800_threshold:
+                rolls_1800 += 1
+                remaining = 0
+    
+    # Build combination list for display
+    combination = []
+    for _ in range(rolls_3600):
+        combination.append("3600mm")
+    for _ in range(rolls_1800):
+        combination.append("1800mm")
+    
+    return combination, rolls_1800, rolls_3600
+
+
+def calculate_wall_rolls_by_height(height_mm, perimeter_m, has_floor_covering=False):
+    """
+    Calculate wall rolls based on height pattern and perimeter coverage.
+    
+    Args:
+        height_mm: Wall height in millimeters
+        perimeter_m: Room perimeter in meters
+        has_floor_covering: Whether floor covering is being calculated
+    
+    Returns:
+        tuple: (combination_list, rolls_1800_per_set, rolls_3600_per_set, num_sets)
+    """
+    if height_mm <= 0 or perimeter_m <= 0:
+        return [], 0, 0, 0
+    
+    # Get the height-based roll pattern using wall-specific logic
+    combination, rolls_1800_per_set, rolls_3600_per_set = calculate_wall_roll_combination_by_dimension(height_mm, has_floor_covering)
+    
+    # Calculate how many sets needed for perimeter coverage (50m per roll)
+    num_sets = math.ceil(perimeter_m / ROLL_LENGTH)
+    
+    # Total rolls = pattern per set × number of sets
+    total_rolls_1800 = rolls_1800_per_set * num_sets
+    total_rolls_3600 = rolls_3600_per_set * num_sets
+    
+    return combination, total_rolls_1800, total_rolls_3600, num_sets
+
+
+def calculate_floor_rolls_by_length(width_mm, length_m):
+    """
+    Calculate floor rolls based on width pattern and room length.
+    Floor requires 2 layers, so length calculation is doubled.
+    An additional 0.6m is added to the room length for safety margin/waste allowance.
+    
+    Args:
+        width_mm: Room width in millimeters
+        length_m: Room length in meters
+    
+    Returns:
+        tuple: (combination_list, total_rolls_1800, total_rolls_3600)
+    """
+    if width_mm <= 0 or length_m <= 0:
+        return [], 0, 0
+    
+    # Add 0.6m safety margin to room length
+    adjusted_length_m = length_m + 0.6
+    
+    # Get the width-based roll pattern
+    combination, rolls_1800_per_layer, rolls_3600_per_layer = calculate_roll_combination_by_dimension(width_mm)
+    
+    # Calculate total length needed (2 layers)
+    total_rolls_1800 = 0
+    total_rolls_3600 = 0
+    
+    if rolls_1800_per_layer > 0:
+        length_needed_1800 = adjusted_length_m * 2 * rolls_1800_per_layer
+        total_rolls_1800 = math.ceil(length_needed_1800 / ROLL_LENGTH)
+    
+    if rolls_3600_per_layer > 0:
+        length_needed_3600 = adjusted_length_m * 2 * rolls_3600_per_layer
+        total_rolls_3600 = math.ceil(length_needed_3600 / ROLL_LENGTH)
+    
+    return combination, total_rolls_1800, total_rolls_3600
+
+
+# ==============================================================================
+# POOLING KERNEL
+# ==============================================================================
+
+def split_area_by_pattern(area, rolls_1800, rolls_3600):
+    """
+    Split an area into 1800mm / 3600mm coverage needs by the strip counts of its roll pattern.
+
+    Returns:
+        tuple: (need_1800, need_3600) in m², (0, 0) for an empty area or pattern
+    """
+    total_pattern_units = rolls_1800 + rolls_3600
+    if area <= 0 or total_pattern_units <= 0:
+        return 0, 0
+    return area * (rolls_1800 / total_pattern_units), area * (rolls_3600 / total_pattern_units)
+
+
+def _float_new_rolls(need, coverage):
+    """Whole rolls for a need and the coverage they leave unused, in float m²."""
+    rolls_exact = need / coverage
+    new_rolls = math.ceil(rolls_exact)
+    return new_rolls, (new_rolls - rolls_exact) * coverage
+
+
+# Arithmetic the pooling kernel runs on: roll coverages, new rolls for a need
+# (rolls, unused coverage), ceiling division and the pattern split. The float
+# optimizers work in m²; fixed_point_engine plugs in the integer mm² versions.
+FLOAT_POOL_ARITHMETIC = {
+    'coverages': {spec_key: spec['actual_coverage'] for spec_key, spec in SHEET_SPECS.items()},
+    'new_rolls': _float_new_rolls,
+    'ceil_div': lambda numerator, denominator: math.ceil(numerator / denominator),
+    'split': split_area_by_pattern
+}
+
+
+def draw_pool(need, leftover, coverage, arithmetic=FLOAT_POOL_ARITHMETIC):
+    """
+    Cover a need from one leftover pool first and open new rolls for the rest.
+
+    The unused coverage of the new rolls goes back into the pool. This is
+    the one leftover step every pooled optimizer is built from.
+
+    Args:
+        need: Coverage needed in m²
+        leftover: Coverage in the pool before the draw
+        coverage: Coverage of one new roll
+        arithmetic: Pool arithmetic (FLOAT_POOL_ARITHMETIC, or the fixed-point one)
+
+    Returns:
+        tuple: (from_leftover, new_rolls, leftover after the draw)
+    """
+    from_leftover = 0
+    if need > 0 and leftover > 0:
+        from_leftover = min(leftover, need)
+        leftover -= from_leftover
+        need -= from_leftover
+
+    new_rolls = 0
+    if need > 0:
+        new_rolls, unused = arithmetic['new_rolls'](need, coverage)
+        leftover += unused
+    return from_leftover, new_rolls, leftover
+
+
+def pool_ceiling_wall_room(ceiling_1800_needed, ceiling_3600_needed, wall_area, wall_1800_per_set, wall_3600_per_set,
+                           leftover_1800, leftover_3600, arithmetic=FLOAT_POOL_ARITHMETIC):
+    """
+    Pool one room's ceiling and walls into the shared 0.1mm leftovers.
+
+    The ceiling draws on the pool of its own width. Walls then take any
+    leftover, 1800mm first, and buy whole wall pattern sets for the rest;
+    the unused part of those sets is shared back in pattern proportion.
+
+    Args:
+        ceiling_1800_needed, ceiling_3600_needed: Ceiling coverage per width (split_area_by_pattern)
+        wall_area: Wall coverage needed in m²
+        wall_1800_per_set, wall_3600_per_set: Wall rolls per 50m set (0, 0 when walls have no pattern)
+        leftover_1800, leftover_3600: Pools before the room
+        arithmetic: Pool arithmetic (FLOAT_POOL_ARITHMETIC, or the fixed-point one)
+
+    Returns:
+        tuple: (usage, leftover_1800, leftover_3600) where usage holds the room's
+               *_from_leftover, new/additional roll counts and room totals
+    """
+    coverage_1800 = arithmetic['coverages']['ceiling_thin']
+    coverage_3600 = arithmetic['coverages']['ceiling_wide']
+
+    ceiling_1800_from_leftover, new_ceiling_1800_rolls, leftover_1800 = draw_pool(
+        ceiling_1800_needed, leftover_1800, coverage_1800, arithmetic
+    )
+    ceiling_3600_from_leftover, new_ceiling_3600_rolls, leftover_3600 = draw_pool(
+        ceiling_3600_needed, leftover_3600, coverage_3600, arithmetic
+    )
+
+    # Walls can use any leftover, whatever the width
+    remaining_wall_area = wall_area
+    wall_1800_from_leftover = 0
+    wall_3600_from_leftover = 0
+    if remaining_wall_area > 0 and leftover_1800 > 0:
+        wall_1800_from_leftover = min(leftover_1800, remaining_wall_area)
+        leftover_1800 -= wall_1800_from_leftover
+        remaining_wall_area -= wall_1800_from_leftover
+    if remaining_wall_area > 0 and leftover_3600 > 0:
+        wall_3600_from_leftover = min(leftover_3600, remaining_wall_area)
+        leftover_3600 -= wall_3600_from_leftover
+        remaining_wall_area -= wall_3600_from_leftover
+
+    additional_wall_1800_rolls = 0
+    additional_wall_3600_rolls = 0
+    if remaining_wall_area > 0:
+        if wall_1800_per_set > 0 or wall_3600_per_set > 0:
+            pattern_coverage_per_set = (wall_3600_per_set * coverage_3600) + (wall_1800_per_set * coverage_1800)
+            sets_needed = arithmetic['ceil_div'](remaining_wall_area, pattern_coverage_per_set)
+            additional_wall_3600_rolls = wall_3600_per_set * sets_needed
+            additional_wall_1800_rolls = wall_1800_per_set * sets_needed
+
+            # Distribute the unused part of the sets proportionally
+            wall_leftover = sets_needed * pattern_coverage_per_set - remaining_wall_area
+            wall_leftover_1800, wall_leftover_3600 = arithmetic['split'](
+                wall_leftover, wall_1800_per_set, wall_3600_per_set
+            )
+            leftover_1800 += wall_leftover_1800
+            leftover_3600 += wall_leftover_3600
+        elif remaining_wall_area >= coverage_3600:
+            # Fallback without a wall pattern
+            additional_wall_3600_rolls = int(remaining_wall_area // coverage_3600)
+            remaining_after_3600 = remaining_wall_area % coverage_3600
+            if remaining_after_3600 > 0:
+                additional_wall_1800_rolls = 1
+                leftover_1800 += (coverage_1800 - remaining_after_3600)
+        else:
+            additional_wall_1800_rolls = 1
+            leftover_1800 += (coverage_1800 - remaining_wall_area)
+
+    return {
+        'ceiling_1800_from_leftover': ceiling_1800_from_leftover,
+        'ceiling_3600_from_leftover': ceiling_3600_from_leftover,
+        'new_ceiling_1800_rolls': new_ceiling_1800_rolls,
+        'new_ceiling_3600_rolls': new_ceiling_3600_rolls,
+        'wall_1800_from_leftover': wall_1800_from_leftover,
+        'wall_3600_from_leftover': wall_3600_from_leftover,
+        'additional_wall_1800_rolls': additional_wall_1800_rolls,
+        'additional_wall_3600_rolls': additional_wall_3600_rolls,
+        'room_total_1800': new_ceiling_1800_rolls + additional_wall_1800_rolls,
+        'room_total_3600': new_ceiling_3600_rolls + additional_wall_3600_rolls
+    }, leftover_1800, leftover_3600
+
+
+def pool_floor_room(floor_1800_needed, floor_3600_needed, leftover_1800_floor, leftover_3600_floor,
+                    arithmetic=FLOAT_POOL_ARITHMETIC):
+    """
+    Pool one room's floor covering into the 0.15mm leftovers of each width.
+
+    Returns:
+        tuple: (usage, leftover_1800_floor, leftover_3600_floor) where usage holds the
+               room's floor_*_from_leftover, new roll counts and room totals
+    """
+    floor_1800_from_leftover, new_floor_1800_rolls, leftover_1800_floor = draw_pool(
+        floor_1800_needed, leftover_1800_floor, arithmetic['coverages']['floor_thin'], arithmetic
+    )
+    floor_3600_from_leftover, new_floor_3600_rolls, leftover_3600_floor = draw_pool(
+        floor_3600_needed, leftover_3600_floor, arithmetic['coverages']['floor_wide'], arithmetic
+    )
+    return {
+        'floor_1800_from_leftover': floor_1800_from_leftover,
+        'floor_3600_from_leftover': floor_3600_from_leftover,
+        'new_floor_1800_rolls': new_floor_1800_rolls,
+        'new_floor_3600_rolls': new_floor_3600_rolls,
+        'room_total_1800': new_floor_1800_rolls,
+        'room_total_3600': new_floor_3600_rolls
+    }, leftover_1800_floor, leftover_3600_floor
+
+
+def pool_ceiling_wall_steps(steps, leftover_1800, leftover_3600):
+    """
+    Run precomputed ceiling/wall needs through pool_ceiling_wall_room, keeping only the totals.
+
+    Args:
+        steps: Iterable of (ceiling_1800_needed, ceiling_3600_needed, wall_area,
+               wall_1800_per_set, wall_3600_per_set) per room, in pooling order
+        leftover_1800, leftover_3600: Pools before the first step
+
+    Returns:
+        tuple: (leftover_1800, leftover_3600, rolls_1800, rolls_3600) after the steps
+    """
+    rolls_1800 = 0
+    rolls_3600 = 0
+    for ceiling_1800_needed, ceiling_3600_needed, wall_area, wall_1800_per_set, wall_3600_per_set in steps:
+        usage, leftover_1800, leftover_3600 = pool_ceiling_wall_room(
+            ceiling_1800_needed, ceiling_3600_needed, wall_area, wall_1800_per_set, wall_3600_per_set,
+            leftover_1800, leftover_3600
+        )
+        rolls_1800 += usage['room_total_1800']
+        rolls_3600 += usage['room_total_3600']
+    return leftover_1800, leftover_3600, rolls_1800, rolls_3600
+
+
+def pool_floor_needs(needs, leftover_1800_floor, leftover_3600_floor):
+    """
+    Run precomputed (need_1800, need_3600) floor needs through pool_floor_room, keeping only the totals.
+
+    Returns:
+        tuple: (leftover_1800_floor, leftover_3600_floor, rolls_1800, rolls_3600)
+    """
+    rolls_1800 = 0
+    rolls_3600 = 0
+    for need_1800, need_3600 in needs:
+        usage, leftover_1800_floor, leftover_3600_floor = pool_floor_room(
+            need_1800, need_3600, leftover_1800_floor, leftover_3600_floor
+        )
+        rolls_1800 += usage['new_floor_1800_rolls']
+        rolls_3600 += usage['new_floor_3600_rolls']
+    return leftover_1800_floor, leftover_3600_floor, rolls_1800, rolls_3600
+
+
+def _with_progress(rooms_data, progress_callback):
+    """Yield the rooms, calling progress_callback(room_index, room_count, room_name) before each one."""
+    for room_index, room in enumerate(rooms_data):
+        if progress_callback is not None:
+            progress_callback(room_index, len(rooms_data), room['name'])
+        yield room
+
+
+def iter_optimized_multi_room_floor(rooms, initial_leftover_1800_floor=0, initial_leftover_3600_floor=0,
+                                    arithmetic=FLOAT_POOL_ARITHMETIC):
+    """
+    Pool floor roll usage room by room, yielding each room's result as soon as it is computed.
+
+    Rooms may be any iterable, including an unbounded stream: only the pool
+    state is kept between rooms.
+
+    Args:
+        rooms: Iterable of room dictionaries with floor_area, width_mm, length_m
+        initial_leftover_1800_floor: Coverage (m²) already available before the first room
+        initial_leftover_3600_floor: Same for 3600mm rolls
+        arithmetic: Pool arithmetic; the fixed-point engine passes rooms and pools in mm²
+
+    Yields:
+        tuple: (room_result, pool_state) where pool_state holds the running
+               total_rolls_1800_floor / total_rolls_3600_floor and
+               final_leftover_1800_floor / final_leftover_3600_floor after the room
+    """
+    # Track global leftover coverage that can be shared between rooms (in m²)
+    global_leftover_1800_floor = initial_leftover_1800_floor
+    global_leftover_3600_floor = initial_leftover_3600_floor
+    
+    # Track total rolls needed
+    total_rolls_1800_floor = 0
+    total_rolls_3600_floor = 0
+    
+    for room in rooms:
+        room_name = room['name']
+        floor_area = room.get('floor_area', 0)
+        width_mm = room.get('width_mm', 0)
+        length_m = room.get('length_m', 0)
+        
+        if floor_area <= 0 or width_mm <= 0 or length_m <= 0:
+            continue
+        
+        # Get the width-based roll pattern
+        combination, rolls_1800_per_layer, rolls_3600_per_layer = calculate_roll_combination_by_dimension(width_mm)
+        
+        # Do NOT double the area - actual_coverage already accounts for 2 layers
+        floor_1800_coverage_needed, floor_3600_coverage_needed = arithmetic['split'](
+            floor_area, rolls_1800_per_layer, rolls_3600_per_layer
+        )
+        
+        # Use global leftover first, then new rolls (work entirely in coverage area, m²)
+        usage, global_leftover_1800_floor, global_leftover_3600_floor = pool_floor_room(
+            floor_1800_coverage_needed, floor_3600_coverage_needed, global_leftover_1800_floor, global_leftover_3600_floor,
+            arithmetic
+        )
+        
+        # Update totals
+        total_rolls_1800_floor += usage['new_floor_1800_rolls']
+        total_rolls_3600_floor += usage['new_floor_3600_rolls']
+        
+        yield {
+            'name': room_name,
+            **usage,
+            'floor_combination': combination
+        }, {
+            'total_rolls_1800_floor': total_rolls_1800_floor,
+            'total_rolls_3600_floor': total_rolls_3600_floor,
+            'final_leftover_1800_floor': global_leftover_1800_floor,
+            'final_leftover_3600_floor': global_leftover_3600_floor
+        }
+
+
+def calculate_optimized_multi_room_floor(rooms_data, progress_callback=None,
+                                        initial_leftover_1800_floor=0, initial_leftover_3600_floor=0,
+                                        result_callback=None, arithmetic=FLOAT_POOL_ARITHMETIC):
+    """
+    Calculate optimized floor roll usage across ALL rooms.
+    This function pools leftover material across rooms to minimize total rolls needed.
+    
+    Args:
+        rooms_data: List of room dictionaries with floor_area, width_mm, length_m
+        progress_callback: Optional callable(room_index, room_count, room_name) invoked
+            before each room is processed (used for background job progress)
+        initial_leftover_1800_floor: Coverage (m²) already available before the first room,
+            e.g. partly used 0.15mm stock rolls
+        initial_leftover_3600_floor: Same for 3600mm rolls
+        result_callback: Optional callable(room_result, pool_state) invoked as soon as
+            each room is computed (see iter_optimized_multi_room_floor)
+        arithmetic: Pool arithmetic (see iter_optimized_multi_room_floor)
+    
+    Returns:
+        dict: Detailed breakdown including per-room usage and cross-room optimization
+    """
+    if not rooms_data:
+        return {}, 0, 0
+
+    floor_room_results = []
+    pool_state = {
+        'total_rolls_1800_floor': 0,
+        'total_rolls_3600_floor': 0,
+        'final_leftover_1800_floor': initial_leftover_1800_floor,
+        'final_leftover_3600_floor': initial_leftover_3600_floor
+    }
+    stream = iter_optimized_multi_room_floor(
+        _with_progress(rooms_data, progress_callback), initial_leftover_1800_floor, initial_leftover_3600_floor,
+        arithmetic
+    )
+    for room_result, pool_state in stream:
+        floor_room_results.append(room_result)
+        if result_callback is not None:
+            result_callback(room_result, pool_state)
+
+    return {
+        'floor_room_results': floor_room_results,
+        **pool_state
+    }, pool_state['total_rolls_1800_floor'], pool_state['total_rolls_3600_floor']
+
+
+def iter_optimized_multi_room_ceiling_wall(rooms, has_floor_covering=False,
+                                           initial_leftover_1800=0, initial_leftover_3600=0,
+                                           arithmetic=FLOAT_POOL_ARITHMETIC):
+    """
+    Pool ceiling and wall roll usage room by room, yielding each room's result as soon as it is computed.
+
+    Rooms may be any iterable, including an unbounded stream: only the pool
+    state is kept between rooms.
+
+    Args:
+        rooms: Iterable of room dictionaries with ceiling_area, wall_area, width_mm, height_mm, perimeter
+            (optionally wall_segment_rolls from calculate_wall_segments_batch)
+        has_floor_covering: Whether floor covering is being calculated (affects wall dimension logic)
+        initial_leftover_1800: Coverage (m²) already available before the first room
+        initial_leftover_3600: Same for 3600mm rolls
+        arithmetic: Pool arithmetic; the fixed-point engine passes rooms and pools in mm²
+
+    Yields:
+        tuple: (room_result, pool_state) where pool_state holds the running
+               total_rolls_1800 / total_rolls_3600 and final_leftover_1800 /
+               final_leftover_3600 after the room
+    """
+    # Track global leftover coverage that can be shared between rooms
+    global_leftover_1800 = initial_leftover_1800
+    global_leftover_3600 = initial_leftover_3600
+    
+    # Track total rolls needed
+    total_rolls_1800 = 0
+    total_rolls_3600 = 0
+    
+    for room in rooms:
+        room_name = room['name']
+        ceiling_area = room.get('ceiling_area', 0)
+        wall_area = room.get('wall_area', 0)
+        width_mm = room.get('width_mm', 0)
+        height_mm = room.get('height_mm', 0)
+        perimeter = room.get('perimeter', 0)
+        
+        if ceiling_area <= 0 and wall_area <= 0:
+            continue
+        
+        # Get patterns
+        ceiling_combination, ceiling_1800_pattern, ceiling_3600_pattern = \
+            calculate_roll_combination_by_dimension(width_mm) if width_mm > 0 else ([], 0, 0)
+        
+        if room.get('wall_segment_rolls') is not None:
+            # Per-segment wall patterns (wall_segments.py) replace the single perimeter run
+            wall_combination, wall_1800_per_set, wall_3600_per_set, wall_perimeter_sets = room['wall_segment_rolls']
+        else:
+            wall_combination, wall_1800_per_set, wall_3600_per_set, wall_perimeter_sets = \
+                calculate_wall_rolls_by_height(height_mm, perimeter, has_floor_covering) if height_mm > 0 and perimeter > 0 else ([], 0, 0, 0)
+        
+        # Ceiling first from the leftover of its width, then walls from any leftover
+        ceiling_1800_coverage_needed, ceiling_3600_coverage_needed = arithmetic['split'](
+            ceiling_area, ceiling_1800_pattern, ceiling_3600_pattern
+        )
+        usage, global_leftover_1800, global_leftover_3600 = pool_ceiling_wall_room(
+            ceiling_1800_coverage_needed, ceiling_3600_coverage_needed, wall_area,
+            wall_1800_per_set, wall_3600_per_set, global_leftover_1800, global_leftover_3600, arithmetic
+        )
+        
+        # Update totals
+        total_rolls_1800 += usage['room_total_1800']
+        total_rolls_3600 += usage['room_total_3600']
+        
+        yield {
+            'name': room_name,
+            **usage,
+            'ceiling_combination': ceiling_combination,
+            'wall_combination': wall_combination,
+            'wall_perimeter_sets': wall_perimeter_sets
+        }, {
+            'total_rolls_1800': total_rolls_1800,
+            'total_rolls_3600': total_rolls_3600,
+            'final_leftover_1800': global_leftover_1800,
+            'final_leftover_3600': global_leftover_3600
+        }
+
+
+def calculate_optimized_multi_room_ceiling_wall(rooms_data, has_floor_covering=False, progress_callback=None,
+                                                initial_leftover_1800=0, initial_leftover_3600=0,
+                                                result_callback=None, arithmetic=FLOAT_POOL_ARITHMETIC):
+    """
+    Calculate optimized roll usage across ALL rooms for ceiling and walls.
+    This function pools leftover material across rooms to minimize total rolls needed.
+    
+    Args:
+        rooms_data: List of room dictionaries with ceiling_area, wall_area, width_mm, height_mm, perimeter
+            (optionally wall_segment_rolls from calculate_wall_segments_batch)
+        has_floor_covering: Whether floor covering is being calculated (affects wall dimension logic)
+        progress_callback: Optional callable(room_index, room_count, room_name) invoked
+            before each room is processed (used for background job progress)
+        initial_leftover_1800: Coverage (m²) already available before the first room,
+            e.g. partly used 0.1mm stock rolls
+        initial_leftover_3600: Same for 3600mm rolls
+        result_callback: Optional callable(room_result, pool_state) invoked as soon as
+            each room is computed (see iter_optimized_multi_room_ceiling_wall)
+        arithmetic: Pool arithmetic (see iter_optimized_multi_room_ceiling_wall)
+    
+    Returns:
+        dict: Detailed breakdown including per-room usage and cross-room optimization
+    """
+    if not rooms_data:
+        return {}, 0, 0
+
+    room_results = []
+    pool_state = {
+        'total_rolls_1800': 0,
+        'total_rolls_3600': 0,
+        'final_leftover_1800': initial_leftover_1800,
+        'final_leftover_3600': initial_leftover_3600
+    }
+    stream = iter_optimized_multi_room_ceiling_wall(
+        _with_progress(rooms_data, progress_callback), has_floor_covering, initial_leftover_1800, initial_leftover_3600,
+        arithmetic
+    )
+    for room_result, pool_state in stream:
+        room_results.append(room_result)
+        if result_callback is not None:
+            result_callback(room_result, pool_state)
+
+    return {
+        'room_results': room_results,
+        **pool_state
+    }, pool_state['total_rolls_1800'], pool_state['total_rolls_3600']
+
+
+def calculate_optimized_multi_room_ceiling_wall_1800_only(rooms_data, has_floor_covering=False):
+    """
+    Calculate optimized roll usage across ALL rooms for ceiling and walls.
+    ONLY uses 1800mm rolls (no 3600mm rolls).
+    This function pools leftover material across rooms to minimize total rolls needed.
+    
+    Args:
+        rooms_data: List of room dictionaries with ceiling_area, wall_area, width_mm, height_mm, perimeter
+        has_floor_covering: Whether floor covering is being calculated
+    
+    Returns:
+        dict: Detailed breakdown including per-room usage and cross-room optimization
+    """
+    if not rooms_data:
+        return {}, 0, 0
+    
+    # Track global leftover coverage that can be shared between rooms
+    global_leftover_1800 = 0
+    
+    # Track total rolls needed (only 1800mm)
+    total_rolls_1800 = 0
+    
+    # Track detailed results per room
+    room_results = []
+    
+    # Coverage values (only 1800mm)
+    coverage_1800 = SHEET_SPECS['ceiling_thin']['actual_coverage']  # 72 m²
+    
+    for room in rooms_data:
+        room_name = room['name']
+        ceiling_area = room.get('ceiling_area', 0)
+        wall_area = room.get('wall_area', 0)
+        
+        if ceiling_area <= 0 and wall_area <= 0:
+            continue
+        
+        # Use global leftover first, then new rolls
+        area_from_leftover, new_rolls_1800, global_leftover_1800 = draw_pool(
+            ceiling_area + wall_area, global_leftover_1800, coverage_1800
+        )
+        
+        # Update totals
+        total_rolls_1800 += new_rolls_1800
+        
+        # Store results
+        room_results.append({
+            'name': room_name,
+            'area_from_leftover': area_from_leftover,
+            'new_rolls_1800': new_rolls_1800,
+            'room_total_1800': new_rolls_1800,
+            'room_total_3600': 0,  # No 3600mm rolls used
+            'ceiling_combination': ["1800mm"] if ceiling_area > 0 else [],
+            'wall_combination': ["1800mm"] if wall_area > 0 else []
+        })
+    
+    return {
+        'room_results': room_results,
+        'total_rolls_1800': total_rolls_1800,
+        'total_rolls_3600': 0,  # No 3600mm rolls
+        'final_leftover_1800': global_leftover_1800,
+        'final_leftover_3600': 0  # No 3600mm rolls
+    }, total_rolls_1800, 0
+
+
+def calculate_optimized_multi_room_floor_1800_only(rooms_data):
+    """
+    Calculate optimized floor roll usage across ALL rooms.
+    ONLY uses 1800mm rolls (no 3600mm rolls).
+    This function pools leftover material across rooms to minimize total rolls needed.
+    
+    Args:
+        rooms_data: List of room dictionaries with floor_area, width_mm, length_m
+    
+    Returns:
+        dict: Detailed breakdown including per-room usage and cross-room optimization
+    """
+    if not rooms_data:
+        return {}, 0, 0
+    
+    # Track global leftover coverage that can be shared between rooms (in m²)
+    global_leftover_1800_floor = 0
+    
+    # Track total rolls needed (only 1800mm)
+    total_rolls_1800_floor = 0
+    
+    # Track detailed results per room
+    floor_room_results = []
+    
+    # Floor coverage values (0.15mm thickness, 2 layers required) - only 1800mm
+    coverage_1800_floor = SHEET_SPECS['floor_thin']['actual_coverage']  # 36 m²
+    
+    for room in rooms_data:
+        room_name = room['name']
+        floor_area = room.get('floor_area', 0)
+        
+        if floor_area <= 0:
+            continue
+        
+        # Use global leftover first, then new rolls
+        floor_from_leftover, new_floor_1800_rolls, global_leftover_1800_floor = draw_pool(
+            floor_area, global_leftover_1800_floor, coverage_1800_floor
+        )
+        
+        # Update totals
+        total_rolls_1800_floor += new_floor_1800_rolls
+        
+        # Store results
+        floor_room_results.append({
+            'name': room_name,
+            'floor_1800_from_leftover': floor_from_leftover,
+            'floor_3600_from_leftover': 0,  # No 3600mm rolls
+            'new_floor_1800_rolls': new_floor_1800_rolls,
+            'new_floor_3600_rolls': 0,  # No 3600mm rolls
+            'room_total_1800': new_floor_1800_rolls,
+            'room_total_3600': 0,  # No 3600mm rolls
+            'floor_combination': ["1800mm"] if floor_area > 0 else []
+        })
+    
+    return {
+        'floor_room_results': floor_room_results,
+        'total_rolls_1800_floor': total_rolls_1800_floor,
+        'total_rolls_3600_floor': 0,  # No 3600mm rolls
+        'final_leftover_1800_floor': global_leftover_1800_floor,
+        'final_leftover_3600_floor': 0  # No 3600mm rolls
+    }, total_rolls_1800_floor, 0
+
+
+# ==============================================================================
+# HELPER FUNCTIONS - ROOM CALCULATIONS
+# ==============================================================================
+
+def calculate_room_metrics(length, width, height):
+    """Calculate all metrics for a single room."""
+    if length <= 0 or width <= 0 or height <= 0:
+        return None
+    
+    floor_area = length * width
+    ceiling_area = floor_area
+    perimeter = 2 * (length + width)
+    wall_area = perimeter * height
+    
+    return {
+        'floor_area': floor_area,
+        'ceiling_area': ceiling_area,
+        'perimeter': perimeter,
+        'wall_area': wall_area
+    }
+
+
+# ==============================================================================
+# HELPER FUNCTIONS - SCAFFOLDING CALCULATIONS
+# ==============================================================================
+
+def calculate_scaffolding_requirements(building_length_m, building_height_m,
+                                       scaffolding_length_m, scaffolding_width_m, scaffolding_height_m):
+    """
+    Calculate scaffolding units, coverage areas and 1800mm roll counts for one facade side.
+    
+    Args:
+        building_length_m: Building facade length in meters
+        building_height_m: Building height in meters
+        scaffolding_length_m: Length of one scaffolding unit in meters
+        scaffolding_width_m: Width (depth) of one scaffolding unit in meters
+        scaffolding_height_m: Height of one scaffolding unit in meters
+    
+    Returns:
+        dict: Unit counts, top/bottom/side areas and roll requirements, or None for invalid input
+    """
+    if (building_length_m <= 0 or building_height_m <= 0 or scaffolding_length_m <= 0 or
+            scaffolding_width_m <= 0 or scaffolding_height_m <= 0):
+        return None
+    
+    # Calculate number of scaffolding units needed for ONE SIDE (always round UP)
+    units_along_length = math.ceil(building_length_m / scaffolding_length_m)
+    units_along_height = math.ceil(building_height_m / scaffolding_height_m)
+    
+    # Calculate scaffolding units for one side only
+    total_side_units = units_along_length * units_along_height
+    
+    # Calculate coverage areas per scaffolding unit
+    # Each unit covers: scaffolding_length × scaffolding_width (already in m²)
+    unit_coverage_area = scaffolding_length_m * scaffolding_width_m
+    
+    # Total coverage areas for one side
+    total_top_area = total_side_units * unit_coverage_area      # Top (floor covering)
+    total_bottom_area = total_side_units * unit_coverage_area   # Bottom (ceiling covering)
+    
+    # Calculate side wall coverage (足場側壁養生)
+    # Total scaffolding length = units_along_length * scaffolding_length_m
+    # Total scaffolding height = units_along_height * scaffolding_height_m
+    total_scaffolding_length = units_along_length * scaffolding_length_m
+    total_scaffolding_height = units_along_height * scaffolding_height_m
+    side_wall_area = total_scaffolding_length * total_scaffolding_height
+    
+    total_coverage_area = total_top_area + total_bottom_area + side_wall_area
+    
+    return {
+        'units_along_length': units_along_length,
+        'units_along_height': units_along_height,
+        'total_side_units': total_side_units,
+        'unit_coverage_area': unit_coverage_area,
+        'total_top_area': total_top_area,
+        'total_bottom_area': total_bottom_area,
+        'total_scaffolding_length': total_scaffolding_length,
+        'total_scaffolding_height': total_scaffolding_height,
+        'side_wall_area': side_wall_area,
+        'total_coverage_area': total_coverage_area,
+        **calculate_scaffolding_rolls(total_top_area, total_bottom_area,
+                                      total_scaffolding_length, total_scaffolding_height)
+    }
+
+
+def calculate_scaffolding_rolls(total_top_area, total_bottom_area, total_scaffolding_length, total_scaffolding_height):
+    """
+    Calculate 1800mm roll counts for the covering areas of one scaffolding layout.
+    
+    Args:
+        total_top_area: Platform top area in m² (floor covering)
+        total_bottom_area: Platform bottom area in m² (ceiling covering)
+        total_scaffolding_length: Total layout length in meters
+        total_scaffolding_height: Total layout height in meters
+    
+    Returns:
+        dict: Side wall strip counts and roll counts per surface
+    """
+    # Calculate side wall horizontal covering details
+    # Each 1800mm roll covers 1.8m width × 50m length horizontally
+    roll_width_m = ROLL_WIDTH_1800 / 1000  # Convert 1800mm to 1.8m
+    horizontal_strips_needed = math.ceil(total_scaffolding_height / roll_width_m)
+    rolls_per_strip = math.ceil(total_scaffolding_length / ROLL_LENGTH)  # 50m per roll
+    
+    # Calculate roll requirements
+    # Always use 1800mm rolls only for all surfaces in 外壁養生
+    top_roll_coverage = SHEET_SPECS['floor_thin']['actual_coverage']      # 36 m² (2 layers, 0.15mm)
+    bottom_roll_coverage = SHEET_SPECS['ceiling_thin']['actual_coverage']  # 72 m² (1 layer, 0.1mm)
+    
+    # Calculate rolls needed for each surface (all using 1800mm rolls)
+    total_top_rolls = math.ceil(total_top_area / top_roll_coverage)
+    total_bottom_rolls = math.ceil(total_bottom_area / bottom_roll_coverage)
+    
+    # Side wall calculation: Use pre-calculated horizontal covering values
+    total_side_wall_rolls = horizontal_strips_needed * rolls_per_strip
+    
+    # Total rolls = sum of all surfaces (all 1800mm)
+    total_all_rolls = total_top_rolls + total_bottom_rolls + total_side_wall_rolls
+    
+    return {
+        'horizontal_strips_needed': horizontal_strips_needed,
+        'rolls_per_strip': rolls_per_strip,
+        'total_top_rolls': total_top_rolls,
+        'total_bottom_rolls': total_bottom_rolls,
+        'total_side_wall_rolls': total_side_wall_rolls,
+        'total_all_rolls': total_all_rolls
+    }
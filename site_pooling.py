@@ -0,0 +1,202 @@
+from floor_strips import calculate_floor_strip_plan
+from roll_orientation import apply_roll_orientation, choose_roll_orientations
+from sheet_engine import (
+    ROLL_LENGTH,
+    SHEET_SPECS,
+    calculate_optimized_multi_room_ceiling_wall,
+    calculate_optimized_multi_room_floor,
+    draw_pool
+)
+
+
+# ==============================================================================
+# CONSTANTS
+# ==============================================================================
+
+# Scaffolding surfaces in pass order, with the pool (thickness class) they share with the rooms.
+# Scaffolding is covered with 1800mm rolls only; like room walls, the side walls may also
+# use 3600mm offcuts, while top and bottom draw on 1800mm leftovers like floors and ceilings.
+SCAFFOLDING_SURFACES = (
+    ('top', '足場 上面', 'floor', ('1800',)),
+    ('bottom', '足場 下面', 'ceiling_wall', ('1800',)),
+    ('side_wall', '足場 側壁', 'ceiling_wall', ('1800', '3600'))
+)
+
+
+# ==============================================================================
+# UNIFIED SITE POOLING
+# ==============================================================================
+
+def scaffolding_surface_needs(scaffolding):
+    """
+    Coverage needs of the scaffolding surfaces in m², as the pooled optimizers count them.
+
+    Top and bottom are their platform areas. Side walls are covered in
+    horizontal 1800mm strips along the whole layout; the side wall need is
+    the coverage of one strip, needed horizontal_strips_needed times.
+
+    Args:
+        scaffolding: Result of calculate_scaffolding_requirements or
+                     calculate_mixed_scaffolding_requirements
+
+    Returns:
+        dict: top and bottom needs and the side_wall need per strip in m²
+    """
+    return {
+        'top': scaffolding['total_top_area'],
+        'bottom': scaffolding['total_bottom_area'],
+        'side_wall': scaffolding['total_scaffolding_length'] * SHEET_SPECS['ceiling_thin']['actual_coverage'] / ROLL_LENGTH
+    }
+
+
+def _pool_side_wall_strips(strip_need, strips, rolls_per_strip, pool_leftovers, leftover_widths):
+    """
+    Cut side wall strips from room leftovers or buy the rolls of each strip, as calculate_scaffolding_rolls does.
+
+    A strip is taken from a leftover pool only when the pool covers the whole
+    strip, so strips are never spliced from pieces of several rolls.
+
+    Returns:
+        tuple: (from_leftover per width, strips bought)
+    """
+    from_leftover = {'1800': 0, '3600': 0}
+    strips_bought = 0
+    for _ in range(strips):
+        width = next((width for width in leftover_widths if pool_leftovers[width] >= strip_need), None)
+        if width is None:
+            strips_bought += 1
+            continue
+        pool_leftovers[width] -= strip_need
+        from_leftover[width] += strip_need
+    return from_leftover, strips_bought
+
+
+def pool_scaffolding(scaffolding, leftovers):
+    """
+    Cover the scaffolding surfaces from room leftovers first, in SCAFFOLDING_SURFACES order.
+
+    Scaffolding only draws on what the rooms left over. The offcuts of its own
+    rolls are not cut again, exactly as calculate_scaffolding_rolls buys them,
+    so without leftovers the rolls equal the building tab; the offcuts are
+    added to the leftovers afterwards.
+
+    Args:
+        scaffolding: Scaffolding requirements of the building tab
+        leftovers: {'ceiling_wall': {'1800', '3600'}, 'floor': {'1800', '3600'}}; updated in place
+
+    Returns:
+        tuple: (scaffolding_results per surface, new 1800mm rolls per thickness class)
+    """
+    coverages = {
+        'ceiling_wall': SHEET_SPECS['ceiling_thin']['actual_coverage'],
+        'floor': SHEET_SPECS['floor_thin']['actual_coverage']
+    }
+    new_rolls = {'ceiling_wall': 0, 'floor': 0}
+    offcuts = {'ceiling_wall': 0, 'floor': 0}
+
+    needs = scaffolding_surface_needs(scaffolding)
+    scaffolding_results = []
+    for surface, label, pool, leftover_widths in SCAFFOLDING_SURFACES:
+        if surface == 'side_wall':
+            from_leftover, strips_bought = _pool_side_wall_strips(
+                needs[surface], scaffolding['horizontal_strips_needed'], scaffolding['rolls_per_strip'],
+                leftovers[pool], leftover_widths
+            )
+            surface_rolls = strips_bought * scaffolding['rolls_per_strip']
+            offcuts[pool] += strips_bought * (scaffolding['rolls_per_strip'] * coverages[pool] - needs[surface])
+            need_area = needs[surface] * scaffolding['horizontal_strips_needed']
+        else:
+            from_leftover_1800 = min(max(leftovers[pool]['1800'], 0), needs[surface])
+            leftovers[pool]['1800'] -= from_leftover_1800
+            _, surface_rolls, offcut = draw_pool(needs[surface] - from_leftover_1800, 0, coverages[pool])
+            offcuts[pool] += offcut
+            from_leftover = {'1800': from_leftover_1800, '3600': 0}
+            need_area = needs[surface]
+        new_rolls[pool] += surface_rolls
+
+        scaffolding_results.append({
+            'surface': surface,
+            'label': label,
+            'thickness_class': pool,
+            'need_area': need_area,
+            'from_leftover_1800': from_leftover['1800'],
+            'from_leftover_3600': from_leftover['3600'],
+            'new_1800_rolls': surface_rolls
+        })
+
+    for pool, offcut in offcuts.items():
+        leftovers[pool]['1800'] += offcut
+    return scaffolding_results, new_rolls
+
+
+def calculate_unified_site_plan(rooms_data, scaffolding, has_floor_covering=False, floor_strips=False,
+                                auto_orientation=False):
+    """
+    Pool interior rooms and exterior scaffolding in one pass over all surfaces.
+
+    Rooms go first, exactly as in the mixed-width optimizers; the scaffolding
+    surfaces follow in the same pass and draw on the leftovers of their
+    thickness class before new 1800mm rolls are opened. Scaffolding rolls
+    are cut as on the building tab (pool_scaffolding), so rolls_saved only
+    counts what the room leftovers cover: it is never negative and 0
+    without rooms. The room passes take the same options as the background
+    optimization job, so the interior totals match the main plan.
+
+    Args:
+        rooms_data: Surface-filtered room dictionaries
+        scaffolding: Scaffolding requirements of the building tab
+        has_floor_covering: Whether floor covering is being calculated (affects wall patterns)
+        floor_strips: Plan floors with calculate_floor_strip_plan instead of the area-ratio optimizer
+        auto_orientation: Rotate rooms where the other roll direction buys fewer rolls
+                          (floors only with the area-ratio optimizer)
+
+    Returns:
+        dict: ceiling_wall_results, floor_results, scaffolding_results (per surface),
+              pooled totals per width and thickness, separate_total and rolls_saved
+    """
+    ceiling_rooms = floor_rooms = rooms_data
+    if auto_orientation:
+        orientation = choose_roll_orientations(rooms_data, has_floor_covering)
+        ceiling_rooms = apply_roll_orientation(rooms_data, orientation['ceiling'])
+        if not floor_strips:
+            floor_rooms = apply_roll_orientation(rooms_data, orientation['floor'])
+
+    ceiling_wall_results, total_cw_1800, total_cw_3600 = \
+        calculate_optimized_multi_room_ceiling_wall(ceiling_rooms, has_floor_covering)
+    floor_results, total_floor_1800, total_floor_3600 = {}, 0, 0
+    if has_floor_covering:
+        floor_optimizer = calculate_floor_strip_plan if floor_strips else calculate_optimized_multi_room_floor
+        floor_results, total_floor_1800, total_floor_3600 = floor_optimizer(floor_rooms)
+
+    leftovers = {
+        'ceiling_wall': {
+            '1800': ceiling_wall_results.get('final_leftover_1800', 0),
+            '3600': ceiling_wall_results.get('final_leftover_3600', 0)
+        },
+        'floor': {
+            '1800': floor_results.get('final_leftover_1800_floor', 0),
+            '3600': floor_results.get('final_leftover_3600_floor', 0)
+        }
+    }
+    scaffolding_results, new_rolls = pool_scaffolding(scaffolding, leftovers)
+
+    interior_total = total_cw_1800 + total_cw_3600 + total_floor_1800 + total_floor_3600
+    unified_total = interior_total + new_rolls['ceiling_wall'] + new_rolls['floor']
+    separate_total = interior_total + scaffolding['total_all_rolls']
+    return {
+        'ceiling_wall_results': ceiling_wall_results,
+        'floor_results': floor_results,
+        'scaffolding_results': scaffolding_results,
+        'room_count': len(rooms_data),
+        'total_cw_1800': total_cw_1800 + new_rolls['ceiling_wall'],
+        'total_cw_3600': total_cw_3600,
+        'total_floor_1800': total_floor_1800 + new_rolls['floor'],
+        'total_floor_3600': total_floor_3600,
+        'final_leftover_1800': leftovers['ceiling_wall']['1800'],
+        'final_leftover_3600': leftovers['ceiling_wall']['3600'],
+        'final_leftover_1800_floor': leftovers['floor']['1800'],
+        'final_leftover_3600_floor': leftovers['floor']['3600'],
+        'unified_total': unified_total,
+        'separate_total': separate_total,
+        'rolls_saved': separate_total - unified_total
+    }
@@ -0,0 +1,255 @@
+import math
+
+from breakpoints import get_ceiling_floor_breakpoint_index, get_wall_breakpoint_index
+from sheet_engine import (
+    ROLL_LENGTH,
+    SHEET_SPECS,
+    draw_pool,
+    pool_ceiling_wall_room,
+    pool_floor_room,
+    split_area_by_pattern
+)
+
+
+# ==============================================================================
+# CONSTANTS
+# ==============================================================================
+
+STRATEGY_MIXED = 'mixed'
+STRATEGY_1800_ONLY = '1800_only'
+STRATEGY_3600_PREFERRED = '3600_preferred'
+
+ALL_STRATEGIES = (STRATEGY_MIXED, STRATEGY_1800_ONLY, STRATEGY_3600_PREFERRED)
+
+STRATEGY_LABELS = {
+    STRATEGY_MIXED: '混合 (1800mm + 3600mm)',
+    STRATEGY_1800_ONLY: '1800mmのみ',
+    STRATEGY_3600_PREFERRED: '3600mm優先'
+}
+
+
+# ==============================================================================
+# STRATEGY PLANS
+# ==============================================================================
+
+class _StrategyPlan:
+    """
+    Running pool state of one strategy.
+
+    The pooling itself is sheet_engine's kernel (pool_ceiling_wall_room,
+    pool_floor_room, draw_pool), the same steps the optimizers are built
+    from, so each plan matches its optimizers exactly. Per-room results are
+    only built when asked for; totals alone cost one kernel call per room.
+    """
+
+    def __init__(self, keep_room_results):
+        self.global_leftover_1800 = 0
+        self.global_leftover_3600 = 0
+        self.global_leftover_1800_floor = 0
+        self.global_leftover_3600_floor = 0
+        self.total_rolls_1800 = 0
+        self.total_rolls_3600 = 0
+        self.total_rolls_1800_floor = 0
+        self.total_rolls_3600_floor = 0
+        self.room_results = [] if keep_room_results else None
+        self.floor_room_results = [] if keep_room_results else None
+
+    def add_ceiling_wall(self, room_name, ceiling_needs, wall_area, wall_rolls):
+        """Pool a room's ceiling (needs per width) and walls (combination, 1800 / 3600 per set, sets)."""
+        wall_combination, wall_1800_per_set, wall_3600_per_set, wall_perimeter_sets = wall_rolls
+        usage, self.global_leftover_1800, self.global_leftover_3600 = pool_ceiling_wall_room(
+            ceiling_needs[0], ceiling_needs[1], wall_area, wall_1800_per_set, wall_3600_per_set,
+            self.global_leftover_1800, self.global_leftover_3600
+        )
+        self.total_rolls_1800 += usage['room_total_1800']
+        self.total_rolls_3600 += usage['room_total_3600']
+        if self.room_results is not None:
+            self.room_results.append({
+                'name': room_name,
+                **usage,
+                'ceiling_combination': ceiling_needs[2],
+                'wall_combination': wall_combination,
+                'wall_perimeter_sets': wall_perimeter_sets
+            })
+
+    def add_floor(self, room_name, floor_needs):
+        """Pool a room's floor covering (need_1800, need_3600, combination)."""
+        usage, self.global_leftover_1800_floor, self.global_leftover_3600_floor = pool_floor_room(
+            floor_needs[0], floor_needs[1], self.global_leftover_1800_floor, self.global_leftover_3600_floor
+        )
+        self.total_rolls_1800_floor += usage['new_floor_1800_rolls']
+        self.total_rolls_3600_floor += usage['new_floor_3600_rolls']
+        if self.floor_room_results is not None:
+            self.floor_room_results.append({'name': room_name, **usage, 'floor_combination': floor_needs[2]})
+
+
+class _Only1800Plan(_StrategyPlan):
+    """
+    Running pool state of the 1800mm-only plan.
+
+    Ceiling and wall share one 1800mm pool and floors another; patterns are
+    ignored. Matches the *_1800_only optimizers exactly.
+    """
+
+    def add_ceiling_wall(self, room_name, ceiling_area, wall_area):
+        area_from_leftover, new_rolls_1800, self.global_leftover_1800 = draw_pool(
+            ceiling_area + wall_area, self.global_leftover_1800, SHEET_SPECS['ceiling_thin']['actual_coverage']
+        )
+        self.total_rolls_1800 += new_rolls_1800
+        if self.room_results is not None:
+            self.room_results.append({
+                'name': room_name,
+                'area_from_leftover': area_from_leftover,
+                'new_rolls_1800': new_rolls_1800,
+                'room_total_1800': new_rolls_1800,
+                'room_total_3600': 0,
+                'ceiling_combination': ["1800mm"] if ceiling_area > 0 else [],
+                'wall_combination': ["1800mm"] if wall_area > 0 else []
+            })
+
+    def add_floor(self, room_name, floor_area):
+        floor_from_leftover, new_floor_1800_rolls, self.global_leftover_1800_floor = draw_pool(
+            floor_area, self.global_leftover_1800_floor, SHEET_SPECS['floor_thin']['actual_coverage']
+        )
+        self.total_rolls_1800_floor += new_floor_1800_rolls
+        if self.floor_room_results is not None:
+            self.floor_room_results.append({
+                'name': room_name,
+                'floor_1800_from_leftover': floor_from_leftover,
+                'floor_3600_from_leftover': 0,
+                'new_floor_1800_rolls': new_floor_1800_rolls,
+                'new_floor_3600_rolls': 0,
+                'room_total_1800': new_floor_1800_rolls,
+                'room_total_3600': 0,
+                'floor_combination': ["1800mm"] if floor_area > 0 else []
+            })
+
+
+def _plan_summary(plan, strategy):
+    ceiling_wall_results = {
+        'room_results': plan.room_results,
+        'total_rolls_1800': plan.total_rolls_1800,
+        'total_rolls_3600': plan.total_rolls_3600,
+        'final_leftover_1800': plan.global_leftover_1800,
+        'final_leftover_3600': plan.global_leftover_3600
+    }
+    floor_results = {
+        'floor_room_results': plan.floor_room_results,
+        'total_rolls_1800_floor': plan.total_rolls_1800_floor,
+        'total_rolls_3600_floor': plan.total_rolls_3600_floor,
+        'final_leftover_1800_floor': plan.global_leftover_1800_floor,
+        'final_leftover_3600_floor': plan.global_leftover_3600_floor
+    }
+    total_1800 = plan.total_rolls_1800 + plan.total_rolls_1800_floor
+    total_3600 = plan.total_rolls_3600 + plan.total_rolls_3600_floor
+    return {
+        'strategy': strategy,
+        'label': STRATEGY_LABELS[strategy],
+        'ceiling_wall_results': ceiling_wall_results,
+        'total_cw_1800': plan.total_rolls_1800,
+        'total_cw_3600': plan.total_rolls_3600,
+        'floor_results': floor_results,
+        'total_floor_1800': plan.total_rolls_1800_floor,
+        'total_floor_3600': plan.total_rolls_3600_floor,
+        'total_1800': total_1800,
+        'total_3600': total_3600,
+        'total_rolls': total_1800 + total_3600,
+        'leftover_cw': plan.global_leftover_1800 + plan.global_leftover_3600,
+        'leftover_floor': plan.global_leftover_1800_floor + plan.global_leftover_3600_floor
+    }
+
+
+# ==============================================================================
+# SINGLE-PASS MULTI-STRATEGY EVALUATION
+# ==============================================================================
+
+def evaluate_strategies(rooms_data, has_floor_covering=False, strategies=ALL_STRATEGIES, progress_callback=None,
+                        room_results=True):
+    """
+    Evaluate several roll strategies in one walk over the room list.
+
+    Room patterns and area splits are computed once per room (the width
+    pattern serves both ceiling and floor); each strategy then only costs
+    one pooling kernel call per surface, so comparing the plans costs about
+    as much as one optimizer run. Plans:
+    - mixed: same results as the mixed-width optimizers
+    - 1800_only: same results as the *_1800_only optimizers
+    - 3600_preferred: mixed patterns with every 1800mm strip laid as 3600mm
+
+    Args:
+        rooms_data: Surface-filtered room dictionaries (floor areas are 0 when floors are excluded)
+        has_floor_covering: Whether floor covering is being calculated (affects wall patterns)
+        strategies: Strategy keys to evaluate
+        progress_callback: Optional callable(room_index, room_count, room_name)
+        room_results: Whether to build per-room results; without them the
+                      result lists are None and only totals are reported
+
+    Returns:
+        dict: Per strategy key, the ceiling/wall and floor results in the optimizers'
+              shapes plus roll and leftover totals
+    """
+    plans = {
+        strategy: _Only1800Plan(room_results) if strategy == STRATEGY_1800_ONLY else _StrategyPlan(room_results)
+        for strategy in strategies
+    }
+    mixed = plans.get(STRATEGY_MIXED)
+    only_1800 = plans.get(STRATEGY_1800_ONLY)
+    prefer_3600 = plans.get(STRATEGY_3600_PREFERRED)
+    ceiling_index = get_ceiling_floor_breakpoint_index()
+    wall_index = get_wall_breakpoint_index(has_floor_covering)
+
+    for room_index, room in enumerate(rooms_data):
+        room_name = room['name']
+        if progress_callback is not None:
+            progress_callback(room_index, len(rooms_data), room_name)
+        ceiling_area = room.get('ceiling_area', 0)
+        wall_area = room.get('wall_area', 0)
+        floor_area = room.get('floor_area', 0)
+        width_mm = room.get('width_mm', 0)
+        height_mm = room.get('height_mm', 0)
+        length_m = room.get('length_m', 0)
+        perimeter = room.get('perimeter', 0)
+
+        # Width pattern via the breakpoint index (calculate_roll_combination_by_dimension);
+        # 3600mm-preferred lays every strip of it as 3600mm
+        width_1800, width_3600 = ceiling_index.lookup(width_mm)
+        width_strips = width_1800 + width_3600
+        width_combination = ["3600mm"] * width_3600 + ["1800mm"] * width_1800
+        wide_combination = ["3600mm"] * width_strips
+
+        if ceiling_area > 0 or wall_area > 0:
+            if only_1800 is not None:
+                only_1800.add_ceiling_wall(room_name, ceiling_area, wall_area)
+            if mixed is not None or prefer_3600 is not None:
+                if room.get('wall_segment_rolls') is not None:
+                    wall_rolls = tuple(room['wall_segment_rolls'])
+                elif height_mm > 0 and perimeter > 0:
+                    # calculate_wall_rolls_by_height via the breakpoint index
+                    wall_1800, wall_3600 = wall_index.lookup(height_mm)
+                    sets = math.ceil(perimeter / ROLL_LENGTH)
+                    wall_rolls = (["3600mm"] * wall_3600 + ["1800mm"] * wall_1800, wall_1800 * sets, wall_3600 * sets, sets)
+                else:
+                    wall_rolls = ([], 0, 0, 0)
+                if mixed is not None:
+                    need_1800, need_3600 = split_area_by_pattern(ceiling_area, width_1800, width_3600)
+                    mixed.add_ceiling_wall(room_name, (need_1800, need_3600, width_combination), wall_area, wall_rolls)
+                if prefer_3600 is not None:
+                    wall_combination, wall_1800_per_set, wall_3600_per_set, wall_sets = wall_rolls
+                    prefer_3600.add_ceiling_wall(
+                        room_name,
+                        (0, ceiling_area if width_strips > 0 else 0, wide_combination),
+                        wall_area,
+                        (["3600mm"] * len(wall_combination), 0, wall_3600_per_set + wall_1800_per_set, wall_sets)
+                    )
+
+        if floor_area > 0:
+            if only_1800 is not None:
+                only_1800.add_floor(room_name, floor_area)
+            if width_mm > 0 and length_m > 0:
+                if mixed is not None:
+                    need_1800, need_3600 = split_area_by_pattern(floor_area, width_1800, width_3600)
+                    mixed.add_floor(room_name, (need_1800, need_3600, width_combination))
+                if prefer_3600 is not None:
+                    prefer_3600.add_floor(room_name, (0, floor_area if width_strips > 0 else 0, wide_combination))
+
+    return {strategy: _plan_summary(plan, strategy) for strategy, plan in plans.items()}
@@ -0,0 +1,150 @@
+import numpy as np
+
+from breakpoints import get_wall_breakpoint_index
+from sheet_engine import ROLL_LENGTH
+
+
+# ==============================================================================
+# HELPER FUNCTIONS
+# ==============================================================================
+
+def rectangular_wall_segments(length_m, width_m, height_m):
+    """Default segments for a rectangular room: four walls of one height, no openings."""
+    return [
+        {'length_m': length_m, 'height_m': height_m, 'openings': []},
+        {'length_m': width_m, 'height_m': height_m, 'openings': []},
+        {'length_m': length_m, 'height_m': height_m, 'openings': []},
+        {'length_m': width_m, 'height_m': height_m, 'openings': []}
+    ]
+
+
+# ==============================================================================
+# WALL SEGMENT BATCH CALCULATION
+# ==============================================================================
+
+def calculate_wall_segments_batch(rooms_segments, has_floor_covering=False):
+    """
+    Calculate net wall areas and roll patterns for every wall segment of a project.
+
+    All segments of all rooms are flattened into arrays so that areas,
+    opening deductions and pattern lookups run as single numpy operations.
+    Segments that share a roll pattern within a room are laid as one
+    continuous run, so 50m sets are counted per (room, pattern) group.
+
+    Args:
+        rooms_segments: Per room, a list of segments with length_m, height_m and
+            openings (list of dicts with width_m, height_m)
+        has_floor_covering: Whether floor covering is being calculated (affects wall patterns)
+
+    Returns:
+        list: Per room dict with gross_wall_area, opening_area, net_wall_area,
+              run_length_m, segments (per-segment breakdown) and wall_segment_rolls
+              (combination, rolls_1800, rolls_3600, sets) for the ceiling/wall optimizer
+    """
+    room_count = len(rooms_segments)
+    segment_room = []
+    segment_lengths = []
+    segment_heights = []
+    opening_segment = []
+    opening_areas = []
+
+    for room_index, segments in enumerate(rooms_segments):
+        for segment in segments:
+            segment_index = len(segment_lengths)
+            segment_room.append(room_index)
+            segment_lengths.append(max(segment.get('length_m', 0) or 0, 0))
+            segment_heights.append(max(segment.get('height_m', 0) or 0, 0))
+            for opening in segment.get('openings', []):
+                opening_segment.append(segment_index)
+                opening_areas.append(max(opening.get('width_m', 0) or 0, 0) * max(opening.get('height_m', 0) or 0, 0))
+
+    segment_count = len(segment_lengths)
+    if segment_count == 0:
+        return [_empty_room_walls() for _ in range(room_count)]
+
+    segment_room = np.asarray(segment_room, dtype=np.int64)
+    lengths = np.asarray(segment_lengths, dtype=np.float64)
+    heights = np.asarray(segment_heights, dtype=np.float64)
+
+    gross_areas = lengths * heights
+    segment_opening_areas = np.bincount(
+        np.asarray(opening_segment, dtype=np.int64),
+        weights=np.asarray(opening_areas, dtype=np.float64),
+        minlength=segment_count
+    ) if opening_segment else np.zeros(segment_count)
+    # Openings can never remove more than the segment itself
+    segment_opening_areas = np.minimum(segment_opening_areas, gross_areas)
+    net_areas = gross_areas - segment_opening_areas
+
+    valid = (lengths > 0) & (heights > 0)
+    patterns = get_wall_breakpoint_index(has_floor_covering).lookup_many(heights * 1000)
+    patterns[~valid] = 0
+
+    # Group valid segments by (room, pattern) and count 50m sets per continuous run
+    group_keys = np.stack([segment_room, patterns[:, 0], patterns[:, 1]], axis=1)[valid]
+    run_lengths = lengths[valid]
+    room_rolls_1800 = np.zeros(room_count, dtype=np.int64)
+    room_rolls_3600 = np.zeros(room_count, dtype=np.int64)
+    room_sets = np.zeros(room_count, dtype=np.int64)
+    if len(group_keys):
+        unique_keys, inverse = np.unique(group_keys, axis=0, return_inverse=True)
+        group_lengths = np.bincount(inverse.ravel(), weights=run_lengths, minlength=len(unique_keys))
+        group_sets = np.ceil(group_lengths / ROLL_LENGTH).astype(np.int64)
+        np.add.at(room_rolls_1800, unique_keys[:, 0], unique_keys[:, 1] * group_sets)
+        np.add.at(room_rolls_3600, unique_keys[:, 0], unique_keys[:, 2] * group_sets)
+        np.add.at(room_sets, unique_keys[:, 0], group_sets)
+
+    room_gross = np.bincount(segment_room, weights=gross_areas, minlength=room_count)
+    room_openings = np.bincount(segment_room, weights=segment_opening_areas, minlength=room_count)
+    room_net = np.bincount(segment_room, weights=net_areas, minlength=room_count)
+    room_run_length = np.bincount(segment_room, weights=np.where(valid, lengths, 0), minlength=room_count)
+
+    # Segments were flattened room by room, so segment_room is sorted and each room is one slice
+    room_offsets = np.searchsorted(segment_room, np.arange(room_count + 1))
+
+    results = []
+    for room_index in range(room_count):
+        indices = np.arange(room_offsets[room_index], room_offsets[room_index + 1])
+        segments = [
+            {
+                'length_m': float(lengths[i]),
+                'height_m': float(heights[i]),
+                'gross_area': float(gross_areas[i]),
+                'opening_area': float(segment_opening_areas[i]),
+                'net_area': float(net_areas[i]),
+                'rolls_1800_per_set': int(patterns[i, 0]),
+                'rolls_3600_per_set': int(patterns[i, 1])
+            }
+            for i in indices
+        ]
+        # Display the pattern of the tallest segment, like the single-height wall combination
+        if len(indices) and valid[indices].any():
+            tallest = indices[valid[indices]][np.argmax(heights[indices][valid[indices]])]
+            combination = ["3600mm"] * int(patterns[tallest, 1]) + ["1800mm"] * int(patterns[tallest, 0])
+        else:
+            combination = []
+        results.append({
+            'gross_wall_area': float(room_gross[room_index]),
+            'opening_area': float(room_openings[room_index]),
+            'net_wall_area': float(room_net[room_index]),
+            'run_length_m': float(room_run_length[room_index]),
+            'segments': segments,
+            'wall_segment_rolls': (
+                combination,
+                int(room_rolls_1800[room_index]),
+                int(room_rolls_3600[room_index]),
+                int(room_sets[room_index])
+            )
+        })
+    return results
+
+
+def _empty_room_walls():
+    return {
+        'gross_wall_area': 0.0,
+        'opening_area': 0.0,
+        'net_wall_area': 0.0,
+        'run_length_m': 0.0,
+        'segments': [],
+        'wall_segment_rolls': ([], 0, 0, 0)
+    }